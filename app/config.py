@@ -6,9 +6,13 @@ DATA_DIR: str = os.getenv("DATA_DIR", "")
 if DATA_DIR:
     _default_db = f"sqlite:///{DATA_DIR}/reviews.db"
     _default_upload = f"{DATA_DIR}/uploads"
+    _default_import = f"{DATA_DIR}/imports"
+    _default_backup = f"{DATA_DIR}/backups"
 else:
     _default_db = "sqlite:///./reviews.db"
     _default_upload = "./uploads"
+    _default_import = "./imports"
+    _default_backup = "./backups"
 
 DATABASE_URL: str = os.getenv("DATABASE_URL", _default_db)
 SECRET_KEY: str = os.getenv("SECRET_KEY", "dev-secret-key")
@@ -16,3 +20,76 @@ ALLOWED_ORIGINS: list[str] = os.getenv("ALLOWED_ORIGINS", "*").split(",")
 UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", _default_upload)
 MAX_IMAGE_SIZE: int = int(os.getenv("MAX_IMAGE_SIZE", "10485760"))  # 10MB
 MAX_IMAGES_PER_REVIEW: int = 5
+MAX_BATCH_SIZE: int = 1000  # 일괄 처리 API 한 요청의 리뷰 수 상한
+
+# SQLite 커넥션 풀
+DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "8"))
+DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "10"))  # 초
+DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "3600"))  # 초
+DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+
+# API의 DB 작업을 실행하는 전용 스레드 수 (0이면 DB_POOL_SIZE와 같게)
+DB_EXECUTOR_WORKERS: int = int(os.getenv("DB_EXECUTOR_WORKERS", "0"))
+# 스레드를 기다리는 DB 작업 수 상한. 넘으면 503 (0이면 무제한)
+DB_EXECUTOR_MAX_QUEUE: int = int(os.getenv("DB_EXECUTOR_MAX_QUEUE", "256"))
+
+# 쓰기 전용 스레드 (API 쓰기를 한 스레드로 모아 그룹 커밋, 0이면 DB 스레드 풀에서 직접 쓰기)
+DB_WRITER_ENABLED: bool = os.getenv("DB_WRITER_ENABLED", "1") == "1"
+# 한 트랜잭션(커밋)에 묶는 쓰기 작업 수 상한
+DB_WRITER_MAX_BATCH: int = int(os.getenv("DB_WRITER_MAX_BATCH", "64"))
+# 첫 작업 뒤 같은 커밋에 묶을 작업을 더 기다리는 시간 (밀리초, 0이면 이미 대기 중인 작업만)
+DB_WRITER_MAX_DELAY_MS: float = float(os.getenv("DB_WRITER_MAX_DELAY_MS", "0"))
+# 쓰기 스레드를 기다리는 작업 수 상한. 넘으면 503 (0이면 무제한)
+DB_WRITER_MAX_QUEUE: int = int(os.getenv("DB_WRITER_MAX_QUEUE", "1024"))
+
+# 위젯 API 응답 캐시 (0이면 비활성화)
+WIDGET_CACHE_TTL: int = int(os.getenv("WIDGET_CACHE_TTL", "60"))  # 초
+WIDGET_CACHE_MAX_BYTES: int = int(os.getenv("WIDGET_CACHE_MAX_BYTES", "33554432"))  # 32MB
+
+# 위젯 API 브라우저/CDN 캐시 시간 (Cache-Control max-age, 초)
+WIDGET_HTTP_MAX_AGE: int = int(os.getenv("WIDGET_HTTP_MAX_AGE", "60"))
+
+# 위젯/리뷰 목록을 Pydantic 모델 대신 Row → dict → orjson으로 직렬화 (출력 동일)
+FAST_JSON: bool = os.getenv("FAST_JSON", "0") == "1"
+
+# 응답 압축 (gzip, brotli 패키지가 있으면 br). 최소 크기 미만 응답은 그대로 보낸다
+COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "1") == "1"
+COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # 바이트
+COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_MEDIA_TYPES: list[str] = os.getenv(
+    "COMPRESSION_MEDIA_TYPES",
+    "application/json,application/x-ndjson,text/html,text/plain,text/csv,"
+    "text/css,application/javascript",
+).split(",")
+# 위젯 응답 캐시에 압축된 본문도 함께 보관 (요청마다 다시 압축하지 않음)
+WIDGET_CACHE_COMPRESSED: bool = os.getenv("WIDGET_CACHE_COMPRESSED", "1") == "1"
+
+# 엑셀 일괄 등록 시 한 번에 커밋하는 행 수
+EXCEL_IMPORT_CHUNK_SIZE: int = int(os.getenv("EXCEL_IMPORT_CHUNK_SIZE", "1000"))
+
+# 백그라운드 엑셀 등록 작업의 업로드 파일 보관 경로 (재시작 후 이어서 처리)
+IMPORT_DIR: str = os.getenv("IMPORT_DIR", _default_import)
+
+# 업로드 이미지 변형(썸네일/카드/라이트박스) 생성 프로세스 수 (0이면 워커 스레드에서 직접 생성)
+IMAGE_VARIANT_WORKERS: int = int(os.getenv("IMAGE_VARIANT_WORKERS", "1"))
+
+# 업로드 파일 저장소: local(UPLOAD_DIR) 또는 s3(S3 호환 오브젝트 스토리지, boto3 필요)
+STORAGE_BACKEND: str = os.getenv("STORAGE_BACKEND", "local")
+S3_BUCKET: str = os.getenv("S3_BUCKET", "")
+S3_ENDPOINT_URL: str = os.getenv("S3_ENDPOINT_URL", "")  # R2/MinIO 등 (AWS S3면 비워둠)
+S3_REGION: str = os.getenv("S3_REGION", "")
+S3_PREFIX: str = os.getenv("S3_PREFIX", "")
+# CDN/공개 버킷 주소. 비어 있으면 사전 서명 URL을 발급한다.
+S3_PUBLIC_BASE_URL: str = os.getenv("S3_PUBLIC_BASE_URL", "")
+S3_PRESIGN_EXPIRES: int = int(os.getenv("S3_PRESIGN_EXPIRES", "86400"))  # 초
+
+# SQLite 온라인 스냅샷 (sqlite3 백업 API, 쓰기를 막지 않음)
+BACKUP_DIR: str = os.getenv("BACKUP_DIR", _default_backup)
+BACKUP_INTERVAL_HOURS: float = float(os.getenv("BACKUP_INTERVAL_HOURS", "24"))  # 0이면 정기 스냅샷 끔
+BACKUP_KEEP: int = int(os.getenv("BACKUP_KEEP", "7"))  # 보관 개수 (0이면 모두 보관)
+BACKUP_COMPRESS: bool = os.getenv("BACKUP_COMPRESS", "1") == "1"  # gzip
+BACKUP_GZIP_LEVEL: int = int(os.getenv("BACKUP_GZIP_LEVEL", "6"))
+# 한 단계에 복사하는 페이지 수와 단계 사이 대기 시간 (초)
+BACKUP_STEP_PAGES: int = int(os.getenv("BACKUP_STEP_PAGES", "1024"))
+BACKUP_STEP_SLEEP: float = float(os.getenv("BACKUP_STEP_SLEEP", "0.005"))
@@ -1,9 +1,19 @@
+import asyncio
+import functools
+import inspect
+import logging
+import queue
 import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Callable, ContextManager, Generator, Optional, TypeVar
 
 from app import config
 
+logger = logging.getLogger(__name__)
+
 _CREATE_TABLES_SQL = """
 CREATE TABLE IF NOT EXISTS reviews (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -36,9 +46,285 @@ CREATE TABLE IF NOT EXISTS products (
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX IF NOT EXISTS idx_reviews_product_no ON reviews(product_no);
+"""
+
+# 인덱스 세트. 위젯/관리 API의 각 쿼리가 전체 스캔이나 임시 정렬(temp B-tree)
+# 없이 실행되는지는 tests/test_query_plans.py에서 EXPLAIN QUERY PLAN으로 검증한다.
+_CREATE_INDEXES_SQL = """
 CREATE INDEX IF NOT EXISTS idx_review_images_review_id ON review_images(review_id);
-CREATE INDEX IF NOT EXISTS idx_products_product_no ON products(product_no);
+CREATE INDEX IF NOT EXISTS idx_products_name ON products(product_name, product_no);
+
+-- 관리 목록 (created_at DESC, id DESC)
+CREATE INDEX IF NOT EXISTS idx_reviews_created ON reviews(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_reviews_product_created
+    ON reviews(product_no, created_at, id);
+
+-- 위젯 정렬별 (latest / rating_high / rating_low) 및 갤러리
+CREATE INDEX IF NOT EXISTS idx_reviews_widget_latest
+    ON reviews(product_no, is_visible, display_order, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_reviews_widget_rating_high
+    ON reviews(product_no, is_visible, rating, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_reviews_widget_rating_low
+    ON reviews(product_no, is_visible, rating, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_reviews_widget_gallery
+    ON reviews(product_no, is_visible, created_at, id);
+
+-- 위 복합 인덱스의 접두사와 중복 / UNIQUE 제약 인덱스와 중복.
+-- 새 인덱스가 만들어진 뒤에 지워야 조회가 인덱스 없이 실행되는 구간이 없다.
+DROP INDEX IF EXISTS idx_reviews_product_no;
+DROP INDEX IF EXISTS idx_products_product_no;
+"""
+
+
+def _stats_delta_sql(ref: str, sign: str) -> str:
+    """리뷰 한 건(NEW/OLD)만큼 product_review_stats를 증감하는 UPSERT 문."""
+    stars = ", ".join(f"{sign}({ref}.rating = {n})" for n in range(1, 6))
+    star_updates = ", ".join(
+        f"star_{n} = star_{n} + excluded.star_{n}" for n in range(1, 6)
+    )
+    return f"""
+    INSERT INTO product_review_stats
+        (product_no, review_count, rating_sum,
+         star_1, star_2, star_3, star_4, star_5,
+         photo_review_count, updated_at)
+    SELECT {ref}.product_no, {sign}1, {sign}{ref}.rating, {stars},
+           {sign}EXISTS(SELECT 1 FROM review_images WHERE review_id = {ref}.id),
+           CURRENT_TIMESTAMP
+    WHERE {ref}.is_visible = 1
+    ON CONFLICT(product_no) DO UPDATE SET
+        review_count = review_count + excluded.review_count,
+        rating_sum = rating_sum + excluded.rating_sum,
+        {star_updates},
+        photo_review_count = photo_review_count + excluded.photo_review_count,
+        updated_at = excluded.updated_at;"""
+
+
+# 상품별 노출 리뷰 요약 (위젯 통계용). 트리거로 쓰기 시점에 동기화된다.
+# 리뷰 삭제 시 CASCADE로 이미지가 먼저 지워지므로 삭제 트리거는 BEFORE로 둔다.
+_CREATE_STATS_SQL = f"""
+CREATE TABLE IF NOT EXISTS product_review_stats (
+    product_no TEXT PRIMARY KEY,
+    review_count INTEGER NOT NULL DEFAULT 0,
+    rating_sum INTEGER NOT NULL DEFAULT 0,
+    star_1 INTEGER NOT NULL DEFAULT 0,
+    star_2 INTEGER NOT NULL DEFAULT 0,
+    star_3 INTEGER NOT NULL DEFAULT 0,
+    star_4 INTEGER NOT NULL DEFAULT 0,
+    star_5 INTEGER NOT NULL DEFAULT 0,
+    photo_review_count INTEGER NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_reviews_stats_insert
+AFTER INSERT ON reviews
+BEGIN{_stats_delta_sql("NEW", "+")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_reviews_stats_delete
+BEFORE DELETE ON reviews
+BEGIN{_stats_delta_sql("OLD", "-")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_reviews_stats_update
+AFTER UPDATE OF product_no, rating, is_visible ON reviews
+BEGIN{_stats_delta_sql("OLD", "-")}{_stats_delta_sql("NEW", "+")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_review_images_stats_insert
+AFTER INSERT ON review_images
+WHEN (SELECT COUNT(*) FROM review_images WHERE review_id = NEW.review_id) = 1
+BEGIN
+    UPDATE product_review_stats
+    SET photo_review_count = photo_review_count + 1,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE product_no = (
+        SELECT product_no FROM reviews WHERE id = NEW.review_id AND is_visible = 1
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_review_images_stats_delete
+AFTER DELETE ON review_images
+WHEN NOT EXISTS (SELECT 1 FROM review_images WHERE review_id = OLD.review_id)
+BEGIN
+    UPDATE product_review_stats
+    SET photo_review_count = photo_review_count - 1,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE product_no = (
+        SELECT product_no FROM reviews WHERE id = OLD.review_id AND is_visible = 1
+    );
+END;
+"""
+
+
+def _version_bump_sql(scope_expr: str, source: str = "", where: str = "true") -> str:
+    """data_versions의 scope 버전을 1 올리는 UPSERT 문."""
+    select = f"SELECT {scope_expr}, 1, CURRENT_TIMESTAMP"
+    if source:
+        select += f" {source}"
+    return f"""
+    INSERT INTO data_versions (scope, version, updated_at)
+    {select}
+    WHERE {where}
+    ON CONFLICT(scope) DO UPDATE SET
+        version = version + 1,
+        updated_at = excluded.updated_at;"""
+
+
+# HTTP 조건부 요청(ETag/Last-Modified)용 버전 카운터.
+# scope: 'reviews'(전체) 또는 'product:<상품번호>'
+_CREATE_VERSIONS_SQL = f"""
+CREATE TABLE IF NOT EXISTS data_versions (
+    scope TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_reviews_version_insert
+AFTER INSERT ON reviews
+BEGIN{_version_bump_sql("'product:' || NEW.product_no")}{_version_bump_sql("'reviews'")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_reviews_version_update
+AFTER UPDATE ON reviews
+BEGIN{_version_bump_sql("'product:' || OLD.product_no")}{_version_bump_sql("'product:' || NEW.product_no", where="NEW.product_no != OLD.product_no")}{_version_bump_sql("'reviews'")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_reviews_version_delete
+AFTER DELETE ON reviews
+BEGIN{_version_bump_sql("'product:' || OLD.product_no")}{_version_bump_sql("'reviews'")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_review_images_version_insert
+AFTER INSERT ON review_images
+BEGIN{_version_bump_sql("'product:' || product_no", "FROM reviews", "id = NEW.review_id")}{_version_bump_sql("'reviews'")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_review_images_version_delete
+AFTER DELETE ON review_images
+BEGIN{_version_bump_sql("'product:' || product_no", "FROM reviews", "id = OLD.review_id")}{_version_bump_sql("'reviews'")}
+END;
+"""
+
+
+# 관리자 검색용 FTS5 인덱스 (trigram: 한글 부분 문자열 검색 지원).
+# reviews를 content 테이블로 쓰는 external content 방식이며 트리거로 동기화한다.
+_CREATE_SEARCH_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS reviews_fts USING fts5(
+    author, title, content,
+    content='reviews', content_rowid='id',
+    tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_reviews_fts_insert
+AFTER INSERT ON reviews
+BEGIN
+    INSERT INTO reviews_fts (rowid, author, title, content)
+    VALUES (NEW.id, NEW.author, NEW.title, NEW.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_reviews_fts_delete
+AFTER DELETE ON reviews
+BEGIN
+    INSERT INTO reviews_fts (reviews_fts, rowid, author, title, content)
+    VALUES ('delete', OLD.id, OLD.author, OLD.title, OLD.content);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_reviews_fts_update
+AFTER UPDATE OF author, title, content ON reviews
+BEGIN
+    INSERT INTO reviews_fts (reviews_fts, rowid, author, title, content)
+    VALUES ('delete', OLD.id, OLD.author, OLD.title, OLD.content);
+    INSERT INTO reviews_fts (rowid, author, title, content)
+    VALUES (NEW.id, NEW.author, NEW.title, NEW.content);
+END;
+"""
+
+
+# 업로드 이미지의 반응형 변형 목록(JSON)과 생성 상태. 컬럼 추가(ALTER TABLE)는
+# 멱등하지 않아 마이그레이션 함수에서 컬럼 존재 여부를 확인한 뒤 실행한다.
+_IMAGE_VARIANT_COLUMNS = (
+    ("variants", "TEXT NOT NULL DEFAULT '[]'"),
+    ("variant_status", "TEXT NOT NULL DEFAULT 'pending'"),
+)
+
+# 변형 생성이 끝나면 위젯 ETag가 바뀌도록 버전을 올린다.
+_CREATE_IMAGE_VARIANTS_SQL = f"""
+CREATE TRIGGER IF NOT EXISTS trg_review_images_version_update
+AFTER UPDATE OF variants ON review_images
+BEGIN{_version_bump_sql("'product:' || product_no", "FROM reviews", "id = NEW.review_id")}{_version_bump_sql("'reviews'")}
+END;
+"""
+
+# 업로드 파일(blob) 참조 카운트. 같은 내용의 이미지는 해시 기반 경로 하나를 공유하고,
+# review_images 행이 추가/삭제될 때(리뷰 CASCADE 삭제 포함) 트리거로 카운트를 맞춘다.
+# 카운트가 0이 된 파일은 storage.release_images()/collect_garbage()가 지운다.
+_CREATE_IMAGE_BLOBS_SQL = """
+CREATE TABLE IF NOT EXISTS image_blobs (
+    file_path TEXT PRIMARY KEY,
+    file_size INTEGER NOT NULL DEFAULT 0,
+    ref_count INTEGER NOT NULL DEFAULT 0,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_image_blobs_unreferenced
+ON image_blobs(file_path) WHERE ref_count <= 0;
+
+INSERT INTO image_blobs (file_path, file_size, ref_count)
+SELECT file_path, MAX(COALESCE(file_size, 0)), COUNT(*)
+FROM review_images
+WHERE true
+GROUP BY file_path
+ON CONFLICT(file_path) DO NOTHING;
+
+CREATE TRIGGER IF NOT EXISTS trg_review_images_blob_insert
+AFTER INSERT ON review_images
+BEGIN
+    INSERT INTO image_blobs (file_path, file_size, ref_count)
+    VALUES (NEW.file_path, COALESCE(NEW.file_size, 0), 1)
+    ON CONFLICT(file_path) DO UPDATE SET ref_count = ref_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_review_images_blob_delete
+AFTER DELETE ON review_images
+BEGIN
+    UPDATE image_blobs SET ref_count = ref_count - 1
+    WHERE file_path = OLD.file_path;
+END;
+"""
+
+# 저장소에서 지운 blob 경로와 삭제 시각 (epoch 초, 진행 중이면 finished_at이 NULL).
+# 업로드는 쓰기 트랜잭션 밖에서 파일을 먼저 배치하므로, review_images 등록 시
+# 그 사이 같은 경로의 삭제가 있었는지 여기서 확인한다 (storage.check_blob_deletions).
+_CREATE_IMAGE_BLOB_DELETIONS_SQL = """
+CREATE TABLE IF NOT EXISTS image_blob_deletions (
+    file_path TEXT PRIMARY KEY,
+    started_at REAL NOT NULL,
+    finished_at REAL
+);
+"""
+
+# 백그라운드 엑셀 등록 작업. processed_rows까지는 리뷰와 같은 트랜잭션으로
+# 커밋되므로 재시작 후 그 다음 행부터 이어서 처리한다.
+_CREATE_IMPORT_JOBS_SQL = """
+CREATE TABLE IF NOT EXISTS import_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    filename TEXT NOT NULL DEFAULT '',
+    file_path TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued'
+        CHECK(status IN ('queued', 'running', 'completed', 'failed', 'cancelled')),
+    total_rows INTEGER,
+    processed_rows INTEGER NOT NULL DEFAULT 0,
+    success_count INTEGER NOT NULL DEFAULT 0,
+    fail_count INTEGER NOT NULL DEFAULT 0,
+    errors TEXT NOT NULL DEFAULT '[]',
+    error_message TEXT NOT NULL DEFAULT '',
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    started_at DATETIME,
+    finished_at DATETIME
+);
+
+CREATE INDEX IF NOT EXISTS idx_import_jobs_status ON import_jobs(status, id);
 """
 
 
@@ -49,44 +335,810 @@ def _get_db_path() -> str:
     return "./reviews.db"
 
 
-def get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(_get_db_path(), check_same_thread=False)
+class _Connection(sqlite3.Connection):
+    """커밋 직후 실행할 콜백(after_commit)을 지원하는 연결."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.commit_hooks: list[Callable[[], None]] = []
+
+    def commit(self) -> None:
+        super().commit()
+        hooks, self.commit_hooks = self.commit_hooks, []
+        for hook in hooks:
+            hook()
+
+    def rollback(self) -> None:
+        super().rollback()
+        self.commit_hooks = []
+
+
+def after_commit(conn: sqlite3.Connection, callback: Callable[[], None]) -> None:
+    """현재 트랜잭션이 커밋된 뒤 callback을 실행한다 (롤백 시 버려짐)."""
+    if isinstance(conn, _Connection):
+        conn.commit_hooks.append(callback)
+    else:
+        callback()
+
+
+def _open_connection(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, check_same_thread=False, factory=_Connection)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA foreign_keys=ON")
     return conn
 
 
+def get_connection() -> sqlite3.Connection:
+    """풀을 거치지 않는 새 연결을 연다 (단독 스크립트용)."""
+    return _open_connection(_get_db_path())
+
+
+class PoolTimeoutError(RuntimeError):
+    """풀의 모든 연결이 사용 중이고 대기 시간이 초과되었을 때 발생한다."""
+
+
+class ConnectionPool:
+    """스레드 친화적(thread-affine) SQLite 커넥션 풀.
+
+    - 최대 ``max_size``개의 연결을 유지하며, 모두 사용 중이면 ``timeout``초까지 대기
+    - 반납된 연결은 마지막으로 사용한 스레드에 우선 재할당 (스레드 친화성)
+    - ``recycle``초보다 오래된 연결은 폐기 후 재생성
+    - ``pre_ping``이 켜져 있으면 대여 시 ``SELECT 1``로 상태 확인
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_size: int = 8,
+        timeout: float = 10.0,
+        recycle: int = 3600,
+        pre_ping: bool = True,
+    ) -> None:
+        self.db_path = db_path
+        self.max_size = max(1, max_size)
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._idle: dict[int, sqlite3.Connection] = {}
+        self._created_at: dict[int, float] = {}
+        self._in_use = 0
+        self._closed = False
+        self._stats = {
+            "checkouts": 0,
+            "hits": 0,
+            "affinity_hits": 0,
+            "misses": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "recycled": 0,
+            "health_check_failures": 0,
+        }
+
+    # -- 연결 생성/폐기 ------------------------------------------------------
+    # 연결 열기/닫기와 SELECT 1 은 self._cond 밖에서 한다. 락 안에서는 무엇을 할지
+    # 정하고(슬롯 예약) _idle, _created_at, 카운터만 갱신한다.
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = _open_connection(self.db_path)
+        with self._cond:
+            self._created_at[id(conn)] = time.monotonic()
+        return conn
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        with self._cond:
+            self._created_at.pop(id(conn), None)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _health_failure(self, conn: sqlite3.Connection) -> Optional[str]:
+        """연결을 쓸 수 없으면 해당 통계 키를, 괜찮으면 None을 반환한다 (락 밖에서 호출)."""
+        created = self._created_at.get(id(conn), 0.0)
+        if self.recycle > 0 and time.monotonic() - created > self.recycle:
+            return "recycled"
+        if self.pre_ping:
+            try:
+                conn.execute("SELECT 1").fetchone()
+            except sqlite3.Error:
+                return "health_check_failures"
+        return None
+
+    # -- 대여/반납 -----------------------------------------------------------
+
+    def _take_idle(self) -> Optional[sqlite3.Connection]:
+        """유휴 연결 하나를 꺼낸다. 현재 스레드가 마지막으로 쓴 연결을 우선한다."""
+        preferred: Optional[int] = getattr(self._local, "conn_id", None)
+        if preferred is not None and preferred in self._idle:
+            self._stats["affinity_hits"] += 1
+            return self._idle.pop(preferred)
+        if self._idle:
+            # 가장 최근에 반납된 연결 (LIFO)
+            return self._idle.pop(next(reversed(self._idle)))
+        return None
+
+    def _reserve(self, deadline: float) -> Optional[sqlite3.Connection]:
+        """락 안에서 슬롯 하나를 예약한다.
+
+        유휴 연결을 꺼냈으면 그 연결을, 새로 열어야 하면 None을 반환한다.
+        어느 경우든 ``_in_use``가 이미 늘어 있으므로 실패 시 ``_unreserve``해야 한다.
+        """
+        waited = False
+        while True:
+            if self._closed:
+                raise PoolTimeoutError("커넥션 풀이 닫혔습니다.")
+            conn = self._take_idle()
+            if conn is not None or self._in_use + len(self._idle) < self.max_size:
+                self._in_use += 1
+                return conn
+            if not waited:
+                self._stats["waits"] += 1
+                waited = True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._stats["timeouts"] += 1
+                raise PoolTimeoutError(
+                    f"{self.timeout}초 안에 DB 연결을 얻지 못했습니다. "
+                    f"(풀 크기 {self.max_size})"
+                )
+            self._cond.wait(remaining)
+
+    def _unreserve(self) -> None:
+        with self._cond:
+            self._in_use -= 1
+            self._cond.notify()
+
+    def acquire(self) -> sqlite3.Connection:
+        """풀에서 연결을 대여한다."""
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            if self._closed:
+                raise PoolTimeoutError("커넥션 풀이 닫혔습니다.")
+            self._stats["checkouts"] += 1
+        while True:
+            with self._cond:
+                conn = self._reserve(deadline)
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except BaseException:
+                    self._unreserve()
+                    raise
+                with self._cond:
+                    self._stats["misses"] += 1
+                break
+            failure = self._health_failure(conn)
+            if failure is None:
+                with self._cond:
+                    self._stats["hits"] += 1
+                break
+            with self._cond:
+                self._stats[failure] += 1
+            self._discard(conn)
+            self._unreserve()
+        self._local.conn_id = id(conn)
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """연결을 풀에 반납한다. 열린 트랜잭션은 롤백된다."""
+        healthy = True
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            if isinstance(conn, _Connection):
+                conn.commit_hooks = []
+            conn.row_factory = sqlite3.Row
+        except sqlite3.Error:
+            healthy = False
+
+        with self._cond:
+            keep = healthy and not self._closed
+            if keep:
+                self._idle[id(conn)] = conn
+                self._in_use -= 1
+                self._cond.notify()
+        if not keep:
+            # 닫은 뒤에 슬롯을 돌려줘야 max_size를 넘는 연결이 동시에 열리지 않는다
+            self._discard(conn)
+            self._unreserve()
+
+    @contextmanager
+    def connection(self) -> Generator[sqlite3.Connection, None, None]:
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self) -> None:
+        """유휴 연결을 모두 닫는다. 대여 중인 연결은 반납 시 닫힌다."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle.values())
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in idle:
+            self._discard(conn)
+
+    def stats(self) -> dict:
+        """풀 사이징을 위한 지표를 반환한다."""
+        with self._cond:
+            data: dict = dict(self._stats)
+            data["size"] = self._in_use + len(self._idle)
+            data["max_size"] = self.max_size
+            data["in_use"] = self._in_use
+            data["idle"] = len(self._idle)
+            checkouts = data["checkouts"]
+            data["hit_rate"] = round(data["hits"] / checkouts, 4) if checkouts else 0.0
+            return data
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """현재 DB 경로에 대한 전역 커넥션 풀을 반환한다 (지연 생성)."""
+    global _pool
+    db_path = _get_db_path()
+    with _pool_lock:
+        if _pool is None or _pool.db_path != db_path:
+            if _pool is not None:
+                _pool.close()
+            _pool = ConnectionPool(
+                db_path,
+                max_size=config.DB_POOL_SIZE,
+                timeout=config.DB_POOL_TIMEOUT,
+                recycle=config.DB_POOL_RECYCLE,
+                pre_ping=config.DB_POOL_PRE_PING,
+            )
+        return _pool
+
+
+def close_pool() -> None:
+    """전역 커넥션 풀을 닫는다 (앱 종료 시)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
 @contextmanager
 def get_db() -> Generator[sqlite3.Connection, None, None]:
-    conn = get_connection()
-    try:
-        yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
-
-
-def get_db_dependency() -> Generator[sqlite3.Connection, None, None]:
-    """FastAPI Depends용 제너레이터."""
-    conn = get_connection()
-    try:
-        yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
-
-
-def init_db() -> None:
-    conn = get_connection()
-    try:
-        conn.executescript(_CREATE_TABLES_SQL)
-        conn.commit()
-    finally:
-        conn.close()
+    with get_pool().connection() as conn:
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
+# ---------------------------------------------------------------------------
+# 비동기 DB 접근 (전용 스레드 풀)
+# ---------------------------------------------------------------------------
+
+T = TypeVar("T")
+
+
+class DBOverloadedError(RuntimeError):
+    """DB 작업 대기열이 가득 찼을 때 발생한다 (503으로 응답)."""
+
+
+class DBExecutor:
+    """DB 작업 전용 스레드 풀.
+
+    라우터는 이벤트 루프에서 sqlite3를 직접 호출하지 않고 ``run()``으로 작업을 넘긴다.
+    작업 하나는 한 스레드에서 연결 대여 → 실행 → 커밋/롤백 → 반납까지 끝내므로
+    트랜잭션이 스레드를 넘나들지 않고, 워커 스레드가 고정되어 풀의 스레드 친화성이 유지된다.
+
+    - ``workers``: 동시에 실행되는 DB 작업 수 (기본값은 풀 크기와 같아 연결 대기가 없음)
+    - ``max_queue``: 워커를 기다리는 작업 수 상한. 넘으면 DBOverloadedError (0이면 무제한)
+    - ``connection``: 작업마다 연결을 여는 컨텍스트 매니저 팩토리 (기본 get_db)
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_queue: int = 0,
+        connection: Optional[Callable[[], ContextManager[sqlite3.Connection]]] = None,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.connection = connection or get_db
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="db"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0  # 대기 + 실행 중
+        self._active = 0
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "max_queued": 0,
+        }
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _call(self, enqueued: float, fn: Callable[..., T], args: tuple, kwargs: dict) -> T:
+        waited = time.monotonic() - enqueued
+        with self._lock:
+            self._active += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        try:
+            with self.connection() as db:
+                return fn(db, *args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                self._stats["failed"] += 1
+            else:
+                self._stats["completed"] += 1
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        """fn(db, *args, **kwargs)를 DB 스레드에서 실행하도록 넘긴다."""
+        with self._lock:
+            queued = self._pending - self.workers + 1
+            if self.max_queue and queued > self.max_queue:
+                self._stats["rejected"] += 1
+                raise DBOverloadedError(
+                    f"DB 작업 대기열이 가득 찼습니다. (대기 {self.max_queue}건)"
+                )
+            self._pending += 1
+            self._stats["submitted"] += 1
+            self._stats["max_queued"] = max(self._stats["max_queued"], queued)
+        try:
+            future = self._executor.submit(
+                self._call, time.monotonic(), fn, args, kwargs
+            )
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        # 시작 전에 취소된 작업(클라이언트 연결 종료)도 여기서 정리된다
+        future.add_done_callback(self._done)
+        return future
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """fn(db, *args, **kwargs)를 DB 스레드에서 실행하고 결과를 기다린다."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def stats(self) -> dict:
+        """동시성 설정 조정을 위한 지표를 반환한다."""
+        with self._lock:
+            data: dict = dict(self._stats)
+            data["workers"] = self.workers
+            data["max_queue"] = self.max_queue
+            data["active"] = self._active
+            data["queued"] = max(0, self._pending - self._active)
+            started = data["completed"] + data["failed"] + self._active
+            data["avg_wait_ms"] = (
+                round(self._wait_total / started * 1000, 3) if started else 0.0
+            )
+            data["max_wait_ms"] = round(self._wait_max * 1000, 3)
+            return data
+
+
+_db_executor: Optional[DBExecutor] = None
+_db_executor_lock = threading.Lock()
+
+
+def get_db_executor() -> DBExecutor:
+    """전역 DB 작업 스레드 풀을 반환한다 (지연 생성)."""
+    global _db_executor
+    with _db_executor_lock:
+        if _db_executor is None:
+            _db_executor = DBExecutor(
+                workers=config.DB_EXECUTOR_WORKERS or config.DB_POOL_SIZE,
+                max_queue=config.DB_EXECUTOR_MAX_QUEUE,
+            )
+        return _db_executor
+
+
+def close_db_executor() -> None:
+    """진행 중인 DB 작업을 마치고 스레드 풀을 닫는다 (앱 종료 시)."""
+    global _db_executor
+    with _db_executor_lock:
+        if _db_executor is not None:
+            _db_executor.shutdown()
+            _db_executor = None
+
+
+async def run_db(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """fn(db, *args, **kwargs)를 DB 스레드에서 한 트랜잭션으로 실행한다.
+
+    정상 종료하면 커밋하고(after_commit 콜백 포함) 예외가 나면 롤백한다.
+    """
+    return await get_db_executor().run(fn, *args, **kwargs)
+
+
+# ---------------------------------------------------------------------------
+# 쓰기 전용 스레드 (그룹 커밋)
+# ---------------------------------------------------------------------------
+
+_STOP = object()
+
+
+class _WriteJob:
+    __slots__ = ("fn", "args", "kwargs", "future", "enqueued")
+
+    def __init__(self, fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future: Future = Future()
+        self.enqueued = time.monotonic()
+
+
+class DBWriter:
+    """쓰기 작업을 한 스레드로 모아 그룹 커밋하는 단일 쓰기 스레드.
+
+    SQLite는 쓰기 잠금이 하나뿐이라 여러 스레드가 동시에 쓰면 잠금을 두고 서로
+    기다리고, 커밋마다 fsync를 따로 한다. 쓰기를 이 스레드 하나로 모으면 잠금 경합이
+    없고, 대기 중인 작업 여러 개를 ``BEGIN IMMEDIATE`` 트랜잭션 하나로 실행해 커밋
+    (fsync) 한 번으로 끝낸다. 읽기는 계속 DBExecutor의 WAL 리더 연결에서 실행된다.
+
+    작업마다 SAVEPOINT를 두어 한 작업의 예외는 그 작업만 되돌리고(after_commit 콜백
+    포함), 결과/예외는 커밋이 끝난 뒤 Future로 알린다. 작업 안에서 commit/rollback을
+    호출하면 안 된다.
+
+    - ``max_batch``: 한 트랜잭션에 묶는 작업 수 상한
+    - ``max_delay``: 첫 작업 뒤 작업을 더 기다리는 시간 (초, 0이면 이미 대기 중인 작업만)
+    - ``max_queue``: 대기 작업 수 상한. 넘으면 DBOverloadedError (0이면 무제한)
+    - ``connection``: 트랜잭션마다 연결을 여는 컨텍스트 매니저 팩토리 (기본은 전용 연결)
+    """
+
+    def __init__(
+        self,
+        max_batch: int = 64,
+        max_delay: float = 0.0,
+        max_queue: int = 0,
+        connection: Optional[Callable[[], ContextManager[sqlite3.Connection]]] = None,
+    ) -> None:
+        self.max_batch = max(1, max_batch)
+        self.max_delay = max(0.0, max_delay)
+        self.max_queue = max(0, max_queue)
+        self.connection = connection or self._dedicated_connection
+        self._conn: Optional[sqlite3.Connection] = None
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending = 0  # 대기 + 실행 중 (커밋 전)
+        self._closed = False
+        self._stats = {
+            "submitted": 0,
+            "committed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "rejected": 0,
+            "batches": 0,
+            "max_batch_size": 0,
+            "max_queued": 0,
+            "commit_errors": 0,
+            "busy_errors": 0,
+        }
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._lock_wait_total = 0.0
+        self._lock_wait_max = 0.0
+        self._commit_total = 0.0
+        self._commit_max = 0.0
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    @contextmanager
+    def _dedicated_connection(self) -> Generator[sqlite3.Connection, None, None]:
+        if self._conn is None:
+            self._conn = _open_connection(_get_db_path())
+        yield self._conn
+
+    # -- 제출 ---------------------------------------------------------------
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        """fn(db, *args, **kwargs)를 쓰기 스레드에서 실행하도록 넘긴다.
+
+        Future는 작업이 속한 트랜잭션이 커밋된 뒤에 결과로, 작업이 실패하거나 커밋이
+        실패하면 예외로 끝난다.
+        """
+        job = _WriteJob(fn, args, kwargs)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("쓰기 스레드가 종료되었습니다.")
+            if self.max_queue and self._pending >= self.max_queue:
+                self._stats["rejected"] += 1
+                raise DBOverloadedError(
+                    f"DB 쓰기 대기열이 가득 찼습니다. (대기 {self.max_queue}건)"
+                )
+            self._pending += 1
+            self._stats["submitted"] += 1
+            self._stats["max_queued"] = max(self._stats["max_queued"], self._pending)
+            self._queue.put(job)
+        return job.future
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """fn(db, *args, **kwargs)를 쓰기 스레드에서 실행하고 커밋까지 기다린다."""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    # -- 쓰기 스레드 -----------------------------------------------------------
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            job = self._queue.get()
+            if job is _STOP:
+                break
+            try:
+                with self.connection() as db:
+                    stop = self._run_batch(db, job)
+            except Exception as exc:
+                # 연결을 열지 못한 경우 등. 첫 작업만 실패로 돌리고 계속한다
+                logger.exception("쓰기 트랜잭션을 시작하지 못했습니다.")
+                self._resolve([(job, None, exc)])
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _next_job(self, deadline: float) -> Any:
+        remaining = deadline - time.monotonic()
+        try:
+            if remaining > 0:
+                return self._queue.get(timeout=remaining)
+            return self._queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def _run_batch(self, db: sqlite3.Connection, first: _WriteJob) -> bool:
+        """first부터 작업을 모아 한 트랜잭션으로 실행하고 커밋한다. 종료 신호를 받으면 True."""
+        started = time.monotonic()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as exc:
+            self._count_busy(exc)
+            self._resolve([(first, None, exc)])
+            return False
+        lock_wait = time.monotonic() - started
+
+        deadline = started + self.max_delay
+        done: list[tuple[_WriteJob, Any, Optional[BaseException]]] = []
+        stop = False
+        job: Any = first
+        while True:
+            if job is _STOP:
+                stop = True
+                break
+            if job.future.set_running_or_notify_cancel():
+                done.append(self._execute(db, job))
+            else:
+                self._resolve([(job, None, None)])
+            if not db.in_transaction:
+                # 작업이 트랜잭션을 끝냈거나 SQLite가 오류로 트랜잭션 전체를 되돌렸다
+                error = done[-1][2] or RuntimeError("쓰기 작업 안에서 트랜잭션이 끝났습니다.")
+                db.rollback()
+                self._resolve([(j, None, exc or error) for j, _, exc in done])
+                return stop
+            if len(done) >= self.max_batch:
+                break
+            job = self._next_job(deadline)
+            if job is None:
+                break
+
+        if not done:
+            db.rollback()
+            return stop
+        hooks, db.commit_hooks = db.commit_hooks, []
+        commit_started = time.monotonic()
+        try:
+            db.commit()
+        except sqlite3.Error as exc:
+            self._count_busy(exc)
+            with self._lock:
+                self._stats["commit_errors"] += 1
+            db.rollback()
+            self._resolve([(j, None, error or exc) for j, _, error in done])
+            return stop
+        commit_time = time.monotonic() - commit_started
+        for hook in hooks:
+            try:
+                hook()
+            except Exception:
+                logger.exception("커밋 후 콜백 실행 중 오류가 발생했습니다.")
+
+        with self._lock:
+            self._stats["batches"] += 1
+            self._stats["max_batch_size"] = max(self._stats["max_batch_size"], len(done))
+            self._lock_wait_total += lock_wait
+            self._lock_wait_max = max(self._lock_wait_max, lock_wait)
+            self._commit_total += commit_time
+            self._commit_max = max(self._commit_max, commit_time)
+        self._resolve(done)
+        return stop
+
+    def _execute(
+        self, db: sqlite3.Connection, job: _WriteJob
+    ) -> tuple[_WriteJob, Any, Optional[BaseException]]:
+        waited = time.monotonic() - job.enqueued
+        with self._lock:
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        mark = len(db.commit_hooks)
+        try:
+            db.execute("SAVEPOINT write_job")
+            value = job.fn(db, *job.args, **job.kwargs)
+            if db.in_transaction:
+                db.execute("RELEASE write_job")
+        except Exception as exc:
+            try:
+                if db.in_transaction:
+                    db.execute("ROLLBACK TO write_job")
+                    db.execute("RELEASE write_job")
+                    del db.commit_hooks[mark:]
+            except sqlite3.Error:
+                # 이 작업만 되돌릴 수 없으면 트랜잭션 전체를 버린다
+                db.rollback()
+            return job, None, exc
+        return job, value, None
+
+    def _count_busy(self, exc: sqlite3.Error) -> None:
+        message = str(exc)
+        if "locked" in message or "busy" in message:
+            with self._lock:
+                self._stats["busy_errors"] += 1
+
+    def _resolve(self, results: list[tuple[_WriteJob, Any, Optional[BaseException]]]) -> None:
+        """작업 결과를 Future에 넘긴다. 취소된 작업은 (job, None, None)으로 온다."""
+        for job, value, exc in results:
+            if job.future.done() and not job.future.cancelled():
+                continue
+            with self._lock:
+                self._pending -= 1
+                if job.future.cancelled():
+                    self._stats["cancelled"] += 1
+                elif exc is not None:
+                    self._stats["failed"] += 1
+                else:
+                    self._stats["committed"] += 1
+            if job.future.cancelled():
+                continue
+            if exc is not None:
+                job.future.set_exception(exc)
+            else:
+                job.future.set_result(value)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """이미 받은 작업까지 커밋하고 쓰기 스레드를 끝낸다."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        if wait:
+            self._thread.join()
+
+    def stats(self) -> dict:
+        """그룹 커밋/잠금 경합 지표를 반환한다."""
+        with self._lock:
+            data: dict = dict(self._stats)
+            data["max_batch"] = self.max_batch
+            data["max_delay_ms"] = round(self.max_delay * 1000, 3)
+            data["max_queue"] = self.max_queue
+            data["queued"] = self._pending
+            batches = data["batches"]
+            started = data["committed"] + data["failed"]
+            data["avg_batch_size"] = round(data["committed"] / batches, 2) if batches else 0.0
+            data["avg_wait_ms"] = (
+                round(self._wait_total / started * 1000, 3) if started else 0.0
+            )
+            data["max_wait_ms"] = round(self._wait_max * 1000, 3)
+            data["avg_lock_wait_ms"] = (
+                round(self._lock_wait_total / batches * 1000, 3) if batches else 0.0
+            )
+            data["max_lock_wait_ms"] = round(self._lock_wait_max * 1000, 3)
+            data["avg_commit_ms"] = (
+                round(self._commit_total / batches * 1000, 3) if batches else 0.0
+            )
+            data["max_commit_ms"] = round(self._commit_max * 1000, 3)
+            return data
+
+
+_db_writer: Optional[DBWriter] = None
+_db_writer_lock = threading.Lock()
+
+
+def get_db_writer() -> DBWriter:
+    """전역 쓰기 스레드를 반환한다 (지연 생성)."""
+    global _db_writer
+    with _db_writer_lock:
+        if _db_writer is None:
+            _db_writer = DBWriter(
+                max_batch=config.DB_WRITER_MAX_BATCH,
+                max_delay=config.DB_WRITER_MAX_DELAY_MS / 1000,
+                max_queue=config.DB_WRITER_MAX_QUEUE,
+            )
+        return _db_writer
+
+
+def close_db_writer() -> None:
+    """대기 중인 쓰기를 커밋하고 쓰기 스레드를 닫는다 (앱 종료 시)."""
+    global _db_writer
+    with _db_writer_lock:
+        if _db_writer is not None:
+            _db_writer.shutdown()
+            _db_writer = None
+
+
+async def run_write(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """fn(db, *args, **kwargs)를 쓰기 스레드에서 실행하고 커밋을 기다린다.
+
+    예외가 나면 그 작업만 되돌린다. DB_WRITER_ENABLED가 꺼져 있으면 run_db와 같다.
+    """
+    if not config.DB_WRITER_ENABLED:
+        return await run_db(fn, *args, **kwargs)
+    return await get_db_writer().run(fn, *args, **kwargs)
+
+
+def run_write_sync(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """run_write의 동기 버전 (백그라운드 스레드용). 커밋될 때까지 현재 스레드를 막는다."""
+    if not config.DB_WRITER_ENABLED:
+        with get_db() as db:
+            return fn(db, *args, **kwargs)
+    return get_db_writer().submit(fn, *args, **kwargs).result()
+
+
+def _endpoint(fn: Callable[..., Any], runner: Callable[..., Any]) -> Callable[..., Any]:
+    signature = inspect.signature(fn)
+    params = list(signature.parameters.values())
+    if not params or params[0].name != "db":
+        raise TypeError(f"{fn.__name__}: 첫 번째 매개변수는 db여야 합니다.")
+
+    @functools.wraps(fn)
+    async def endpoint(*args: Any, **kwargs: Any) -> Any:
+        return await runner(fn, *args, **kwargs)
+
+    endpoint.__signature__ = signature.replace(parameters=params[1:])  # type: ignore[attr-defined]
+    return endpoint
+
+
+def db_endpoint(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """첫 인자로 연결(db)을 받는 동기 핸들러를 run_db로 실행하는 async 엔드포인트로 만든다.
+
+    FastAPI에는 db를 뺀 시그니처를 보여주므로 나머지 매개변수(경로/쿼리/본문)는
+    그대로 주입된다. 핸들러 본문은 DB 스레드에서 실행되어 이벤트 루프를 막지 않는다.
+    """
+    return _endpoint(fn, run_db)
+
+
+def write_endpoint(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """db_endpoint와 같지만 핸들러를 쓰기 스레드(run_write)에서 실행한다.
+
+    쓰기만 하는 짧은 핸들러에 쓴다. 핸들러 전체가 다른 쓰기와 한 트랜잭션에 묶이므로
+    오래 걸리는 읽기나 파일 작업은 핸들러 밖에서 한다.
+    """
+    return _endpoint(fn, run_write)
+
+
+def init_db(background: bool = False) -> None:
+    """스키마 마이그레이션을 최신 버전까지 적용한다 (app.migrations 참고).
+
+    background=True면 온라인 인덱스 생성을 백그라운드 스레드로 넘기고 바로 반환한다.
+    """
+    from app.migrations import migrate, start_online_builds
+
+    with get_db() as conn:
+        migrate(conn, background=background)
+    if background:
+        start_online_builds()
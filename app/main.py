@@ -1,16 +1,30 @@
-import json
 import logging
 import os
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from app import config
-from app.database import get_db, init_db
-from app.routers import admin, images, reviews, widget
+from app.database import (
+    DBOverloadedError,
+    PoolTimeoutError,
+    close_db_executor,
+    close_db_writer,
+    close_pool,
+    get_db,
+    init_db,
+)
+from app.migrations import wait_for_online_builds
+from app.routers import admin, assets, backup, images, jobs, metrics, reviews, uploads, widget
+from app.utils import assets as widget_assets
+from app.utils import image_variants, import_jobs, snapshots, storage
+from app.utils.backup import read_backup, restore_backup
+from app.utils.compression import CompressionMiddleware
+from app.utils.storage_backends import get_backend
 
 logger = logging.getLogger(__name__)
 
@@ -22,52 +36,42 @@ SEED_BACKUP = BASE_DIR / "data" / "seed_backup.json"
 
 
 def _restore_from_seed() -> None:
-    """DB가 비어있을 때 seed 백업에서 리뷰 데이터를 복원한다."""
+    """DB가 비어있을 때 seed 백업에서 리뷰 데이터를 복원한다.
+
+    이미지 행은 파일이 저장소에 있는 것만 복원한다 (다른 서버의 백업이면 파일이 없음).
+    """
     if not SEED_BACKUP.exists():
         return
 
     with get_db() as db:
-        count = db.execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
-        if count > 0:
+        if db.execute("SELECT 1 FROM reviews LIMIT 1").fetchone() is not None:
             return  # 데이터가 이미 있으면 건너뜀
 
         logger.info("DB가 비어있습니다. seed backup에서 복원합니다...")
-
-        with open(SEED_BACKUP, "r", encoding="utf-8") as f:
-            backup = json.load(f)
-
-        restored = 0
-        for r in backup.get("reviews", []):
-            db.execute(
-                "INSERT INTO reviews "
-                "(product_no, product_name, author, rating, title, content, "
-                " is_visible, display_order, created_at, updated_at) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                (
-                    r["product_no"],
-                    r.get("product_name", ""),
-                    r["author"],
-                    r["rating"],
-                    r.get("title", ""),
-                    r["content"],
-                    1 if r.get("is_visible", True) else 0,
-                    r.get("display_order", 0),
-                    r.get("created_at"),
-                    r.get("updated_at"),
-                ),
-            )
-            restored += 1
-
-        logger.info("seed 복원 완료: %d개 리뷰", restored)
+        # 복원 중 인덱스를 지웠다 다시 만들므로 백그라운드 인덱스 생성과 겹치지 않게 한다
+        wait_for_online_builds()
+        counts = restore_backup(db, read_backup(SEED_BACKUP), image_exists=get_backend().exists)
+        logger.info("seed 복원 완료: %d개 리뷰, %d개 이미지", counts["reviews"], counts["images"])
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    init_db()
+    init_db(background=True)
     os.makedirs(config.UPLOAD_DIR, exist_ok=True)
     os.makedirs(STATIC_DIR, exist_ok=True)
     _restore_from_seed()
+    widget_assets.build_all()
+    import_jobs.resume_jobs()
+    snapshots.start_scheduler()
     yield
+    snapshots.shutdown()
+    # 등록 작업이 현재 청크를 정리한 뒤 쓰기 스레드를 닫는다
+    import_jobs.shutdown()
+    close_db_writer()
+    close_db_executor()
+    image_variants.shutdown()
+    storage.shutdown()
+    close_pool()
 
 
 app = FastAPI(title="카페24 스태프 리뷰", version="1.0.0", lifespan=lifespan)
@@ -81,15 +85,44 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축 (JSON 등 텍스트 응답)
+if config.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=config.COMPRESSION_MIN_SIZE,
+        media_types=config.COMPRESSION_MEDIA_TYPES,
+    )
+
+
+# DB 과부하
+@app.exception_handler(DBOverloadedError)
+@app.exception_handler(PoolTimeoutError)
+async def db_unavailable_handler(request: Request, exc: RuntimeError) -> JSONResponse:
+    """DB 작업 대기열 초과 / 연결 대기 시간 초과는 잠시 후 재시도하도록 503으로 응답한다."""
+    logger.warning("DB 과부하로 요청 거절: %s %s (%s)", request.method, request.url.path, exc)
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해 주세요."},
+        headers={"Retry-After": "1"},
+    )
+
+
 # 라우터 등록
 app.include_router(reviews.router)
 app.include_router(images.router)
 app.include_router(widget.router)
 app.include_router(admin.router)
+app.include_router(metrics.router)
+app.include_router(jobs.router)
+app.include_router(backup.router)
+# /static 마운트보다 먼저 등록해야 위젯 고정 URL을 가로챈다
+app.include_router(assets.router)
+if config.STORAGE_BACKEND == "local":
+    # S3 백엔드는 이미지 URL이 CDN/사전 서명 URL이므로 앱이 서빙하지 않음
+    app.include_router(uploads.router)
 
 # 정적 파일
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
-app.mount("/uploads", StaticFiles(directory=config.UPLOAD_DIR), name="uploads")
 
 
 @app.get("/")
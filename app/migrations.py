@@ -0,0 +1,293 @@
+"""버전 기반 스키마 마이그레이션.
+
+DB 파일 헤더의 ``PRAGMA user_version``에 적용된 마지막 버전을 기록하고,
+MIGRATIONS에 정의된 단계를 버전 순서대로 한 번씩 적용한다.
+각 단계는 하나의 트랜잭션으로 실행되며 실패하면 롤백되어 버전이 오르지 않는다.
+단계의 SQL은 ``IF NOT EXISTS`` 등으로 멱등하게 작성해 버전 기록 이전에 만들어진
+기존 DB(예전 CREATE IF NOT EXISTS 부트스트랩)에도 그대로 적용할 수 있게 한다.
+
+온라인(online) 단계는 인덱스 생성처럼 없어도 조회 결과가 달라지지 않는 작업이다.
+앱 시작 시에는 버전만 기록하고 실제 생성은 백그라운드 스레드가 문장마다 쓰기
+스레드 작업(run_write_sync)으로 넘긴다. WAL 모드에서는 인덱스를 만드는 동안에도 읽기
+(위젯 조회)가 막히지 않는다. 쓰기는 문장 사이사이에 끼어들고, 문장 하나를 만드는
+동안에는 잠금 오류 없이 쓰기 스레드 대기열에서 기다린다 (큰 테이블이면 그만큼 지연).
+CLI(``python -m app.migrations``)는 별도 프로세스라 쓰기 잠금을 직접 잡으므로, 실행 중인
+앱의 쓰기가 busy timeout(5초)보다 오래 기다리면 실패할 수 있다.
+
+사용법:
+    python -m app.migrations              # 대기 중인 단계 적용 (온라인 단계 포함)
+    python -m app.migrations --dry-run    # 적용할 단계만 출력
+"""
+
+import argparse
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Iterator, NamedTuple, Optional, Sequence
+
+from app.database import (
+    _CREATE_IMAGE_BLOB_DELETIONS_SQL,
+    _CREATE_IMAGE_BLOBS_SQL,
+    _CREATE_IMAGE_VARIANTS_SQL,
+    _CREATE_IMPORT_JOBS_SQL,
+    _CREATE_INDEXES_SQL,
+    _CREATE_SEARCH_SQL,
+    _CREATE_STATS_SQL,
+    _CREATE_TABLES_SQL,
+    _CREATE_VERSIONS_SQL,
+    _IMAGE_VARIANT_COLUMNS,
+    _get_db_path,
+    _open_connection,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Migration(NamedTuple):
+    """마이그레이션 단계.
+
+    - ``sql``: 실행할 DDL/DML (여러 문장 가능, 멱등하게 작성)
+    - ``func``: sql 실행 후 같은 트랜잭션에서 호출할 데이터 보정 함수
+    - ``online``: 인덱스 생성 등 백그라운드로 미룰 수 있는 단계 (func 사용 불가)
+    """
+
+    version: int
+    name: str
+    sql: str = ""
+    func: Optional[Callable[[sqlite3.Connection], None]] = None
+    online: bool = False
+
+
+def _backfill_stats(conn: sqlite3.Connection) -> None:
+    from app.utils.review_stats import rebuild_product_stats
+
+    rebuild_product_stats(conn)
+
+
+def _create_search_index(conn: sqlite3.Connection) -> None:
+    # FTS5(trigram) 미지원 빌드면 건너뛰고 LIKE 검색으로 동작
+    conn.execute("SAVEPOINT create_search")
+    try:
+        for statement in _statements(_CREATE_SEARCH_SQL):
+            conn.execute(statement)
+    except sqlite3.OperationalError:
+        conn.execute("ROLLBACK TO create_search")
+        logger.warning("SQLite FTS5를 사용할 수 없어 LIKE 검색으로 동작합니다.")
+    else:
+        from app.utils.search import rebuild_search_index
+
+        rebuild_search_index(conn)
+    finally:
+        conn.execute("RELEASE create_search")
+
+
+def _add_image_variants(conn: sqlite3.Connection) -> None:
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(review_images)")}
+    for column, definition in _IMAGE_VARIANT_COLUMNS:
+        if column not in existing:
+            conn.execute(f"ALTER TABLE review_images ADD COLUMN {column} {definition}")
+    for statement in _statements(_CREATE_IMAGE_VARIANTS_SQL):
+        conn.execute(statement)
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "create_tables", _CREATE_TABLES_SQL),
+    Migration(2, "composite_indexes", _CREATE_INDEXES_SQL, online=True),
+    Migration(3, "product_review_stats", _CREATE_STATS_SQL, _backfill_stats),
+    Migration(4, "data_versions", _CREATE_VERSIONS_SQL),
+    Migration(5, "reviews_fts", func=_create_search_index),
+    Migration(6, "import_jobs", _CREATE_IMPORT_JOBS_SQL),
+    Migration(7, "image_variants", func=_add_image_variants),
+    Migration(8, "image_blobs", _CREATE_IMAGE_BLOBS_SQL),
+    Migration(9, "image_blob_deletions", _CREATE_IMAGE_BLOB_DELETIONS_SQL),
+]
+
+
+def _statements(sql: str) -> Iterator[str]:
+    """SQL 스크립트를 문장 단위로 나눈다 (트리거 BEGIN ... END 포함)."""
+    buffer = ""
+    for line in sql.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            yield buffer.strip()
+            buffer = ""
+    leftover = [
+        line for line in buffer.splitlines()
+        if line.strip() and not line.strip().startswith("--")
+    ]
+    if leftover:
+        raise ValueError(f"완결되지 않은 SQL 문장: {buffer.strip()}")
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def pending(
+    conn: sqlite3.Connection, steps: Sequence[Migration] = MIGRATIONS
+) -> list[Migration]:
+    """아직 적용되지 않은 단계를 버전 순으로 반환한다."""
+    version = current_version(conn)
+    return sorted(
+        (step for step in steps if step.version > version),
+        key=lambda step: step.version,
+    )
+
+
+def _apply(conn: sqlite3.Connection, step: Migration, run_sql: bool) -> bool:
+    """단계 하나를 트랜잭션으로 적용한다. 다른 프로세스가 먼저 적용했으면 False."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if current_version(conn) >= step.version:
+            conn.rollback()
+            return False
+        if run_sql:
+            for statement in _statements(step.sql):
+                conn.execute(statement)
+        if step.func is not None:
+            step.func(conn)
+        conn.execute(f"PRAGMA user_version = {int(step.version)}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return True
+
+
+def migrate(
+    conn: sqlite3.Connection,
+    steps: Sequence[Migration] = MIGRATIONS,
+    dry_run: bool = False,
+    background: bool = False,
+) -> list[Migration]:
+    """대기 중인 단계를 순서대로 적용하고 적용한(dry_run이면 적용할) 단계를 반환한다.
+
+    background=True면 온라인 단계는 버전만 기록하고 실제 SQL은
+    build_online_indexes()/start_online_builds()에 맡긴다.
+    """
+    if conn.in_transaction:
+        conn.commit()
+    todo = pending(conn, steps)
+    if dry_run:
+        return todo
+
+    applied = []
+    for step in todo:
+        defer = background and step.online
+        started = time.monotonic()
+        if _apply(conn, step, run_sql=not defer):
+            applied.append(step)
+            logger.info(
+                "마이그레이션 v%d %s 적용%s (%.2fs)",
+                step.version,
+                step.name,
+                " (인덱스는 백그라운드 생성)" if defer else "",
+                time.monotonic() - started,
+            )
+    return applied
+
+
+def _execute(conn: sqlite3.Connection, statement: str) -> None:
+    conn.execute(statement)
+
+
+def build_online_indexes(
+    conn: sqlite3.Connection,
+    steps: Sequence[Migration] = MIGRATIONS,
+    write: Optional[Callable[..., Any]] = None,
+) -> None:
+    """적용된 온라인 단계의 SQL을 문장마다 커밋하며 실행한다.
+
+    문장이 멱등하므로 이미 만들어진 인덱스는 바로 건너뛴다. 앱 시작마다 호출해
+    이전 프로세스가 생성 도중 종료된 경우도 이어서 완료한다. ``write``(예:
+    run_write_sync)를 주면 문장을 conn 대신 그 함수에 작업으로 넘겨 커밋한다.
+    문장마다 걸린 시간을 로그로 남긴다 (그동안 다른 쓰기는 기다린다).
+    """
+    version = current_version(conn)
+    for step in sorted(steps, key=lambda step: step.version):
+        if not step.online or step.version > version:
+            continue
+        for statement in _statements(step.sql):
+            started = time.monotonic()
+            if write is not None:
+                write(_execute, statement)
+            else:
+                conn.execute(statement)
+                conn.commit()
+            logger.info(
+                "온라인 인덱스 생성 (%.2fs, 쓰기 대기): %s",
+                time.monotonic() - started,
+                statement,
+            )
+
+
+_online_thread: Optional[threading.Thread] = None
+
+
+def _run_online_builds(db_path: Optional[str]) -> None:
+    from app.database import run_write_sync
+
+    # 앱 DB면 쓰기 스레드로 넘겨 다른 쓰기와 잠금을 다투지 않게 한다
+    write = run_write_sync if db_path is None else None
+    conn = _open_connection(db_path or _get_db_path())
+    try:
+        build_online_indexes(conn, write=write)
+    except Exception:
+        logger.exception("온라인 인덱스 생성 실패 (다음 시작 시 재시도)")
+    finally:
+        conn.close()
+
+
+def start_online_builds(db_path: Optional[str] = None) -> threading.Thread:
+    """온라인 인덱스 생성을 데몬 스레드로 시작한다.
+
+    db_path가 없으면 앱 DB에 쓰기 스레드를 통해 만들고, 있으면 그 파일에 별도 연결로 만든다.
+    """
+    global _online_thread
+    _online_thread = threading.Thread(
+        target=_run_online_builds,
+        args=(db_path,),
+        name="online-index-build",
+        daemon=True,
+    )
+    _online_thread.start()
+    return _online_thread
+
+
+def wait_for_online_builds(timeout: Optional[float] = None) -> bool:
+    """백그라운드 인덱스 생성이 끝날 때까지 기다린다. 끝났으면 True."""
+    if _online_thread is None:
+        return True
+    _online_thread.join(timeout)
+    return not _online_thread.is_alive()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="DB 스키마 마이그레이션")
+    parser.add_argument("--db", help="DB 파일 경로 (기본: DATABASE_URL)")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="적용하지 않고 대기 중인 단계만 출력"
+    )
+    args = parser.parse_args(argv)
+
+    conn = _open_connection(args.db or _get_db_path())
+    try:
+        version = current_version(conn)
+        steps = migrate(conn, dry_run=args.dry_run)
+        label = "적용 예정" if args.dry_run else "적용"
+        for step in steps:
+            online = " (online)" if step.online else ""
+            print(f"{label}: v{step.version} {step.name}{online}")
+        if args.dry_run:
+            print(f"스키마 버전: {version} (대기 중인 단계 {len(steps)}개)")
+            return
+        build_online_indexes(conn)
+        print(f"스키마 버전: {version} -> {current_version(conn)}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
@@ -3,6 +3,8 @@ from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from app import config
+
 
 # --- Review ---
 
@@ -29,6 +31,16 @@ class ReviewUpdate(BaseModel):
     created_at: Optional[str] = None
 
 
+class ImageVariant(BaseModel):
+    name: str  # thumb / card / lightbox
+    format: str  # webp / jpeg
+    width: int
+    height: int
+    file_path: str
+    file_size: int
+    url: str = ""
+
+
 class ImageResponse(BaseModel):
     id: int
     review_id: int
@@ -36,6 +48,15 @@ class ImageResponse(BaseModel):
     original_name: str
     file_size: int
     created_at: str
+    url: str = ""
+    variant_status: str = "pending"
+    variants: list[ImageVariant] = []
+
+
+class GalleryPhoto(BaseModel):
+    file_path: str
+    url: str = ""
+    variants: list[ImageVariant] = []
 
 
 class ReviewResponse(BaseModel):
@@ -55,9 +76,41 @@ class ReviewResponse(BaseModel):
 
 class ReviewListResponse(BaseModel):
     items: list[ReviewResponse]
-    total: int
+    total: Optional[int]  # count=none이면 None
     page: int
     per_page: int
+    next_cursor: Optional[str] = None
+
+
+# --- Batch ---
+
+class BatchVisibility(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=config.MAX_BATCH_SIZE)
+    is_visible: bool
+
+
+class BatchDelete(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=config.MAX_BATCH_SIZE)
+
+
+class OrderAssignment(BaseModel):
+    id: int
+    display_order: int
+
+
+class BatchReorder(BaseModel):
+    items: list[OrderAssignment] = Field(..., min_length=1, max_length=config.MAX_BATCH_SIZE)
+
+
+class BatchItemResult(BaseModel):
+    id: int
+    status: str  # updated / deleted / not_found
+
+
+class BatchResult(BaseModel):
+    succeeded: int
+    not_found: int
+    results: list[BatchItemResult]  # 요청 순서 (중복 id는 한 번)
 
 
 # --- Excel ---
@@ -73,6 +126,70 @@ class ExcelUploadResult(BaseModel):
     errors: list[ExcelError]
 
 
+class ImportJobResponse(BaseModel):
+    id: int
+    filename: str
+    status: str  # queued / running / completed / failed / cancelled
+    total_rows: Optional[int] = None  # 시트 크기 정보가 없으면 None
+    processed_rows: int
+    success_count: int
+    fail_count: int
+    errors: list[ExcelError] = []
+    error_message: str = ""
+    cancel_requested: bool
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+
+# --- Snapshot ---
+
+class SnapshotUploads(BaseModel):
+    referenced_files: int  # 스냅샷이 참조하는 파일 (원본 + 변형)
+    stored_files: int  # 저장소에 있는 파일
+    missing_files: int  # 참조되지만 저장소에 없는 파일
+    unreferenced_files: int  # 저장소에만 있는 파일
+
+
+class SnapshotResponse(BaseModel):
+    name: str
+    trigger: str  # manual / scheduled
+    created_at: str
+    duration_ms: float
+    copy_ms: float
+    manifest_ms: float
+    compress_ms: float
+    steps: int  # 백업 단계 수 (BACKUP_STEP_PAGES 페이지씩)
+    pages: int
+    page_size: int
+    db_size: int
+    file: str
+    file_size: int
+    compressed: bool
+    sha256: str
+    uploads_manifest: str
+    uploads: SnapshotUploads
+
+
+class SnapshotProgress(BaseModel):
+    trigger: str
+    phase: str  # starting / copy / manifest / compress / finalize
+    name: Optional[str] = None
+    started_at: Optional[str] = None
+    pages_total: Optional[int] = None
+    pages_remaining: Optional[int] = None
+
+
+class SnapshotStatusResponse(BaseModel):
+    running: bool
+    progress: Optional[SnapshotProgress] = None
+    last_error: Optional[str] = None
+    interval_hours: float
+    keep: int
+    next_run_at: Optional[str] = None  # 정기 스냅샷이 꺼져 있으면 None
+    snapshots: list[SnapshotResponse]
+
+
 # --- Stats ---
 
 class StatsResponse(BaseModel):
@@ -118,3 +235,5 @@ class WidgetReviewResponse(BaseModel):
     rating_distribution: RatingDistribution
     photo_review_count: int
     all_photo_urls: list[str]
+    all_photos: list[GalleryPhoto] = []
+    next_cursor: Optional[str] = None
@@ -0,0 +1,66 @@
+"""위젯 정적 자산 서빙 (해시 파일명 + 사전 압축).
+
+- ``/assets/widget.<해시>.js``: 1년 immutable, Accept-Encoding에 맞는 사전 압축 본문
+- ``/static/widget.js``, ``/static/widget.css``: 쇼핑몰에 심은 고정 URL.
+  현재 해시 URL로 302 리디렉션하며, 리디렉션 자체는 짧게 캐시된다.
+"""
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import RedirectResponse, Response
+
+from app.utils.assets import WIDGET_ASSETS, asset_for_file_name, get_asset
+from app.utils.compression import negotiate_encoding
+from app.utils.http_cache import etag_matches
+from app.utils.storage_backends import IMMUTABLE_CACHE_CONTROL
+
+router = APIRouter(tags=["assets"])
+
+# 재배포 후 새 해시가 이 시간 안에 퍼진다
+LOADER_CACHE_CONTROL = "public, max-age=300"
+
+
+def _redirect(url: str, cache_control: str) -> RedirectResponse:
+    return RedirectResponse(url, status_code=302, headers={"Cache-Control": cache_control})
+
+
+def _loader(name: str):
+    def serve_loader() -> RedirectResponse:
+        return _redirect(get_asset(name).url, LOADER_CACHE_CONTROL)
+
+    serve_loader.__name__ = f"serve_loader_{name.replace('.', '_')}"
+    return serve_loader
+
+
+for _name in WIDGET_ASSETS:
+    router.add_api_route(
+        f"/static/{_name}",
+        _loader(_name),
+        methods=["GET", "HEAD"],
+        include_in_schema=False,
+    )
+
+
+@router.api_route("/assets/{file_name}", methods=["GET", "HEAD"], include_in_schema=False)
+def serve_asset(file_name: str, request: Request) -> Response:
+    """해시 파일명 자산을 사전 압축 본문으로 응답한다."""
+    asset, current = asset_for_file_name(file_name)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
+    if not current:
+        # 예전 해시: 현재 버전으로 안내 (캐시하지 않음)
+        return _redirect(asset.url, "no-cache")
+
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    etag = f'"{asset.digest}"' if encoding == "identity" else f'"{asset.digest}-{encoding}"'
+    headers = {
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+        "ETag": etag,
+        "Vary": "Accept-Encoding",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(asset.bodies[encoding], media_type=asset.media_type, headers=headers)
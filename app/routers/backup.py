@@ -0,0 +1,104 @@
+"""데이터 백업 API."""
+
+import os
+from datetime import datetime
+from typing import Iterator, Literal
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from app import config
+from app.database import get_connection
+from app.models import SnapshotStatusResponse
+from app.utils import snapshots
+from app.utils.backup import iter_backup
+from app.utils.file_serving import serve_file
+
+router = APIRouter(prefix="/api/admin", tags=["backup"])
+
+_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "json": "application/json"}
+
+
+def _stream_backup(fmt: str) -> Iterator[bytes]:
+    """전용 연결의 읽기 트랜잭션 하나로 백업을 만든다.
+
+    응답이 끝날 때까지 연결을 잡고 있으므로 API용 커넥션 풀을 쓰지 않는다.
+    WAL 모드라 백업 중에도 쓰기는 막히지 않고, 백업은 시작 시점의 스냅샷이 된다.
+    """
+    conn = get_connection()
+    try:
+        conn.execute("BEGIN")
+        yield from iter_backup(conn, fmt)
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+@router.get("/backup")
+def download_backup(
+    format: Literal["ndjson", "json"] = Query(
+        "ndjson", description="ndjson: 한 줄에 레코드 하나 (대용량 복원용), json: seed_backup.json 형식"
+    ),
+) -> StreamingResponse:
+    """리뷰(이미지 포함)와 상품 전체를 백업 파일로 내려받는다 (스트리밍, 메모리 일정)."""
+    filename = f"reviews_backup_{datetime.now():%Y%m%d_%H%M%S}.{format}"
+    return StreamingResponse(
+        _stream_backup(format),
+        media_type=_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+        },
+    )
+
+
+@router.get("/snapshots", response_model=SnapshotStatusResponse)
+def snapshot_status():
+    """DB 스냅샷 목록(소요 시간/크기 통계 포함)과 진행 상황, 다음 정기 실행 시각."""
+    return snapshots.status()
+
+
+@router.post("/snapshots", response_model=SnapshotStatusResponse, status_code=202)
+async def create_snapshot(
+    response: Response,
+    wait: bool = Query(False, description="true면 스냅샷이 끝난 뒤 응답"),
+):
+    """DB 스냅샷을 시작한다. 이미 진행 중이면 409."""
+    try:
+        if wait:
+            await run_in_threadpool(snapshots.create_snapshot, "manual")
+            response.status_code = 200
+        else:
+            snapshots.start_snapshot("manual")
+    except snapshots.SnapshotBusyError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    return snapshots.status()
+
+
+@router.get("/snapshots/{name}/{kind}")
+def download_snapshot(request: Request, name: str, kind: Literal["db", "uploads"]):
+    """스냅샷 DB 파일(db) 또는 업로드 파일 목록(uploads)을 내려받는다."""
+    meta = snapshots.get_snapshot(name)
+    if meta is None:
+        raise HTTPException(status_code=404, detail="스냅샷을 찾을 수 없습니다.")
+    file_name = meta["file"] if kind == "db" else meta["uploads_manifest"]
+    if file_name.endswith(".gz"):
+        media_type = "application/gzip"
+    elif kind == "db":
+        media_type = "application/vnd.sqlite3"
+    else:
+        media_type = "application/x-ndjson"
+    path = os.path.join(config.BACKUP_DIR, file_name)
+    if not os.path.isfile(path):
+        # 목록을 읽은 뒤 보관 개수 정리로 지워진 경우
+        raise HTTPException(status_code=404, detail="스냅샷을 찾을 수 없습니다.")
+    return serve_file(
+        request,
+        path,
+        media_type,
+        {
+            "Content-Disposition": f'attachment; filename="{file_name}"',
+            "Cache-Control": "no-store",
+        },
+    )
@@ -1,29 +1,31 @@
 import sqlite3
+import time
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile
+from fastapi import APIRouter, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 
 from app import config
-from app.database import get_db_dependency
+from app.database import run_db, run_write, write_endpoint
 from app.models import ImageResponse
-from app.utils.storage import delete_image, save_image
+from app.utils.cache import invalidate_products
+from app.utils.hydration import row_to_image
+from app.utils.image_variants import schedule_after_commit
+from app.utils.storage import (
+    BlobDeletedError,
+    check_blob_deletions,
+    delete_image,
+    discard_upload,
+    save_image,
+    store_blob,
+)
 
 router = APIRouter(prefix="/api", tags=["images"])
 
 
-@router.post(
-    "/reviews/{review_id}/images",
-    response_model=list[ImageResponse],
-    status_code=201,
-)
-async def upload_images(
-    review_id: int,
-    files: list[UploadFile],
-    db: sqlite3.Connection = Depends(get_db_dependency),
-) -> list[ImageResponse]:
-    """리뷰에 이미지를 업로드한다."""
-    # 리뷰 존재 여부 확인
+def _check_upload(db: sqlite3.Connection, review_id: int, file_count: int) -> str:
+    """리뷰 존재 여부와 이미지 수 한도를 확인하고 상품번호를 반환한다."""
     row = db.execute(
-        "SELECT id FROM reviews WHERE id = ?", (review_id,)
+        "SELECT id, product_no FROM reviews WHERE id = ?", (review_id,)
     ).fetchone()
     if row is None:
         raise HTTPException(status_code=404, detail="리뷰를 찾을 수 없습니다.")
@@ -35,7 +37,7 @@ async def upload_images(
     ).fetchone()
     current_count: int = count_row["cnt"] if count_row else 0
 
-    if current_count + len(files) > config.MAX_IMAGES_PER_REVIEW:
+    if current_count + file_count > config.MAX_IMAGES_PER_REVIEW:
         raise HTTPException(
             status_code=400,
             detail=(
@@ -43,21 +45,21 @@ async def upload_images(
                 f"업로드할 수 있습니다. (현재 {current_count}개)"
             ),
         )
+    return row["product_no"]
 
-    # 파일 업로드가 없는 경우
-    if not files:
-        raise HTTPException(
-            status_code=400,
-            detail="업로드할 파일이 없습니다.",
-        )
-
-    saved_images: list[ImageResponse] = []
 
-    for file in files:
-        # 파일 저장
-        result: dict = await save_image(file, review_id)
+def _insert_images(
+    db: sqlite3.Connection, review_id: int, uploads: list[dict], stored_at: float
+) -> list[ImageResponse]:
+    """배치된 업로드 파일을 리뷰 이미지로 등록한다 (한 트랜잭션)."""
+    # 파일을 받는 동안 다른 요청이 추가했을 수 있으므로 트랜잭션 안에서 다시 확인
+    product_no = _check_upload(db, review_id, len(uploads))
+    # 배치한 뒤 같은 blob이 정리되었으면 파일이 없을 수 있으므로 등록하지 않음
+    check_blob_deletions(db, (upload["file_path"] for upload in uploads), stored_at)
 
-        # DB에 레코드 삽입
+    saved_images: list[ImageResponse] = []
+    for result in uploads:
+        # DB에 레코드 삽입 (image_blobs 참조 카운트는 트리거가 증가)
         cursor = db.execute(
             """
             INSERT INTO review_images (review_id, file_path, original_name, file_size)
@@ -77,37 +79,84 @@ async def upload_images(
             "SELECT * FROM review_images WHERE id = ?", (image_id,)
         ).fetchone()
 
-        saved_images.append(
-            ImageResponse(
-                id=image_row["id"],
-                review_id=image_row["review_id"],
-                file_path=image_row["file_path"],
-                original_name=image_row["original_name"],
-                file_size=image_row["file_size"],
-                created_at=image_row["created_at"],
-            )
-        )
+        saved_images.append(row_to_image(image_row))
 
+    invalidate_products(db, product_no)
+    # 썸네일/반응형 변형은 커밋 후 백그라운드에서 생성 (variant_status: pending -> ready)
+    schedule_after_commit(db, [image.id for image in saved_images])
     return saved_images
 
 
+@router.post(
+    "/reviews/{review_id}/images",
+    response_model=list[ImageResponse],
+    status_code=201,
+)
+async def upload_images(
+    review_id: int,
+    files: list[UploadFile],
+) -> list[ImageResponse]:
+    """리뷰에 이미지를 업로드한다.
+
+    파일 수신·저장은 이벤트 루프에서 비동기로 하고, DB 작업은 앞뒤 두 번만 실행해
+    (확인은 DB 스레드, 등록은 쓰기 스레드) 업로드가 느린 동안 연결을 잡고 있지 않는다.
+    저장소 배치(S3면 네트워크 왕복)도 등록 전에 스레드 풀에서 해 쓰기 스레드를 막지 않는다.
+    """
+    await run_db(_check_upload, review_id, len(files))
+
+    # 파일 업로드가 없는 경우
+    if not files:
+        raise HTTPException(
+            status_code=400,
+            detail="업로드할 파일이 없습니다.",
+        )
+
+    uploads: list[dict] = []
+    try:
+        for file in files:
+            # 임시 파일에 저장하며 내용 해시 계산
+            uploads.append(await save_image(file))
+        # 같은 내용의 파일이 이미 있으면 새로 쓰지 않음
+        stored_at = time.time()
+        for upload in uploads:
+            await run_in_threadpool(store_blob, upload)
+        try:
+            return await run_write(_insert_images, review_id, uploads, stored_at)
+        except BlobDeletedError:
+            raise HTTPException(
+                status_code=503,
+                detail="같은 이미지를 정리하는 중입니다. 잠시 후 다시 시도해 주세요.",
+                headers={"Retry-After": "1"},
+            ) from None
+    except BaseException:
+        # 배치 전 임시 파일은 지우고, 이미 배치한 blob은 collect_garbage()에 맡긴다
+        # (롤백 직후 다른 요청이 같은 내용을 참조했을 수 있으므로)
+        for upload in uploads:
+            discard_upload(upload)
+        raise
+
+
 @router.delete("/images/{image_id}")
-async def delete_single_image(
+@write_endpoint
+def delete_single_image(
+    db: sqlite3.Connection,
     image_id: int,
-    db: sqlite3.Connection = Depends(get_db_dependency),
 ) -> dict:
     """이미지를 삭제한다."""
     # 이미지 레코드 조회
     row = db.execute(
-        "SELECT * FROM review_images WHERE id = ?", (image_id,)
+        "SELECT ri.*, r.product_no FROM review_images ri "
+        "INNER JOIN reviews r ON r.id = ri.review_id WHERE ri.id = ?",
+        (image_id,),
     ).fetchone()
     if row is None:
         raise HTTPException(status_code=404, detail="이미지를 찾을 수 없습니다.")
 
-    # 파일시스템에서 삭제
-    delete_image(row["file_path"])
-
     # DB 레코드 삭제
     db.execute("DELETE FROM review_images WHERE id = ?", (image_id,))
 
+    # 커밋 후 마지막 참조였으면 파일(변형 포함) 삭제
+    delete_image(db, row["file_path"])
+    invalidate_products(db, row["product_no"])
+
     return {"detail": "삭제되었습니다"}
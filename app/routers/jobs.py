@@ -0,0 +1,79 @@
+"""백그라운드 엑셀 등록 작업 API."""
+
+import os
+import sqlite3
+
+from fastapi import APIRouter, HTTPException, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+from app.database import db_endpoint, run_write, write_endpoint
+from app.models import ImportJobResponse
+from app.utils.import_jobs import create_job, get_job, request_cancel, row_to_job, store_upload
+
+router = APIRouter(prefix="/api/import-jobs", tags=["import-jobs"])
+
+
+def _get_job_or_404(db: sqlite3.Connection, job_id: int) -> ImportJobResponse:
+    row = get_job(db, job_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return row_to_job(row)
+
+
+def _create_job(db: sqlite3.Connection, filename: str, path: str) -> ImportJobResponse:
+    job_id = create_job(db, filename, path)
+    return _get_job_or_404(db, job_id)
+
+
+@router.post("", response_model=ImportJobResponse, status_code=202)
+async def create_import_job(file: UploadFile) -> ImportJobResponse:
+    """엑셀 파일(.xlsx) 등록 작업을 만들고 바로 반환한다. 처리는 백그라운드에서 진행된다.
+
+    파일 보관은 일반 스레드 풀에서 먼저 끝내고, 쓰기 스레드에서는 작업 등록만 한다
+    (느린 업로드가 DB 연결을 잡고 있지 않게).
+    """
+    if not file.filename or not file.filename.endswith(".xlsx"):
+        raise HTTPException(
+            status_code=400,
+            detail="xlsx 파일만 업로드할 수 있습니다.",
+        )
+    path = await run_in_threadpool(store_upload, file)
+    try:
+        return await run_write(_create_job, file.filename, path)
+    except Exception:
+        os.unlink(path)
+        raise
+
+
+@router.get("", response_model=list[ImportJobResponse])
+@db_endpoint
+def list_import_jobs(
+    db: sqlite3.Connection,
+    limit: int = Query(20, ge=1, le=100),
+) -> list[ImportJobResponse]:
+    """최근 작업 목록을 반환한다."""
+    rows = db.execute(
+        "SELECT * FROM import_jobs ORDER BY id DESC LIMIT ?", (limit,)
+    ).fetchall()
+    return [row_to_job(row) for row in rows]
+
+
+@router.get("/{job_id}", response_model=ImportJobResponse)
+@db_endpoint
+def get_import_job(
+    db: sqlite3.Connection,
+    job_id: int,
+) -> ImportJobResponse:
+    """작업 진행 상황(처리 행 수, 성공/실패 건수, 지금까지의 오류)을 반환한다."""
+    return _get_job_or_404(db, job_id)
+
+
+@router.post("/{job_id}/cancel", response_model=ImportJobResponse)
+@write_endpoint
+def cancel_import_job(
+    db: sqlite3.Connection,
+    job_id: int,
+) -> ImportJobResponse:
+    """작업을 취소한다. 이미 커밋된 청크의 리뷰는 등록된 상태로 남는다."""
+    request_cancel(db, job_id)
+    return _get_job_or_404(db, job_id)
@@ -0,0 +1,19 @@
+"""운영 모니터링용 지표 API."""
+
+from fastapi import APIRouter
+
+from app.database import get_db_executor, get_db_writer, get_pool
+from app.utils.cache import widget_cache
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+
+
+@router.get("")
+def get_metrics() -> dict:
+    """커넥션 풀, DB 작업/쓰기 스레드, 위젯 캐시 등 내부 지표를 반환한다."""
+    return {
+        "db_pool": get_pool().stats(),
+        "db_executor": get_db_executor().stats(),
+        "db_writer": get_db_writer().stats(),
+        "widget_cache": widget_cache.stats(),
+    }
@@ -2,19 +2,24 @@
 
 import os
 import sqlite3
+from datetime import date, datetime
 from io import BytesIO
-from typing import Optional
+from typing import Iterator, Literal, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile
+from fastapi import APIRouter, HTTPException, Query, Request, Response, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
-from openpyxl import Workbook, load_workbook
+from openpyxl import Workbook
 
 from app import config
-from app.database import get_db_dependency
+from app.database import db_endpoint, get_connection, run_write_sync, write_endpoint
 from app.models import (
-    ExcelError,
+    BatchDelete,
+    BatchItemResult,
+    BatchReorder,
+    BatchResult,
+    BatchVisibility,
     ExcelUploadResult,
-    ImageResponse,
     ProductCreate,
     ProductResponse,
     ReviewCreate,
@@ -23,53 +28,136 @@ from app.models import (
     ReviewUpdate,
     StatsResponse,
 )
+from app.utils.cache import invalidate_all, invalidate_products
+from app.utils.excel_import import TEMPLATE_HEADERS, import_workbook, spool_upload
+from app.utils.http_cache import (
+    ADMIN_CACHE_CONTROL,
+    GLOBAL_SCOPE,
+    cache_headers,
+    get_version,
+    is_not_modified,
+    make_etag,
+    not_modified,
+    product_scope,
+)
+from app.utils.fast_json import FastJSONResponse
+from app.utils.hydration import hydrate_review, hydrate_reviews, review_dicts
+from app.utils.pagination import decode_cursor, encode_cursor, fetch_keyset, order_by
+from app.utils.review_export import export_query, iter_csv, iter_export_rows, iter_xlsx
+from app.utils.review_stats import rebuild_product_stats
+from app.utils.search import fts_phrase, search_condition, use_fts
+from app.utils.storage import delete_review_images, release_images
 
 router = APIRouter(prefix="/api", tags=["reviews"])
 
+_LIST_SORT_KEYS = [("created_at", "DESC"), ("id", "DESC")]
+_COUNT_ESTIMATE_CAP = 10_000
+
+_XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
 
 # ---------------------------------------------------------------------------
 # Helper functions
 # ---------------------------------------------------------------------------
 
 
-def _get_images(review_id: int, db: sqlite3.Connection) -> list[ImageResponse]:
-    """주어진 리뷰의 이미지 목록을 반환한다."""
-    cursor = db.execute(
-        "SELECT id, review_id, file_path, original_name, file_size, created_at "
-        "FROM review_images WHERE review_id = ? ORDER BY id",
-        (review_id,),
-    )
-    rows = cursor.fetchall()
-    return [
-        ImageResponse(
-            id=row["id"],
-            review_id=row["review_id"],
-            file_path=row["file_path"],
-            original_name=row["original_name"],
-            file_size=row["file_size"],
-            created_at=str(row["created_at"]),
+def _count_reviews(
+    db: sqlite3.Connection,
+    from_where: str,
+    params: list[object],
+    count: str,
+) -> Optional[int]:
+    """count 방식(exact/estimate/none)에 따라 전체 건수를 계산한다."""
+    if count == "exact":
+        return db.execute(
+            f"SELECT COUNT(*) as cnt FROM {from_where}", params
+        ).fetchone()["cnt"]
+    if count == "estimate":
+        return db.execute(
+            f"SELECT COUNT(*) as cnt FROM (SELECT 1 FROM {from_where} LIMIT ?)",
+            [*params, _COUNT_ESTIMATE_CAP],
+        ).fetchone()["cnt"]
+    return None
+
+
+def _review_list(
+    db: sqlite3.Connection,
+    rows: list[sqlite3.Row],
+    headers: dict[str, str],
+    total: Optional[int],
+    page: int,
+    per_page: int,
+    next_cursor: Optional[str] = None,
+) -> Union[ReviewListResponse, Response]:
+    """리뷰 목록 응답. FAST_JSON이면 response_model 검증 없이 바로 JSON으로 만든다."""
+    if config.FAST_JSON:
+        # ReviewListResponse와 같은 필드 순서/타입
+        return FastJSONResponse(
+            {
+                "items": review_dicts(rows, db),
+                "total": total,
+                "page": page,
+                "per_page": per_page,
+                "next_cursor": next_cursor,
+            },
+            headers=headers,
         )
-        for row in rows
+    return ReviewListResponse(
+        items=hydrate_reviews(rows, db),
+        total=total,
+        page=page,
+        per_page=per_page,
+        next_cursor=next_cursor,
+    )
+
+
+def _existing_reviews(db: sqlite3.Connection, ids: list[int]) -> dict[int, str]:
+    """ids 중 존재하는 리뷰의 {id: product_no}."""
+    placeholders = ", ".join("?" * len(ids))
+    rows = db.execute(
+        f"SELECT id, product_no FROM reviews WHERE id IN ({placeholders})", ids
+    ).fetchall()
+    return {row["id"]: row["product_no"] for row in rows}
+
+
+def _batch_result(ids: list[int], existing: dict[int, str], status: str) -> BatchResult:
+    results = [
+        BatchItemResult(id=review_id, status=status if review_id in existing else "not_found")
+        for review_id in ids
     ]
+    return BatchResult(
+        succeeded=len(existing),
+        not_found=len(ids) - len(existing),
+        results=results,
+    )
 
 
-def _row_to_review(row: sqlite3.Row, db: sqlite3.Connection) -> ReviewResponse:
-    """sqlite3.Row를 ReviewResponse로 변환한다 (이미지 포함)."""
-    images = _get_images(row["id"], db)
-    return ReviewResponse(
-        id=row["id"],
-        product_no=row["product_no"],
-        product_name=row["product_name"] or "",
-        author=row["author"],
-        rating=row["rating"],
-        title=row["title"] or "",
-        content=row["content"],
-        is_visible=bool(row["is_visible"]),
-        display_order=row["display_order"] or 0,
-        created_at=str(row["created_at"]),
-        updated_at=str(row["updated_at"]),
-        images=images,
+def _list_reviews_ranked(
+    db: sqlite3.Connection,
+    search: str,
+    conditions: list[str],
+    params: list[object],
+    page: int,
+    per_page: int,
+    count: str,
+    headers: dict[str, str],
+) -> Union[ReviewListResponse, Response]:
+    """FTS bm25 관련도순 리뷰 목록."""
+    where = " AND ".join(["reviews_fts MATCH ?", *conditions])
+    from_where = (
+        "reviews_fts JOIN reviews ON reviews.id = reviews_fts.rowid "
+        f"WHERE {where}"
     )
+    query_params = [fts_phrase(search), *params]
+
+    total = _count_reviews(db, from_where, query_params, count)
+    rows = db.execute(
+        f"SELECT reviews.* FROM {from_where} "
+        "ORDER BY reviews_fts.rank, reviews.id DESC LIMIT ? OFFSET ?",
+        [*query_params, per_page, (page - 1) * per_page],
+    ).fetchall()
+
+    return _review_list(db, rows, headers, total, page, per_page)
 
 
 # ---------------------------------------------------------------------------
@@ -78,14 +166,41 @@ def _row_to_review(row: sqlite3.Row, db: sqlite3.Connection) -> ReviewResponse:
 
 
 @router.get("/reviews", response_model=ReviewListResponse)
+@db_endpoint
 def list_reviews(
+    db: sqlite3.Connection,
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
     product_no: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
-    db: sqlite3.Connection = Depends(get_db_dependency),
-) -> ReviewListResponse:
-    """리뷰 목록을 페이징 및 필터와 함께 반환한다."""
+    cursor: Optional[str] = Query(
+        None, description="키셋 페이지네이션 cursor (빈 값이면 첫 페이지, page 무시)"
+    ),
+    count: Literal["exact", "estimate", "none"] = Query(
+        "exact", description="전체 건수 계산 방식"
+    ),
+    sort: Literal["latest", "relevance"] = Query(
+        "latest", description="정렬 기준 (relevance: 검색어 관련도순)"
+    ),
+) -> Union[ReviewListResponse, Response]:
+    """리뷰 목록을 페이징 및 필터와 함께 반환한다.
+
+    - count=exact: 정확한 전체 건수 (기본)
+    - count=estimate: 최대 10,000건까지만 센 값 (대량 목록에서 빠름)
+    - count=none: 건수 계산 생략 (total=null)
+    """
+    scope = product_scope(product_no) if product_no else GLOBAL_SCOPE
+    version = get_version(db, scope)
+    etag = make_etag(
+        version, "list", page, per_page, product_no, search, cursor, count, sort
+    )
+    headers = cache_headers(etag, version, ADMIN_CACHE_CONTROL)
+    if is_not_modified(request, etag, version):
+        return not_modified(headers)
+    response.headers.update(headers)
+
     conditions: list[str] = []
     params: list[object] = []
 
@@ -93,36 +208,54 @@ def list_reviews(
         conditions.append("product_no = ?")
         params.append(product_no)
 
-    if search:
-        conditions.append(
-            "(author LIKE ? OR title LIKE ? OR content LIKE ?)"
+    # 관련도순: FTS 인덱스의 bm25 순위로 정렬 (OFFSET 페이징만 지원)
+    if sort == "relevance" and search and use_fts(db, search):
+        if cursor is not None:
+            raise HTTPException(
+                status_code=400,
+                detail="관련도순 정렬에서는 cursor를 사용할 수 없습니다.",
+            )
+        return _list_reviews_ranked(
+            db, search, conditions, params, page, per_page, count, headers
         )
-        like_val = f"%{search}%"
-        params.extend([like_val, like_val, like_val])
+
+    if search:
+        search_sql, search_params = search_condition(db, search)
+        conditions.append(search_sql)
+        params.extend(search_params)
 
     where_clause = ""
     if conditions:
         where_clause = "WHERE " + " AND ".join(conditions)
 
     # 전체 건수
-    count_sql = f"SELECT COUNT(*) as cnt FROM reviews {where_clause}"
-    total: int = db.execute(count_sql, params).fetchone()["cnt"]
+    total = _count_reviews(db, f"reviews {where_clause}", params, count)
 
     # 페이징 데이터
-    offset = (page - 1) * per_page
-    data_sql = (
-        f"SELECT * FROM reviews {where_clause} "
-        f"ORDER BY created_at DESC LIMIT ? OFFSET ?"
-    )
-    rows = db.execute(data_sql, [*params, per_page, offset]).fetchall()
+    next_cursor: Optional[str] = None
+    if cursor is not None:
+        after = decode_cursor(cursor, "created", _LIST_SORT_KEYS)
+        rows = fetch_keyset(
+            db,
+            "SELECT * FROM reviews",
+            conditions,
+            params,
+            _LIST_SORT_KEYS,
+            after,
+            per_page + 1,
+        )
+        if len(rows) > per_page:
+            rows = rows[:per_page]
+            next_cursor = encode_cursor("created", rows[-1], _LIST_SORT_KEYS)
+    else:
+        offset = (page - 1) * per_page
+        data_sql = (
+            f"SELECT * FROM reviews {where_clause} "
+            f"ORDER BY {order_by(_LIST_SORT_KEYS)} LIMIT ? OFFSET ?"
+        )
+        rows = db.execute(data_sql, [*params, per_page, offset]).fetchall()
 
-    items = [_row_to_review(row, db) for row in rows]
-    return ReviewListResponse(
-        items=items,
-        total=total,
-        page=page,
-        per_page=per_page,
-    )
+    return _review_list(db, rows, headers, total, page, per_page, next_cursor)
 
 
 # ---------------------------------------------------------------------------
@@ -131,16 +264,28 @@ def list_reviews(
 
 
 @router.get("/stats", response_model=StatsResponse)
+@db_endpoint
 def get_stats(
-    db: sqlite3.Connection = Depends(get_db_dependency),
-) -> StatsResponse:
+    db: sqlite3.Connection,
+    request: Request,
+    response: Response,
+) -> Union[StatsResponse, Response]:
     """대시보드 통계를 반환한다."""
+    version = get_version(db, GLOBAL_SCOPE)
+    etag = make_etag(version, "stats")
+    headers = cache_headers(etag, version, ADMIN_CACHE_CONTROL)
+    if is_not_modified(request, etag, version):
+        return not_modified(headers)
+    response.headers.update(headers)
+
+    # COUNT(DISTINCT)는 임시 B-tree를 만들므로 상품 수는 인덱스 순서 GROUP BY로 센다
     row = db.execute(
         "SELECT "
         "  COUNT(*) as total_reviews, "
         "  SUM(CASE WHEN is_visible = 1 THEN 1 ELSE 0 END) as visible_reviews, "
         "  COALESCE(AVG(rating), 0) as average_rating, "
-        "  COUNT(DISTINCT product_no) as total_products "
+        "  (SELECT COUNT(*) FROM (SELECT product_no FROM reviews GROUP BY product_no)) "
+        "    as total_products "
         "FROM reviews"
     ).fetchone()
 
@@ -152,15 +297,27 @@ def get_stats(
     )
 
 
+@router.post("/stats/rebuild")
+@write_endpoint
+def rebuild_stats(
+    db: sqlite3.Connection,
+) -> dict[str, int]:
+    """상품별 리뷰 요약 테이블을 리뷰 원본으로부터 다시 계산한다 (불일치 복구용)."""
+    rebuilt = rebuild_product_stats(db)
+    invalidate_all(db)
+    return {"rebuilt_products": rebuilt}
+
+
 # ---------------------------------------------------------------------------
 # Products -- 상품 목록 / 등록
 # ---------------------------------------------------------------------------
 
 
 @router.get("/products", response_model=list[ProductResponse])
+@db_endpoint
 def list_products(
+    db: sqlite3.Connection,
     search: Optional[str] = Query(None),
-    db: sqlite3.Connection = Depends(get_db_dependency),
 ) -> list[ProductResponse]:
     """상품 목록을 반환한다. search 파라미터로 상품번호/상품명을 검색할 수 있다."""
     if search:
@@ -190,9 +347,10 @@ def list_products(
 
 
 @router.post("/products", response_model=ProductResponse, status_code=201)
+@write_endpoint
 def create_product(
+    db: sqlite3.Connection,
     body: ProductCreate,
-    db: sqlite3.Connection = Depends(get_db_dependency),
 ) -> ProductResponse:
     """상품을 수동으로 등록한다. 이미 존재하면 상품명을 업데이트한다."""
     db.execute(
@@ -220,9 +378,10 @@ def create_product(
 
 
 @router.delete("/products/{product_no}")
+@write_endpoint
 def delete_product(
+    db: sqlite3.Connection,
     product_no: str,
-    db: sqlite3.Connection = Depends(get_db_dependency),
 ) -> dict[str, str]:
     """상품을 삭제한다."""
     existing = db.execute(
@@ -242,141 +401,25 @@ def delete_product(
 
 
 @router.post("/reviews/excel-upload", response_model=ExcelUploadResult)
-async def excel_upload(
-    file: UploadFile,
-    db: sqlite3.Connection = Depends(get_db_dependency),
-) -> ExcelUploadResult:
-    """엑셀 파일(.xlsx)로 리뷰를 일괄 등록한다."""
+async def excel_upload(file: UploadFile) -> ExcelUploadResult:
+    """엑셀 파일(.xlsx)로 리뷰를 일괄 등록한다.
+
+    EXCEL_IMPORT_CHUNK_SIZE개 행마다 커밋하므로, 도중에 실패하면 그 이전
+    청크까지는 등록된 상태로 남는다.
+    """
     if not file.filename or not file.filename.endswith(".xlsx"):
         raise HTTPException(
             status_code=400,
             detail="xlsx 파일만 업로드할 수 있습니다.",
         )
 
-    contents = await file.read()
+    path = await run_in_threadpool(spool_upload, file)
     try:
-        wb = load_workbook(filename=BytesIO(contents), read_only=True)
-    except Exception:
-        raise HTTPException(
-            status_code=400,
-            detail="엑셀 파일을 읽을 수 없습니다.",
-        )
-
-    ws = wb.active
-    if ws is None:
-        raise HTTPException(
-            status_code=400,
-            detail="엑셀 파일에 활성 시트가 없습니다.",
-        )
-
-    rows_iter = ws.iter_rows(min_row=2, values_only=True)  # 헤더 건너뜀
-    success_count = 0
-    fail_count = 0
-    errors: list[ExcelError] = []
-
-    for idx, row_data in enumerate(rows_iter, start=2):
-        # 빈 행 건너뛰기
-        if not row_data or all(cell is None for cell in row_data):
-            continue
-
-        # 최소 7열이어야 함 (부족하면 None으로 채움)
-        padded = list(row_data) + [None] * (7 - len(row_data))
-        product_no_val = padded[0]
-        product_name_val = padded[1]
-        author_val = padded[2]
-        rating_val = padded[3]
-        title_val = padded[4]
-        content_val = padded[5]
-        created_at_val = padded[6]
-
-        # 유효성 검사
-        row_errors: list[str] = []
-
-        if not product_no_val:
-            row_errors.append("상품번호는 필수입니다")
-        if not author_val:
-            row_errors.append("작성자명은 필수입니다")
-        if not content_val:
-            row_errors.append("리뷰내용은 필수입니다")
-
-        # 별점 검사
-        try:
-            rating_int = int(rating_val)  # type: ignore[arg-type]
-            if rating_int < 1 or rating_int > 5:
-                row_errors.append("별점은 1~5 사이 정수여야 합니다")
-        except (TypeError, ValueError):
-            row_errors.append("별점은 1~5 사이 정수여야 합니다")
-            rating_int = 0
-
-        if row_errors:
-            fail_count += 1
-            errors.append(
-                ExcelError(row=idx, message="; ".join(row_errors))
-            )
-            continue
-
-        pno = str(product_no_val).strip()
-        pname = str(product_name_val).strip() if product_name_val else ""
-
-        # 작성일 처리 (선택, 없으면 현재 시간)
-        created_at_str = None
-        if created_at_val:
-            raw = str(created_at_val).strip()
-            # datetime 객체인 경우 (openpyxl이 날짜 셀을 자동 변환)
-            if hasattr(created_at_val, "strftime"):
-                created_at_str = created_at_val.strftime("%Y-%m-%d %H:%M:%S")
-            elif len(raw) >= 10:
-                created_at_str = raw[:10] + " 00:00:00"
-
-        if created_at_str:
-            db.execute(
-                "INSERT INTO reviews (product_no, product_name, author, rating, title, content, created_at, updated_at) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                (
-                    pno,
-                    pname,
-                    str(author_val).strip(),
-                    rating_int,
-                    str(title_val).strip() if title_val else "",
-                    str(content_val).strip(),
-                    created_at_str,
-                    created_at_str,
-                ),
-            )
-        else:
-            db.execute(
-                "INSERT INTO reviews (product_no, product_name, author, rating, title, content) "
-                "VALUES (?, ?, ?, ?, ?, ?)",
-                (
-                    pno,
-                    pname,
-                    str(author_val).strip(),
-                    rating_int,
-                    str(title_val).strip() if title_val else "",
-                    str(content_val).strip(),
-                ),
-            )
-
-        # 상품 테이블에 자동 등록
-        db.execute(
-            "INSERT OR IGNORE INTO products (product_no, product_name) VALUES (?, ?)",
-            (pno, pname),
-        )
-        if pname:
-            db.execute(
-                "UPDATE products SET product_name = ? WHERE product_no = ? AND product_name = ''",
-                (pname, pno),
-            )
-
-        success_count += 1
-
-    wb.close()
-
-    return ExcelUploadResult(
-        success_count=success_count,
-        fail_count=fail_count,
-        errors=errors,
-    )
+        # 파싱은 일반 스레드 풀에서 하고(DB 연결을 잡지 않음), 청크 등록만 쓰기 스레드에
+        # 넘겨 다른 쓰기와 번갈아 커밋한다
+        return await run_in_threadpool(import_workbook, None, path, write=run_write_sync)
+    finally:
+        os.unlink(path)
 
 
 # ---------------------------------------------------------------------------
@@ -391,7 +434,7 @@ def excel_template() -> StreamingResponse:
     ws = wb.active
     if ws is not None:
         ws.title = "리뷰"
-        ws.append(["상품번호", "상품명", "작성자명", "별점(1~5)", "리뷰제목", "리뷰내용", "작성일(YYYY-MM-DD)"])
+        ws.append(TEMPLATE_HEADERS)
 
     buffer = BytesIO()
     wb.save(buffer)
@@ -400,22 +443,130 @@ def excel_template() -> StreamingResponse:
 
     return StreamingResponse(
         buffer,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        media_type=_XLSX_MEDIA_TYPE,
         headers={
             "Content-Disposition": 'attachment; filename="staff_review_template.xlsx"'
         },
     )
 
 
+# ---------------------------------------------------------------------------
+# 8-1. GET /api/reviews/export  -- 리뷰 내보내기 (CSV / 엑셀)
+# ---------------------------------------------------------------------------
+
+
+def _stream_export(fmt: str, sql: str, params: list[object]) -> Iterator[bytes]:
+    """전용 연결의 읽기 트랜잭션 하나로 내보낸다 (백업 다운로드와 같은 방식).
+
+    응답이 끝날 때까지 연결을 잡고 있으므로 API용 커넥션 풀/DB 스레드를 쓰지 않는다.
+    """
+    conn = get_connection()
+    try:
+        conn.execute("BEGIN")
+        rows = iter_export_rows(conn, sql, params)
+        yield from iter_csv(rows) if fmt == "csv" else iter_xlsx(rows)
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+@router.get("/reviews/export")
+def export_reviews(
+    format: Literal["xlsx", "csv"] = Query("xlsx", description="xlsx: 엑셀, csv: UTF-8(BOM) CSV"),
+    product_no: Optional[str] = Query(None),
+    is_visible: Optional[bool] = Query(None, description="노출 여부 (없으면 전체)"),
+    date_from: Optional[date] = Query(None, description="작성일 시작 (YYYY-MM-DD, 포함)"),
+    date_to: Optional[date] = Query(None, description="작성일 끝 (YYYY-MM-DD, 포함)"),
+) -> StreamingResponse:
+    """조건에 맞는 리뷰를 최신순으로 내려받는다 (스트리밍, 메모리 일정).
+
+    앞 7열은 일괄 등록 템플릿과 같아 다른 쇼핑몰에 그대로 다시 등록할 수 있다.
+    """
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from이 date_to보다 늦습니다.")
+
+    sql, params = export_query(product_no, is_visible, date_from, date_to)
+    filename = f"reviews_export_{datetime.now():%Y%m%d_%H%M%S}.{format}"
+    return StreamingResponse(
+        _stream_export(format, sql, params),
+        media_type="text/csv; charset=utf-8" if format == "csv" else _XLSX_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+        },
+    )
+
+
+# ---------------------------------------------------------------------------
+# 8-2. 일괄 처리 (노출 / 삭제 / 순서)  -- /reviews/{review_id}보다 먼저 등록
+# ---------------------------------------------------------------------------
+
+
+@router.patch("/reviews/batch/visibility", response_model=BatchResult)
+@write_endpoint
+def batch_visibility(db: sqlite3.Connection, body: BatchVisibility) -> BatchResult:
+    """여러 리뷰의 노출 상태를 한 트랜잭션으로 변경한다. 없는 id는 not_found."""
+    ids = list(dict.fromkeys(body.ids))
+    existing = _existing_reviews(db, ids)
+    db.executemany(
+        "UPDATE reviews SET is_visible = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+        [(int(body.is_visible), review_id) for review_id in existing],
+    )
+    invalidate_products(db, *existing.values())
+    return _batch_result(ids, existing, "updated")
+
+
+@router.post("/reviews/batch/delete", response_model=BatchResult)
+@write_endpoint
+def batch_delete(db: sqlite3.Connection, body: BatchDelete) -> BatchResult:
+    """여러 리뷰를 한 트랜잭션으로 삭제한다.
+
+    이미지 파일은 커밋 후 백그라운드에서 지운다 (다른 리뷰가 참조하지 않는 것만).
+    """
+    ids = list(dict.fromkeys(body.ids))
+    existing = _existing_reviews(db, ids)
+    if existing:
+        placeholders = ", ".join("?" * len(existing))
+        paths = db.execute(
+            f"SELECT file_path FROM review_images WHERE review_id IN ({placeholders})",
+            list(existing),
+        ).fetchall()
+        # CASCADE로 이미지 레코드도 삭제 (blob 참조 카운트는 트리거가 맞춤)
+        db.executemany(
+            "DELETE FROM reviews WHERE id = ?", [(review_id,) for review_id in existing]
+        )
+        release_images(db, (row["file_path"] for row in paths))
+        invalidate_products(db, *existing.values())
+    return _batch_result(ids, existing, "deleted")
+
+
+@router.patch("/reviews/batch/order", response_model=BatchResult)
+@write_endpoint
+def batch_reorder(db: sqlite3.Connection, body: BatchReorder) -> BatchResult:
+    """여러 리뷰의 display_order를 한 트랜잭션으로 지정한다."""
+    ids = [item.id for item in body.items]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail="같은 리뷰 id가 두 번 이상 있습니다.")
+
+    existing = _existing_reviews(db, ids)
+    db.executemany(
+        "UPDATE reviews SET display_order = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+        [(item.display_order, item.id) for item in body.items if item.id in existing],
+    )
+    invalidate_products(db, *existing.values())
+    return _batch_result(ids, existing, "updated")
+
+
 # ---------------------------------------------------------------------------
 # 2. POST /api/reviews  -- 리뷰 생성
 # ---------------------------------------------------------------------------
 
 
 @router.post("/reviews", response_model=ReviewResponse, status_code=201)
+@write_endpoint
 def create_review(
+    db: sqlite3.Connection,
     body: ReviewCreate,
-    db: sqlite3.Connection = Depends(get_db_dependency),
 ) -> ReviewResponse:
     """새 리뷰를 생성한다."""
     cursor = db.execute(
@@ -445,9 +596,10 @@ def create_review(
             "UPDATE products SET product_name = ? WHERE product_no = ? AND product_name = ''",
             (body.product_name, body.product_no),
         )
+    invalidate_products(db, body.product_no)
 
     row = db.execute("SELECT * FROM reviews WHERE id = ?", (review_id,)).fetchone()
-    return _row_to_review(row, db)
+    return hydrate_review(row, db)
 
 
 # ---------------------------------------------------------------------------
@@ -456,15 +608,29 @@ def create_review(
 
 
 @router.get("/reviews/{review_id}", response_model=ReviewResponse)
+@db_endpoint
 def get_review(
+    db: sqlite3.Connection,
     review_id: int,
-    db: sqlite3.Connection = Depends(get_db_dependency),
-) -> ReviewResponse:
+    request: Request,
+    response: Response,
+) -> Union[ReviewResponse, Response]:
     """단건 리뷰를 반환한다."""
-    row = db.execute("SELECT * FROM reviews WHERE id = ?", (review_id,)).fetchone()
-    if row is None:
+    owner = db.execute(
+        "SELECT product_no FROM reviews WHERE id = ?", (review_id,)
+    ).fetchone()
+    if owner is None:
         raise HTTPException(status_code=404, detail="리뷰를 찾을 수 없습니다.")
-    return _row_to_review(row, db)
+
+    version = get_version(db, product_scope(owner["product_no"]))
+    etag = make_etag(version, "review", review_id)
+    headers = cache_headers(etag, version, ADMIN_CACHE_CONTROL)
+    if is_not_modified(request, etag, version):
+        return not_modified(headers)
+    response.headers.update(headers)
+
+    row = db.execute("SELECT * FROM reviews WHERE id = ?", (review_id,)).fetchone()
+    return hydrate_review(row, db)
 
 
 # ---------------------------------------------------------------------------
@@ -473,10 +639,11 @@ def get_review(
 
 
 @router.put("/reviews/{review_id}", response_model=ReviewResponse)
+@write_endpoint
 def update_review(
+    db: sqlite3.Connection,
     review_id: int,
     body: ReviewUpdate,
-    db: sqlite3.Connection = Depends(get_db_dependency),
 ) -> ReviewResponse:
     """기존 리뷰를 수정한다. 전달된 필드만 업데이트한다."""
     existing = db.execute(
@@ -487,7 +654,7 @@ def update_review(
 
     update_data = body.model_dump(exclude_unset=True)
     if not update_data:
-        return _row_to_review(existing, db)
+        return hydrate_review(existing, db)
 
     set_clauses: list[str] = []
     values: list[object] = []
@@ -502,9 +669,12 @@ def update_review(
 
     sql = f"UPDATE reviews SET {', '.join(set_clauses)} WHERE id = ?"
     db.execute(sql, values)
+    invalidate_products(
+        db, existing["product_no"], update_data.get("product_no") or ""
+    )
 
     row = db.execute("SELECT * FROM reviews WHERE id = ?", (review_id,)).fetchone()
-    return _row_to_review(row, db)
+    return hydrate_review(row, db)
 
 
 # ---------------------------------------------------------------------------
@@ -513,9 +683,10 @@ def update_review(
 
 
 @router.delete("/reviews/{review_id}")
+@write_endpoint
 def delete_review(
+    db: sqlite3.Connection,
     review_id: int,
-    db: sqlite3.Connection = Depends(get_db_dependency),
 ) -> dict[str, str]:
     """리뷰를 삭제한다. 연결된 이미지도 DB 및 파일시스템에서 함께 삭제한다."""
     existing = db.execute(
@@ -524,18 +695,12 @@ def delete_review(
     if existing is None:
         raise HTTPException(status_code=404, detail="리뷰를 찾을 수 없습니다.")
 
-    # 연결된 이미지 파일 삭제
-    images = db.execute(
-        "SELECT file_path FROM review_images WHERE review_id = ?", (review_id,)
-    ).fetchall()
-    for img in images:
-        file_path = img["file_path"]
-        full_path = os.path.join(config.UPLOAD_DIR, file_path)
-        if os.path.isfile(full_path):
-            os.remove(full_path)
+    # 연결된 이미지 파일은 커밋 후 다른 리뷰가 참조하지 않을 때만 삭제
+    delete_review_images(db, review_id)
 
     # DB 레코드 삭제 (CASCADE로 이미지 레코드도 삭제됨)
     db.execute("DELETE FROM reviews WHERE id = ?", (review_id,))
+    invalidate_products(db, existing["product_no"])
 
     return {"detail": "삭제되었습니다"}
 
@@ -546,10 +711,11 @@ def delete_review(
 
 
 @router.patch("/reviews/{review_id}/visibility", response_model=ReviewResponse)
+@write_endpoint
 def toggle_visibility(
+    db: sqlite3.Connection,
     review_id: int,
     body: dict,
-    db: sqlite3.Connection = Depends(get_db_dependency),
 ) -> ReviewResponse:
     """리뷰의 노출 상태를 변경한다."""
     if "is_visible" not in body:
@@ -568,6 +734,7 @@ def toggle_visibility(
         "UPDATE reviews SET is_visible = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
         (is_visible, review_id),
     )
+    invalidate_products(db, existing["product_no"])
 
     row = db.execute("SELECT * FROM reviews WHERE id = ?", (review_id,)).fetchone()
-    return _row_to_review(row, db)
+    return hydrate_review(row, db)
@@ -0,0 +1,92 @@
+"""업로드 이미지 서빙 (STORAGE_BACKEND=local).
+
+blob과 변형 파일은 내용 주소 기반이라 같은 URL의 내용이 바뀌지 않으므로
+1년 immutable 캐시로 내보낸다. 변형 JPEG(``<해시>_<이름>.jpg``) 요청은 Accept에 따라
+같이 만들어 둔 ``<해시>_<이름>.webp``로 응답한다. 대체 파일이 있는 키에만
+``Vary: Accept``를 붙인다 (원본 blob은 대체 파일이 없어 CDN 캐시를 나누지 않음).
+"""
+
+import mimetypes
+import os
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+
+from app import config
+from app.utils.file_serving import serve_file
+from app.utils.storage_backends import IMMUTABLE_CACHE_CONTROL
+
+router = APIRouter(tags=["uploads"])
+
+# 협상 대상 원본 확장자와, 선호 순서대로의 대체 형식 (image_variants가 만드는 형식만)
+_NEGOTIABLE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+_ALTERNATIVES = (("image/webp", ".webp"),)
+
+# 시스템 mime.types에 없을 수 있는 형식
+mimetypes.add_type("image/webp", ".webp")
+
+
+def _accepts(accept: str, media_type: str) -> bool:
+    """Accept 헤더가 media_type을 명시적으로 허용하는지 (q=0이면 거부)."""
+    for item in accept.split(","):
+        value, *params = item.strip().split(";")
+        if value.strip().lower() != media_type:
+            continue
+        for param in params:
+            name, _, q = param.strip().partition("=")
+            if name == "q":
+                try:
+                    return float(q) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+def _resolve(file_path: str) -> str:
+    """URL 경로를 UPLOAD_DIR 안의 실제 파일 경로로 바꾼다. 없거나 밖이면 404."""
+    parts = file_path.split("/")
+    # 숨김 경로(.incoming 임시 파일 등)와 상위 디렉토리 참조 차단
+    if any(not part or part.startswith(".") for part in parts):
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
+    root = os.path.realpath(config.UPLOAD_DIR)
+    full_path = os.path.realpath(os.path.join(root, *parts))
+    if not full_path.startswith(root + os.sep) or not os.path.isfile(full_path):
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
+    return full_path
+
+
+def _alternatives(full_path: str) -> list[tuple[str, str]]:
+    """full_path 옆에 있는 대체 형식 파일 (media type, 경로) 목록 (선호 순서)."""
+    stem, extension = os.path.splitext(full_path)
+    if extension.lower() not in _NEGOTIABLE_EXTENSIONS:
+        return []
+    return [
+        (media_type, stem + alt_extension)
+        for media_type, alt_extension in _ALTERNATIVES
+        if os.path.isfile(stem + alt_extension)
+    ]
+
+
+def _negotiate(full_path: str, alternatives: list[tuple[str, str]], accept: str) -> str:
+    """Accept에 맞는 대체 형식 파일이 있으면 그 경로를 반환한다."""
+    for media_type, alt_path in alternatives:
+        if _accepts(accept, media_type):
+            return alt_path
+    return full_path
+
+
+@router.api_route(
+    "/uploads/{file_path:path}", methods=["GET", "HEAD"], include_in_schema=False
+)
+def serve_upload(file_path: str, request: Request) -> Response:
+    """업로드 파일을 immutable 캐시, ETag, Range 지원으로 응답한다."""
+    full_path = _resolve(file_path)
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    alternatives = _alternatives(full_path)
+    if alternatives:
+        headers["Vary"] = "Accept"
+        full_path = _negotiate(full_path, alternatives, request.headers.get("accept", ""))
+
+    media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+    return serve_file(request, full_path, media_type, headers)
@@ -1,216 +1,208 @@
 """위젯용 공개 API -- 카페24 상품 상세 페이지에서 호출."""
 
 import sqlite3
-from typing import List, Literal
-
-from fastapi import APIRouter, Depends, Query
-
-from app.database import get_db_dependency
-from app.models import (
-    ImageResponse,
-    RatingDistribution,
-    ReviewResponse,
-    WidgetReviewResponse,
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import JSONResponse, Response
+
+from app import config
+from app.database import db_endpoint
+from app.models import GalleryPhoto, WidgetReviewResponse
+from app.utils.cache import widget_cache
+from app.utils.compression import compress, dynamic_level, encoded_etag, response_encoding
+from app.utils.http_cache import (
+    cache_headers,
+    get_version,
+    is_not_modified,
+    make_etag,
+    not_modified,
+    product_scope,
 )
+from app.utils.fast_json import dumps
+from app.utils.hydration import hydrate_reviews, parse_variants, review_dicts
+from app.utils.pagination import decode_cursor, encode_cursor, fetch_keyset, order_by
+from app.utils.review_stats import get_product_stats
+from app.utils.storage import file_url, url_epoch, url_refresh_interval
 
 router = APIRouter(prefix="/api/widget", tags=["widget"])
 
 
-def _build_review_with_images(
-    review_row: sqlite3.Row,
-    db: sqlite3.Connection,
-) -> ReviewResponse:
-    """리뷰 Row를 ReviewResponse로 변환하고, 해당 이미지 목록을 첨부한다."""
-    images_rows = db.execute(
-        "SELECT id, review_id, file_path, original_name, file_size, created_at "
-        "FROM review_images WHERE review_id = ? ORDER BY id ASC",
-        (review_row["id"],),
-    ).fetchall()
-
-    images: List[ImageResponse] = [
-        ImageResponse(
-            id=img["id"],
-            review_id=img["review_id"],
-            file_path=img["file_path"],
-            original_name=img["original_name"],
-            file_size=img["file_size"],
-            created_at=str(img["created_at"]),
-        )
-        for img in images_rows
-    ]
-
-    return ReviewResponse(
-        id=review_row["id"],
-        product_no=review_row["product_no"],
-        product_name=review_row["product_name"],
-        author=review_row["author"],
-        rating=review_row["rating"],
-        title=review_row["title"],
-        content=review_row["content"],
-        is_visible=bool(review_row["is_visible"]),
-        display_order=review_row["display_order"],
-        created_at=str(review_row["created_at"]),
-        updated_at=str(review_row["updated_at"]),
-        images=images,
-    )
-
-
-def _get_rating_distribution(
-    db: sqlite3.Connection, product_no: str
-) -> RatingDistribution:
-    """별점 분포를 계산한다."""
-    rows = db.execute(
-        "SELECT rating, COUNT(*) AS cnt "
-        "FROM reviews WHERE product_no = ? AND is_visible = 1 "
-        "GROUP BY rating",
-        (product_no,),
-    ).fetchall()
-
-    dist = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-    for row in rows:
-        rating = row["rating"]
-        if rating in dist:
-            dist[rating] = row["cnt"]
-
-    return RatingDistribution(
-        star_5=dist[5],
-        star_4=dist[4],
-        star_3=dist[3],
-        star_2=dist[2],
-        star_1=dist[1],
+def _cached_response(
+    request: Request, cache_key: tuple, body: bytes, headers: dict[str, str]
+) -> Response:
+    """위젯 응답 본문을 Accept-Encoding에 맞게 보낸다.
+
+    압축본은 캐시 항목에 함께 보관해 같은 응답을 요청마다 다시 압축하지 않는다.
+    WIDGET_CACHE_COMPRESSED=0이면 본문 그대로 보내고 압축은 미들웨어에 맡긴다.
+    """
+    encoding = response_encoding(request.headers.get("accept-encoding", ""), len(body))
+    if encoding == "identity" or not config.WIDGET_CACHE_COMPRESSED:
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    compressed = widget_cache.get_encoded(cache_key, encoding)
+    if compressed is None:
+        compressed = compress(body, encoding, dynamic_level(encoding))
+        widget_cache.set_encoded(cache_key, encoding, compressed)
+    return Response(
+        content=compressed,
+        media_type="application/json",
+        headers={
+            **headers,
+            "ETag": encoded_etag(headers["ETag"], encoding),
+            "Content-Encoding": encoding,
+            "Vary": "Accept-Encoding",
+        },
     )
 
 
-def _get_photo_review_count(
-    db: sqlite3.Connection, product_no: str
-) -> int:
-    """포토리뷰 수를 계산한다."""
-    row = db.execute(
-        "SELECT COUNT(DISTINCT r.id) AS cnt "
-        "FROM reviews r "
-        "INNER JOIN review_images ri ON ri.review_id = r.id "
-        "WHERE r.product_no = ? AND r.is_visible = 1",
-        (product_no,),
-    ).fetchone()
-    return row["cnt"] if row else 0
-
-
-def _get_all_photo_urls(
+def _get_gallery_photos(
     db: sqlite3.Connection, product_no: str, limit: int = 20
-) -> list[str]:
-    """갤러리 스트립용 포토 URL (리뷰당 첫 이미지, 최신순)."""
+) -> list[GalleryPhoto]:
+    """갤러리 스트립용 포토 (리뷰당 첫 이미지와 그 변형, 최신순)."""
     rows = db.execute(
-        "SELECT ri.file_path "
-        "FROM review_images ri "
-        "INNER JOIN reviews r ON r.id = ri.review_id "
-        "WHERE r.product_no = ? AND r.is_visible = 1 "
-        "AND ri.id = ("
-        "  SELECT MIN(ri2.id) FROM review_images ri2 WHERE ri2.review_id = r.id"
-        ") "
-        "ORDER BY r.created_at DESC "
-        "LIMIT ?",
+        "SELECT ri.file_path, ri.variants FROM ("
+        "  SELECT ("
+        "    SELECT id FROM review_images "
+        "    WHERE review_id = reviews.id ORDER BY id LIMIT 1"
+        "  ) AS image_id, created_at, id "
+        "  FROM reviews "
+        "  WHERE product_no = ? AND is_visible = 1 "
+        "  AND EXISTS (SELECT 1 FROM review_images WHERE review_id = reviews.id) "
+        "  ORDER BY created_at DESC, id DESC "
+        "  LIMIT ?"
+        ") AS first "
+        "JOIN review_images ri ON ri.id = first.image_id "
+        "ORDER BY first.created_at DESC, first.id DESC",
         (product_no, limit),
     ).fetchall()
-    return [row["file_path"] for row in rows]
+    return [
+        GalleryPhoto(
+            file_path=row["file_path"],
+            url=file_url(row["file_path"]),
+            variants=parse_variants(row["variants"]),
+        )
+        for row in rows
+    ]
 
 
 _SORT_MAP = {
-    "latest": "display_order ASC, created_at DESC",
-    "rating_high": "rating DESC, created_at DESC",
-    "rating_low": "rating ASC, created_at DESC",
+    "latest": [("display_order", "ASC"), ("created_at", "DESC"), ("id", "DESC")],
+    "rating_high": [("rating", "DESC"), ("created_at", "DESC"), ("id", "DESC")],
+    "rating_low": [("rating", "ASC"), ("created_at", "DESC"), ("id", "DESC")],
 }
 
-# photo_only 쿼리에서는 JOIN 때문에 테이블 접두사가 필요
-_SORT_MAP_PREFIXED = {
-    "latest": "r.display_order ASC, r.created_at DESC",
-    "rating_high": "r.rating DESC, r.created_at DESC",
-    "rating_low": "r.rating ASC, r.created_at DESC",
-}
+_REVIEW_SELECT = (
+    "SELECT id, product_no, product_name, author, rating, title, content, "
+    "       is_visible, display_order, created_at, updated_at "
+    "FROM reviews"
+)
 
 
 @router.get("/reviews/{product_no}", response_model=WidgetReviewResponse)
-async def get_widget_reviews(
+@db_endpoint
+def get_widget_reviews(
+    db: sqlite3.Connection,
     product_no: str,
+    request: Request,
     page: int = Query(1, ge=1, description="페이지 번호"),
     per_page: int = Query(5, ge=1, le=50, description="페이지당 리뷰 수"),
     sort: Literal["latest", "rating_high", "rating_low"] = Query(
         "latest", description="정렬 기준"
     ),
     photo_only: bool = Query(False, description="포토 리뷰만 보기"),
-    db: sqlite3.Connection = Depends(get_db_dependency),
-) -> WidgetReviewResponse:
+    cursor: Optional[str] = Query(
+        None, description="키셋 페이지네이션 cursor (빈 값이면 첫 페이지, page 무시)"
+    ),
+) -> Response:
     """상품별 공개 리뷰 목록 (위젯용, 인증 불필요)."""
+    # 0) 조건부 요청: 상품 버전이 그대로면 리뷰를 읽지 않고 304
+    version = get_version(db, product_scope(product_no))
+    etag = make_etag(
+        version, "widget", product_no, page, per_page, sort, photo_only, cursor
+    )
+    # 이미지 URL이 만료되면 브라우저/CDN 캐시도 URL 발급 주기보다 짧게
+    max_age = config.WIDGET_HTTP_MAX_AGE
+    interval = url_refresh_interval()
+    if interval is not None:
+        max_age = min(max_age, interval)
+    headers = cache_headers(etag, version, f"public, max-age={max_age}")
+    if is_not_modified(request, etag, version):
+        return not_modified(headers)
+
+    cache_key = (product_no, page, per_page, sort, photo_only, cursor, url_epoch())
+    cached = widget_cache.get(cache_key)
+    if cached is not None:
+        return _cached_response(request, cache_key, cached, headers)
+    generation = widget_cache.generation(product_no)
+
+    # 1) 전체 통계 (요약 테이블 PK 조회 1회, 항상 전체 기준)
+    stats = get_product_stats(db, product_no)
+    total_reviews: int = stats["total_reviews"]
+    photo_review_count: int = stats["photo_review_count"]
+
+    # 2) 갤러리 포토 (포토리뷰가 없으면 조회 생략)
+    all_photos = (
+        _get_gallery_photos(db, product_no) if photo_review_count else []
+    )
 
-    # 1) 전체 통계 (항상 전체 기준)
-    stats_row = db.execute(
-        "SELECT COUNT(*) AS cnt, COALESCE(AVG(rating), 0) AS avg_rating "
-        "FROM reviews WHERE product_no = ? AND is_visible = 1",
-        (product_no,),
-    ).fetchone()
-
-    total_reviews: int = stats_row["cnt"]
-    average_rating: float = round(float(stats_row["avg_rating"]), 1)
-
-    # 2) 별점 분포
-    rating_distribution = _get_rating_distribution(db, product_no)
-
-    # 3) 포토리뷰 수
-    photo_review_count = _get_photo_review_count(db, product_no)
-
-    # 4) 갤러리 URL
-    all_photo_urls = _get_all_photo_urls(db, product_no)
+    # 3) 필터링된 리뷰 수 (페이지네이션용)
+    filtered_total = photo_review_count if photo_only else total_reviews
 
-    # 5) 필터링된 리뷰 수 (페이지네이션용)
+    # 4) 페이징된 리뷰 목록 (필터 + 정렬 적용)
+    keys = _SORT_MAP.get(sort, _SORT_MAP["latest"])
+    conditions = ["product_no = ?", "is_visible = 1"]
     if photo_only:
-        count_row = db.execute(
-            "SELECT COUNT(DISTINCT r.id) AS cnt "
-            "FROM reviews r "
-            "INNER JOIN review_images ri ON ri.review_id = r.id "
-            "WHERE r.product_no = ? AND r.is_visible = 1",
-            (product_no,),
-        ).fetchone()
-        filtered_total = count_row["cnt"]
-    else:
-        filtered_total = total_reviews
-
-    # 6) 페이징된 리뷰 목록 (필터 + 정렬 적용)
-    offset = (page - 1) * per_page
-    order_clause = _SORT_MAP.get(sort, _SORT_MAP["latest"])
+        conditions.append(
+            "EXISTS (SELECT 1 FROM review_images WHERE review_id = reviews.id)"
+        )
 
-    if photo_only:
-        prefixed_order = _SORT_MAP_PREFIXED.get(sort, _SORT_MAP_PREFIXED["latest"])
-        review_rows = db.execute(
-            "SELECT DISTINCT r.id, r.product_no, r.product_name, r.author, "
-            "       r.rating, r.title, r.content, r.is_visible, "
-            "       r.display_order, r.created_at, r.updated_at "
-            "FROM reviews r "
-            "INNER JOIN review_images ri ON ri.review_id = r.id "
-            "WHERE r.product_no = ? AND r.is_visible = 1 "
-            f"ORDER BY {prefixed_order} "
-            "LIMIT ? OFFSET ?",
-            (product_no, per_page, offset),
-        ).fetchall()
+    next_cursor: Optional[str] = None
+    if cursor is not None:
+        after = decode_cursor(cursor, sort, keys)
+        review_rows = fetch_keyset(
+            db, _REVIEW_SELECT, conditions, [product_no], keys, after, per_page + 1
+        )
+        if len(review_rows) > per_page:
+            review_rows = review_rows[:per_page]
+            next_cursor = encode_cursor(sort, review_rows[-1], keys)
     else:
+        offset = (page - 1) * per_page
         review_rows = db.execute(
-            "SELECT id, product_no, product_name, author, rating, title, content, "
-            "       is_visible, display_order, created_at, updated_at "
-            "FROM reviews "
-            "WHERE product_no = ? AND is_visible = 1 "
-            f"ORDER BY {order_clause} "
-            "LIMIT ? OFFSET ?",
+            f"{_REVIEW_SELECT} WHERE {' AND '.join(conditions)} "
+            f"ORDER BY {order_by(keys)} LIMIT ? OFFSET ?",
             (product_no, per_page, offset),
         ).fetchall()
 
-    items = [_build_review_with_images(row, db) for row in review_rows]
-
-    return WidgetReviewResponse(
-        items=items,
-        total=filtered_total,
-        page=page,
-        per_page=per_page,
-        average_rating=average_rating,
-        total_reviews=total_reviews,
-        rating_distribution=rating_distribution,
-        photo_review_count=photo_review_count,
-        all_photo_urls=all_photo_urls,
-    )
+    if config.FAST_JSON:
+        # WidgetReviewResponse와 같은 필드 순서/타입의 dict를 바로 직렬화
+        body = dumps({
+            "items": review_dicts(review_rows, db),
+            "total": filtered_total,
+            "page": page,
+            "per_page": per_page,
+            "average_rating": float(stats["average_rating"]),
+            "total_reviews": total_reviews,
+            "rating_distribution": stats["rating_distribution"].model_dump(),
+            "photo_review_count": photo_review_count,
+            "all_photo_urls": [photo.file_path for photo in all_photos],
+            "all_photos": [photo.model_dump() for photo in all_photos],
+            "next_cursor": next_cursor,
+        })
+    else:
+        result = WidgetReviewResponse(
+            items=hydrate_reviews(review_rows, db),
+            total=filtered_total,
+            page=page,
+            per_page=per_page,
+            average_rating=stats["average_rating"],
+            total_reviews=total_reviews,
+            rating_distribution=stats["rating_distribution"],
+            photo_review_count=photo_review_count,
+            all_photo_urls=[photo.file_path for photo in all_photos],
+            all_photos=all_photos,
+            next_cursor=next_cursor,
+        )
+        body = JSONResponse(content=result.model_dump(mode="json")).body
+    widget_cache.set(cache_key, product_no, body, generation)
+    return _cached_response(request, cache_key, body, headers)
@@ -0,0 +1,147 @@
+"""위젯 정적 자산(widget.js / widget.css) 파이프라인.
+
+빌드 도구 없이 앱이 처음 요청될 때(그리고 원본이 바뀌면) 다음을 메모리에서 한다.
+
+1. 축소(minify): 주석·들여쓰기·빈 줄 제거 (줄바꿈은 남겨 JS 자동 세미콜론 삽입을 보존)
+2. 내용 해시로 파일명 지정: ``widget.<해시12자>.js``
+3. gzip(+ brotli 설치 시 br) 사전 압축
+
+쇼핑몰은 고정 URL(``/static/widget.js``)을 그대로 쓰고, 앱은 이를 현재 해시 URL
+(``/assets/widget.<해시>.js``)로 짧게 캐시되는 302 리디렉션한다. 해시 URL은 내용이
+바뀌지 않으므로 1년 immutable로 캐시된다.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from app.utils.compression import ENCODINGS, compress
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).resolve().parent.parent.parent / "static"
+
+WIDGET_ASSETS: tuple[str, ...] = ("widget.js", "widget.css")
+
+ASSET_URL_PREFIX = "/assets"
+
+_MEDIA_TYPES = {
+    ".js": "application/javascript; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+}
+
+
+class Asset(NamedTuple):
+    name: str               # widget.js
+    file_name: str          # widget.<해시>.js
+    media_type: str
+    digest: str
+    source_mtime_ns: int
+    bodies: dict[str, bytes]  # "identity" / "gzip" / "br" → 본문
+
+    @property
+    def url(self) -> str:
+        return f"{ASSET_URL_PREFIX}/{self.file_name}"
+
+
+def minify_js(source: str) -> str:
+    """줄 단위로 주석 줄·블록 주석·들여쓰기·빈 줄을 제거한다.
+
+    문자열/정규식 안을 해석하지 않으므로 코드 뒤의 ``//`` 주석과 줄바꿈은 남긴다.
+    """
+    lines: list[str] = []
+    in_block = False
+    for line in source.splitlines():
+        stripped = line.strip()
+        if in_block:
+            if "*/" in stripped:
+                in_block = False
+                stripped = stripped.split("*/", 1)[1].strip()
+            else:
+                continue
+        if stripped.startswith("/*"):
+            if "*/" not in stripped:
+                in_block = True
+                continue
+            stripped = stripped.split("*/", 1)[1].strip()
+        if not stripped or stripped.startswith("//"):
+            continue
+        lines.append(stripped)
+    return "\n".join(lines) + "\n"
+
+
+def minify_css(source: str) -> str:
+    """주석과 불필요한 공백을 제거한다 (선택자의 의미 있는 공백은 유지)."""
+    css = re.sub(r"/\*.*?\*/", "", source, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = css.replace(";}", "}")
+    return css.strip() + "\n"
+
+
+_MINIFIERS = {".js": minify_js, ".css": minify_css}
+
+
+def build_asset(name: str, static_dir: Path = STATIC_DIR) -> Asset:
+    """static_dir/name을 축소·해시·압축해 Asset을 만든다."""
+    source_path = static_dir / name
+    stat = source_path.stat()
+    stem, extension = os.path.splitext(name)
+    minified = _MINIFIERS[extension](source_path.read_text(encoding="utf-8")).encode("utf-8")
+    digest = hashlib.sha256(minified).hexdigest()[:12]
+
+    bodies = {"identity": minified}
+    for encoding in ENCODINGS:
+        bodies[encoding] = compress(minified, encoding)
+
+    return Asset(
+        name=name,
+        file_name=f"{stem}.{digest}{extension}",
+        media_type=_MEDIA_TYPES[extension],
+        digest=digest,
+        source_mtime_ns=stat.st_mtime_ns,
+        bodies=bodies,
+    )
+
+
+_lock = threading.Lock()
+_assets: dict[str, Asset] = {}
+
+
+def get_asset(name: str) -> Asset:
+    """현재 Asset을 반환한다. 원본이 바뀌었으면 다시 빌드한다 (stat 1회)."""
+    mtime_ns = (STATIC_DIR / name).stat().st_mtime_ns
+    with _lock:
+        asset = _assets.get(name)
+        if asset is None or asset.source_mtime_ns != mtime_ns:
+            asset = build_asset(name)
+            _assets[name] = asset
+            logger.info(
+                "자산 빌드: %s → %s (%s)",
+                name,
+                asset.file_name,
+                ", ".join(f"{enc} {len(body)}B" for enc, body in asset.bodies.items()),
+            )
+        return asset
+
+
+def build_all() -> list[Asset]:
+    """앱 시작 시 모든 위젯 자산을 미리 빌드한다."""
+    return [get_asset(name) for name in WIDGET_ASSETS]
+
+
+def asset_for_file_name(file_name: str) -> tuple[Optional[Asset], bool]:
+    """해시 파일명에 해당하는 자산과, 그 해시가 현재 것인지를 반환한다.
+
+    예전 해시(재배포 전)면 (현재 Asset, False) — 현재 URL로 리디렉션하면 된다.
+    """
+    stem, extension = os.path.splitext(file_name)
+    base = stem.rsplit(".", 1)[0] + extension
+    if base not in WIDGET_ASSETS:
+        return None, False
+    asset = get_asset(base)
+    return asset, asset.file_name == file_name
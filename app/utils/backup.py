@@ -0,0 +1,378 @@
+"""리뷰 데이터 논리 백업(JSON/NDJSON)과 일괄 복원.
+
+백업은 상품과 리뷰(이미지 포함)를 id 순 커서로 읽어 한 건씩 직렬화하므로 전체 건수와
+관계없이 메모리 사용량이 일정하다. 리뷰와 이미지는 각각 id / review_id 순 커서 두 개를
+나란히 읽어 합친다 (리뷰마다 이미지를 조회하지 않음).
+
+복원은 빈 DB에 executemany로 한 트랜잭션 안에서 넣는다. 적재 동안 보조 인덱스와
+트리거를 지웠다가 끝난 뒤 다시 만들고, 트리거가 행마다 맞추던 파생 데이터(상품 요약,
+검색 인덱스, blob 참조 카운트, 데이터 버전)는 마지막에 한 번에 계산한다.
+
+형식:
+    NDJSON  첫 줄 {"type": "meta", ...}, 이후 한 줄에 레코드 하나
+            {"type": "product", ...} / {"type": "review", ..., "images": [...]}
+    JSON    data/seed_backup.json과 같은 {"backup_date", "total_reviews",
+            "products": [...], "reviews": [...]} (복원 시 파일 전체를 읽음)
+"""
+
+import json
+import logging
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+from app.utils.cache import invalidate_all
+from app.utils.fast_json import dumps, loads
+from app.utils.review_stats import rebuild_product_stats
+from app.utils.search import fts_available, rebuild_search_index
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+# 응답 청크 하나에 모으는 최소 바이트 수 (레코드마다 보내면 전송 오버헤드가 큼)
+_CHUNK_BYTES = 64 * 1024
+# 복원 시 executemany 한 번에 넣는 리뷰 수
+_RESTORE_BATCH_SIZE = 5000
+
+# 복원 중 지웠다가 다시 만드는 인덱스/트리거의 대상 테이블
+_DEFERRED_TABLES = ("reviews", "review_images", "products")
+
+_REVIEW_COLUMNS = (
+    "id, product_no, product_name, author, rating, title, content, "
+    "is_visible, display_order, created_at, updated_at"
+)
+_IMAGE_COLUMNS = (
+    "id, review_id, file_path, original_name, file_size, created_at, "
+    "variant_status, variants"
+)
+
+Record = tuple[str, dict]
+
+
+# ---------------------------------------------------------------------------
+# 백업 (직렬화)
+# ---------------------------------------------------------------------------
+
+
+def backup_meta(db: sqlite3.Connection, **extra: object) -> dict:
+    """백업 파일 머리에 넣는 정보 (백업 시각, 형식 버전, 건수)."""
+    return {
+        "backup_date": datetime.now().isoformat(),
+        "format_version": FORMAT_VERSION,
+        "schema_version": db.execute("PRAGMA user_version").fetchone()[0],
+        "total_reviews": db.execute("SELECT COUNT(*) FROM reviews").fetchone()[0],
+        "total_products": db.execute("SELECT COUNT(*) FROM products").fetchone()[0],
+        **extra,
+    }
+
+
+def _image_record(row: sqlite3.Row) -> dict:
+    return {
+        "id": row["id"],
+        "review_id": row["review_id"],
+        "file_path": row["file_path"],
+        "original_name": row["original_name"] or "",
+        "file_size": row["file_size"] or 0,
+        "created_at": row["created_at"],
+        "variant_status": row["variant_status"],
+        "variants": json.loads(row["variants"] or "[]"),
+    }
+
+
+def _review_record(row: sqlite3.Row, images: list[dict]) -> dict:
+    return {
+        "id": row["id"],
+        "product_no": row["product_no"],
+        "product_name": row["product_name"] or "",
+        "author": row["author"],
+        "rating": row["rating"],
+        "title": row["title"] or "",
+        "content": row["content"],
+        "is_visible": bool(row["is_visible"]),
+        "display_order": row["display_order"] or 0,
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"],
+        "images": images,
+    }
+
+
+def iter_products(db: sqlite3.Connection) -> Iterator[dict]:
+    for row in db.execute(
+        "SELECT product_no, product_name, created_at FROM products ORDER BY id"
+    ):
+        yield {
+            "product_no": row["product_no"],
+            "product_name": row["product_name"] or "",
+            "created_at": row["created_at"],
+        }
+
+
+def iter_reviews(db: sqlite3.Connection) -> Iterator[dict]:
+    """리뷰를 id 순으로, 각 리뷰의 이미지를 함께 담아 하나씩 반환한다."""
+    images = db.execute(
+        f"SELECT {_IMAGE_COLUMNS} FROM review_images ORDER BY review_id, id"
+    )
+    pending: Optional[sqlite3.Row] = next(images, None)
+    for row in db.execute(f"SELECT {_REVIEW_COLUMNS} FROM reviews ORDER BY id"):
+        # 리뷰가 없는 이미지 행(외래 키 미적용 시절 데이터)은 건너뜀
+        while pending is not None and pending["review_id"] < row["id"]:
+            pending = next(images, None)
+        own: list[dict] = []
+        while pending is not None and pending["review_id"] == row["id"]:
+            own.append(_image_record(pending))
+            pending = next(images, None)
+        yield _review_record(row, own)
+
+
+def _chunked(parts: Iterable[bytes]) -> Iterator[bytes]:
+    buffer: list[bytes] = []
+    size = 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= _CHUNK_BYTES:
+            yield b"".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def _ndjson_parts(db: sqlite3.Connection, meta: dict) -> Iterator[bytes]:
+    yield dumps({"type": "meta", **meta}) + b"\n"
+    for product in iter_products(db):
+        yield dumps({"type": "product", **product}) + b"\n"
+    for review in iter_reviews(db):
+        yield dumps({"type": "review", **review}) + b"\n"
+
+
+def _json_parts(db: sqlite3.Connection, meta: dict) -> Iterator[bytes]:
+    # 메타 객체의 닫는 중괄호 대신 목록 키를 이어 붙인다
+    yield dumps(meta)[:-1] + b',"products":['
+    for i, product in enumerate(iter_products(db)):
+        yield (b",\n" if i else b"\n") + dumps(product)
+    yield b'\n],"reviews":['
+    for i, review in enumerate(iter_reviews(db)):
+        yield (b",\n" if i else b"\n") + dumps(review)
+    yield b"\n]}\n"
+
+
+def iter_backup(
+    db: sqlite3.Connection, fmt: str = "ndjson", **meta: object
+) -> Iterator[bytes]:
+    """백업 파일 내용을 청크 단위로 만든다 (fmt: ndjson / json).
+
+    일관된 스냅샷이 필요하면 호출자가 읽기 트랜잭션(BEGIN) 안에서 호출한다.
+    """
+    parts = _json_parts if fmt == "json" else _ndjson_parts
+    return _chunked(parts(db, backup_meta(db, **meta)))
+
+
+# ---------------------------------------------------------------------------
+# 복원
+# ---------------------------------------------------------------------------
+
+
+def read_backup(path: Union[str, Path]) -> Iterator[Record]:
+    """백업 파일에서 ("product" | "review", 레코드)를 차례로 읽는다.
+
+    NDJSON은 한 줄씩 읽고, JSON(seed_backup.json 형식)은 파일 전체를 읽는다.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        first = f.readline()
+        try:
+            head = json.loads(first)
+        except json.JSONDecodeError:
+            head = None
+        if isinstance(head, dict) and head.get("type") == "meta":
+            for line in f:
+                if line.strip():
+                    record = loads(line)
+                    yield record.pop("type"), record
+            return
+
+        f.seek(0)
+        data = json.load(f)
+    for product in data.get("products", []):
+        yield "product", product
+    for review in data.get("reviews", []):
+        yield "review", review
+
+
+def _drop_deferred(db: sqlite3.Connection) -> tuple[list[str], list[str]]:
+    """적재 대상 테이블의 보조 인덱스와 트리거를 지우고 다시 만들 SQL을 반환한다.
+
+    UNIQUE 제약 인덱스(sql이 NULL)는 ON CONFLICT에 필요하므로 남긴다.
+
+    Returns:
+        (인덱스 SQL 목록, 트리거 SQL 목록)
+    """
+    placeholders = ", ".join("?" * len(_DEFERRED_TABLES))
+    rows = db.execute(
+        "SELECT type, name, sql FROM sqlite_master "
+        f"WHERE type IN ('index', 'trigger') AND tbl_name IN ({placeholders}) "
+        "AND sql IS NOT NULL ORDER BY name",
+        _DEFERRED_TABLES,
+    ).fetchall()
+    for row in rows:
+        db.execute(f'DROP {row["type"].upper()} "{row["name"]}"')
+    return (
+        [row["sql"] for row in rows if row["type"] == "index"],
+        [row["sql"] for row in rows if row["type"] == "trigger"],
+    )
+
+
+def _review_params(review_id: int, review: dict) -> tuple:
+    return (
+        review_id,
+        review["product_no"],
+        review.get("product_name", ""),
+        review["author"],
+        review["rating"],
+        review.get("title", ""),
+        review["content"],
+        1 if review.get("is_visible", True) else 0,
+        review.get("display_order", 0),
+        review.get("created_at"),
+        review.get("updated_at"),
+    )
+
+
+def _image_params(review_id: int, image: dict) -> tuple:
+    variants = image.get("variants") or []
+    return (
+        image.get("id"),
+        review_id,
+        image["file_path"],
+        image.get("original_name", ""),
+        image.get("file_size", 0),
+        image.get("created_at"),
+        image.get("variant_status") or ("ready" if variants else "pending"),
+        json.dumps(variants, ensure_ascii=False),
+    )
+
+
+def _rebuild_derived(db: sqlite3.Connection) -> None:
+    """트리거 없이 적재한 뒤 파생 테이블을 한 번에 맞춘다."""
+    # 리뷰에만 있는 상품 자동 등록 (리뷰 생성 API와 같은 동작)
+    db.execute(
+        "INSERT OR IGNORE INTO products (product_no, product_name) "
+        "SELECT product_no, MAX(product_name) FROM reviews GROUP BY product_no"
+    )
+    rebuild_product_stats(db)
+    if fts_available(db):
+        rebuild_search_index(db)
+    db.execute(
+        "INSERT INTO image_blobs (file_path, file_size, ref_count) "
+        "SELECT file_path, MAX(COALESCE(file_size, 0)), COUNT(*) "
+        "FROM review_images WHERE true GROUP BY file_path "
+        "ON CONFLICT(file_path) DO UPDATE SET ref_count = excluded.ref_count"
+    )
+    # 이전에 발급된 ETag가 새 데이터와 맞지 않도록 버전을 올린다
+    for scope_select in (
+        "SELECT 'product:' || product_no, 1, CURRENT_TIMESTAMP "
+        "FROM reviews WHERE true GROUP BY product_no",
+        "SELECT 'reviews', 1, CURRENT_TIMESTAMP",
+    ):
+        db.execute(
+            f"INSERT INTO data_versions (scope, version, updated_at) {scope_select} "
+            "ON CONFLICT(scope) DO UPDATE SET "
+            "version = version + 1, updated_at = excluded.updated_at"
+        )
+    invalidate_all(db)
+
+
+def restore_backup(
+    db: sqlite3.Connection,
+    records: Iterable[Record],
+    batch_size: int = _RESTORE_BATCH_SIZE,
+    image_exists: Optional[Callable[[str], bool]] = None,
+) -> dict[str, int]:
+    """백업 레코드를 빈 DB에 일괄 등록한다. 커밋은 호출자(get_db)가 한다.
+
+    리뷰 id와 이미지 id는 백업 값을 그대로 쓴다 (id가 없는 리뷰는 그때까지의 최대 id
+    다음 번호). image_exists를 주면 파일이 저장소에 없는 이미지 행은 건너뛴다.
+
+    Returns:
+        dict: reviews / images / products / skipped_images 건수
+    """
+    # DDL(DROP/CREATE)은 암묵적 BEGIN을 열지 않으므로 트랜잭션을 먼저 직접 연다.
+    # 그래야 도중에 실패해도 지운 인덱스/트리거가 적재와 함께 롤백된다.
+    if not db.in_transaction:
+        db.execute("BEGIN IMMEDIATE")
+    if db.execute("SELECT 1 FROM reviews LIMIT 1").fetchone() is not None:
+        raise ValueError("리뷰가 없는 DB에만 복원할 수 있습니다.")
+
+    started = time.monotonic()
+    counts = {"reviews": 0, "images": 0, "products": 0, "skipped_images": 0}
+    indexes, triggers = _drop_deferred(db)
+
+    reviews: list[tuple] = []
+    images: list[tuple] = []
+    products: list[tuple] = []
+    next_id = 1
+
+    def flush() -> None:
+        # 이미지의 외래 키가 리뷰를 가리키므로 리뷰를 먼저 넣는다
+        db.executemany(
+            f"INSERT INTO reviews ({_REVIEW_COLUMNS}) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, "
+            "COALESCE(?, CURRENT_TIMESTAMP), COALESCE(?, CURRENT_TIMESTAMP))",
+            reviews,
+        )
+        db.executemany(
+            f"INSERT INTO review_images ({_IMAGE_COLUMNS}) "
+            "VALUES (?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP), ?, ?)",
+            images,
+        )
+        counts["reviews"] += len(reviews)
+        counts["images"] += len(images)
+        reviews.clear()
+        images.clear()
+
+    for kind, record in records:
+        if kind == "product":
+            products.append((
+                record["product_no"],
+                record.get("product_name", ""),
+                record.get("created_at"),
+            ))
+        elif kind == "review":
+            review_id = record.get("id") or next_id
+            next_id = max(next_id, review_id + 1)
+            reviews.append(_review_params(review_id, record))
+            for image in record.get("images") or []:
+                if image_exists is not None and not image_exists(image["file_path"]):
+                    counts["skipped_images"] += 1
+                    continue
+                images.append(_image_params(review_id, image))
+            if len(reviews) >= batch_size:
+                flush()
+    flush()
+
+    db.executemany(
+        "INSERT INTO products (product_no, product_name, created_at) "
+        "VALUES (?, ?, COALESCE(?, CURRENT_TIMESTAMP)) "
+        "ON CONFLICT(product_no) DO UPDATE SET product_name = excluded.product_name",
+        products,
+    )
+
+    # 인덱스부터 다시 만들어 파생 데이터 계산이 인덱스를 쓰게 하고, 트리거는 마지막에
+    for sql in indexes:
+        db.execute(sql)
+    _rebuild_derived(db)
+    for sql in triggers:
+        db.execute(sql)
+    counts["products"] = db.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    logger.info(
+        "백업 복원: 리뷰 %d개, 이미지 %d개, 상품 %d개 (건너뛴 이미지 %d개, %.2fs)",
+        counts["reviews"],
+        counts["images"],
+        counts["products"],
+        counts["skipped_images"],
+        time.monotonic() - started,
+    )
+    return counts
@@ -0,0 +1,178 @@
+"""위젯 API 응답 캐시 (프로세스 내 TTL + LRU).
+
+직렬화된 응답 바이트를 키별로 보관하고, 상품번호(tag) 단위로 무효화한다.
+같은 항목에 gzip/br로 압축한 본문도 함께 보관할 수 있다 (WIDGET_CACHE_COMPRESSED).
+쓰기 엔드포인트는 invalidate_products()를 호출해 해당 상품의 키를 지운다.
+"""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, NamedTuple, Optional
+
+from app import config
+from app.database import after_commit
+
+
+class _Entry(NamedTuple):
+    tag: str
+    body: bytes
+    expires_at: float
+    encoded: dict[str, bytes]  # 인코딩 → 압축된 본문
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(data) for data in self.encoded.values())
+
+
+class ResponseCache:
+    """TTL + 바이트 크기 기준 LRU 캐시.
+
+    - ``ttl``초가 지난 항목은 조회 시 만료 처리
+    - 전체 크기가 ``max_bytes``를 넘으면 가장 오래 사용되지 않은 항목부터 제거
+    - ``invalidate(tag)``로 한 상품의 모든 키를 제거. 무효화 이전에 시작된
+      조회 결과가 늦게 저장되지 않도록 tag별 세대(generation)를 함께 관리한다.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._keys_by_tag: dict[str, set] = {}
+        self._generations: dict[str, int] = {}
+        self._epoch = 0  # clear() 시 증가
+        self._size = 0
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_bytes > 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._size -= entry.size
+        keys = self._keys_by_tag.get(entry.tag)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_tag[entry.tag]
+
+    def generation(self, tag: str) -> int:
+        """조회 시작 시점의 세대. set()에 그대로 넘긴다."""
+        with self._lock:
+            return self._epoch + self._generations.get(tag, 0)
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry.body
+
+    def set(self, key: Hashable, tag: str, body: bytes, generation: int) -> None:
+        if not self.enabled or len(body) > self.max_bytes:
+            return
+        with self._lock:
+            # 조회 도중 무효화되었다면 오래된 결과이므로 저장하지 않음
+            if self._epoch + self._generations.get(tag, 0) != generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(tag, body, time.monotonic() + self.ttl, {})
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+            self._size += len(body)
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._stats["evictions"] += 1
+
+    def get_encoded(self, key: Hashable, encoding: str) -> Optional[bytes]:
+        """get()으로 찾은 항목의 압축 본문 (없으면 None). 조회 통계에 넣지 않는다."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.encoded.get(encoding) if entry is not None else None
+
+    def set_encoded(self, key: Hashable, encoding: str, data: bytes) -> None:
+        """항목에 압축 본문을 덧붙인다. 그 사이 항목이 사라졌으면 무시한다."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or encoding in entry.encoded:
+                return
+            entry.encoded[encoding] = data
+            self._size += len(data)
+            self._evict()
+
+    def invalidate(self, tag: str) -> None:
+        with self._lock:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+            for key in list(self._keys_by_tag.get(tag, ())):
+                self._remove(key)
+            self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._keys_by_tag.clear()
+            self._size = 0
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            data: dict = dict(self._stats)
+            data["entries"] = len(self._entries)
+            data["size_bytes"] = self._size
+            data["max_bytes"] = self.max_bytes
+            data["ttl"] = self.ttl
+            lookups = data["hits"] + data["misses"]
+            data["hit_rate"] = round(data["hits"] / lookups, 4) if lookups else 0.0
+            return data
+
+
+widget_cache = ResponseCache(
+    max_bytes=config.WIDGET_CACHE_MAX_BYTES,
+    ttl=config.WIDGET_CACHE_TTL,
+)
+
+
+def invalidate_products(db: sqlite3.Connection, *product_nos: str) -> None:
+    """상품들의 위젯 캐시를 무효화한다.
+
+    즉시 한 번, 트랜잭션 커밋 후 한 번 더 무효화해 커밋 전에 다시 채워진
+    (변경 이전 데이터의) 항목도 제거한다.
+    """
+    targets = {p for p in product_nos if p}
+
+    def _invalidate() -> None:
+        for product_no in targets:
+            widget_cache.invalidate(product_no)
+
+    _invalidate()
+    after_commit(db, _invalidate)
+
+
+def invalidate_all(db: sqlite3.Connection) -> None:
+    """위젯 캐시 전체를 무효화한다 (요약 재계산 등)."""
+    widget_cache.clear()
+    after_commit(db, widget_cache.clear)
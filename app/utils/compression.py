@@ -0,0 +1,240 @@
+"""응답 압축 (gzip / brotli).
+
+- ``compress()`` / ``negotiate_encoding()``: 사전 압축(위젯 자산, 위젯 응답 캐시)에 사용
+- ``CompressionMiddleware``: JSON/HTML 등 텍스트 응답을 요청마다 압축
+
+brotli는 선택 의존성이다 (``pip install brotli``). 없으면 gzip만 사용한다.
+
+압축된 응답의 ETag에는 ``"<etag>-gzip"``처럼 인코딩을 붙여 표현마다 다르게 한다.
+클라이언트가 그 값으로 재검증하면 미들웨어가 If-None-Match에 원래 ETag를 덧붙여
+라우터의 기존 304 판단이 그대로 동작한다.
+"""
+
+import gzip
+import zlib
+from typing import Iterable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import config
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - 선택 의존성
+    brotli = None
+
+# 서버 선호 순서 (같은 q 값이면 앞의 것을 고른다)
+ENCODINGS: tuple[str, ...] = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """encoding(br/gzip)으로 압축한다. level이 없으면 각 형식의 최고 압축."""
+    if encoding == "gzip":
+        # mtime=0: 같은 입력이면 같은 출력 (ETag/캐시 안정성)
+        return gzip.compress(data, compresslevel=9 if level is None else level, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=11 if level is None else level)
+    raise ValueError(f"지원하지 않는 인코딩: {encoding}")
+
+
+def dynamic_level(encoding: str) -> int:
+    """요청마다 압축할 때의 레벨 (속도 우선, 설정값)."""
+    return config.COMPRESSION_BROTLI_QUALITY if encoding == "br" else config.COMPRESSION_GZIP_LEVEL
+
+
+def negotiate_encoding(accept_encoding: str, available: Iterable[str] = ENCODINGS) -> str:
+    """Accept-Encoding에 맞는 인코딩을 고른다. 맞는 것이 없으면 "identity"."""
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, *params = item.strip().split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+
+    best, best_q = "identity", 0.0
+    for coding in available:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def response_encoding(accept_encoding: str, size: int) -> str:
+    """압축 설정과 본문 크기를 고려해 응답에 쓸 인코딩을 고른다."""
+    if not config.COMPRESSION_ENABLED or size < config.COMPRESSION_MIN_SIZE:
+        return "identity"
+    return negotiate_encoding(accept_encoding)
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """``"abc"`` → ``"abc-gzip"`` (약한 ETag의 W/ 접두사는 유지)."""
+    if encoding == "identity" or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _strip_encoding(etag: str) -> Optional[str]:
+    """인코딩이 붙은 ETag면 원래 ETag를 반환한다."""
+    for encoding in ENCODINGS:
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[: -len(suffix)] + '"'
+    return None
+
+
+class _StreamCompressor:
+    """스트리밍 응답을 청크마다 flush하며 압축한다."""
+
+    def __init__(self, encoding: str, level: int) -> None:
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=level)
+        else:
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """텍스트 응답을 gzip/brotli로 압축하는 ASGI 미들웨어.
+
+    - minimum_size 미만인 응답, media_types에 없는 형식, 이미 Content-Encoding이
+      있는 응답(사전 압축 자산 등), 206/204 응답은 그대로 보낸다
+    - 스트리밍 응답(여러 body 메시지)은 청크마다 flush하며 압축한다
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        media_types: Iterable[str] = ("application/json",),
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.media_types = frozenset(media_types)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""))
+
+        # If-None-Match의 "abc-gzip"에 "abc"를 덧붙여 라우터가 원래 ETag로 비교하게 한다
+        original_tags: dict[str, str] = {}
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match:
+            for tag in if_none_match.split(","):
+                tag = tag.strip()
+                base = _strip_encoding(tag)
+                if base is not None:
+                    original_tags[base] = tag
+            if original_tags:
+                value = ", ".join([if_none_match, *original_tags])
+                scope = dict(scope)
+                scope["headers"] = [
+                    (k, v) for k, v in scope["headers"] if k != b"if-none-match"
+                ] + [(b"if-none-match", value.encode("latin-1"))]
+
+        responder = _CompressionResponder(self, send, encoding, original_tags)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(
+        self,
+        middleware: CompressionMiddleware,
+        send: Send,
+        encoding: str,
+        original_tags: dict[str, str],
+    ) -> None:
+        self.middleware = middleware
+        self._send = send
+        self.encoding = encoding
+        self.original_tags = original_tags
+        self.start: Optional[Message] = None
+        self.compressor: Optional[_StreamCompressor] = None
+        self.passthrough = False
+
+    def _eligible(self, headers: MutableHeaders) -> bool:
+        status = self.start["status"]
+        if not 200 <= status < 300 or status in (204, 206):
+            return False
+        if "content-encoding" in headers:
+            return False
+        media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return media_type in self.middleware.media_types
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers = MutableHeaders(raw=message["headers"])
+            if message["status"] == 304:
+                # 클라이언트가 가진 압축 표현의 ETag로 되돌린다
+                etag = headers.get("etag")
+                if etag in self.original_tags:
+                    headers["etag"] = self.original_tags[etag]
+                    headers.add_vary_header("Accept-Encoding")
+            if not self._eligible(headers):
+                self.passthrough = True
+                await self._send(message)
+            return
+
+        if self.passthrough or message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        headers = MutableHeaders(raw=self.start["headers"])
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self._send(self.start)
+                await self._send(message)
+                return
+            headers.add_vary_header("Accept-Encoding")
+            if self.encoding == "identity":
+                self.passthrough = True
+                await self._send(self.start)
+                await self._send(message)
+                return
+
+            headers["content-encoding"] = self.encoding
+            if "etag" in headers:
+                headers["etag"] = encoded_etag(headers["etag"], self.encoding)
+            if not more_body:
+                # 한 번에 오는 본문: 전체를 압축하고 길이를 알려준다
+                compressed = compress(body, self.encoding, dynamic_level(self.encoding))
+                headers["content-length"] = str(len(compressed))
+                await self._send(self.start)
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+            del headers["content-length"]
+            self.compressor = _StreamCompressor(self.encoding, dynamic_level(self.encoding))
+            await self._send(self.start)
+
+        chunk = self.compressor.compress(body) if body else b""
+        if not more_body:
+            chunk += self.compressor.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -0,0 +1,241 @@
+"""엑셀(.xlsx) 리뷰 일괄 등록.
+
+업로드 파일을 임시 파일로 옮긴 뒤 openpyxl read-only 모드로 행을 하나씩 읽고,
+검증을 통과한 행을 EXCEL_IMPORT_CHUNK_SIZE개씩 모아 executemany로 등록한다.
+청크마다 커밋하므로 메모리 사용량과 쓰기 잠금 시간이 청크 크기로 제한된다.
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+from typing import Callable, Iterator, Optional
+
+from fastapi import HTTPException, UploadFile
+from openpyxl import load_workbook
+
+from app import config
+from app.models import ExcelError, ExcelUploadResult
+from app.utils.cache import invalidate_products
+
+# 일괄 등록 템플릿의 헤더 (1행). 리뷰 내보내기 파일의 앞 7열도 같다
+TEMPLATE_HEADERS = ["상품번호", "상품명", "작성자명", "별점(1~5)", "리뷰제목", "리뷰내용", "작성일(YYYY-MM-DD)"]
+
+# 응답에 담는 오류 행 수 상한 (fail_count는 전체 건수)
+MAX_REPORTED_ERRORS = 1000
+
+_SPOOL_BUFFER_SIZE = 1024 * 1024
+
+_INSERT_REVIEW_SQL = (
+    "INSERT INTO reviews "
+    "(product_no, product_name, author, rating, title, content, created_at, updated_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, "
+    "COALESCE(?, CURRENT_TIMESTAMP), COALESCE(?, CURRENT_TIMESTAMP))"
+)
+
+# 새 상품은 등록하고, 기존 상품은 상품명이 비어 있을 때만 채운다
+_UPSERT_PRODUCT_SQL = (
+    "INSERT INTO products (product_no, product_name) VALUES (?, ?) "
+    "ON CONFLICT(product_no) DO UPDATE SET product_name = excluded.product_name "
+    "WHERE products.product_name = '' AND excluded.product_name != ''"
+)
+
+# (product_no, product_name, author, rating, title, content, created_at, updated_at)
+ReviewRow = tuple
+
+
+def spool_upload(file: UploadFile, directory: Optional[str] = None) -> str:
+    """업로드 파일을 디스크의 임시 파일로 복사하고 경로를 반환한다 (호출자가 삭제)."""
+    fd, path = tempfile.mkstemp(suffix=".xlsx", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            file.file.seek(0)
+            shutil.copyfileobj(file.file, out, _SPOOL_BUFFER_SIZE)
+    except Exception:
+        os.unlink(path)
+        raise
+    return path
+
+
+def _format_created_at(value: object) -> Optional[str]:
+    """작성일 셀 값을 'YYYY-MM-DD HH:MM:SS'로 변환한다 (없으면 None → 현재 시간)."""
+    if not value:
+        return None
+    # datetime 객체인 경우 (openpyxl이 날짜 셀을 자동 변환)
+    if hasattr(value, "strftime"):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    raw = str(value).strip()
+    if len(raw) >= 10:
+        return raw[:10] + " 00:00:00"
+    return None
+
+
+def parse_row(values: tuple) -> tuple[Optional[ReviewRow], list[str]]:
+    """엑셀 한 행을 검증해 INSERT 파라미터 또는 오류 메시지 목록을 반환한다."""
+    # 최소 7열이어야 함 (부족하면 None으로 채움)
+    padded = list(values) + [None] * (7 - len(values))
+    product_no, product_name, author, rating, title, content, created_at = padded[:7]
+
+    errors: list[str] = []
+    if not product_no:
+        errors.append("상품번호는 필수입니다")
+    if not author:
+        errors.append("작성자명은 필수입니다")
+    if not content:
+        errors.append("리뷰내용은 필수입니다")
+
+    try:
+        rating_int = int(rating)  # type: ignore[arg-type]
+        if rating_int < 1 or rating_int > 5:
+            errors.append("별점은 1~5 사이 정수여야 합니다")
+    except (TypeError, ValueError):
+        errors.append("별점은 1~5 사이 정수여야 합니다")
+        rating_int = 0
+
+    if errors:
+        return None, errors
+
+    created_at_str = _format_created_at(created_at)
+    return (
+        str(product_no).strip(),
+        str(product_name).strip() if product_name else "",
+        str(author).strip(),
+        rating_int,
+        str(title).strip() if title else "",
+        str(content).strip(),
+        created_at_str,
+        created_at_str,
+    ), []
+
+
+def _open_sheet(path: str):
+    try:
+        wb = load_workbook(filename=path, read_only=True)
+    except Exception:
+        raise HTTPException(
+            status_code=400,
+            detail="엑셀 파일을 읽을 수 없습니다.",
+        )
+    if wb.active is None:
+        wb.close()
+        raise HTTPException(
+            status_code=400,
+            detail="엑셀 파일에 활성 시트가 없습니다.",
+        )
+    return wb
+
+
+def count_rows(path: str) -> Optional[int]:
+    """시트 크기 정보로 헤더를 뺀 행 수를 구한다 (알 수 없으면 None)."""
+    wb = _open_sheet(path)
+    try:
+        max_row = wb.active.max_row
+        return max(max_row - 1, 0) if max_row else None
+    finally:
+        wb.close()
+
+
+def iter_rows(path: str, start_row: int = 2) -> Iterator[tuple[int, tuple]]:
+    """엑셀 파일의 데이터 행을 (행 번호, 값) 으로 하나씩 읽는다. 빈 행은 건너뛴다."""
+    wb = _open_sheet(path)
+    try:
+        # 1행은 헤더
+        start_row = max(start_row, 2)
+        rows = wb.active.iter_rows(min_row=start_row, values_only=True)
+        for idx, values in enumerate(rows, start=start_row):
+            if not values or all(cell is None for cell in values):
+                continue
+            yield idx, values
+    finally:
+        wb.close()
+
+
+def _insert_chunk(db: sqlite3.Connection, chunk: list[ReviewRow]) -> None:
+    """검증된 행 묶음을 등록한다 (커밋은 호출자)."""
+    # 청크 안에서 상품별로 한 번만 upsert (처음 나온 비어 있지 않은 상품명 사용)
+    products: dict[str, str] = {}
+    for row in chunk:
+        if not products.get(row[0]):
+            products[row[0]] = row[1]
+
+    db.executemany(_INSERT_REVIEW_SQL, chunk)
+    db.executemany(_UPSERT_PRODUCT_SQL, products.items())
+    invalidate_products(db, *products)
+
+
+def import_workbook(
+    db: Optional[sqlite3.Connection],
+    path: str,
+    chunk_size: Optional[int] = None,
+    on_chunk: Optional[Callable[[sqlite3.Connection, ExcelUploadResult, int], None]] = None,
+    start_row: int = 2,
+    result: Optional[ExcelUploadResult] = None,
+    write: Optional[Callable[[Callable[[sqlite3.Connection], None]], None]] = None,
+) -> ExcelUploadResult:
+    """엑셀 파일의 리뷰를 청크 단위로 등록한다.
+
+    chunk_size개 행(실패 행 포함)마다 등록 후 커밋한다. on_chunk(연결, 결과, 마지막 행 번호)는
+    커밋 직전 같은 트랜잭션 안에서 호출되므로 진행 상황 기록이 등록과 함께 커밋되고,
+    on_chunk에서 예외를 던지면 해당 청크는 커밋되지 않는다.
+    start_row/result로 중단된 등록을 이어서 진행할 수 있다.
+
+    write를 주면 청크마다 write(fn)을 호출해 fn(연결)로 등록하고 커밋은 write에 맡긴다
+    (run_write_sync를 넘기면 청크가 쓰기 스레드의 작업 하나가 되어 다른 쓰기와 번갈아 커밋된다).
+    이때 db는 쓰지 않으므로 None을 넘겨도 된다.
+    """
+    size = max(1, chunk_size or config.EXCEL_IMPORT_CHUNK_SIZE)
+    if result is None:
+        result = ExcelUploadResult(success_count=0, fail_count=0, errors=[])
+    chunk: list[ReviewRow] = []
+    failed: list[ExcelError] = []  # 이번 청크의 실패 행 (보고 한도 안의 것만)
+    failed_count = 0
+    pending_rows = 0
+    last_row = start_row - 1
+
+    def chunk_result() -> ExcelUploadResult:
+        """이번 청크까지 반영한 결과. result 자체는 커밋된 뒤에만 갱신한다."""
+        return ExcelUploadResult(
+            success_count=result.success_count + len(chunk),
+            fail_count=result.fail_count + failed_count,
+            errors=result.errors + failed,
+        )
+
+    def write_chunk(conn: sqlite3.Connection) -> None:
+        if chunk:
+            _insert_chunk(conn, chunk)
+        if on_chunk is not None:
+            on_chunk(conn, chunk_result(), last_row)
+
+    def flush() -> None:
+        nonlocal pending_rows, failed_count
+        if write is None:
+            assert db is not None, "write가 없으면 db가 필요합니다."
+            write_chunk(db)
+            db.commit()
+        else:
+            write(write_chunk)
+        # 청크가 커밋된 뒤에만 건수에 더한다 (롤백된 청크가 결과에 남지 않게)
+        result.success_count += len(chunk)
+        result.fail_count += failed_count
+        result.errors.extend(failed)
+        chunk.clear()
+        failed.clear()
+        failed_count = 0
+        pending_rows = 0
+
+    for idx, values in iter_rows(path, start_row):
+        last_row = idx
+        pending_rows += 1
+        row, row_errors = parse_row(values)
+        if row is None:
+            failed_count += 1
+            if len(result.errors) + len(failed) < MAX_REPORTED_ERRORS:
+                failed.append(ExcelError(row=idx, message="; ".join(row_errors)))
+        else:
+            chunk.append(row)
+        if pending_rows >= size:
+            flush()
+
+    if pending_rows:
+        flush()
+    return result
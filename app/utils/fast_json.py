@@ -0,0 +1,49 @@
+"""JSON 직렬화 빠른 경로 (FAST_JSON=1).
+
+위젯/목록 응답을 Pydantic 모델로 만들고 다시 검증·직렬화하는 대신, SQLite Row에서
+바로 만든 dict를 orjson으로 직렬화한다. 출력은 기존 경로(JSONResponse:
+``ensure_ascii=False``, 공백 없는 구분자)와 바이트 단위로 같다.
+dict의 키 순서와 값 타입은 app/models.py의 필드 정의를 따라야 한다
+(tests/test_fast_json.py가 비교한다).
+
+orjson이 없으면 표준 json으로 같은 바이트를 만든다 (Pydantic 생략 이득만 남음).
+"""
+
+import json
+from typing import Any, Union
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - requirements에 포함되지만 없는 환경 대비
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """JSONResponse.render()와 같은 바이트를 만든다.
+
+    orjson은 지수 표기 실수(1e+16 ↔ 1e16)만 표준 json과 다르다. 응답의 실수는
+    평균 별점(소수 첫째 자리)뿐이라 해당하지 않는다.
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """JSON을 파싱한다 (orjson이 있으면 orjson, 결과는 json.loads와 같음)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(Response):
+    """이미 직렬화 가능한 dict/list를 검증 없이 JSON으로 응답한다."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,169 @@
+"""불변(immutable) 파일 서빙 (업로드 이미지 / 정적 자산).
+
+Starlette FileResponse는 Range 요청과 강한 ETag를 지원하지 않아 직접 구현한다.
+
+- 강한 ETag (크기 + mtime 나노초) / If-None-Match → 304
+- ``Range: bytes=a-b`` 단일 구간 → 206, 만족할 수 없으면 416
+  (여러 구간 요청은 전체 본문 200으로 응답, If-Range가 다르면 전체 본문)
+- 서버가 ASGI ``http.response.pathsend`` 확장을 지원하면 전체 본문은 파일 경로만
+  넘겨 서버가 sendfile로 보내게 하고, 아니면 스레드에서 청크 단위로 읽는다.
+"""
+
+import os
+from email.utils import formatdate
+from typing import Optional
+
+import anyio
+from fastapi import Request
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.utils.http_cache import etag_matches
+
+# 청크 스트리밍 단위 (pathsend를 못 쓰는 서버에서만 사용)
+_CHUNK_SIZE = 256 * 1024
+
+
+def file_etag(stat: os.stat_result) -> str:
+    """파일 크기와 수정 시각으로 만든 강한 ETag."""
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """``bytes=`` 단일 구간을 (시작, 끝 포함) 으로 해석한다.
+
+    해석할 수 없거나 여러 구간이면 None (전체 본문으로 응답),
+    만족할 수 없는 구간이면 ValueError.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep or not (first or last):
+        return None
+    if not (first or "0").isdigit() or not (last or "0").isdigit():
+        return None
+    if not first:
+        # 접미 구간: 마지막 N바이트
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise ValueError("빈 접미 구간")
+        return max(0, size - suffix), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError("파일 크기를 넘는 구간")
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+class FileRangeResponse(Response):
+    """파일 전체 또는 한 구간을 보내는 응답."""
+
+    def __init__(
+        self,
+        path: str,
+        stat: os.stat_result,
+        headers: dict[str, str],
+        media_type: Optional[str],
+        byte_range: Optional[tuple[int, int]] = None,
+        send_body: bool = True,
+    ) -> None:
+        super().__init__(
+            status_code=206 if byte_range else 200,
+            headers=headers,
+            media_type=media_type,
+        )
+        self.path = path
+        self.size = stat.st_size
+        self.byte_range = byte_range
+        self.send_body = send_body
+        start, end = byte_range or (0, self.size - 1)
+        self.headers["content-length"] = str(end - start + 1)
+        if byte_range:
+            self.headers["content-range"] = f"bytes {start}-{end}/{self.size}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        if not self.send_body:
+            await send({"type": "http.response.body", "body": b""})
+            return
+        if self.byte_range is None and "http.response.pathsend" in scope.get("extensions", {}):
+            await send({"type": "http.response.pathsend", "path": self.path})
+            return
+
+        start, end = self.byte_range or (0, self.size - 1)
+        remaining = end - start + 1
+        if remaining <= 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+        fd = await anyio.to_thread.run_sync(os.open, self.path, os.O_RDONLY)
+        try:
+            offset = start
+            while remaining > 0:
+                chunk = await anyio.to_thread.run_sync(
+                    os.pread, fd, min(_CHUNK_SIZE, remaining), offset
+                )
+                if not chunk:
+                    break
+                offset += len(chunk)
+                remaining -= len(chunk)
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": remaining > 0,
+                })
+            if remaining > 0:
+                # 응답 도중 파일이 짧아짐: 본문을 닫기만 한다
+                await send({"type": "http.response.body", "body": b""})
+        finally:
+            os.close(fd)
+
+
+def serve_file(
+    request: Request,
+    path: str,
+    media_type: Optional[str],
+    headers: dict[str, str],
+) -> Response:
+    """ETag/Last-Modified를 붙여 파일을 응답한다 (304 / 206 / 416 처리 포함).
+
+    headers에는 Cache-Control, Vary 등 모든 응답에 공통인 헤더를 넘긴다.
+    """
+    stat = os.stat(path)
+    etag = file_etag(stat)
+    headers = {
+        **headers,
+        "ETag": etag,
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+        "Accept-Ranges": "bytes",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == etag):
+        try:
+            byte_range = parse_range(range_header, stat.st_size)
+        except ValueError:
+            return Response(
+                status_code=416,
+                headers={**headers, "Content-Range": f"bytes */{stat.st_size}"},
+            )
+
+    return FileRangeResponse(
+        path,
+        stat,
+        headers,
+        media_type,
+        byte_range,
+        send_body=request.method != "HEAD",
+    )
@@ -0,0 +1,119 @@
+"""HTTP 조건부 요청(ETag / Last-Modified) 처리.
+
+data_versions 테이블의 버전 카운터로 ETag를 만들고, If-None-Match /
+If-Modified-Since가 일치하면 본문을 만들지 않고 304를 반환한다.
+
+updated_at은 초 단위라 같은 초에 쓰기가 두 번 있으면 Last-Modified가 같다. 그래서 변경된
+초가 다 지나기 전에는 Last-Modified를 보내지 않고 If-Modified-Since로 304도 하지 않는다
+(RFC 9110 8.8.2.2). 두 검증자가 함께 오면 ETag만 비교한다.
+"""
+
+import hashlib
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import NamedTuple, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.utils.storage import url_epoch
+
+GLOBAL_SCOPE = "reviews"
+
+# 관리 API: 캐시는 허용하되 매번 재검증(304)하도록 함
+ADMIN_CACHE_CONTROL = "private, no-cache"
+
+
+class Version(NamedTuple):
+    version: int
+    updated_at: Optional[datetime]
+
+
+def product_scope(product_no: str) -> str:
+    return f"product:{product_no}"
+
+
+def get_version(db: sqlite3.Connection, scope: str) -> Version:
+    """scope의 현재 버전을 조회한다 (PK 조회 1회).
+
+    응답의 이미지 URL이 만료되는 경우(S3 사전 서명) updated_at을 현재 URL 발급
+    주기의 시작 시각 이상으로 올려, 주기가 바뀌면 ETag/Last-Modified도 바뀌게 한다.
+    """
+    row = db.execute(
+        "SELECT version, updated_at FROM data_versions WHERE scope = ?", (scope,)
+    ).fetchone()
+    version = 0
+    updated_at = None
+    if row is not None:
+        version = row["version"]
+        if row["updated_at"]:
+            updated_at = datetime.strptime(
+                str(row["updated_at"]), "%Y-%m-%d %H:%M:%S"
+            ).replace(tzinfo=timezone.utc)
+    epoch = url_epoch()
+    if epoch is not None and (updated_at is None or updated_at < epoch):
+        updated_at = epoch
+    return Version(version, updated_at)
+
+
+def make_etag(version: Version, *parts: object) -> str:
+    """버전과 요청 파라미터로 강한(strong) ETag를 만든다."""
+    raw = ":".join(str(p) for p in (version.version, version.updated_at, *parts))
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest() + '"'
+
+
+def _now() -> datetime:
+    # url_epoch()와 같은 시계(time.time)를 쓴다
+    return datetime.fromtimestamp(time.time(), timezone.utc)
+
+
+def _settled(updated_at: datetime) -> bool:
+    """updated_at의 초가 다 지나 같은 Last-Modified로 더 바뀔 수 없는지."""
+    return _now() >= updated_at + timedelta(seconds=1)
+
+
+def cache_headers(etag: str, version: Version, cache_control: str) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if version.updated_at is not None and _settled(version.updated_at):
+        headers["Last-Modified"] = format_datetime(version.updated_at, usegmt=True)
+    return headers
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match 헤더 값에 etag가 포함되는지 (약한 비교)."""
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+
+def is_not_modified(request: Request, etag: str, version: Version) -> bool:
+    """If-None-Match(우선) 또는 If-Modified-Since로 변경 여부를 판단한다.
+
+    If-None-Match가 있으면 If-Modified-Since는 보지 않는다.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if (
+        if_modified_since
+        and version.updated_at is not None
+        and _settled(version.updated_at)
+    ):
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return version.updated_at <= since
+
+    return False
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,154 @@
+"""리뷰 Row -> 응답 모델 변환 (이미지 일괄 로딩).
+
+리뷰 한 페이지의 이미지를 ``WHERE review_id IN (...)`` 한 번으로 읽어
+메모리에서 그룹핑한다. 리뷰마다 이미지를 조회하던 N+1 쿼리를 대체한다.
+
+``*_dict`` 함수는 FAST_JSON 경로용으로, 같은 응답을 Pydantic 모델 없이 dict로 만든다.
+키 순서와 타입은 app/models.py의 필드 정의와 같아야 한다.
+"""
+
+import json
+import sqlite3
+from typing import Iterable, Optional
+
+from app.models import ImageResponse, ImageVariant, ReviewResponse
+from app.utils.storage import file_url
+
+# SQLite 바인드 변수 한도(구버전 999)를 넘지 않도록 나눠서 조회
+_IN_CHUNK_SIZE = 900
+
+
+def parse_variants(variants_json: Optional[str]) -> list[ImageVariant]:
+    """review_images.variants(JSON) 컬럼을 ImageVariant 목록으로 변환한다."""
+    return [
+        ImageVariant(**v, url=file_url(v["file_path"]))
+        for v in json.loads(variants_json or "[]")
+    ]
+
+
+def row_to_image(row: sqlite3.Row) -> ImageResponse:
+    """review_images Row를 ImageResponse로 변환한다."""
+    return ImageResponse(
+        id=row["id"],
+        review_id=row["review_id"],
+        file_path=row["file_path"],
+        original_name=row["original_name"] or "",
+        file_size=row["file_size"] or 0,
+        created_at=str(row["created_at"]),
+        url=file_url(row["file_path"]),
+        variant_status=row["variant_status"],
+        variants=parse_variants(row["variants"]),
+    )
+
+
+def variant_dicts(variants_json: Optional[str]) -> list[dict]:
+    """parse_variants()와 같은 내용의 dict 목록 (ImageVariant 필드 순서)."""
+    return [
+        {
+            "name": v["name"],
+            "format": v["format"],
+            "width": v["width"],
+            "height": v["height"],
+            "file_path": v["file_path"],
+            "file_size": v["file_size"],
+            "url": file_url(v["file_path"]),
+        }
+        for v in json.loads(variants_json or "[]")
+    ]
+
+
+def image_dict(row: sqlite3.Row) -> dict:
+    """row_to_image()와 같은 내용의 dict (ImageResponse 필드 순서)."""
+    return {
+        "id": row["id"],
+        "review_id": row["review_id"],
+        "file_path": row["file_path"],
+        "original_name": row["original_name"] or "",
+        "file_size": row["file_size"] or 0,
+        "created_at": str(row["created_at"]),
+        "url": file_url(row["file_path"]),
+        "variant_status": row["variant_status"],
+        "variants": variant_dicts(row["variants"]),
+    }
+
+
+def load_images(
+    db: sqlite3.Connection, review_ids: Iterable[int], convert=row_to_image
+) -> dict[int, list]:
+    """여러 리뷰의 이미지를 한 번에 조회해 review_id별로 묶어 반환한다.
+
+    convert로 Row를 변환한다 (기본 ImageResponse, FAST_JSON 경로는 image_dict).
+    """
+    ids = list(dict.fromkeys(review_ids))
+    images: dict[int, list] = {review_id: [] for review_id in ids}
+
+    for start in range(0, len(ids), _IN_CHUNK_SIZE):
+        chunk = ids[start:start + _IN_CHUNK_SIZE]
+        placeholders = ", ".join("?" * len(chunk))
+        rows = db.execute(
+            "SELECT id, review_id, file_path, original_name, file_size, created_at, "
+            "       variant_status, variants "
+            f"FROM review_images WHERE review_id IN ({placeholders}) "
+            "ORDER BY review_id, id",
+            chunk,
+        ).fetchall()
+        for row in rows:
+            images[row["review_id"]].append(convert(row))
+
+    return images
+
+
+def _build_review(row: sqlite3.Row, images: list[ImageResponse]) -> ReviewResponse:
+    return ReviewResponse(
+        id=row["id"],
+        product_no=row["product_no"],
+        product_name=row["product_name"] or "",
+        author=row["author"],
+        rating=row["rating"],
+        title=row["title"] or "",
+        content=row["content"],
+        is_visible=bool(row["is_visible"]),
+        display_order=row["display_order"] or 0,
+        created_at=str(row["created_at"]),
+        updated_at=str(row["updated_at"]),
+        images=images,
+    )
+
+
+def hydrate_reviews(
+    rows: list[sqlite3.Row], db: sqlite3.Connection
+) -> list[ReviewResponse]:
+    """리뷰 Row 목록을 이미지가 포함된 ReviewResponse 목록으로 변환한다."""
+    if not rows:
+        return []
+    images = load_images(db, (row["id"] for row in rows))
+    return [_build_review(row, images[row["id"]]) for row in rows]
+
+
+def review_dicts(rows: list[sqlite3.Row], db: sqlite3.Connection) -> list[dict]:
+    """hydrate_reviews()와 같은 내용의 dict 목록 (ReviewResponse 필드 순서)."""
+    if not rows:
+        return []
+    images = load_images(db, (row["id"] for row in rows), convert=image_dict)
+    return [
+        {
+            "id": row["id"],
+            "product_no": row["product_no"],
+            "product_name": row["product_name"] or "",
+            "author": row["author"],
+            "rating": row["rating"],
+            "title": row["title"] or "",
+            "content": row["content"],
+            "is_visible": bool(row["is_visible"]),
+            "display_order": row["display_order"] or 0,
+            "created_at": str(row["created_at"]),
+            "updated_at": str(row["updated_at"]),
+            "images": images[row["id"]],
+        }
+        for row in rows
+    ]
+
+
+def hydrate_review(row: sqlite3.Row, db: sqlite3.Connection) -> ReviewResponse:
+    """리뷰 Row 하나를 이미지가 포함된 ReviewResponse로 변환한다."""
+    return hydrate_reviews([row], db)[0]
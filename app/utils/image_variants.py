@@ -0,0 +1,246 @@
+"""업로드 이미지의 반응형 변형(variant) 생성.
+
+원본 업로드를 그대로 위젯에 내보내지 않도록 너비별(갤러리 썸네일 / 카드 / 라이트박스)
+WebP + JPEG 변형을 만든다. 이미지 디코딩·리사이즈는 CPU 작업이라 요청 경로 밖의
+프로세스 풀에서 실행하고, 결과는 review_images.variants(JSON)에 기록한다.
+
+- variant_status: pending(생성 전) / ready / skipped(애니메이션 등 원본 사용) / failed
+- 변형 파일은 원본 키 옆에 ``{원본 파일명}_{이름}.{webp|jpg}``로 저장
+  (원본이 내용 주소 기반 blob이므로 같은 사진의 변형은 한 번만 만든다)
+- 프로세스 풀은 로컬 임시 디렉토리에만 쓰고, 저장소 업로드는 디스패처 스레드가 한다
+"""
+
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Iterable, Optional
+
+from PIL import Image, ImageOps
+
+from app import config
+
+logger = logging.getLogger(__name__)
+
+# (이름, 최대 너비). 위젯 썸네일은 72~80px이므로 thumb는 2배 밀도 기준
+VARIANT_SPECS: tuple[tuple[str, int], ...] = (
+    ("lightbox", 1280),
+    ("card", 480),
+    ("thumb", 160),
+)
+
+# (format 이름, Pillow 포맷, 확장자, 저장 옵션)
+_FORMATS = (
+    ("webp", "WEBP", ".webp", {"quality": 80, "method": 4}),
+    ("jpeg", "JPEG", ".jpg", {"quality": 82, "optimize": True, "progressive": True}),
+)
+
+PENDING = "pending"
+READY = "ready"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+
+def _to_rgb(image: Image.Image) -> Image.Image:
+    """투명 영역을 흰 배경으로 채워 JPEG로 저장 가능한 RGB 이미지로 만든다."""
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def generate_variants(source_path: str, output_dir: str) -> list[dict]:
+    """원본 이미지의 변형을 output_dir에 ``{이름}.{webp|jpg}``로 저장하고 목록을 반환한다.
+
+    프로세스 풀에서 실행되므로 DB/저장소에 접근하지 않는다. 반환하는 file_path는
+    output_dir 안의 파일명이다. 애니메이션 이미지는 빈 목록.
+    """
+    with Image.open(source_path) as original:
+        if getattr(original, "is_animated", False):
+            return []
+        # JPEG는 필요한 최대 크기 근처로 축소 디코딩해 시간을 줄인다
+        largest = VARIANT_SPECS[0][1]
+        original.draft("RGB", (largest, largest * original.height // max(original.width, 1)))
+        source = ImageOps.exif_transpose(original)
+        source.load()
+
+    if source.mode not in ("RGB", "RGBA"):
+        source = source.convert("RGBA" if "transparency" in source.info or source.mode in ("LA", "P") else "RGB")
+
+    variants: list[dict] = []
+    # 큰 변형부터 만들어 다음 변형의 원본으로 재사용
+    for name, max_width in VARIANT_SPECS:
+        if source.width > max_width:
+            height = max(1, round(source.height * max_width / source.width))
+            source = source.resize((max_width, height), Image.Resampling.LANCZOS)
+        for fmt, pil_format, extension, options in _FORMATS:
+            image = _to_rgb(source) if pil_format == "JPEG" else source
+            file_name = f"{name}{extension}"
+            full_path = os.path.join(output_dir, file_name)
+            image.save(full_path, pil_format, **options)
+            variants.append({
+                "name": name,
+                "format": fmt,
+                "width": image.width,
+                "height": image.height,
+                "file_path": file_name,
+                "file_size": os.path.getsize(full_path),
+            })
+    return variants
+
+
+# ---------------------------------------------------------------------------
+# 백그라운드 실행
+# ---------------------------------------------------------------------------
+
+_lock = threading.Lock()
+_dispatcher: Optional[ThreadPoolExecutor] = None
+_process_pool: Optional[ProcessPoolExecutor] = None
+_pending: set[Future] = set()
+
+
+def _executors() -> tuple[ThreadPoolExecutor, Optional[ProcessPoolExecutor]]:
+    global _dispatcher, _process_pool
+    with _lock:
+        workers = config.IMAGE_VARIANT_WORKERS
+        if _dispatcher is None:
+            _dispatcher = ThreadPoolExecutor(
+                max_workers=max(1, workers), thread_name_prefix="image-variant"
+            )
+        if _process_pool is None and workers > 0:
+            _process_pool = ProcessPoolExecutor(max_workers=workers)
+        return _dispatcher, _process_pool
+
+
+def _generate(source_path: str, output_dir: str) -> list[dict]:
+    _, process_pool = _executors()
+    if process_pool is None:
+        # IMAGE_VARIANT_WORKERS=0: 디스패처 스레드에서 직접 생성
+        return generate_variants(source_path, output_dir)
+    return process_pool.submit(generate_variants, source_path, output_dir).result()
+
+
+def build_variants(file_path: str) -> list[dict]:
+    """저장소의 원본(file_path 키)으로 변형을 만들어 ``{stem}_{이름}.{확장자}`` 키로 저장한다."""
+    from app.utils.storage import INCOMING_DIR
+    from app.utils.storage_backends import get_backend
+
+    backend = get_backend()
+    stem, _ = os.path.splitext(file_path)
+    scratch = os.path.join(config.UPLOAD_DIR, INCOMING_DIR)
+    os.makedirs(scratch, exist_ok=True)
+    output_dir = tempfile.mkdtemp(dir=scratch)
+    try:
+        with backend.local_copy(file_path) as source_path:
+            variants = _generate(source_path, output_dir)
+        for variant in variants:
+            local_path = os.path.join(output_dir, variant["file_path"])
+            variant["file_path"] = f"{stem}_{variant['file_path']}"
+            backend.put(variant["file_path"], local_path)
+        return variants
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+def _shared_variants(db: sqlite3.Connection, image_id: int, file_path: str) -> Optional[sqlite3.Row]:
+    """같은 blob을 쓰는 다른 이미지에 이미 만들어진 변형이 있으면 반환한다."""
+    return db.execute(
+        "SELECT variants, variant_status FROM review_images "
+        "WHERE file_path = ? AND id != ? AND variant_status IN (?, ?) LIMIT 1",
+        (file_path, image_id, READY, SKIPPED),
+    ).fetchone()
+
+
+def _record_variants(
+    db: sqlite3.Connection, image_id: int, row: sqlite3.Row, variants_json: str, status: str
+) -> None:
+    from app.utils.cache import invalidate_products
+    from app.utils.storage import release_images
+
+    updated = db.execute(
+        "UPDATE review_images SET variants = ?, variant_status = ? WHERE id = ?",
+        (variants_json, status, image_id),
+    ).rowcount
+    if updated:
+        invalidate_products(db, row["product_no"])
+    else:
+        # 생성 도중 이미지가 삭제됨: 마지막 참조였으면 방금 만든 변형도 정리 (커밋 후 백그라운드)
+        release_images(db, [row["file_path"]])
+
+
+def process_image(image_id: int) -> str:
+    """이미지 하나의 변형을 만들고 결과를 기록한다 (쓰기 스레드). 최종 variant_status를 반환한다."""
+    from app.database import get_db, run_write_sync
+
+    with get_db() as db:
+        row = db.execute(
+            "SELECT ri.file_path, r.product_no FROM review_images ri "
+            "JOIN reviews r ON r.id = ri.review_id WHERE ri.id = ?",
+            (image_id,),
+        ).fetchone()
+        shared = _shared_variants(db, image_id, row["file_path"]) if row else None
+    if row is None:
+        return FAILED
+
+    if shared is not None:
+        # 중복 업로드: 같은 내용의 변형 파일을 그대로 사용
+        variants_json, status = shared["variants"], shared["variant_status"]
+    else:
+        try:
+            variants = build_variants(row["file_path"])
+            status = READY if variants else SKIPPED
+        except Exception as exc:  # 손상되었거나 Pillow가 읽지 못하는 파일
+            logger.warning("이미지 %d 변형 생성 실패: %s", image_id, exc)
+            variants, status = [], FAILED
+        variants_json = json.dumps(variants, ensure_ascii=False)
+
+    run_write_sync(_record_variants, image_id, row, variants_json, status)
+    return status
+
+
+def schedule(image_ids: Iterable[int]) -> list[Future]:
+    """이미지들의 변형 생성을 백그라운드에 넘긴다."""
+    dispatcher, _ = _executors()
+    futures = [dispatcher.submit(process_image, image_id) for image_id in image_ids]
+    with _lock:
+        _pending.update(futures)
+    for future in futures:
+        future.add_done_callback(_forget)
+    return futures
+
+
+def _forget(future: Future) -> None:
+    with _lock:
+        _pending.discard(future)
+
+
+def wait_for_variants() -> None:
+    """지금까지 넘긴 변형 생성(결과 커밋 포함)이 끝날 때까지 기다린다."""
+    with _lock:
+        pending = list(_pending)
+    wait(pending)
+
+
+def schedule_after_commit(db: sqlite3.Connection, image_ids: Iterable[int]) -> None:
+    """이미지 레코드가 커밋된 뒤 변형 생성을 시작한다."""
+    from app.database import after_commit
+
+    ids = list(image_ids)
+    after_commit(db, lambda: schedule(ids))
+
+
+def shutdown(wait: bool = True) -> None:
+    global _dispatcher, _process_pool
+    with _lock:
+        dispatcher, _dispatcher = _dispatcher, None
+        process_pool, _process_pool = _process_pool, None
+    if dispatcher is not None:
+        dispatcher.shutdown(wait=wait, cancel_futures=not wait)
+    if process_pool is not None:
+        process_pool.shutdown(wait=wait, cancel_futures=not wait)
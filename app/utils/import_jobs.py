@@ -0,0 +1,250 @@
+"""백그라운드 엑셀 등록 작업.
+
+업로드 파일을 IMPORT_DIR에 보관하고 import_jobs 테이블에 작업을 기록한 뒤
+단일 워커 스레드가 순서대로 처리한다 (SQLite 쓰기는 어차피 한 번에 하나).
+진행 상황은 청크를 등록하는 트랜잭션 안에서 함께 갱신되므로, 서버가 재시작되면
+resume_jobs()가 마지막으로 커밋된 행 다음부터 이어서 처리한다.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from fastapi import HTTPException, UploadFile
+
+from app import config
+from app.database import after_commit, get_db, run_write_sync
+from app.models import ExcelError, ExcelUploadResult, ImportJobResponse
+from app.utils.excel_import import count_rows, import_workbook, spool_upload
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATUSES = (COMPLETED, FAILED, CANCELLED)
+
+
+class ImportCancelled(Exception):
+    """작업 취소 요청이 확인되었을 때 진행 중인 청크를 버리기 위해 사용한다."""
+
+
+class _Interrupted(Exception):
+    """서버 종료로 작업을 중단한다 (상태는 running으로 남아 재시작 시 재개)."""
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_stopping = threading.Event()
+
+
+def row_to_job(row: sqlite3.Row) -> ImportJobResponse:
+    return ImportJobResponse(
+        id=row["id"],
+        filename=row["filename"],
+        status=row["status"],
+        total_rows=row["total_rows"],
+        processed_rows=row["processed_rows"],
+        success_count=row["success_count"],
+        fail_count=row["fail_count"],
+        errors=[ExcelError(**e) for e in json.loads(row["errors"])],
+        error_message=row["error_message"],
+        cancel_requested=bool(row["cancel_requested"]),
+        created_at=row["created_at"],
+        started_at=row["started_at"],
+        finished_at=row["finished_at"],
+    )
+
+
+def get_job(db: sqlite3.Connection, job_id: int) -> Optional[sqlite3.Row]:
+    return db.execute("SELECT * FROM import_jobs WHERE id = ?", (job_id,)).fetchone()
+
+
+def _executor_instance() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _stopping.clear()
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="import-job")
+        return _executor
+
+
+def enqueue(job_id: int) -> Future:
+    """작업을 워커 스레드에 넘긴다."""
+    return _executor_instance().submit(run_job, job_id)
+
+
+def store_upload(file: UploadFile) -> str:
+    """업로드 파일을 IMPORT_DIR에 보관하고 경로를 반환한다 (DB 접근 없음)."""
+    os.makedirs(config.IMPORT_DIR, exist_ok=True)
+    return spool_upload(file, directory=config.IMPORT_DIR)
+
+
+def create_job(db: sqlite3.Connection, filename: str, path: str) -> int:
+    """store_upload()로 보관한 파일의 작업을 등록한다. 커밋 후 워커에 넘겨진다."""
+    cursor = db.execute(
+        "INSERT INTO import_jobs (filename, file_path) VALUES (?, ?)",
+        (filename, path),
+    )
+    job_id = cursor.lastrowid
+    after_commit(db, lambda: enqueue(job_id))
+    return job_id
+
+
+def request_cancel(db: sqlite3.Connection, job_id: int) -> None:
+    """작업 취소를 요청한다. 대기 중이면 바로 취소되고, 실행 중이면 다음 청크에서 멈춘다."""
+    job = get_job(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    if job["status"] in FINISHED_STATUSES:
+        raise HTTPException(status_code=409, detail="이미 종료된 작업입니다.")
+
+    db.execute(
+        "UPDATE import_jobs SET cancel_requested = 1 WHERE id = ?", (job_id,)
+    )
+    # 워커가 아직 가져가지 않았으면 바로 취소 (이미 시작했으면 워커가 처리)
+    started = db.execute(
+        "SELECT status != ? FROM import_jobs WHERE id = ?", (QUEUED, job_id)
+    ).fetchone()[0]
+    if not started:
+        _finish(db, job_id, CANCELLED, job["file_path"])
+
+
+def _finish(
+    db: sqlite3.Connection,
+    job_id: int,
+    status: str,
+    file_path: str,
+    message: str = "",
+) -> None:
+    db.execute(
+        "UPDATE import_jobs SET status = ?, error_message = ?, "
+        "finished_at = CURRENT_TIMESTAMP WHERE id = ?",
+        (status, message, job_id),
+    )
+
+    def _remove_file() -> None:
+        if os.path.isfile(file_path):
+            os.remove(file_path)
+
+    after_commit(db, _remove_file)
+
+
+def _save_progress(
+    db: sqlite3.Connection, job_id: int, result: ExcelUploadResult, last_row: int
+) -> None:
+    db.execute(
+        "UPDATE import_jobs SET processed_rows = ?, success_count = ?, "
+        "fail_count = ?, errors = ? WHERE id = ?",
+        (
+            max(last_row - 1, 0),  # 헤더 행 제외
+            result.success_count,
+            result.fail_count,
+            json.dumps(
+                [e.model_dump() for e in result.errors], ensure_ascii=False
+            ),
+            job_id,
+        ),
+    )
+
+
+def _claim(db: sqlite3.Connection, job_id: int, total_rows: Optional[int]) -> bool:
+    return db.execute(
+        "UPDATE import_jobs SET status = ?, total_rows = ?, "
+        "started_at = COALESCE(started_at, CURRENT_TIMESTAMP) "
+        "WHERE id = ? AND status IN (?, ?)",
+        (RUNNING, total_rows, job_id, QUEUED, RUNNING),
+    ).rowcount > 0
+
+
+def run_job(job_id: int, chunk_size: Optional[int] = None) -> None:
+    """작업 하나를 처리한다. 중단된 작업은 마지막으로 커밋된 행 다음부터 이어서 처리한다.
+
+    상태 변경과 청크 등록은 모두 쓰기 스레드(run_write_sync)에서 실행하고, 파일 읽기는
+    이 워커 스레드에서 한다 (DB 연결을 잡고 있지 않음).
+    """
+    with get_db() as db:
+        job = get_job(db, job_id)
+    if job is None or job["status"] in FINISHED_STATUSES:
+        return
+    path = job["file_path"]
+    if job["cancel_requested"]:
+        run_write_sync(_finish, job_id, CANCELLED, path)
+        return
+
+    try:
+        total_rows = job["total_rows"]
+        if total_rows is None:
+            total_rows = count_rows(path)
+        if not run_write_sync(_claim, job_id, total_rows):
+            return  # 그 사이 취소됨
+
+        def on_chunk(
+            conn: sqlite3.Connection, result: ExcelUploadResult, last_row: int
+        ) -> None:
+            if _stopping.is_set():
+                raise _Interrupted
+            cancelled = conn.execute(
+                "SELECT cancel_requested FROM import_jobs WHERE id = ?", (job_id,)
+            ).fetchone()[0]
+            if cancelled:
+                raise ImportCancelled
+            _save_progress(conn, job_id, result, last_row)
+
+        resumed = ExcelUploadResult(
+            success_count=job["success_count"],
+            fail_count=job["fail_count"],
+            errors=[ExcelError(**e) for e in json.loads(job["errors"])],
+        )
+        import_workbook(
+            None,
+            path,
+            chunk_size=chunk_size,
+            on_chunk=on_chunk,
+            start_row=job["processed_rows"] + 2,
+            result=resumed,
+            write=run_write_sync,
+        )
+    except _Interrupted:
+        logger.info("엑셀 등록 작업 %d 중단 (재시작 시 이어서 처리)", job_id)
+        return
+    except ImportCancelled:
+        run_write_sync(_finish, job_id, CANCELLED, path)
+    except HTTPException as exc:
+        run_write_sync(_finish, job_id, FAILED, path, str(exc.detail))
+    except Exception as exc:
+        logger.exception("엑셀 등록 작업 %d 실패", job_id)
+        run_write_sync(_finish, job_id, FAILED, path, str(exc))
+    else:
+        run_write_sync(_finish, job_id, COMPLETED, path)
+
+
+def resume_jobs() -> int:
+    """대기/실행 중 상태로 남은 작업을 다시 워커에 넘긴다 (앱 시작 시)."""
+    with get_db() as db:
+        job_ids = [
+            row["id"]
+            for row in db.execute(
+                "SELECT id FROM import_jobs WHERE status IN (?, ?) ORDER BY id",
+                (QUEUED, RUNNING),
+            )
+        ]
+    for job_id in job_ids:
+        enqueue(job_id)
+    return len(job_ids)
+
+
+def shutdown(wait: bool = True) -> None:
+    """워커를 멈춘다. 실행 중인 작업은 현재 청크를 버리고 running 상태로 남는다."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        _stopping.set()
+        executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,96 @@
+"""키셋(cursor) 페이지네이션.
+
+OFFSET 대신 마지막 행의 정렬 키를 cursor로 넘겨 다음 페이지를 인덱스 탐색으로
+바로 찾는다. 정렬 방향이 섞인 키(예: display_order ASC, created_at DESC)는
+방향이 같은 구간별로 나눠 단계적으로 조회해 각 단계가 인덱스 범위 탐색이 되게 한다.
+"""
+
+import base64
+import json
+import sqlite3
+from typing import Optional, Sequence
+
+from fastapi import HTTPException
+
+# (컬럼, "ASC" | "DESC") 목록. 마지막 키는 유일해야 한다 (보통 id).
+SortKeys = Sequence[tuple[str, str]]
+
+
+def order_by(keys: SortKeys) -> str:
+    """ORDER BY 절 본문을 만든다."""
+    return ", ".join(f"{column} {direction}" for column, direction in keys)
+
+
+def encode_cursor(sort: str, row: sqlite3.Row, keys: SortKeys) -> str:
+    """행의 정렬 키 값을 불투명한 cursor 토큰으로 인코딩한다."""
+    payload = {"s": sort, "k": [row[column] for column, _ in keys]}
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, sort: str, keys: SortKeys) -> Optional[list]:
+    """cursor 토큰을 정렬 키 값 목록으로 디코딩한다. 빈 토큰은 첫 페이지(None)."""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = payload["k"]
+        valid = payload["s"] == sort and len(values) == len(keys)
+    except (ValueError, KeyError, TypeError):
+        valid = False
+    if not valid:
+        raise HTTPException(status_code=400, detail="잘못된 cursor입니다.")
+    return values
+
+
+def _keyset_stages(keys: SortKeys, values: list) -> list[tuple[str, list]]:
+    """cursor 이후 행을 찾는 조건을 방향이 같은 구간별 단계로 나눈다.
+
+    예) display_order ASC, created_at DESC, id DESC
+        1단계: display_order = ? AND (created_at, id) < (?, ?)
+        2단계: display_order > ?
+    """
+    runs: list[tuple[int, int]] = []
+    start = 0
+    for i in range(1, len(keys) + 1):
+        if i == len(keys) or keys[i][1] != keys[start][1]:
+            runs.append((start, i))
+            start = i
+
+    stages: list[tuple[str, list]] = []
+    for start, end in reversed(runs):
+        columns = [column for column, _ in keys[start:end]]
+        op = ">" if keys[start][1] == "ASC" else "<"
+        if len(columns) == 1:
+            compare = f"{columns[0]} {op} ?"
+        else:
+            placeholders = ", ".join("?" * len(columns))
+            compare = f"({', '.join(columns)}) {op} ({placeholders})"
+        equals = [f"{column} = ?" for column, _ in keys[:start]]
+        stages.append((" AND ".join([*equals, compare]), list(values[:end])))
+    return stages
+
+
+def fetch_keyset(
+    db: sqlite3.Connection,
+    select_sql: str,
+    conditions: list[str],
+    params: list[object],
+    keys: SortKeys,
+    after: Optional[list],
+    limit: int,
+) -> list[sqlite3.Row]:
+    """after(cursor 값) 다음의 행을 최대 limit개 조회한다."""
+    stages = _keyset_stages(keys, after) if after is not None else [("", [])]
+    rows: list[sqlite3.Row] = []
+    for condition, stage_params in stages:
+        where = [*conditions, condition] if condition else list(conditions)
+        where_clause = f"WHERE {' AND '.join(where)} " if where else ""
+        sql = f"{select_sql} {where_clause}ORDER BY {order_by(keys)} LIMIT ?"
+        rows.extend(
+            db.execute(sql, [*params, *stage_params, limit - len(rows)]).fetchall()
+        )
+        if len(rows) >= limit:
+            break
+    return rows
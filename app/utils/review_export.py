@@ -0,0 +1,127 @@
+"""리뷰 내보내기 (CSV / xlsx).
+
+전용 연결의 읽기 트랜잭션 하나에서 커서를 _FETCH_SIZE행씩 읽어 바로 내보낸다.
+CSV는 행을 모아 조각 단위로 응답에 흘려보내고, xlsx는 openpyxl write-only 모드로
+행을 임시 파일에 쓴 뒤 완성된 파일을 조각 단위로 읽어 보낸다 (인라인 문자열이라
+공유 문자열 표도 메모리에 쌓이지 않는다). 어느 쪽이든 메모리 사용량은 건수와 무관하다.
+
+앞 7열은 엑셀 일괄 등록 템플릿과 같아서 내보낸 파일을 그대로 다시 등록할 수 있다.
+"""
+
+import csv
+import io
+import os
+import sqlite3
+import tempfile
+from datetime import date, timedelta
+from typing import Iterator, Optional
+
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+from app.utils.excel_import import TEMPLATE_HEADERS
+from app.utils.storage import file_url
+
+EXPORT_HEADERS = [*TEMPLATE_HEADERS, "리뷰ID", "노출여부", "노출순서", "수정일", "이미지"]
+
+_FETCH_SIZE = 1000
+_CHUNK_BYTES = 64 * 1024
+# CSV 조각은 문자 수로 자른다 (한글은 UTF-8로 3바이트라 조각이 최대 약 48KB)
+_CSV_CHUNK_CHARS = 16 * 1024
+
+_SELECT_SQL = (
+    "SELECT id, product_no, product_name, author, rating, title, content, "
+    "is_visible, display_order, created_at, updated_at, "
+    "(SELECT group_concat(file_path, ' ') FROM "
+    " (SELECT file_path FROM review_images WHERE review_id = reviews.id ORDER BY id)"
+    ") AS image_paths "
+    "FROM reviews"
+)
+
+
+def export_query(
+    product_no: Optional[str] = None,
+    is_visible: Optional[bool] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> tuple[str, list[object]]:
+    """필터에 맞는 리뷰를 최신순으로 읽는 SQL과 파라미터. date_to는 그날까지 포함."""
+    conditions: list[str] = []
+    params: list[object] = []
+    if product_no:
+        conditions.append("product_no = ?")
+        params.append(product_no)
+    if is_visible is not None:
+        conditions.append("is_visible = ?")
+        params.append(1 if is_visible else 0)
+    if date_from is not None:
+        conditions.append("created_at >= ?")
+        params.append(date_from.isoformat())
+    if date_to is not None:
+        conditions.append("created_at < ?")
+        params.append((date_to + timedelta(days=1)).isoformat())
+
+    sql = _SELECT_SQL
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    return sql + " ORDER BY created_at DESC, id DESC", params
+
+
+def iter_export_rows(db: sqlite3.Connection, sql: str, params: list[object]) -> Iterator[list]:
+    """EXPORT_HEADERS 순서의 값 목록을 한 행씩 돌려준다."""
+    cursor = db.execute(sql, params)
+    while rows := cursor.fetchmany(_FETCH_SIZE):
+        for row in rows:
+            image_paths = row["image_paths"]
+            yield [
+                row["product_no"],
+                row["product_name"],
+                row["author"],
+                row["rating"],
+                row["title"],
+                row["content"],
+                row["created_at"],
+                row["id"],
+                "Y" if row["is_visible"] else "N",
+                row["display_order"],
+                row["updated_at"],
+                " ".join(file_url(path) for path in image_paths.split(" ")) if image_paths else "",
+            ]
+
+
+def iter_csv(rows: Iterator[list]) -> Iterator[bytes]:
+    """CSV (UTF-8 BOM, 엑셀에서 한글이 깨지지 않게)를 조각 단위로 만든다."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow(EXPORT_HEADERS)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= _CSV_CHUNK_CHARS:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def iter_xlsx(rows: Iterator[list]) -> Iterator[bytes]:
+    """write-only 워크북을 임시 파일로 만든 뒤 조각 단위로 읽어 돌려준다."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("리뷰")
+    ws.append(EXPORT_HEADERS)
+    for row in rows:
+        # 엑셀 XML에 넣을 수 없는 제어 문자는 뺀다 (CSV는 그대로)
+        ws.append([
+            ILLEGAL_CHARACTERS_RE.sub("", value) if isinstance(value, str) else value
+            for value in row
+        ])
+
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    try:
+        wb.save(path)
+        with open(path, "rb") as f:
+            while chunk := f.read(_CHUNK_BYTES):
+                yield chunk
+    finally:
+        os.unlink(path)
@@ -0,0 +1,84 @@
+"""상품별 리뷰 요약(product_review_stats) 조회 및 재계산.
+
+요약 테이블은 app/database.py의 트리거가 쓰기 시점에 갱신한다.
+트리거 누락 등으로 값이 어긋났을 때는 rebuild_product_stats로 복구한다.
+"""
+
+import sqlite3
+from typing import Optional
+
+from app.models import RatingDistribution
+
+_REBUILD_SELECT_SQL = """
+INSERT INTO product_review_stats
+    (product_no, review_count, rating_sum,
+     star_1, star_2, star_3, star_4, star_5,
+     photo_review_count, updated_at)
+SELECT r.product_no, COUNT(*), SUM(r.rating),
+       SUM(r.rating = 1), SUM(r.rating = 2), SUM(r.rating = 3),
+       SUM(r.rating = 4), SUM(r.rating = 5),
+       SUM(EXISTS(SELECT 1 FROM review_images ri WHERE ri.review_id = r.id)),
+       CURRENT_TIMESTAMP
+FROM reviews r
+WHERE r.is_visible = 1 {product_filter}
+GROUP BY r.product_no
+"""
+
+
+def get_product_stats(db: sqlite3.Connection, product_no: str) -> dict:
+    """상품의 노출 리뷰 요약을 반환한다 (PK 조회 1회).
+
+    Returns:
+        dict: total_reviews, average_rating, rating_distribution, photo_review_count
+    """
+    row = db.execute(
+        "SELECT review_count, rating_sum, star_1, star_2, star_3, star_4, star_5, "
+        "       photo_review_count "
+        "FROM product_review_stats WHERE product_no = ?",
+        (product_no,),
+    ).fetchone()
+
+    if row is None or row["review_count"] <= 0:
+        return {
+            "total_reviews": 0,
+            "average_rating": 0.0,
+            "rating_distribution": RatingDistribution(),
+            "photo_review_count": 0,
+        }
+
+    return {
+        "total_reviews": row["review_count"],
+        "average_rating": round(row["rating_sum"] / row["review_count"], 1),
+        "rating_distribution": RatingDistribution(
+            star_5=row["star_5"],
+            star_4=row["star_4"],
+            star_3=row["star_3"],
+            star_2=row["star_2"],
+            star_1=row["star_1"],
+        ),
+        "photo_review_count": row["photo_review_count"],
+    }
+
+
+def rebuild_product_stats(
+    db: sqlite3.Connection, product_no: Optional[str] = None
+) -> int:
+    """reviews/review_images로부터 요약 테이블을 다시 계산한다.
+
+    product_no를 주면 해당 상품만, 없으면 전체를 재계산한다.
+
+    Returns:
+        int: 재계산된 상품 수
+    """
+    if product_no is None:
+        db.execute("DELETE FROM product_review_stats")
+        cursor = db.execute(_REBUILD_SELECT_SQL.format(product_filter=""))
+    else:
+        db.execute(
+            "DELETE FROM product_review_stats WHERE product_no = ?", (product_no,)
+        )
+        cursor = db.execute(
+            _REBUILD_SELECT_SQL.format(product_filter="AND r.product_no = ?"),
+            (product_no,),
+        )
+    return cursor.rowcount
@@ -0,0 +1,47 @@
+"""리뷰 전문 검색 (SQLite FTS5 trigram).
+
+reviews_fts 인덱스가 있으면 MATCH로 부분 문자열을 찾고, 없거나 검색어가
+trigram 최소 길이(3자)보다 짧으면 기존 LIKE 검색으로 처리한다.
+"""
+
+import sqlite3
+
+# trigram 토크나이저는 3자 미만 검색어를 찾지 못한다
+MIN_FTS_LENGTH = 3
+
+
+def fts_available(db: sqlite3.Connection) -> bool:
+    return (
+        db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'reviews_fts'"
+        ).fetchone()
+        is not None
+    )
+
+
+def use_fts(db: sqlite3.Connection, term: str) -> bool:
+    return len(term) >= MIN_FTS_LENGTH and fts_available(db)
+
+
+def fts_phrase(term: str) -> str:
+    """검색어를 FTS5 구문(phrase) 쿼리로 감싼다 (연산자 해석 방지)."""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def search_condition(db: sqlite3.Connection, term: str) -> tuple[str, list[object]]:
+    """작성자/제목/내용 부분 일치 WHERE 조건과 파라미터를 반환한다."""
+    if use_fts(db, term):
+        return (
+            "id IN (SELECT rowid FROM reviews_fts WHERE reviews_fts MATCH ?)",
+            [fts_phrase(term)],
+        )
+    like_val = f"%{term}%"
+    return (
+        "(author LIKE ? OR title LIKE ? OR content LIKE ?)",
+        [like_val, like_val, like_val],
+    )
+
+
+def rebuild_search_index(db: sqlite3.Connection) -> None:
+    """reviews 테이블 전체로 검색 인덱스를 다시 만든다 (기존 DB 백필/복구용)."""
+    db.execute("INSERT INTO reviews_fts (reviews_fts) VALUES ('rebuild')")
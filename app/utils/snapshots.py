@@ -0,0 +1,438 @@
+"""SQLite 온라인 스냅샷 백업.
+
+sqlite3 백업 API(``Connection.backup``)로 DB 파일을 BACKUP_STEP_PAGES 페이지씩
+나눠 복사한다. 원본 연결은 복사가 끝날 때까지 읽기 트랜잭션 하나를 유지하므로
+스냅샷은 시작 시점의 일관된 상태가 되고, 다른 연결의 쓰기로 복사가 처음부터 다시
+시작되지도 않는다. WAL 모드라 그동안에도 쓰기는 막히지 않는다 (체크포인트만 복사가
+끝날 때까지 미뤄져 WAL 파일이 잠시 커진다).
+
+스냅샷 하나는 BACKUP_DIR 아래 다음 파일로 남는다.
+
+- ``reviews-<시각>.db(.gz)``: DB 스냅샷 (journal_mode=DELETE 단일 파일)
+- ``reviews-<시각>.uploads.ndjson(.gz)``: 업로드 파일 목록 (저장소 + 스냅샷의 참조)
+- ``reviews-<시각>.json``: 소요 시간/크기/페이지 수 등 메타데이터 (마지막에 기록)
+
+메타데이터 파일이 있는 스냅샷만 완성된 것으로 보며, 최근 BACKUP_KEEP개만 남긴다.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+from app import config
+from app.database import get_connection
+from app.utils.storage import INCOMING_DIR
+from app.utils.storage_backends import get_backend
+
+logger = logging.getLogger(__name__)
+
+NAME_PREFIX = "reviews-"
+_NAME_RE = re.compile(r"^reviews-\d{8}-\d{6}(-\d+)?$")
+_COPY_CHUNK = 1024 * 1024
+# 스케줄러가 시작 직후 바로 스냅샷을 뜨지 않도록 두는 최소 대기 시간 (초)
+_MIN_DELAY = 60
+
+
+class SnapshotBusyError(RuntimeError):
+    """다른 스냅샷이 이미 진행 중일 때 발생한다."""
+
+
+_lock = threading.Lock()  # 한 번에 스냅샷 하나
+_state_lock = threading.Lock()
+_progress: Optional[dict] = None
+_last_error: Optional[str] = None
+_last_attempt: Optional[datetime] = None
+
+_stopping = threading.Event()
+_scheduler: Optional[threading.Thread] = None
+
+
+def is_valid_name(name: str) -> bool:
+    return bool(_NAME_RE.match(name))
+
+
+def _set_progress(**values) -> None:
+    global _progress
+    with _state_lock:
+        _progress = {**(_progress or {}), **values}
+
+
+def _clear_progress() -> None:
+    global _progress
+    with _state_lock:
+        _progress = None
+
+
+def _between_steps() -> None:
+    """백업 단계 사이에 쉬어 디스크 I/O를 다른 요청에 양보한다."""
+    if config.BACKUP_STEP_SLEEP > 0:
+        time.sleep(config.BACKUP_STEP_SLEEP)
+
+
+# ---------------------------------------------------------------------------
+# 스냅샷 생성
+# ---------------------------------------------------------------------------
+
+
+def _new_name(now: datetime) -> str:
+    name = f"{NAME_PREFIX}{now:%Y%m%d-%H%M%S}"
+    candidate, n = name, 1
+    while os.path.exists(os.path.join(config.BACKUP_DIR, f"{candidate}.json")):
+        n += 1
+        candidate = f"{name}-{n}"
+    return candidate
+
+
+def _copy_database(dest_path: str) -> dict:
+    """운영 DB를 dest_path로 온라인 백업하고 복사 통계를 반환한다."""
+    stats = {"steps": 0}
+
+    def progress(status: int, remaining: int, total: int) -> None:
+        stats["steps"] += 1
+        if _stopping.is_set():
+            raise RuntimeError("서버 종료로 스냅샷을 중단했습니다.")
+        _set_progress(pages_total=total, pages_remaining=remaining)
+        if remaining:
+            _between_steps()
+
+    source = get_connection()
+    try:
+        # 읽기 트랜잭션을 먼저 열어 두면 백업이 이 스냅샷을 끝까지 복사한다
+        source.execute("BEGIN")
+        source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        target = sqlite3.connect(dest_path)
+        # 임시 파일이라 단계마다 fsync하지 않는다 (완성본은 _finalize_db에서 fsync)
+        target.execute("PRAGMA synchronous=OFF")
+        try:
+            source.backup(target, pages=max(config.BACKUP_STEP_PAGES, 1), progress=progress)
+            # WAL 없이 파일 하나로 완결되도록
+            target.execute("PRAGMA journal_mode=DELETE")
+            check = target.execute("PRAGMA quick_check").fetchone()[0]
+            if check != "ok":
+                raise RuntimeError(f"스냅샷 무결성 검사 실패: {check}")
+            stats["pages"] = target.execute("PRAGMA page_count").fetchone()[0]
+            stats["page_size"] = target.execute("PRAGMA page_size").fetchone()[0]
+        finally:
+            target.close()
+    finally:
+        source.rollback()
+        source.close()
+    return stats
+
+
+def _referenced_files(snapshot_path: str) -> set[str]:
+    """스냅샷이 참조하는 업로드 파일 키 (원본 blob + 변형)."""
+    conn = sqlite3.connect(snapshot_path)
+    try:
+        keys = {
+            row[0]
+            for row in conn.execute("SELECT file_path FROM image_blobs WHERE ref_count > 0")
+        }
+        for (variants,) in conn.execute(
+            "SELECT variants FROM review_images WHERE variants != '[]'"
+        ):
+            keys.update(v["file_path"] for v in json.loads(variants))
+    finally:
+        conn.close()
+    return keys
+
+
+def _manifest_lines(referenced: set[str], counts: dict) -> Iterator[bytes]:
+    """업로드 파일 목록 NDJSON. 저장소의 파일과, 참조되지만 저장소에 없는 파일."""
+    seen: set[str] = set()
+    for key, mtime in get_backend().list():
+        if key.startswith(f"{INCOMING_DIR}/"):
+            continue
+        is_referenced = key in referenced
+        seen.add(key)
+        counts["stored_files"] += 1
+        if not is_referenced:
+            counts["unreferenced_files"] += 1
+        yield (json.dumps({
+            "path": key,
+            "mtime": round(mtime, 3),
+            "referenced": is_referenced,
+        }) + "\n").encode("utf-8")
+    for key in sorted(referenced - seen):
+        counts["missing_files"] += 1
+        yield (json.dumps({"path": key, "referenced": True, "missing": True}) + "\n").encode("utf-8")
+
+
+def _write_manifest(snapshot_path: str, dest_path: str, compress: bool) -> dict:
+    referenced = _referenced_files(snapshot_path)
+    counts = {
+        "referenced_files": len(referenced),
+        "stored_files": 0,
+        "missing_files": 0,
+        "unreferenced_files": 0,
+    }
+    opener = gzip.open if compress else open
+    with opener(dest_path, "wb") as f:
+        for line in _manifest_lines(referenced, counts):
+            f.write(line)
+    _fsync(dest_path)
+    return counts
+
+
+def _fsync(path: str) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _finalize_db(raw_path: str, dest_path: str, compress: bool) -> str:
+    """스냅샷 파일을 (압축해) 최종 경로에 두고 원본 DB 내용의 SHA-256을 반환한다."""
+    digest = hashlib.sha256()
+    with open(raw_path, "rb") as src:
+        if compress:
+            with gzip.open(dest_path, "wb", compresslevel=config.BACKUP_GZIP_LEVEL) as dst:
+                while chunk := src.read(_COPY_CHUNK):
+                    digest.update(chunk)
+                    dst.write(chunk)
+        else:
+            while chunk := src.read(_COPY_CHUNK):
+                digest.update(chunk)
+    if not compress:
+        os.replace(raw_path, dest_path)
+    _fsync(dest_path)
+    return digest.hexdigest()
+
+
+def create_snapshot(trigger: str = "manual") -> dict:
+    """스냅샷을 만들고 메타데이터를 반환한다. 진행 중인 스냅샷이 있으면 SnapshotBusyError."""
+    _acquire(trigger)
+    return _run(trigger)
+
+
+def start_snapshot(trigger: str = "manual") -> None:
+    """스냅샷을 백그라운드 스레드에서 시작한다. 진행 중이면 SnapshotBusyError."""
+    _acquire(trigger)
+
+    def run() -> None:
+        try:
+            _run(trigger)
+        except Exception:
+            pass  # _run에서 기록함
+
+    threading.Thread(target=run, name="snapshot", daemon=True).start()
+
+
+def _acquire(trigger: str) -> None:
+    if not _lock.acquire(blocking=False):
+        raise SnapshotBusyError("스냅샷이 이미 진행 중입니다.")
+    _set_progress(trigger=trigger, phase="starting")
+
+
+def _run(trigger: str) -> dict:
+    """_acquire()로 잡은 잠금을 마지막에 푼다."""
+    global _last_error, _last_attempt
+    try:
+        now = datetime.now().replace(microsecond=0)
+        _last_attempt = now
+        os.makedirs(config.BACKUP_DIR, exist_ok=True)
+        name = _new_name(now)
+        _set_progress(name=name, started_at=now.isoformat(timespec="seconds"), phase="copy")
+        try:
+            meta = _create(name, now, trigger)
+        except Exception as exc:
+            _last_error = f"{name}: {exc}"
+            logger.exception("스냅샷 %s 실패", name)
+            raise
+        _last_error = None
+        rotate()
+        logger.info(
+            "스냅샷 %s 완료: %.1fs, %s 바이트 (%d단계)",
+            name, meta["duration_ms"] / 1000, meta["file_size"], meta["steps"],
+        )
+        return meta
+    finally:
+        _clear_progress()
+        _lock.release()
+
+
+def _create(name: str, now: datetime, trigger: str) -> dict:
+    compress = config.BACKUP_COMPRESS
+    base = os.path.join(config.BACKUP_DIR, name)
+    raw_path = f"{base}.db.tmp"
+    db_file = f"{name}.db.gz" if compress else f"{name}.db"
+    manifest_file = f"{name}.uploads.ndjson.gz" if compress else f"{name}.uploads.ndjson"
+    started = time.perf_counter()
+    try:
+        stats = _copy_database(raw_path)
+        copied = time.perf_counter()
+
+        _set_progress(phase="manifest")
+        uploads = _write_manifest(raw_path, os.path.join(config.BACKUP_DIR, manifest_file), compress)
+        listed = time.perf_counter()
+
+        _set_progress(phase="compress" if compress else "finalize")
+        db_size = os.path.getsize(raw_path)
+        sha256 = _finalize_db(raw_path, os.path.join(config.BACKUP_DIR, db_file), compress)
+        finished = time.perf_counter()
+    except BaseException:
+        _remove_files(name)
+        raise
+    finally:
+        if os.path.exists(raw_path):
+            os.remove(raw_path)
+
+    meta = {
+        "name": name,
+        "trigger": trigger,
+        "created_at": now.isoformat(timespec="seconds"),
+        "duration_ms": round((finished - started) * 1000, 1),
+        "copy_ms": round((copied - started) * 1000, 1),
+        "manifest_ms": round((listed - copied) * 1000, 1),
+        "compress_ms": round((finished - listed) * 1000, 1),
+        **stats,
+        "db_size": db_size,
+        "file": db_file,
+        "file_size": os.path.getsize(os.path.join(config.BACKUP_DIR, db_file)),
+        "compressed": compress,
+        "sha256": sha256,
+        "uploads_manifest": manifest_file,
+        "uploads": uploads,
+    }
+    tmp_meta = f"{base}.json.tmp"
+    with open(tmp_meta, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_meta, f"{base}.json")
+    return meta
+
+
+# ---------------------------------------------------------------------------
+# 목록 / 보관 개수
+# ---------------------------------------------------------------------------
+
+
+def list_snapshots() -> list[dict]:
+    """완성된 스냅샷의 메타데이터 (최신순)."""
+    if not os.path.isdir(config.BACKUP_DIR):
+        return []
+    snapshots = []
+    for file_name in os.listdir(config.BACKUP_DIR):
+        name, ext = os.path.splitext(file_name)
+        if ext != ".json" or not is_valid_name(name):
+            continue
+        try:
+            with open(os.path.join(config.BACKUP_DIR, file_name), encoding="utf-8") as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            logger.warning("스냅샷 메타데이터를 읽을 수 없습니다: %s", file_name)
+    snapshots.sort(key=lambda meta: (meta["created_at"], meta["name"]), reverse=True)
+    return snapshots
+
+
+def get_snapshot(name: str) -> Optional[dict]:
+    if not is_valid_name(name):
+        return None
+    path = os.path.join(config.BACKUP_DIR, f"{name}.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _remove_files(name: str) -> None:
+    if not os.path.isdir(config.BACKUP_DIR):
+        return
+    for file_name in os.listdir(config.BACKUP_DIR):
+        if file_name.startswith(f"{name}."):
+            os.remove(os.path.join(config.BACKUP_DIR, file_name))
+
+
+def rotate() -> list[str]:
+    """최근 BACKUP_KEEP개만 남기고 지운 스냅샷 이름을 반환한다 (0이면 모두 보관)."""
+    if config.BACKUP_KEEP <= 0:
+        return []
+    removed = [meta["name"] for meta in list_snapshots()[config.BACKUP_KEEP:]]
+    for name in removed:
+        # 메타데이터를 먼저 지워 목록에서 바로 빠지게 한다
+        os.remove(os.path.join(config.BACKUP_DIR, f"{name}.json"))
+        _remove_files(name)
+    return removed
+
+
+# ---------------------------------------------------------------------------
+# 주기 실행
+# ---------------------------------------------------------------------------
+
+
+def next_run_at(now: Optional[datetime] = None) -> Optional[datetime]:
+    """다음 정기 스냅샷 시각 (비활성화면 None).
+
+    마지막 스냅샷(또는 실패한 시도)에서 BACKUP_INTERVAL_HOURS 뒤이며, 재시작해도
+    주기가 유지된다. 최소 _MIN_DELAY초 뒤.
+    """
+    if config.BACKUP_INTERVAL_HOURS <= 0:
+        return None
+    now = now or datetime.now()
+    earliest = now + timedelta(seconds=_MIN_DELAY)
+    snapshots = list_snapshots()
+    last = datetime.fromisoformat(snapshots[0]["created_at"]) if snapshots else None
+    if _last_attempt is not None and (last is None or _last_attempt > last):
+        last = _last_attempt
+    if last is None:
+        return earliest
+    return max(earliest, last + timedelta(hours=config.BACKUP_INTERVAL_HOURS))
+
+
+def _run_scheduler() -> None:
+    while True:
+        due = next_run_at()
+        if due is None:
+            return
+        delay = (due - datetime.now()).total_seconds()
+        if _stopping.wait(max(delay, 0)):
+            return
+        try:
+            create_snapshot("scheduled")
+        except SnapshotBusyError:
+            pass  # 수동 스냅샷이 진행 중
+        except Exception:
+            pass  # _run에서 기록함, 다음 주기에 다시 시도
+
+
+def start_scheduler() -> None:
+    """정기 스냅샷 스레드를 시작한다 (BACKUP_INTERVAL_HOURS가 0이면 하지 않음)."""
+    global _scheduler
+    if config.BACKUP_INTERVAL_HOURS <= 0 or _scheduler is not None:
+        return
+    _stopping.clear()
+    _scheduler = threading.Thread(target=_run_scheduler, name="snapshot-scheduler", daemon=True)
+    _scheduler.start()
+
+
+def shutdown(wait: bool = True) -> None:
+    """스케줄러를 멈춘다. 진행 중인 스냅샷은 다음 복사 단계에서 중단된다."""
+    global _scheduler
+    _stopping.set()
+    if _scheduler is not None and wait:
+        _scheduler.join()
+    _scheduler = None
+
+
+def status() -> dict:
+    with _state_lock:
+        progress = dict(_progress) if _progress else None
+    due = next_run_at() if _scheduler is not None else None
+    return {
+        "running": progress is not None,
+        "progress": progress,
+        "last_error": _last_error,
+        "interval_hours": config.BACKUP_INTERVAL_HOURS,
+        "keep": config.BACKUP_KEEP,
+        "next_run_at": due.isoformat(timespec="seconds") if due else None,
+        "snapshots": list_snapshots(),
+    }
@@ -1,27 +1,90 @@
+"""업로드 이미지 저장소 (내용 주소 기반).
+
+이미지는 내용의 SHA-256으로 ``blobs/ab/cd/<해시><확장자>``에 저장되어, 같은 사진이
+여러 리뷰에 올라와도 파일은 하나만 남는다. review_images.file_path가 이 경로를
+가리키고, image_blobs.ref_count는 review_images 트리거가 맞춘다.
+
+업로드 순서 (저장소 I/O는 쓰기 트랜잭션 밖에서):
+    1. save_image()    스트림을 임시 파일에 쓰며 해시 계산 (DB 접근 없음)
+    2. store_blob()    임시 파일을 최종 경로로 옮긴다 (이미 있으면 임시 파일만 버린다)
+    3. review_images INSERT (쓰기 스레드 → ref_count 증가). 같은 트랜잭션에서
+       check_blob_deletions()로 2 이후 같은 경로가 지워지지 않았는지 확인한다
+
+삭제는 release_images()가 커밋 후 백그라운드 스레드에 넘긴다. 참조 확인과 blob 행
+삭제만 쓰기 스레드 작업으로 커밋하고, 저장소 삭제는 그 뒤 DB 잠금 없이 한다
+(요청과 다른 쓰기가 저장소 I/O를 기다리지 않게). 삭제 중인 경로는
+image_blob_deletions에 기록되어 겹친 업로드가 등록되지 않는다.
+변형(썸네일 등) 파일은 ``<해시>_<이름>.<확장자>``로 원본 옆에 있으며 함께 지운다.
+review_{id}/ 아래의 예전 경로도 같은 방식으로 참조 카운트된다.
+실제 저장 위치(로컬/S3)는 storage_backends.get_backend()가 정한다.
+"""
+
+import hashlib
+import logging
 import os
-import shutil
+import sqlite3
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable, Iterable, Optional
 
+import aiofiles
+import aiofiles.os
 from fastapi import HTTPException, UploadFile
 
 from app import config
+from app.database import after_commit, run_write_sync
+from app.utils.storage_backends import get_backend
+
+logger = logging.getLogger(__name__)
 
 ALLOWED_TYPES: set[str] = {"image/jpeg", "image/png", "image/webp", "image/gif"}
 ALLOWED_EXTENSIONS: set[str] = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
 
+# 업로드 스트림을 읽어 디스크에 쓰는 단위 (메모리에는 이 크기만 올라온다)
+_CHUNK_SIZE = 64 * 1024
+
+BLOB_DIR = "blobs"
+# 해시 계산 중인 업로드 임시 파일 위치 (UPLOAD_DIR 기준)
+INCOMING_DIR = ".incoming"
+
+# 저장소 삭제에서 쓰기 작업 하나(참조 확인 + 삭제 기록)로 처리하는 경로 수
+_RELEASE_BATCH_SIZE = 100
+
+# 삭제 기록(image_blob_deletions) 보관 시간. 업로드의 배치부터 등록까지 이보다 오래 걸리지 않는다고 본다
+_DELETION_RETENTION = 3600  # 초
+
+# 같은 내용이면 확장자 표기가 달라도 같은 blob을 쓰도록 정규화
+_CANONICAL_EXTENSIONS = {".jpeg": ".jpg"}
+
+
+def _too_large() -> HTTPException:
+    max_mb: float = config.MAX_IMAGE_SIZE / (1024 * 1024)
+    return HTTPException(
+        status_code=400,
+        detail=f"파일 크기가 {max_mb:.0f}MB를 초과합니다.",
+    )
 
-async def save_image(file: UploadFile, review_id: int) -> dict:
+
+def blob_path(digest: str, extension: str) -> str:
+    """해시로부터 blob의 상대 경로를 만든다 (디렉토리당 파일 수를 줄이기 위해 2단 샤딩)."""
+    extension = _CANONICAL_EXTENSIONS.get(extension, extension)
+    return f"{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+
+async def save_image(file: UploadFile) -> dict:
     """
-    업로드된 이미지 파일을 저장한다.
+    업로드된 이미지 파일을 임시 파일에 저장하고 내용 해시를 계산한다.
 
     - content_type과 확장자 검증
-    - 파일 크기 <= MAX_IMAGE_SIZE 검증
-    - UUID 기반 파일명으로 충돌 방지
-    - UPLOAD_DIR/review_{review_id}/ 경로에 저장
+    - 파일 크기 <= MAX_IMAGE_SIZE 검증 (청크 단위로 쓰면서 초과 즉시 중단)
+    - 최종 경로 배치는 review_images INSERT 뒤 store_blob()에서 한다
 
     Returns:
-        dict: file_path(상대경로), original_name, file_size
+        dict: file_path(blob 상대경로), original_name, file_size, temp_path
     """
     # 확장자 검증
     original_name: str = file.filename or "unknown"
@@ -40,59 +103,359 @@ async def save_image(file: UploadFile, review_id: int) -> dict:
             detail=f"허용되지 않는 파일 형식입니다: {content_type}",
         )
 
-    # 파일 내용을 메모리에 읽어 크기 확인
-    content: bytes = await file.read()
-    file_size: int = len(content)
-    if file_size > config.MAX_IMAGE_SIZE:
-        max_mb: float = config.MAX_IMAGE_SIZE / (1024 * 1024)
-        raise HTTPException(
-            status_code=400,
-            detail=f"파일 크기가 {max_mb:.0f}MB를 초과합니다.",
-        )
-
-    if file_size == 0:
-        raise HTTPException(
-            status_code=400,
-            detail="빈 파일은 업로드할 수 없습니다.",
-        )
-
-    # 저장 디렉토리 생성
-    review_dir: str = os.path.join(config.UPLOAD_DIR, f"review_{review_id}")
-    os.makedirs(review_dir, exist_ok=True)
+    # 멀티파트 파서가 알려준 크기로 먼저 거절 (읽기 전에)
+    if file.size is not None and file.size > config.MAX_IMAGE_SIZE:
+        raise _too_large()
 
-    # UUID 기반 파일명 생성
-    unique_name: str = f"{uuid.uuid4()}{extension}"
-    full_path: str = os.path.join(review_dir, unique_name)
+    incoming_dir: str = os.path.join(config.UPLOAD_DIR, INCOMING_DIR)
+    await aiofiles.os.makedirs(incoming_dir, exist_ok=True)
+    temp_path: str = os.path.join(incoming_dir, f"{uuid.uuid4()}.part")
 
-    # 파일 저장
-    with open(full_path, "wb") as f:
-        f.write(content)
+    # 청크 단위로 임시 파일에 저장하며 해시 계산 (크기 초과 시 즉시 중단)
+    digest = hashlib.sha256()
+    file_size: int = 0
+    try:
+        async with aiofiles.open(temp_path, "wb") as f:
+            while chunk := await file.read(_CHUNK_SIZE):
+                file_size += len(chunk)
+                if file_size > config.MAX_IMAGE_SIZE:
+                    raise _too_large()
+                digest.update(chunk)
+                await f.write(chunk)
 
-    # 상대 경로 반환 (UPLOAD_DIR 기준)
-    relative_path: str = f"review_{review_id}/{unique_name}"
+        if file_size == 0:
+            raise HTTPException(
+                status_code=400,
+                detail="빈 파일은 업로드할 수 없습니다.",
+            )
+    except BaseException:
+        if await aiofiles.os.path.exists(temp_path):
+            await aiofiles.os.remove(temp_path)
+        raise
 
     return {
-        "file_path": relative_path,
+        "file_path": blob_path(digest.hexdigest(), extension),
         "original_name": original_name,
         "file_size": file_size,
+        "temp_path": temp_path,
     }
 
 
-def delete_image(file_path: str) -> None:
+class BlobDeletedError(Exception):
+    """배치한 blob이 등록 전에 저장소에서 지워졌을 수 있다 (잠시 후 다시 업로드)."""
+
+
+def store_blob(saved: dict) -> bool:
+    """save_image()의 임시 파일을 blob 경로에 배치한다. 새로 쓴 경우 True.
+
+    review_images 등록 전에 쓰기 스레드 밖에서 호출한다. 경로가 내용 해시라 같은 내용이
+    이미 있으면 임시 파일만 지운다. 그 사이 정리와 겹쳤는지는 등록 트랜잭션의
+    check_blob_deletions()가 확인하고, 등록되지 않은 파일은 collect_garbage()가 회수한다.
     """
-    파일시스템에서 이미지 파일을 삭제한다.
-    파일이 존재하지 않으면 무시한다.
+    backend = get_backend()
+    if backend.exists(saved["file_path"]):
+        discard_upload(saved)
+        return False
+    backend.put(saved["file_path"], saved["temp_path"])
+    return True
+
+
+def check_blob_deletions(
+    db: sqlite3.Connection, file_paths: Iterable[str], since: float
+) -> None:
+    """since(store_blob을 시작한 시각) 이후에 끝났거나 진행 중인 삭제가 있으면 BlobDeletedError.
+
+    review_images INSERT와 같은 트랜잭션에서 호출한다.
     """
-    full_path: str = os.path.join(config.UPLOAD_DIR, file_path)
-    if os.path.exists(full_path):
-        os.remove(full_path)
+    paths = list(file_paths)
+    if not paths:
+        return
+    placeholders = ", ".join("?" * len(paths))
+    row = db.execute(
+        f"SELECT file_path FROM image_blob_deletions WHERE file_path IN ({placeholders}) "
+        "AND (finished_at IS NULL OR finished_at >= ?) LIMIT 1",
+        (*paths, since),
+    ).fetchone()
+    if row is not None:
+        raise BlobDeletedError(row[0])
+
+
+def _start_deletions(db: sqlite3.Connection, keys: list[str]) -> None:
+    """저장소 삭제 시작을 기록한다 (끝나면 _finish_deletions)."""
+    db.executemany(
+        "INSERT INTO image_blob_deletions (file_path, started_at, finished_at) "
+        "VALUES (?, ?, NULL) ON CONFLICT(file_path) DO UPDATE SET "
+        "started_at = excluded.started_at, finished_at = NULL",
+        [(key, time.time()) for key in keys],
+    )
+
+
+def _finish_deletions(db: sqlite3.Connection, keys: list[str]) -> None:
+    """저장소 삭제가 끝났음을 기록하고 보관 시간이 지난 기록을 지운다."""
+    now = time.time()
+    db.executemany(
+        "UPDATE image_blob_deletions SET finished_at = ? WHERE file_path = ?",
+        [(now, key) for key in keys],
+    )
+    db.execute(
+        "DELETE FROM image_blob_deletions WHERE COALESCE(finished_at, started_at) < ?",
+        (now - _DELETION_RETENTION,),
+    )
+
 
+def file_url(file_path: str) -> str:
+    """저장된 파일을 받아 갈 URL (로컬이면 /uploads/..., S3면 CDN/사전 서명 URL)."""
+    return get_backend().url(file_path)
 
-def delete_review_images(review_id: int) -> None:
+
+def url_refresh_interval() -> Optional[int]:
+    """만료되는 파일 URL(S3 사전 서명)을 새로 발급해야 하는 주기(초).
+
+    유효 시간의 절반이라, 한 주기 안에서 만든 응답의 URL은 주기가 끝난 뒤에도
+    그만큼 더 유효하다. URL이 만료되지 않으면 None.
     """
-    리뷰에 속한 모든 이미지 디렉토리를 삭제한다.
-    디렉토리가 존재하지 않으면 무시한다.
+    expires = get_backend().url_expires
+    if expires is None:
+        return None
+    return max(1, expires // 2)
+
+
+def url_epoch() -> Optional[datetime]:
+    """현재 URL 발급 주기의 시작 시각 (URL이 만료되지 않으면 None).
+
+    ETag/Last-Modified와 응답 캐시 키에 넣어, 주기가 바뀌면 304나 캐시된 본문 대신
+    새 URL로 응답을 다시 만들게 한다.
     """
-    review_dir: str = os.path.join(config.UPLOAD_DIR, f"review_{review_id}")
-    if os.path.exists(review_dir):
-        shutil.rmtree(review_dir)
+    interval = url_refresh_interval()
+    if interval is None:
+        return None
+    start = int(time.time()) // interval * interval
+    return datetime.fromtimestamp(start, tz=timezone.utc)
+
+
+def discard_upload(saved: dict) -> None:
+    """배치되지 않은 업로드 임시 파일을 지운다."""
+    if os.path.exists(saved["temp_path"]):
+        os.remove(saved["temp_path"])
+
+
+def remove_files(file_path: str) -> None:
+    """blob 파일과 그 변형 파일을 저장소에서 지운다 (참조 여부는 확인하지 않음)."""
+    backend = get_backend()
+    stem, _ = os.path.splitext(file_path)
+    for key in [file_path, *(key for key, _ in backend.list(f"{stem}_"))]:
+        backend.delete(key)
+
+
+def _claim_unreferenced(db: sqlite3.Connection, file_paths: list[str]) -> list[str]:
+    """참조가 없는 blob 행을 지우고 삭제 시작을 기록한다 (쓰기 스레드 작업).
+
+    blob 행이 이미 없는 경로(먼저 정리됨)도 그 뒤에 생긴 변형 파일을 지우기 위해 고른다.
+    """
+    claimed: list[str] = []
+    for file_path in file_paths:
+        blob = db.execute(
+            "SELECT ref_count FROM image_blobs WHERE file_path = ?", (file_path,)
+        ).fetchone()
+        if blob is not None and blob[0] > 0:
+            continue
+        db.execute("DELETE FROM image_blobs WHERE file_path = ?", (file_path,))
+        claimed.append(file_path)
+    _start_deletions(db, claimed)
+    return claimed
+
+
+def _claim_orphans(db: sqlite3.Connection, keys: list[str]) -> list[str]:
+    """아직 어떤 blob에도 속하지 않는 키만 골라 삭제 시작을 기록한다 (쓰기 스레드 작업)."""
+    claimed: list[str] = []
+    for key in keys:
+        prefix = key.rsplit("_", 1)[0] + "."
+        known = db.execute(
+            "SELECT 1 FROM image_blobs WHERE file_path = ? OR substr(file_path, 1, ?) = ?",
+            (key, len(prefix), prefix),
+        ).fetchone()
+        if known is None:
+            claimed.append(key)
+    _start_deletions(db, claimed)
+    return claimed
+
+
+def _delete_from_storage(
+    claim: Callable[[sqlite3.Connection, list[str]], list[str]],
+    keys: list[str],
+    delete: Callable[[str], None],
+) -> int:
+    """claim(쓰기 스레드 작업)이 고른 키를 커밋 후 DB 잠금 없이 저장소에서 지운다."""
+    removed = 0
+    for start in range(0, len(keys), _RELEASE_BATCH_SIZE):
+        claimed = run_write_sync(claim, keys[start:start + _RELEASE_BATCH_SIZE])
+        if not claimed:
+            continue
+        try:
+            for key in claimed:
+                delete(key)
+        finally:
+            run_write_sync(_finish_deletions, claimed)
+        removed += len(claimed)
+    return removed
+
+
+def unlink_unreferenced(file_paths: list[str]) -> int:
+    """참조가 없는 blob(변형 포함)을 지우고 지운 수를 반환한다.
+
+    참조 확인은 쓰기 스레드 작업으로 하고 저장소 삭제는 그 커밋 뒤에 하므로, 그 사이
+    같은 경로를 배치한 업로드는 삭제 기록을 보고 등록하지 않는다 (check_blob_deletions).
+    """
+    return _delete_from_storage(_claim_unreferenced, file_paths, remove_files)
+
+
+_cleanup_lock = threading.Lock()
+_cleanup: Optional[ThreadPoolExecutor] = None
+
+
+def _cleanup_executor() -> ThreadPoolExecutor:
+    global _cleanup
+    with _cleanup_lock:
+        if _cleanup is None:
+            _cleanup = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-cleanup")
+        return _cleanup
+
+
+def _release_in_background(paths: list[str]) -> None:
+    try:
+        unlink_unreferenced(paths)
+    except Exception:
+        # 남은 파일은 collect_garbage()가 정리
+        logger.exception("이미지 파일 일괄 정리 실패 (%d개)", len(paths))
+
+
+def release_images(db: sqlite3.Connection, file_paths: Iterable[str]) -> None:
+    """review_images 삭제 후 호출한다. 커밋되면 마지막 참조가 사라진 파일만 지운다.
+
+    파일 정리(unlink_unreferenced)는 백그라운드 스레드에 넘긴다. 커밋 후 콜백은
+    쓰기 스레드에서 실행되므로 그 안에서 저장소 I/O를 하면 다른 쓰기가 모두 기다린다.
+    """
+    paths = list(dict.fromkeys(file_paths))
+    if not paths:
+        return
+    after_commit(db, lambda: _cleanup_executor().submit(_release_in_background, paths))
+
+
+def wait_for_cleanup() -> None:
+    """지금까지 넘긴 백그라운드 파일 정리가 끝날 때까지 기다린다."""
+    _cleanup_executor().submit(lambda: None).result()
+
+
+def shutdown(wait: bool = True) -> None:
+    global _cleanup
+    with _cleanup_lock:
+        executor, _cleanup = _cleanup, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+def delete_image(db: sqlite3.Connection, file_path: str) -> None:
+    """
+    이미지 파일 참조 하나를 해제한다.
+    다른 리뷰가 같은 파일을 쓰고 있으면 파일은 남는다.
+    """
+    release_images(db, [file_path])
+
+
+def delete_review_images(db: sqlite3.Connection, review_id: int) -> None:
+    """
+    리뷰에 속한 모든 이미지 파일 참조를 해제한다.
+    리뷰(또는 이미지 레코드)를 삭제하기 전에 호출해야 경로를 알 수 있다.
+    """
+    rows = db.execute(
+        "SELECT file_path FROM review_images WHERE review_id = ?", (review_id,)
+    ).fetchall()
+    release_images(db, (row["file_path"] for row in rows))
+
+
+def _recount_blobs(db: sqlite3.Connection) -> tuple[int, list[str]]:
+    """ref_count를 review_images로 다시 계산하고 (보정 수, 참조 없는 경로)를 반환한다."""
+    db.execute(
+        "INSERT INTO image_blobs (file_path, file_size, ref_count) "
+        "SELECT file_path, MAX(COALESCE(file_size, 0)), 0 FROM review_images "
+        "WHERE true GROUP BY file_path "
+        "ON CONFLICT(file_path) DO NOTHING"
+    )
+    recounted = db.execute(
+        "UPDATE image_blobs SET ref_count = actual.cnt FROM ("
+        "  SELECT b.file_path, COUNT(ri.id) AS cnt FROM image_blobs b "
+        "  LEFT JOIN review_images ri ON ri.file_path = b.file_path "
+        "  GROUP BY b.file_path"
+        ") AS actual "
+        "WHERE image_blobs.file_path = actual.file_path "
+        "AND image_blobs.ref_count != actual.cnt"
+    ).rowcount
+    unreferenced = [
+        row[0] for row in db.execute("SELECT file_path FROM image_blobs WHERE ref_count <= 0")
+    ]
+    return recounted, unreferenced
+
+
+def collect_garbage(
+    db: sqlite3.Connection, grace_seconds: int = 3600, dry_run: bool = False
+) -> dict[str, int]:
+    """image_blobs와 디스크를 review_images 기준으로 맞춘다.
+
+    - ref_count를 review_images로 다시 계산 (누락된 blob 행 추가)
+    - 참조가 없는 blob 행과 파일(변형 포함) 삭제
+    - 어떤 blob에도 속하지 않는 파일 중 grace_seconds보다 오래된 것 삭제
+      (처리 중인 업로드의 임시 파일을 건드리지 않기 위한 유예)
+    - 파일이 없는 blob은 missing으로 집계 (삭제하지 않음)
+
+    DB 변경은 쓰기 스레드 작업(run_write_sync)으로 하고 저장소 목록 조회와 삭제는
+    그 밖에서 하므로, 정리하는 동안에도 앱의 쓰기가 잠금을 기다리지 않는다.
+    """
+    stats = {"recounted": 0, "unreferenced": 0, "orphan_files": 0, "missing": 0}
+    if db.in_transaction:
+        db.commit()
+
+    if dry_run:
+        # 같은 보정을 롤백할 트랜잭션에서 실행해 집계만 한다 (저장소 I/O 전에 롤백)
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            stats["recounted"], unreferenced = _recount_blobs(db)
+        finally:
+            db.rollback()
+    else:
+        stats["recounted"], unreferenced = run_write_sync(_recount_blobs)
+        unlink_unreferenced(unreferenced)
+    stats["unreferenced"] = len(unreferenced)
+
+    # blob 원본과 그 변형(<stem>_*)만 남긴다
+    known = {
+        row[0] for row in db.execute(
+            "SELECT file_path FROM image_blobs UNION SELECT file_path FROM review_images"
+        )
+    } - set(unreferenced)
+    stems = {os.path.splitext(path)[0] for path in known}
+    cutoff = time.time() - grace_seconds
+    stored: set[str] = set()
+    orphans: list[str] = []
+    for key, modified in list(get_backend().list()):
+        if key.startswith(f"{INCOMING_DIR}/"):
+            continue
+        stored.add(key)
+        if key in known or key.rsplit("_", 1)[0] in stems or modified > cutoff:
+            continue
+        orphans.append(key)
+    stats["orphan_files"] = len(orphans)
+    stats["missing"] = len(known - stored)
+    if not dry_run:
+        _delete_from_storage(_claim_orphans, orphans, get_backend().delete)
+
+    # 중단된 업로드의 로컬 임시 파일
+    incoming_dir = os.path.join(config.UPLOAD_DIR, INCOMING_DIR)
+    for directory, _, names in os.walk(incoming_dir):
+        for name in names:
+            full_path = os.path.join(directory, name)
+            if os.path.getmtime(full_path) > cutoff:
+                continue
+            stats["orphan_files"] += 1
+            if not dry_run:
+                os.remove(full_path)
+    return stats
@@ -0,0 +1,246 @@
+"""업로드 파일 저장 백엔드 (로컬 파일시스템 / S3 호환).
+
+storage.py와 image_variants.py는 파일을 키(``blobs/ab/cd/<해시>.jpg`` 같은
+UPLOAD_DIR 기준 상대경로)로만 다루고, 실제 저장은 STORAGE_BACKEND로 고른 백엔드가 한다.
+
+- ``local``: UPLOAD_DIR 아래 파일. ``/uploads`` 경로로 앱이 직접 서빙한다.
+- ``s3``: S3 호환 오브젝트 스토리지(AWS S3, Cloudflare R2, MinIO). 위젯은
+  S3_PUBLIC_BASE_URL(CDN) 또는 사전 서명 URL로 직접 받아 가므로 이미지 바이트가
+  파이썬 프로세스를 거치지 않는다. boto3가 필요하다 (선택 의존성).
+
+업로드/변형 생성 중의 임시 파일은 백엔드와 관계없이 로컬 UPLOAD_DIR에 둔다.
+"""
+
+import mimetypes
+import os
+import shutil
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Iterator, Optional
+from urllib.parse import quote
+
+from app import config
+
+# 내용 주소 기반이라 같은 키의 내용은 바뀌지 않는다
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class StorageBackend(ABC):
+    """업로드 파일 저장소 인터페이스."""
+
+    @abstractmethod
+    def put(self, key: str, source_path: str) -> None:
+        """로컬 파일을 키로 저장한다. source_path는 옮겨지거나 삭제된다."""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """키를 삭제한다. 없으면 무시한다."""
+
+    @abstractmethod
+    def list(self, prefix: str = "") -> Iterator[tuple[str, float]]:
+        """prefix로 시작하는 (키, 수정 시각 epoch) 목록."""
+
+    @abstractmethod
+    def local_copy(self, key: str):
+        """키의 내용을 읽을 수 있는 로컬 파일 경로를 주는 컨텍스트 매니저."""
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        """위젯/관리자 화면이 파일을 받아 갈 URL."""
+
+    @property
+    def url_expires(self) -> Optional[int]:
+        """url()이 발급한 URL의 유효 시간(초). 만료되지 않으면 None."""
+        return None
+
+    def get(self, key: str) -> bytes:
+        with self.local_copy(key) as path:
+            with open(path, "rb") as f:
+                return f.read()
+
+
+class LocalStorage(StorageBackend):
+    """UPLOAD_DIR 아래 파일로 저장한다."""
+
+    def __init__(self, root: str, base_url: str = "/uploads") -> None:
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def put(self, key: str, source_path: str) -> None:
+        full_path = self.path(key)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        os.replace(source_path, full_path)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def delete(self, key: str) -> None:
+        full_path = self.path(key)
+        if os.path.exists(full_path):
+            os.remove(full_path)
+
+    def list(self, prefix: str = "") -> Iterator[tuple[str, float]]:
+        directory = prefix.rpartition("/")[0]
+        start = os.path.join(self.root, directory)
+        for current, _, names in os.walk(start):
+            for name in names:
+                full_path = os.path.join(current, name)
+                key = os.path.relpath(full_path, self.root).replace(os.sep, "/")
+                if key.startswith(prefix):
+                    yield key, os.path.getmtime(full_path)
+
+    @contextmanager
+    def local_copy(self, key: str) -> Iterator[str]:
+        yield self.path(key)
+
+    def url(self, key: str) -> str:
+        return f"{self.base_url}/{quote(key)}"
+
+
+class S3Storage(StorageBackend):
+    """S3 호환 오브젝트 스토리지.
+
+    ``client``는 boto3 S3 클라이언트와 같은 메서드(upload_file, download_file,
+    delete_object, list_objects_v2, generate_presigned_url)를 가진 객체면 된다.
+    public_base_url이 있으면 CDN URL을, 없으면 사전 서명 URL을 반환한다.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        bucket: str,
+        prefix: str = "",
+        public_base_url: str = "",
+        presign_expires: int = 86400,
+    ) -> None:
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.public_base_url = public_base_url.rstrip("/")
+        self.presign_expires = presign_expires
+
+    @property
+    def url_expires(self) -> Optional[int]:
+        return None if self.public_base_url else self.presign_expires
+
+    def _object_key(self, key: str) -> str:
+        return self.prefix + key
+
+    def put(self, key: str, source_path: str) -> None:
+        content_type = mimetypes.guess_type(key)[0] or "application/octet-stream"
+        self.client.upload_file(
+            Filename=source_path,
+            Bucket=self.bucket,
+            Key=self._object_key(key),
+            ExtraArgs={
+                "ContentType": content_type,
+                "CacheControl": IMMUTABLE_CACHE_CONTROL,
+            },
+        )
+        os.remove(source_path)
+
+    def exists(self, key: str) -> bool:
+        object_key = self._object_key(key)
+        response = self.client.list_objects_v2(
+            Bucket=self.bucket, Prefix=object_key, MaxKeys=1
+        )
+        return any(item["Key"] == object_key for item in response.get("Contents", []))
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+    def list(self, prefix: str = "") -> Iterator[tuple[str, float]]:
+        params = {"Bucket": self.bucket, "Prefix": self._object_key(prefix)}
+        while True:
+            response = self.client.list_objects_v2(**params)
+            for item in response.get("Contents", []):
+                modified = item["LastModified"]
+                if isinstance(modified, datetime):
+                    modified = modified.timestamp()
+                yield item["Key"][len(self.prefix):], float(modified)
+            if not response.get("IsTruncated"):
+                return
+            params["ContinuationToken"] = response["NextContinuationToken"]
+
+    @contextmanager
+    def local_copy(self, key: str) -> Iterator[str]:
+        scratch = os.path.join(config.UPLOAD_DIR, ".incoming")
+        os.makedirs(scratch, exist_ok=True)
+        directory = tempfile.mkdtemp(dir=scratch)
+        path = os.path.join(directory, os.path.basename(key))
+        try:
+            self.client.download_file(
+                Bucket=self.bucket, Key=self._object_key(key), Filename=path
+            )
+            yield path
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def url(self, key: str) -> str:
+        if self.public_base_url:
+            return f"{self.public_base_url}/{quote(self._object_key(key))}"
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": self._object_key(key)},
+            ExpiresIn=self.presign_expires,
+        )
+
+
+def _create_s3_client() -> Any:
+    try:
+        import boto3
+    except ImportError as exc:  # pragma: no cover - 선택 의존성
+        raise RuntimeError(
+            "STORAGE_BACKEND=s3에는 boto3가 필요합니다. (pip install boto3)"
+        ) from exc
+    return boto3.client(
+        "s3",
+        endpoint_url=config.S3_ENDPOINT_URL or None,
+        region_name=config.S3_REGION or None,
+    )
+
+
+def create_backend() -> StorageBackend:
+    """설정(STORAGE_BACKEND)에 맞는 백엔드를 만든다."""
+    if config.STORAGE_BACKEND == "local":
+        return LocalStorage(config.UPLOAD_DIR)
+    if config.STORAGE_BACKEND == "s3":
+        if not config.S3_BUCKET:
+            raise RuntimeError("STORAGE_BACKEND=s3에는 S3_BUCKET 설정이 필요합니다.")
+        return S3Storage(
+            _create_s3_client(),
+            config.S3_BUCKET,
+            prefix=config.S3_PREFIX,
+            public_base_url=config.S3_PUBLIC_BASE_URL,
+            presign_expires=config.S3_PRESIGN_EXPIRES,
+        )
+    raise RuntimeError(f"알 수 없는 STORAGE_BACKEND: {config.STORAGE_BACKEND}")
+
+
+_backend: Optional[StorageBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> StorageBackend:
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_backend()
+        return _backend
+
+
+def set_backend(backend: Optional[StorageBackend]) -> None:
+    """사용할 백엔드를 바꾼다 (None이면 다음 호출 시 설정으로 다시 생성)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
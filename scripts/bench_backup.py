@@ -0,0 +1,218 @@
+"""백업 복원/스트리밍 벤치마크 (기본 100만 건 리뷰).
+
+임시 디렉토리에 NDJSON 백업 픽스처(리뷰 3건 중 1건에 이미지 1~2장)를 만든 뒤
+
+1. restore_backup()으로 빈 DB에 일괄 복원하는 시간
+2. /api/admin/backup 응답 생성기(NDJSON, JSON)로 전체를 내보내는 시간과
+   그동안의 RSS 증가량 (메모리가 건수와 무관하게 일정한지 확인)
+3. --compare를 주면 예전 방식(행마다 INSERT, 인덱스/트리거 유지)의 복원 시간
+4. 온라인 스냅샷(app.utils.snapshots) 소요 시간과, 그동안 다른 연결에서 계속한
+   쓰기 트랜잭션의 지연 (스냅샷이 쓰기를 막지 않는지 확인)
+
+을 출력한다. 실제 DB/업로드 디렉토리는 건드리지 않는다.
+
+사용법:
+    python scripts/bench_backup.py                     # 100만 건
+    python scripts/bench_backup.py --reviews 200000 --compare
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_workdir = tempfile.mkdtemp(prefix="bench_backup_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_workdir}/bench.db"
+os.environ["UPLOAD_DIR"] = os.path.join(_workdir, "uploads")
+os.environ["BACKUP_DIR"] = os.path.join(_workdir, "backups")
+
+from app.database import get_connection, get_db, init_db  # noqa: E402
+from app.migrations import migrate  # noqa: E402
+from app.routers.backup import _stream_backup  # noqa: E402
+from app.utils import snapshots  # noqa: E402
+from app.utils.backup import read_backup, restore_backup  # noqa: E402
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _write_fixture(path: str, review_count: int) -> int:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"type": "meta", "total_reviews": review_count}) + "\n")
+        for i in range(1, review_count + 1):
+            # 3건 중 1건이 포토 리뷰 (이미지 1~2장)
+            images = [
+                {
+                    "file_path": f"blobs/{i % 256:02x}/{n:02x}/{i:08d}{n}.jpg",
+                    "original_name": f"IMG_{i}_{n}.jpg",
+                    "file_size": 200_000 + n,
+                    "created_at": "2026-03-01 12:00:00",
+                }
+                for n in range(1 + i % 2)
+            ] if i % 3 == 0 else []
+            f.write(json.dumps({
+                "type": "review",
+                "id": i,
+                "product_no": f"BENCH{i % 500}",
+                "product_name": f"벤치마크 상품 {i % 500}",
+                "author": f"스태프{i % 97}",
+                "rating": i % 5 + 1,
+                "title": f"리뷰 {i}",
+                "content": "사이즈가 딱 맞고 재질이 좋아요. 배송도 빨랐습니다.",
+                "is_visible": i % 10 != 0,
+                "display_order": i % 7,
+                "created_at": f"2026-{i % 12 + 1:02d}-{i % 28 + 1:02d} 10:00:00",
+                "updated_at": "2026-03-01 12:00:00",
+                "images": images,
+            }, ensure_ascii=False) + "\n")
+        size = f.tell()
+    return size
+
+
+def _rss() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        return 0
+
+
+def _export(fmt: str) -> tuple[float, int, int]:
+    """응답 생성기를 끝까지 읽으며 (초, 바이트, RSS 최대 증가량)을 잰다."""
+    baseline = _rss()
+    peak = baseline
+    done = threading.Event()
+
+    def sample() -> None:
+        nonlocal peak
+        while not done.wait(0.05):
+            peak = max(peak, _rss())
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    started = time.perf_counter()
+    total = 0
+    for chunk in _stream_backup(fmt):
+        total += len(chunk)
+    elapsed = time.perf_counter() - started
+    done.set()
+    sampler.join()
+    return elapsed, total, max(0, peak - baseline)
+
+
+def _restore_row_by_row(path: str) -> float:
+    """예전 seed 복원 방식: 인덱스/트리거를 둔 채 행마다 INSERT."""
+    import sqlite3
+
+    conn = sqlite3.connect(os.path.join(_workdir, "legacy.db"))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    migrate(conn)
+    started = time.perf_counter()
+    for kind, r in read_backup(path):
+        if kind != "review":
+            continue
+        review_id = conn.execute(
+            "INSERT INTO reviews "
+            "(product_no, product_name, author, rating, title, content, "
+            " is_visible, display_order, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                r["product_no"], r["product_name"], r["author"], r["rating"],
+                r["title"], r["content"], 1 if r["is_visible"] else 0,
+                r["display_order"], r["created_at"], r["updated_at"],
+            ),
+        ).lastrowid
+        for image in r["images"]:
+            conn.execute(
+                "INSERT INTO review_images (review_id, file_path, original_name, file_size) "
+                "VALUES (?, ?, ?, ?)",
+                (review_id, image["file_path"], image["original_name"], image["file_size"]),
+            )
+    conn.commit()
+    conn.close()
+    return time.perf_counter() - started
+
+
+def _snapshot_under_writes() -> tuple[dict, list[float]]:
+    """쓰기를 계속하는 동안 스냅샷을 만들고 (메타데이터, 쓰기 지연 목록(초))을 반환한다."""
+    done = threading.Event()
+    latencies: list[float] = []
+
+    def write() -> None:
+        conn = get_connection()
+        try:
+            while not done.is_set():
+                started = time.perf_counter()
+                conn.execute(
+                    "INSERT INTO reviews (product_no, author, rating, content) "
+                    "VALUES ('BENCH_WRITE', '쓰기', 5, '스냅샷 중 쓰기')"
+                )
+                conn.commit()
+                latencies.append(time.perf_counter() - started)
+                time.sleep(0.01)
+        finally:
+            conn.close()
+
+    writer = threading.Thread(target=write, daemon=True)
+    writer.start()
+    try:
+        meta = snapshots.create_snapshot("bench")
+    finally:
+        done.set()
+        writer.join()
+    return meta, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="백업 복원/스트리밍 벤치마크")
+    parser.add_argument("--reviews", type=int, default=1_000_000, help="픽스처 리뷰 수 (기본 100만)")
+    parser.add_argument(
+        "--compare", action="store_true", help="예전 방식(행마다 INSERT) 복원 시간도 잰다"
+    )
+    args = parser.parse_args()
+
+    fixture = os.path.join(_workdir, "fixture.ndjson")
+    started = time.perf_counter()
+    size = _write_fixture(fixture, args.reviews)
+    print(f"픽스처: 리뷰 {args.reviews:,}건, {size / 1e6:,.1f}MB ({time.perf_counter() - started:.1f}s)")
+
+    init_db()
+    started = time.perf_counter()
+    with get_db() as db:
+        counts = restore_backup(db, read_backup(fixture))
+    print(
+        f"일괄 복원: {time.perf_counter() - started:6.1f}s  "
+        f"(리뷰 {counts['reviews']:,}, 이미지 {counts['images']:,}, 상품 {counts['products']:,})"
+    )
+
+    if args.compare:
+        print(f"행 단위 복원: {_restore_row_by_row(fixture):6.1f}s")
+
+    for fmt in ("ndjson", "json"):
+        elapsed, total, rss = _export(fmt)
+        print(
+            f"백업 {fmt:>6}: {elapsed:6.1f}s, {total / 1e6:,.1f}MB, "
+            f"RSS 증가 {rss / 1e6:,.1f}MB"
+        )
+
+    meta, latencies = _snapshot_under_writes()
+    latencies.sort()
+    print(
+        f"스냅샷: {meta['duration_ms'] / 1000:6.1f}s (복사 {meta['copy_ms'] / 1000:.1f}s, "
+        f"압축 {meta['compress_ms'] / 1000:.1f}s), {meta['db_size'] / 1e6:,.1f}MB → "
+        f"{meta['file_size'] / 1e6:,.1f}MB, {meta['steps']:,}단계"
+    )
+    if latencies:
+        print(
+            f"스냅샷 중 쓰기 {len(latencies):,}건: p50 {latencies[len(latencies) // 2] * 1000:.1f}ms, "
+            f"최대 {latencies[-1] * 1000:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
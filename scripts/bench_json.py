@@ -0,0 +1,123 @@
+"""JSON 직렬화 빠른 경로(FAST_JSON) 벤치마크.
+
+임시 DB에 리뷰·이미지(변형 포함)를 채운 뒤 위젯 API와 리뷰 목록 API를
+기존 경로(Pydantic 모델 + response_model 검증)와 FAST_JSON 경로로 번갈아 호출해
+요청당 시간을 비교하고, 두 경로의 응답 바이트가 같은지 확인한다.
+다르면 종료 코드 1로 끝난다. 실제 DB/업로드 디렉토리는 건드리지 않는다.
+
+사용법:
+    python scripts/bench_json.py                    # 50개 페이지, 200회 반복
+    python scripts/bench_json.py --per-page 20 --repeat 500
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 앱 임포트 전에 임시 DB와 캐시 비활성화 설정
+_workdir = tempfile.mkdtemp(prefix="bench_json_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_workdir}/bench.db"
+os.environ["UPLOAD_DIR"] = os.path.join(_workdir, "uploads")
+os.environ["WIDGET_CACHE_TTL"] = "0"
+os.environ["COMPRESSION_ENABLED"] = "0"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import config  # noqa: E402
+from app.database import get_db, init_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.utils import fast_json  # noqa: E402
+
+PRODUCT_NO = "BENCH"
+
+
+def _seed(review_count: int) -> None:
+    variants = [
+        {
+            "name": name,
+            "format": fmt,
+            "width": width,
+            "height": width * 3 // 4,
+            "file_path": f"blobs/be/nc/photo_{name}.{ext}",
+            "file_size": width * 40,
+        }
+        for name, width in (("lightbox", 1280), ("card", 480), ("thumb", 160))
+        for fmt, ext in (("webp", "webp"), ("jpeg", "jpg"))
+    ]
+    with get_db() as db:
+        for i in range(review_count):
+            review_id = db.execute(
+                "INSERT INTO reviews (product_no, product_name, author, rating, title, "
+                "content, is_visible, display_order) VALUES (?, ?, ?, ?, ?, ?, 1, 0)",
+                (
+                    PRODUCT_NO,
+                    "벤치마크 상품",
+                    f"스태프{i}",
+                    i % 5 + 1,
+                    f"리뷰 제목 {i}",
+                    "사이즈가 딱 맞고 재질이 좋아요. 배송도 빨랐습니다. " * 6,
+                ),
+            ).lastrowid
+            for n in range(i % 3):
+                db.execute(
+                    "INSERT INTO review_images (review_id, file_path, original_name, "
+                    "file_size, variant_status, variants) VALUES (?, ?, ?, ?, 'ready', ?)",
+                    (
+                        review_id,
+                        f"blobs/be/nc/{review_id:06d}{n}.jpg",
+                        f"IMG_{review_id}_{n}.jpg",
+                        250000,
+                        json.dumps(variants),
+                    ),
+                )
+
+
+def _measure(client: TestClient, url: str, fast: bool, repeat: int) -> tuple[float, bytes]:
+    config.FAST_JSON = fast
+    body = client.get(url).content
+    start = time.perf_counter()
+    for _ in range(repeat):
+        client.get(url)
+    return (time.perf_counter() - start) / repeat * 1000, body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FAST_JSON 직렬화 벤치마크")
+    parser.add_argument("--per-page", type=int, default=50, help="페이지당 리뷰 수 (기본 50)")
+    parser.add_argument("--repeat", type=int, default=200, help="경로별 반복 횟수 (기본 200)")
+    parser.add_argument("--reviews", type=int, default=200, help="생성할 리뷰 수 (기본 200)")
+    args = parser.parse_args()
+
+    init_db()
+    _seed(args.reviews)
+    client = TestClient(app)
+    urls = {
+        "widget": f"/api/widget/reviews/{PRODUCT_NO}?per_page={args.per_page}",
+        "list": f"/api/reviews?product_no={PRODUCT_NO}&per_page={args.per_page}",
+    }
+
+    serializer = "orjson" if fast_json.orjson is not None else "json (orjson 없음)"
+    print(f"직렬화: {serializer}, 페이지당 {args.per_page}개, {args.repeat}회 반복")
+    identical = True
+    for name, url in urls.items():
+        slow_ms, slow_body = _measure(client, url, False, args.repeat)
+        fast_ms, fast_body = _measure(client, url, True, args.repeat)
+        same = slow_body == fast_body
+        identical = identical and same
+        print(
+            f"{name:>6}: 기존 {slow_ms:7.2f}ms  FAST_JSON {fast_ms:7.2f}ms  "
+            f"({slow_ms / fast_ms:4.1f}배, {len(fast_body):,}B, "
+            f"{'동일' if same else '다름!'})"
+        )
+
+    if not identical:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
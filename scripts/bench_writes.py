@@ -0,0 +1,195 @@
+"""동시 쓰기 스트레스 테스트: 쓰기 스레드(그룹 커밋) vs 스레드별 직접 쓰기.
+
+임시 DB에 리뷰를 채운 뒤 여러 스레드가 동시에 리뷰 등록/노출 변경을 반복하면서
+
+1. direct: DB 작업 스레드 풀(DBExecutor)에서 작업마다 커밋 (DB_WRITER_ENABLED=0과 같은 방식)
+2. writer: 모든 쓰기를 DBWriter에 넘기고 Future로 커밋을 기다림
+
+두 방식의 처리량(ops/s), 지연(p50/p99/최대), 잠금 오류 수를 비교한다. --import-rows를
+주면 측정하는 동안 엑셀 등록처럼 1000행씩 청크로 커밋하는 쓰기를 함께 돌린다
+(direct는 전용 연결, writer는 청크를 쓰기 스레드 작업으로 넘김).
+실제 DB는 건드리지 않는다.
+
+사용법:
+    python scripts/bench_writes.py
+    python scripts/bench_writes.py --threads 32 --ops 200 --import-rows 50000
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_workdir = tempfile.mkdtemp(prefix="bench_writes_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_workdir}/bench.db"
+os.environ["UPLOAD_DIR"] = os.path.join(_workdir, "uploads")
+
+from app import config  # noqa: E402
+from app.database import DBExecutor, DBWriter, get_connection, get_db, init_db  # noqa: E402
+
+_IMPORT_CHUNK = 1000
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def _seed(count: int) -> None:
+    with get_db() as db:
+        db.executemany(
+            "INSERT INTO reviews (product_no, author, rating, content) VALUES (?, ?, ?, ?)",
+            [(f"WRITE{i % 50}", f"작성자{i}", i % 5 + 1, "스트레스 테스트 리뷰") for i in range(count)],
+        )
+
+
+def _write_op(db: sqlite3.Connection, n: int, review_count: int) -> None:
+    """API 쓰기 한 건에 해당하는 작업 (등록 또는 노출 변경, 트리거 포함)."""
+    if n % 2:
+        db.execute(
+            "INSERT INTO reviews (product_no, author, rating, content) VALUES (?, ?, ?, ?)",
+            (f"WRITE{n % 50}", "부하", n % 5 + 1, "동시 쓰기"),
+        )
+    else:
+        db.execute(
+            "UPDATE reviews SET is_visible = 1 - is_visible, updated_at = CURRENT_TIMESTAMP "
+            "WHERE id = ?",
+            (n % review_count + 1,),
+        )
+
+
+def _import_chunk(db: sqlite3.Connection, start: int, end: int) -> None:
+    db.executemany(
+        "INSERT INTO reviews (product_no, author, rating, content) VALUES (?, ?, ?, ?)",
+        [(f"IMPORT{i % 20}", "엑셀", 5, "일괄 등록 리뷰") for i in range(start, end)],
+    )
+
+
+def _bulk_import(
+    rows: int, writer: Optional[DBWriter], stop: threading.Event, committed: list[float]
+) -> None:
+    """엑셀 등록처럼 청크마다 커밋하는 쓰기."""
+    conn = get_connection()
+    try:
+        for start in range(0, rows, _IMPORT_CHUNK):
+            if stop.is_set():
+                break
+            end = min(rows, start + _IMPORT_CHUNK)
+            if writer is not None:
+                writer.submit(_import_chunk, start, end).result()
+            else:
+                _import_chunk(conn, start, end)
+                conn.commit()
+            committed.append(time.perf_counter())
+    finally:
+        conn.close()
+
+
+def _run(mode: str, args: argparse.Namespace) -> dict:
+    writer: Optional[DBWriter] = None
+    executor: Optional[DBExecutor] = None
+    if mode == "writer":
+        writer = DBWriter(max_batch=args.max_batch, max_delay=args.max_delay_ms / 1000)
+    else:
+        executor = DBExecutor(workers=config.DB_POOL_SIZE)
+    latencies: list[float] = []
+    errors: list[str] = []
+    lock = threading.Lock()
+
+    def worker(index: int) -> None:
+        local: list[float] = []
+        for i in range(args.ops):
+            n = index * args.ops + i
+            started = time.perf_counter()
+            try:
+                if writer is not None:
+                    writer.submit(_write_op, n, args.reviews).result()
+                else:
+                    executor.submit(_write_op, n, args.reviews).result()
+            except sqlite3.OperationalError as exc:
+                with lock:
+                    errors.append(str(exc))
+                continue
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+
+    stop = threading.Event()
+    chunks: list[float] = []
+    importer = None
+    if args.import_rows:
+        importer = threading.Thread(
+            target=_bulk_import, args=(args.import_rows, writer, stop, chunks)
+        )
+        importer.start()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    if importer is not None:
+        importer.join()
+
+    result = {
+        "mode": mode,
+        "ops": len(latencies),
+        "errors": len(errors),
+        "ops_per_sec": len(latencies) / elapsed,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "max_ms": max(latencies, default=0.0) * 1000,
+        "import_chunks": len([t for t in chunks if t <= started + elapsed]),
+    }
+    if writer is not None:
+        writer.shutdown()
+        result["writer"] = writer.stats()
+    else:
+        executor.shutdown()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 쓰기 스트레스 테스트 (쓰기 스레드 vs 직접 쓰기)")
+    parser.add_argument("--threads", type=int, default=16, help="동시에 쓰는 스레드 수 (기본 16)")
+    parser.add_argument("--ops", type=int, default=200, help="스레드당 쓰기 수 (기본 200)")
+    parser.add_argument("--reviews", type=int, default=20_000, help="미리 채울 리뷰 수 (기본 2만)")
+    parser.add_argument("--import-rows", type=int, default=0, help="측정 중 함께 돌릴 일괄 등록 행 수 (기본 0)")
+    parser.add_argument("--max-batch", type=int, default=64, help="그룹 커밋 작업 수 상한 (기본 64)")
+    parser.add_argument("--max-delay-ms", type=float, default=0, help="그룹 커밋 대기 시간 (기본 0)")
+    args = parser.parse_args()
+
+    init_db()
+    _seed(args.reviews)
+    print(f"작업 디렉토리: {_workdir}")
+    print(f"스레드 {args.threads} x {args.ops}건, 일괄 등록 {args.import_rows}행 동시 진행\n")
+
+    for mode in ("direct", "writer"):
+        r = _run(mode, args)
+        print(
+            f"[{r['mode']:6}] {r['ops']}건 {r['ops_per_sec']:8.0f} ops/s  "
+            f"p50 {r['p50_ms']:6.1f}ms  p99 {r['p99_ms']:7.1f}ms  최대 {r['max_ms']:7.1f}ms  "
+            f"잠금 오류 {r['errors']}건  (측정 중 등록 청크 {r['import_chunks']}개)"
+        )
+        if "writer" in r:
+            w = r["writer"]
+            print(
+                f"          커밋 {w['batches']}회, 평균 {w['avg_batch_size']}건/커밋 (최대 {w['max_batch_size']}), "
+                f"커밋 평균 {w['avg_commit_ms']}ms, 잠금 대기 최대 {w['max_lock_wait_ms']}ms, "
+                f"대기열 최대 {w['max_queued']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
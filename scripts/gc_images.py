@@ -0,0 +1,52 @@
+"""업로드 이미지 저장소 정리(GC) 스크립트.
+
+image_blobs 참조 카운트를 review_images 기준으로 다시 계산하고, 참조가 없는 blob과
+어떤 blob에도 속하지 않는 파일(중단된 업로드, 예전 경로의 고아 파일 등)을 지운다.
+DATABASE_URL / UPLOAD_DIR 환경변수가 가리키는 DB와 업로드 디렉토리를 대상으로 한다.
+
+사용법:
+    python scripts/gc_images.py                # 정리
+    python scripts/gc_images.py --dry-run      # 지울 대상만 집계
+    python scripts/gc_images.py --grace 600    # 10분보다 오래된 고아 파일만 삭제
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import get_db, init_db  # noqa: E402
+from app.utils.storage import collect_garbage  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="업로드 이미지 저장소 정리",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="삭제하지 않고 대상만 집계"
+    )
+    parser.add_argument(
+        "--grace",
+        type=int,
+        default=3600,
+        help="이 시간(초)보다 최근에 만들어진 고아 파일은 건너뜀 (기본 3600)",
+    )
+    args = parser.parse_args()
+
+    init_db()
+    with get_db() as db:
+        stats = collect_garbage(db, grace_seconds=args.grace, dry_run=args.dry_run)
+
+    label = "정리 예정" if args.dry_run else "정리 완료"
+    print(
+        f"{label}: 참조 카운트 보정 {stats['recounted']}개, "
+        f"참조 없는 blob {stats['unreferenced']}개, "
+        f"고아 파일 {stats['orphan_files']}개, "
+        f"파일 없는 blob {stats['missing']}개"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""업로드 이미지의 썸네일/반응형 변형을 일괄 생성하는 스크립트.
+
+변형 기능 도입 이전에 업로드된 이미지(variant_status='pending')나 생성에 실패한
+이미지를 대상으로 한다. DATABASE_URL / UPLOAD_DIR 환경변수가 가리키는 DB와
+업로드 디렉토리를 사용하며, IMAGE_VARIANT_WORKERS 개의 프로세스로 생성한다.
+
+사용법:
+    python scripts/generate_variants.py           # pending 이미지만
+    python scripts/generate_variants.py --retry   # failed 이미지도 다시 시도
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import get_db, init_db  # noqa: E402
+from app.utils import image_variants  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="업로드 이미지 변형 일괄 생성",
+    )
+    parser.add_argument(
+        "--retry", action="store_true", help="생성에 실패한(failed) 이미지도 다시 시도"
+    )
+    args = parser.parse_args()
+
+    statuses = [image_variants.PENDING]
+    if args.retry:
+        statuses.append(image_variants.FAILED)
+
+    init_db()
+    with get_db() as db:
+        image_ids = [
+            row["id"]
+            for row in db.execute(
+                "SELECT id FROM review_images WHERE variant_status IN "
+                f"({', '.join('?' * len(statuses))}) ORDER BY id",
+                statuses,
+            )
+        ]
+
+    counts: Counter = Counter()
+    try:
+        for future in image_variants.schedule(image_ids):
+            counts[future.result()] += 1
+    finally:
+        image_variants.shutdown()
+
+    summary = ", ".join(f"{status} {count}개" for status, count in sorted(counts.items()))
+    print(f"변형 생성 완료: {len(image_ids)}개 이미지 ({summary or '대상 없음'})")
+
+
+if __name__ == "__main__":
+    main()
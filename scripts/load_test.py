@@ -0,0 +1,192 @@
+"""읽기/쓰기 혼합 부하 테스트 (꼬리 지연 측정).
+
+동시 클라이언트 N개가 위젯 조회, 관리 목록 조회, 리뷰 등록, 노출 상태 변경을
+비율대로 섞어 보내고 요청 종류별 p50/p95/p99/최대 지연과 처리량, 503(과부하) 수를
+출력한다. 마지막에 /api/metrics의 DB 풀·DB 작업 스레드 지표를 함께 보여준다.
+
+--url을 주지 않으면 임시 DB로 앱을 프로세스 안에서 띄워(이벤트 루프 하나) 측정한다.
+핸들러가 이벤트 루프에서 sqlite3를 직접 호출하면 이 모드에서 읽기 지연이 쓰기에
+끌려 올라가므로 DB_EXECUTOR_WORKERS / DB_EXECUTOR_MAX_QUEUE 조정 효과를 보기 좋다.
+--url을 주면 실행 중인 서버에 HTTP로 보낸다 (해당 서버의 DB에 리뷰가 생성됨).
+
+사용법:
+    python scripts/load_test.py                              # 32 동시, 10초, 쓰기 20%
+    python scripts/load_test.py --concurrency 64 --duration 30 --write-ratio 0.5
+    python scripts/load_test.py --url http://localhost:8000 --duration 60
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+PRODUCTS = [f"LOAD{i}" for i in range(20)]
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _in_process_client() -> httpx.AsyncClient:
+    """임시 DB로 앱을 띄운 ASGI 클라이언트를 만든다."""
+    workdir = tempfile.mkdtemp(prefix="load_test_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/load.db"
+    os.environ["UPLOAD_DIR"] = os.path.join(workdir, "uploads")
+    os.environ["IMPORT_DIR"] = os.path.join(workdir, "imports")
+
+    from app.database import init_db
+    from app.main import app
+
+    init_db()
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url="http://load-test")
+
+
+async def _seed(client: httpx.AsyncClient, per_product: int) -> list[int]:
+    ids: list[int] = []
+    for product_no in PRODUCTS:
+        for i in range(per_product):
+            resp = await client.post("/api/reviews", json={
+                "product_no": product_no,
+                "product_name": f"부하 테스트 {product_no}",
+                "author": f"스태프{i}",
+                "rating": i % 5 + 1,
+                "title": f"리뷰 {i}",
+                "content": "사이즈가 잘 맞고 배송이 빨라요. " * 4,
+            })
+            resp.raise_for_status()
+            ids.append(resp.json()["id"])
+    return ids
+
+
+async def _operation(
+    client: httpx.AsyncClient, rng: random.Random, write_ratio: float, review_ids: list[int]
+) -> tuple[str, int]:
+    product_no = rng.choice(PRODUCTS)
+    if rng.random() < write_ratio:
+        if rng.random() < 0.5:
+            resp = await client.post("/api/reviews", json={
+                "product_no": product_no,
+                "author": "부하",
+                "rating": rng.randint(1, 5),
+                "content": "부하 테스트 리뷰",
+            })
+            if resp.status_code == 201:
+                review_ids.append(resp.json()["id"])
+            return "create", resp.status_code
+        resp = await client.patch(
+            f"/api/reviews/{rng.choice(review_ids)}/visibility",
+            json={"is_visible": rng.random() < 0.9},
+        )
+        return "visibility", resp.status_code
+    if rng.random() < 0.75:
+        resp = await client.get(
+            f"/api/widget/reviews/{product_no}",
+            params={"sort": rng.choice(["latest", "rating_high"]), "page": rng.randint(1, 3)},
+        )
+        return "widget", resp.status_code
+    resp = await client.get("/api/reviews", params={"product_no": product_no})
+    return "list", resp.status_code
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    seed: int,
+    deadline: float,
+    write_ratio: float,
+    review_ids: list[int],
+    latencies: dict[str, list[float]],
+    statuses: dict[str, dict[int, int]],
+) -> None:
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            name, status = await _operation(client, rng, write_ratio, review_ids)
+        except httpx.HTTPError:
+            name, status = "error", 0
+        latencies[name].append((time.perf_counter() - start) * 1000)
+        statuses[name][status] += 1
+
+
+async def _run(args: argparse.Namespace) -> None:
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=30)
+    else:
+        client = _in_process_client()
+
+    async with client:
+        review_ids = await _seed(client, args.seed_reviews)
+        latencies: dict[str, list[float]] = defaultdict(list)
+        statuses: dict[str, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            _worker(client, i, deadline, args.write_ratio, review_ids, latencies, statuses)
+            for i in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+        metrics: Optional[dict] = None
+        resp = await client.get("/api/metrics")
+        if resp.status_code == 200:
+            metrics = resp.json()
+
+    total = sum(len(v) for v in latencies.values())
+    print(
+        f"동시 {args.concurrency}, {elapsed:.1f}초, 쓰기 {args.write_ratio:.0%}: "
+        f"{total:,}건 ({total / elapsed:,.0f} req/s)"
+    )
+    print(f"{'요청':>10} {'건수':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'최대':>8}  상태")
+    for name in sorted(latencies):
+        values = latencies[name]
+        codes = ", ".join(f"{code}:{n}" for code, n in sorted(statuses[name].items()))
+        print(
+            f"{name:>10} {len(values):>7,} "
+            f"{_percentile(values, 50):7.1f}ms {_percentile(values, 95):7.1f}ms "
+            f"{_percentile(values, 99):7.1f}ms {max(values):7.1f}ms  {codes}"
+        )
+
+    if metrics:
+        pool = metrics["db_pool"]
+        executor = metrics.get("db_executor", {})
+        print(
+            f"DB 풀: 크기 {pool['max_size']}, 대기 {pool['waits']}회, 시간 초과 {pool['timeouts']}회"
+        )
+        if executor:
+            print(
+                f"DB 작업 스레드: {executor['workers']}개, 최대 대기 {executor['max_queued']}건, "
+                f"평균 대기 {executor['avg_wait_ms']}ms, 최대 대기 {executor['max_wait_ms']}ms, "
+                f"거절 {executor['rejected']}건"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="읽기/쓰기 혼합 부하 테스트")
+    parser.add_argument("--url", default="", help="대상 서버 주소 (없으면 프로세스 안에서 실행)")
+    parser.add_argument("--concurrency", type=int, default=32, help="동시 클라이언트 수 (기본 32)")
+    parser.add_argument("--duration", type=float, default=10, help="측정 시간(초, 기본 10)")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="쓰기 요청 비율 (기본 0.2)")
+    parser.add_argument(
+        "--seed-reviews", type=int, default=20, help="시작 전 상품당 생성할 리뷰 수 (기본 20)"
+    )
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""상품별 리뷰 요약 테이블(product_review_stats)을 재계산하는 스크립트.
+
+트리거로 유지되는 요약 값이 실제 리뷰와 어긋났을 때(수동 DB 수정 등) 복구용으로 사용한다.
+DATABASE_URL 환경변수가 가리키는 DB를 대상으로 한다.
+
+사용법:
+    python scripts/rebuild_stats.py              # 전체 상품 재계산
+    python scripts/rebuild_stats.py --product 27 # 특정 상품만 재계산
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import get_db, init_db  # noqa: E402
+from app.utils.review_stats import rebuild_product_stats  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="상품별 리뷰 요약 테이블 재계산",
+    )
+    parser.add_argument("--product", help="재계산할 상품번호 (생략 시 전체)")
+    args = parser.parse_args()
+
+    init_db()
+    with get_db() as db:
+        count = rebuild_product_stats(db, args.product)
+
+    print(f"요약 재계산 완료: {count}개 상품")
+
+
+if __name__ == "__main__":
+    main()
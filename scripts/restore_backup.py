@@ -0,0 +1,50 @@
+"""백업 파일(/api/admin/backup의 NDJSON/JSON, data/seed_backup.json)을 빈 DB에 복원하는 스크립트.
+
+DATABASE_URL 환경변수가 가리키는 DB를 대상으로 하며, 리뷰가 하나라도 있으면 중단한다.
+전체가 한 트랜잭션이라 도중에 실패하면 아무것도 등록되지 않는다.
+
+사용법:
+    python scripts/restore_backup.py reviews_backup_20260301_120000.ndjson
+    python scripts/restore_backup.py data/seed_backup.json --skip-missing-images
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import get_db, init_db  # noqa: E402
+from app.utils.backup import read_backup, restore_backup  # noqa: E402
+from app.utils.storage_backends import get_backend  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="백업 파일을 빈 DB에 일괄 복원")
+    parser.add_argument("path", help="백업 파일 경로 (.ndjson / .json)")
+    parser.add_argument(
+        "--skip-missing-images",
+        action="store_true",
+        help="저장소에 파일이 없는 이미지 행은 건너뜀",
+    )
+    args = parser.parse_args()
+
+    init_db()
+    image_exists = get_backend().exists if args.skip_missing_images else None
+    started = time.monotonic()
+    try:
+        with get_db() as db:
+            counts = restore_backup(db, read_backup(args.path), image_exists=image_exists)
+    except ValueError as exc:
+        sys.exit(str(exc))
+
+    print(
+        f"복원 완료: 리뷰 {counts['reviews']:,}개, 이미지 {counts['images']:,}개, "
+        f"상품 {counts['products']:,}개 (건너뛴 이미지 {counts['skipped_images']:,}개, "
+        f"{time.monotonic() - started:.1f}초)"
+    )
+
+
+if __name__ == "__main__":
+    main()
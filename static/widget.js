@@ -246,13 +246,10 @@
         html += '  <div class="srw-gallery-title">포토리뷰 <span>' + photoCount + '</span></div>';
         html += '  <div class="srw-gallery-strip">';
 
+        var photos = data.all_photos || [];
         for (var i = 0; i < photoUrls.length; i++) {
-            var fullUrl = SRW.serverUrl + '/uploads/' + photoUrls[i];
-            html += '    <img class="srw-gallery-thumb" '
-                + 'src="' + escapeAttr(fullUrl) + '" '
-                + 'alt="포토리뷰 이미지" '
-                + 'data-full-url="' + escapeAttr(fullUrl) + '" '
-                + 'loading="lazy">';
+            var photo = photos[i] || { file_path: photoUrls[i], variants: [] };
+            html += '    ' + renderResponsiveImage(photo, 'srw-gallery-thumb', '72px', '포토리뷰 이미지');
         }
 
         html += '  </div>';
@@ -260,6 +257,56 @@
         return html;
     }
 
+    // ── 반응형 이미지 (서버가 만든 WebP/JPEG 변형 srcset) ─────
+    function uploadUrl(file) {
+        // 서버가 준 url 사용 (S3/CDN이면 절대 URL, 로컬이면 /uploads/... 상대 경로)
+        var url = file.url || ('/uploads/' + file.file_path);
+        return /^https?:\/\//.test(url) ? url : SRW.serverUrl + url;
+    }
+
+    function variantSrcset(variants, format) {
+        var parts = [];
+        for (var i = 0; i < variants.length; i++) {
+            if (variants[i].format === format) {
+                parts.push(uploadUrl(variants[i]) + ' ' + variants[i].width + 'w');
+            }
+        }
+        return parts.join(', ');
+    }
+
+    function largestVariantUrl(image) {
+        // 라이트박스용: 가장 큰 JPEG 변형, 변형이 없으면 원본
+        var best = null;
+        var variants = image.variants || [];
+        for (var i = 0; i < variants.length; i++) {
+            if (variants[i].format === 'jpeg' && (!best || variants[i].width > best.width)) {
+                best = variants[i];
+            }
+        }
+        return uploadUrl(best || image);
+    }
+
+    function renderResponsiveImage(image, className, sizes, alt) {
+        var fullUrl = largestVariantUrl(image);
+        var img = '<img class="' + className + '" '
+            + 'src="' + escapeAttr(uploadUrl(image)) + '" ';
+        var webp = variantSrcset(image.variants || [], 'webp');
+        var jpeg = variantSrcset(image.variants || [], 'jpeg');
+        if (jpeg) {
+            img += 'srcset="' + escapeAttr(jpeg) + '" sizes="' + sizes + '" ';
+        }
+        img += 'alt="' + escapeAttr(alt) + '" '
+            + 'data-full-url="' + escapeAttr(fullUrl) + '" '
+            + 'loading="lazy" decoding="async">';
+        if (!webp) {
+            return img;
+        }
+        return '<picture>'
+            + '<source type="image/webp" srcset="' + escapeAttr(webp) + '" sizes="' + sizes + '">'
+            + img
+            + '</picture>';
+    }
+
     // ── 필터 바 (탭 + 정렬) ──────────────────────────────────
     function renderFilterBar(data) {
         var total = data.total_reviews || 0;
@@ -365,12 +412,7 @@
             html += '  <div class="srw-review-images">';
             for (var j = 0; j < review.images.length; j++) {
                 var img = review.images[j];
-                var imageUrl = SRW.serverUrl + '/uploads/' + img.file_path;
-                html += '    <img class="srw-thumbnail" '
-                    + 'src="' + escapeAttr(imageUrl) + '" '
-                    + 'alt="' + escapeAttr(img.original_name || '리뷰 이미지') + '" '
-                    + 'data-full-url="' + escapeAttr(imageUrl) + '" '
-                    + 'loading="lazy">';
+                html += '    ' + renderResponsiveImage(img, 'srw-thumbnail', '80px', img.original_name || '리뷰 이미지');
             }
             html += '  </div>';
         }
@@ -9,6 +9,9 @@ _test_db = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
 _test_db.close()
 os.environ["DATABASE_URL"] = f"sqlite:///{_test_db.name}"
 os.environ["UPLOAD_DIR"] = tempfile.mkdtemp()
+os.environ["IMPORT_DIR"] = tempfile.mkdtemp()
+os.environ["BACKUP_DIR"] = tempfile.mkdtemp()
+os.environ["IMAGE_VARIANT_WORKERS"] = "0"  # 변형 생성은 워커 스레드에서 직접
 
 from app.database import init_db  # noqa: E402
 from app.main import app  # noqa: E402
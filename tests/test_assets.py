@@ -0,0 +1,117 @@
+"""위젯 정적 자산 파이프라인 (축소 / 해시 파일명 / 사전 압축) 테스트."""
+
+import gzip
+import os
+
+import pytest
+
+from app.utils import assets
+from app.utils.assets import build_asset, get_asset, minify_css, minify_js
+from app.utils.compression import negotiate_encoding
+
+
+class TestMinify:
+    def test_js_strips_comments_and_indentation(self):
+        source = (
+            "/**\n * 헤더 주석\n */\n"
+            "(function () {\n"
+            "    // 줄 주석\n"
+            "    var re = /^https?:\\/\\//;  // 코드 뒤 주석은 유지\n"
+            "    /* 한 줄 블록 */\n"
+            "\n"
+            "    return 'a // b';\n"
+            "})();\n"
+        )
+        assert minify_js(source) == (
+            "(function () {\n"
+            "var re = /^https?:\\/\\//;  // 코드 뒤 주석은 유지\n"
+            "return 'a // b';\n"
+            "})();\n"
+        )
+
+    def test_css(self):
+        source = "/* 주석 */\n.srw-a  >  .b ,\n.srw-c {\n    color: red;\n    margin: 0 auto;\n}\n"
+        assert minify_css(source) == ".srw-a>.b,.srw-c{color: red;margin: 0 auto}\n"
+
+
+class TestNegotiateEncoding:
+    def test_negotiation(self):
+        assert negotiate_encoding("gzip, deflate", ("gzip",)) == "gzip"
+        assert negotiate_encoding("", ("gzip",)) == "identity"
+        assert negotiate_encoding("gzip;q=0", ("gzip",)) == "identity"
+        assert negotiate_encoding("*", ("br", "gzip")) == "br"
+        assert negotiate_encoding("br;q=0.5, gzip", ("br", "gzip")) == "gzip"
+        assert negotiate_encoding("br, gzip", ("br", "gzip")) == "br"
+
+
+class TestBuildAsset:
+    def test_fingerprint_and_bodies(self):
+        asset = build_asset("widget.js")
+        assert asset.file_name == f"widget.{asset.digest}.js"
+        assert len(asset.digest) == 12
+        assert gzip.decompress(asset.bodies["gzip"]) == asset.bodies["identity"]
+        assert len(asset.bodies["gzip"]) < len(asset.bodies["identity"])
+
+    def test_rebuilds_when_source_changes(self, tmp_path, monkeypatch):
+        (tmp_path / "widget.css").write_text(".srw-a { color: red; }\n", encoding="utf-8")
+        monkeypatch.setattr(assets, "STATIC_DIR", tmp_path)
+        monkeypatch.setattr(assets, "_assets", {})
+        monkeypatch.setattr(
+            assets, "build_asset", lambda name: build_asset(name, tmp_path)
+        )
+        first = get_asset("widget.css")
+        assert get_asset("widget.css") is first
+
+        (tmp_path / "widget.css").write_text(".srw-a { color: blue; }\n", encoding="utf-8")
+        stat = os.stat(tmp_path / "widget.css")
+        os.utime(tmp_path / "widget.css", ns=(stat.st_atime_ns, first.source_mtime_ns + 10**9))
+        second = get_asset("widget.css")
+        assert second.file_name != first.file_name
+        assert second.bodies["identity"] == b".srw-a{color: blue}\n"
+
+
+class TestServeAssets:
+    @pytest.mark.parametrize("name", ["widget.js", "widget.css"])
+    def test_loader_redirects_to_fingerprint(self, client, name):
+        resp = client.get(f"/static/{name}", follow_redirects=False)
+        assert resp.status_code == 302
+        assert resp.headers["location"] == get_asset(name).url
+        assert resp.headers["cache-control"] == "public, max-age=300"
+
+    def test_fingerprinted_gzip(self, client):
+        asset = get_asset("widget.js")
+        resp = client.get(asset.url, headers={"Accept-Encoding": "gzip"})
+        assert resp.status_code == 200
+        assert resp.headers["content-encoding"] == "gzip"
+        assert resp.headers["cache-control"] == "public, max-age=31536000, immutable"
+        assert resp.headers["vary"] == "Accept-Encoding"
+        assert resp.headers["etag"] == f'"{asset.digest}-gzip"'
+        assert resp.headers["content-type"].startswith("application/javascript")
+        assert resp.content == asset.bodies["identity"]  # 클라이언트가 해제
+
+    def test_identity_and_304(self, client):
+        asset = get_asset("widget.css")
+        resp = client.get(asset.url, headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in resp.headers
+        assert resp.content == asset.bodies["identity"]
+        assert resp.headers["content-type"].startswith("text/css")
+
+        resp = client.get(
+            asset.url,
+            headers={"Accept-Encoding": "identity", "If-None-Match": resp.headers["etag"]},
+        )
+        assert resp.status_code == 304
+
+    def test_stale_fingerprint_redirects(self, client):
+        resp = client.get("/assets/widget.000000000000.js", follow_redirects=False)
+        assert resp.status_code == 302
+        assert resp.headers["location"] == get_asset("widget.js").url
+        assert resp.headers["cache-control"] == "no-cache"
+
+    def test_unknown_asset(self, client):
+        assert client.get("/assets/admin.abc.js").status_code == 404
+
+    def test_follow_loader(self, client):
+        resp = client.get("/static/widget.js")
+        assert resp.status_code == 200
+        assert b"srw" in resp.content
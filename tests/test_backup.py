@@ -0,0 +1,207 @@
+"""백업 스트리밍(/api/admin/backup)과 일괄 복원 테스트."""
+
+import io
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from app.database import _open_connection
+from app.main import SEED_BACKUP
+from app.migrations import migrate
+from app.utils.backup import read_backup, restore_backup
+from app.utils.image_variants import wait_for_variants
+
+PRODUCT_NO = "BACKUP_TEST"
+
+
+@pytest.fixture()
+def fresh_db():
+    """마이그레이션만 적용된 빈 DB 연결."""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    conn = _open_connection(path)
+    migrate(conn)
+    yield conn
+    conn.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+
+@pytest.fixture(scope="module")
+def seeded(setup_db):
+    """이미지가 있는 리뷰 2건 + 없는 리뷰 1건 (공용 테스트 DB)."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    client = TestClient(app)
+    ids = []
+    for i in range(3):
+        resp = client.post("/api/reviews", json={
+            "product_no": PRODUCT_NO,
+            "product_name": "백업 상품",
+            "author": f"백업작성자{i}",
+            "rating": i + 3,
+            "content": f"백업 복원 테스트 리뷰 {i}",
+        })
+        ids.append(resp.json()["id"])
+    for review_id in ids[:2]:
+        resp = client.post(
+            f"/api/reviews/{review_id}/images",
+            files=[("files", ("b.png", io.BytesIO(b"\x89PNG\r\n\x1a\n" + b"\x01" * 64), "image/png"))],
+        )
+        assert resp.status_code == 201
+    # 변형 생성 결과가 덤프 사이에 바뀌지 않도록
+    wait_for_variants()
+    return ids
+
+
+def _records(content: bytes) -> list[dict]:
+    return [json.loads(line) for line in content.decode("utf-8").splitlines()]
+
+
+def _write(tmp_path: Path, name: str, content: bytes) -> Path:
+    path = tmp_path / name
+    path.write_bytes(content)
+    return path
+
+
+class TestBackupEndpoint:
+    def test_ndjson(self, client, seeded):
+        resp = client.get("/api/admin/backup")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/x-ndjson"
+        assert "attachment" in resp.headers["content-disposition"]
+
+        records = _records(resp.content)
+        meta, rest = records[0], records[1:]
+        assert meta["type"] == "meta"
+        reviews = [r for r in rest if r["type"] == "review"]
+        assert meta["total_reviews"] == len(reviews)
+        assert any(r["type"] == "product" and r["product_no"] == PRODUCT_NO for r in rest)
+
+        ours = {r["id"]: r for r in reviews if r["id"] in seeded}
+        assert [len(ours[i]["images"]) for i in seeded] == [1, 1, 0]
+        assert ours[seeded[0]]["images"][0]["review_id"] == seeded[0]
+        assert [r["id"] for r in reviews] == sorted(r["id"] for r in reviews)
+
+    def test_json_matches_ndjson(self, client, seeded):
+        ndjson = _records(client.get("/api/admin/backup").content)
+        data = client.get("/api/admin/backup", params={"format": "json"}).json()
+        assert data["total_reviews"] == len(data["reviews"])
+        reviews = [r for r in ndjson if r.pop("type") == "review"]
+        assert data["reviews"] == reviews
+
+
+class TestRestore:
+    def test_round_trip(self, client, seeded, fresh_db, tmp_path):
+        path = _write(tmp_path, "backup.ndjson", client.get("/api/admin/backup").content)
+        counts = restore_backup(fresh_db, read_backup(path))
+        fresh_db.commit()
+
+        total = fresh_db.execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+        assert counts["reviews"] == total
+        row = fresh_db.execute(
+            "SELECT author, rating FROM reviews WHERE id = ?", (seeded[1],)
+        ).fetchone()
+        assert tuple(row) == ("백업작성자1", 4)
+        assert fresh_db.execute(
+            "SELECT COUNT(*) FROM review_images WHERE review_id IN (?, ?)", seeded[:2]
+        ).fetchone()[0] == 2
+
+        # 파생 데이터: 요약 테이블, 검색 인덱스, blob 참조 카운트, 버전
+        stored = fresh_db.execute(
+            "SELECT * FROM product_review_stats WHERE product_no = ?", (PRODUCT_NO,)
+        ).fetchone()
+        assert stored["review_count"] == 3
+        assert stored["photo_review_count"] == 2
+        assert fresh_db.execute(
+            "SELECT COUNT(*) FROM reviews_fts WHERE reviews_fts MATCH '\"백업 복원\"'"
+        ).fetchone()[0] >= 3
+        blob_refs = fresh_db.execute(
+            "SELECT SUM(ref_count) FROM image_blobs"
+        ).fetchone()[0]
+        assert blob_refs == fresh_db.execute("SELECT COUNT(*) FROM review_images").fetchone()[0]
+        assert fresh_db.execute(
+            "SELECT version FROM data_versions WHERE scope = ?", (f"product:{PRODUCT_NO}",)
+        ).fetchone()[0] >= 1
+
+    def test_indexes_and_triggers_recreated(self, fresh_db, tmp_path):
+        schema = "SELECT type, name FROM sqlite_master WHERE type IN ('index', 'trigger')"
+        before = set(map(tuple, fresh_db.execute(schema).fetchall()))
+        path = _write(tmp_path, "one.ndjson", b"".join([
+            b'{"type": "meta"}\n',
+            json.dumps({
+                "type": "review", "id": 10, "product_no": "P1", "author": "a",
+                "rating": 5, "content": "c",
+            }).encode() + b"\n",
+        ]))
+        restore_backup(fresh_db, read_backup(path))
+        fresh_db.commit()
+        assert set(map(tuple, fresh_db.execute(schema).fetchall())) == before
+
+        # 복원 뒤의 쓰기는 다시 트리거로 요약 테이블에 반영된다
+        fresh_db.execute(
+            "INSERT INTO reviews (product_no, author, rating, content) VALUES ('P1', 'b', 1, 'd')"
+        )
+        fresh_db.commit()
+        stored = fresh_db.execute(
+            "SELECT review_count, rating_sum FROM product_review_stats WHERE product_no = 'P1'"
+        ).fetchone()
+        assert tuple(stored) == (2, 6)
+
+    def test_failed_restore_keeps_schema(self, fresh_db, tmp_path):
+        """도중에 실패하면 지웠던 인덱스/트리거까지 함께 롤백된다."""
+        schema = "SELECT type, name FROM sqlite_master WHERE type IN ('index', 'trigger')"
+        before = set(map(tuple, fresh_db.execute(schema).fetchall()))
+        path = _write(tmp_path, "bad.ndjson", b"".join([
+            b'{"type": "meta"}\n',
+            json.dumps({
+                "type": "review", "id": 1, "product_no": "P1", "author": "a",
+                "rating": 5, "content": "c",
+            }).encode() + b"\n",
+            # rating 누락
+            json.dumps({
+                "type": "review", "id": 2, "product_no": "P1", "author": "b", "content": "d",
+            }).encode() + b"\n",
+        ]))
+        with pytest.raises(KeyError):
+            restore_backup(fresh_db, read_backup(path))
+        fresh_db.rollback()
+
+        assert set(map(tuple, fresh_db.execute(schema).fetchall())) == before
+        assert fresh_db.execute("SELECT COUNT(*) FROM reviews").fetchone()[0] == 0
+        fresh_db.execute(
+            "INSERT INTO reviews (product_no, author, rating, content) VALUES ('P1', 'b', 4, 'd')"
+        )
+        fresh_db.commit()
+        stored = fresh_db.execute(
+            "SELECT review_count FROM product_review_stats WHERE product_no = 'P1'"
+        ).fetchone()
+        assert stored[0] == 1
+
+    def test_rejects_non_empty_db(self, fresh_db):
+        fresh_db.execute(
+            "INSERT INTO reviews (product_no, author, rating, content) VALUES ('P', 'a', 5, 'c')"
+        )
+        with pytest.raises(ValueError):
+            restore_backup(fresh_db, iter([]))
+
+    def test_seed_file_with_missing_images(self, fresh_db):
+        counts = restore_backup(
+            fresh_db, read_backup(SEED_BACKUP), batch_size=50, image_exists=lambda path: False
+        )
+        fresh_db.commit()
+        seed = json.loads(SEED_BACKUP.read_text(encoding="utf-8"))
+        assert counts["reviews"] == len(seed["reviews"])
+        assert counts["images"] == 0
+        assert counts["skipped_images"] == sum(len(r["images"]) for r in seed["reviews"])
+        assert counts["products"] == len({r["product_no"] for r in seed["reviews"]})
+        # 원본 id를 그대로 쓴다
+        assert fresh_db.execute("SELECT MAX(id) FROM reviews").fetchone()[0] == max(
+            r["id"] for r in seed["reviews"]
+        )
@@ -0,0 +1,106 @@
+"""위젯 응답 캐시(TTL + LRU) 테스트."""
+
+import time
+
+from app.utils.cache import ResponseCache, widget_cache
+
+
+class TestResponseCache:
+    def test_hit_and_miss(self):
+        cache = ResponseCache(max_bytes=1024, ttl=60)
+        assert cache.get("a") is None
+        cache.set("a", "P1", b"body", cache.generation("P1"))
+        assert cache.get("a") == b"body"
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_ttl_expiry(self):
+        cache = ResponseCache(max_bytes=1024, ttl=0.01)
+        cache.set("a", "P1", b"body", cache.generation("P1"))
+        time.sleep(0.02)
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_lru_eviction_by_size(self):
+        cache = ResponseCache(max_bytes=10, ttl=60)
+        cache.set("a", "P1", b"aaaa", 0)
+        cache.set("b", "P1", b"bbbb", 0)
+        cache.get("a")  # a를 최근 사용으로 갱신
+        cache.set("c", "P2", b"cccc", 0)
+        assert cache.get("b") is None
+        assert cache.get("a") == b"aaaa"
+        assert cache.get("c") == b"cccc"
+        stats = cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["size_bytes"] == 8
+
+    def test_invalidate_only_product_keys(self):
+        cache = ResponseCache(max_bytes=1024, ttl=60)
+        cache.set(("P1", 1), "P1", b"one", 0)
+        cache.set(("P1", 2), "P1", b"two", 0)
+        cache.set(("P2", 1), "P2", b"other", 0)
+        cache.invalidate("P1")
+        assert cache.get(("P1", 1)) is None
+        assert cache.get(("P1", 2)) is None
+        assert cache.get(("P2", 1)) == b"other"
+
+    def test_stale_set_after_invalidate_is_dropped(self):
+        cache = ResponseCache(max_bytes=1024, ttl=60)
+        generation = cache.generation("P1")
+        cache.invalidate("P1")  # 조회 도중 쓰기 발생
+        cache.set("a", "P1", b"stale", generation)
+        assert cache.get("a") is None
+
+        generation = cache.generation("P1")
+        cache.clear()
+        cache.set("a", "P1", b"stale", generation)
+        assert cache.get("a") is None
+
+    def test_disabled_when_ttl_zero(self):
+        cache = ResponseCache(max_bytes=1024, ttl=0)
+        cache.set("a", "P1", b"body", 0)
+        assert cache.get("a") is None
+
+
+class TestWidgetCacheIntegration:
+    def _create(self, client, rating: int = 5) -> int:
+        resp = client.post(
+            "/api/reviews",
+            json={
+                "product_no": "CACHE_WIDGET",
+                "author": "캐시작성자",
+                "rating": rating,
+                "content": "캐시 테스트",
+            },
+        )
+        return resp.json()["id"]
+
+    def test_second_request_served_from_cache(self, client):
+        self._create(client)
+        first = client.get("/api/widget/reviews/CACHE_WIDGET")
+        hits_before = widget_cache.stats()["hits"]
+        second = client.get("/api/widget/reviews/CACHE_WIDGET")
+        assert widget_cache.stats()["hits"] == hits_before + 1
+        assert second.content == first.content
+        assert second.headers["content-type"] == "application/json"
+
+    def test_write_invalidates_product(self, client):
+        review_id = self._create(client)
+        before = client.get("/api/widget/reviews/CACHE_WIDGET").json()
+
+        client.patch(
+            f"/api/reviews/{review_id}/visibility", json={"is_visible": False}
+        )
+        after = client.get("/api/widget/reviews/CACHE_WIDGET").json()
+        assert after["total_reviews"] == before["total_reviews"] - 1
+
+        self._create(client, rating=1)
+        latest = client.get("/api/widget/reviews/CACHE_WIDGET").json()
+        assert latest["total_reviews"] == before["total_reviews"]
+
+    def test_metrics_expose_cache_counters(self, client):
+        resp = client.get("/api/metrics")
+        cache_stats = resp.json()["widget_cache"]
+        for key in ("hits", "misses", "evictions", "entries", "size_bytes"):
+            assert key in cache_stats
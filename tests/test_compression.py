@@ -0,0 +1,182 @@
+"""응답 압축 미들웨어와 위젯 캐시 압축본 테스트."""
+
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.utils.cache import ResponseCache, widget_cache
+from app.utils.compression import CompressionMiddleware, encoded_etag
+
+LARGE = "리뷰 " * 1000
+
+
+def _make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=500,
+        media_types=["application/json", "text/plain"],
+    )
+
+    @app.get("/large")
+    def large():
+        return {"text": LARGE}
+
+    @app.get("/small")
+    def small():
+        return {"text": "짧음"}
+
+    @app.get("/tagged")
+    def tagged():
+        return PlainTextResponse(LARGE, headers={"ETag": '"v1"'})
+
+    @app.get("/image")
+    def image():
+        return Response(b"\xff" * 5000, media_type="image/jpeg")
+
+    @app.get("/stream")
+    def stream():
+        def rows():
+            for i in range(200):
+                yield f'{{"row": {i}, "text": "스트리밍"}}\n'
+        return StreamingResponse(rows(), media_type="text/plain")
+
+    @app.get("/not-modified")
+    def not_modified():
+        return Response(status_code=304, headers={"ETag": '"v1"'})
+
+    return app
+
+
+@pytest.fixture()
+def app_client():
+    return TestClient(_make_app())
+
+
+class TestCompressionMiddleware:
+    def test_large_json_gzipped(self, app_client):
+        resp = app_client.get("/large", headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["content-encoding"] == "gzip"
+        assert resp.headers["vary"] == "Accept-Encoding"
+        assert int(resp.headers["content-length"]) < len(LARGE.encode())
+        assert resp.json() == {"text": LARGE}
+
+    def test_small_response_untouched(self, app_client):
+        resp = app_client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in resp.headers
+        assert "vary" not in resp.headers
+
+    def test_identity_request_varies(self, app_client):
+        resp = app_client.get("/large", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in resp.headers
+        assert resp.headers["vary"] == "Accept-Encoding"
+
+    def test_media_type_allowlist(self, app_client):
+        resp = app_client.get("/image", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in resp.headers
+        assert len(resp.content) == 5000
+
+    def test_streaming(self, app_client):
+        with app_client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as resp:
+            raw = b"".join(resp.iter_raw())
+        assert resp.headers["content-encoding"] == "gzip"
+        assert "content-length" not in resp.headers
+        lines = gzip.decompress(raw).decode().splitlines()
+        assert len(lines) == 200
+        assert json.loads(lines[-1])["row"] == 199
+
+    def test_etag_suffix(self, app_client):
+        resp = app_client.get("/tagged", headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["etag"] == '"v1-gzip"'
+
+    def test_304_restores_encoded_etag(self, app_client):
+        resp = app_client.get(
+            "/not-modified",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": '"v1-gzip"'},
+        )
+        assert resp.status_code == 304
+        assert resp.headers["etag"] == '"v1-gzip"'
+
+    def test_encoded_etag(self):
+        assert encoded_etag('"abc"', "gzip") == '"abc-gzip"'
+        assert encoded_etag('W/"abc"', "br") == 'W/"abc-br"'
+        assert encoded_etag('"abc"', "identity") == '"abc"'
+
+
+class TestAppCompression:
+    def _create_reviews(self, client, product_no: str, count: int = 8) -> None:
+        for i in range(count):
+            client.post(
+                "/api/reviews",
+                json={
+                    "product_no": product_no,
+                    "author": f"작성자{i}",
+                    "rating": 5,
+                    "content": "압축 테스트용 리뷰 본문입니다. " * 10,
+                },
+            )
+
+    def test_conditional_request_roundtrip(self, client):
+        self._create_reviews(client, "GZIP_304")
+        first = client.get("/api/reviews?product_no=GZIP_304", headers={"Accept-Encoding": "gzip"})
+        assert first.headers["content-encoding"] == "gzip"
+        assert first.headers["etag"].endswith('-gzip"')
+
+        second = client.get(
+            "/api/reviews?product_no=GZIP_304",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]},
+        )
+        assert second.status_code == 304
+        assert second.headers["etag"] == first.headers["etag"]
+
+    def test_widget_compressed_body_cached(self, client):
+        self._create_reviews(client, "GZIP_WIDGET")
+        url = "/api/widget/reviews/GZIP_WIDGET"
+        first = client.get(url, headers={"Accept-Encoding": "gzip"})
+        assert first.headers["content-encoding"] == "gzip"
+        assert first.headers["etag"].endswith('-gzip"')
+
+        key = ("GZIP_WIDGET", 1, 5, "latest", False, None, None)
+        cached = widget_cache.get_encoded(key, "gzip")
+        assert cached is not None
+        assert json.loads(gzip.decompress(cached)) == first.json()
+
+        plain = client.get(url, headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert plain.json() == first.json()
+
+        revalidated = client.get(
+            url, headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]}
+        )
+        assert revalidated.status_code == 304
+
+
+class TestResponseCacheEncoded:
+    def test_encoded_bodies_count_toward_size(self):
+        cache = ResponseCache(max_bytes=100, ttl=60)
+        cache.set("a", "p1", b"x" * 40, cache.generation("p1"))
+        cache.set_encoded("a", "gzip", b"z" * 10)
+        assert cache.get_encoded("a", "gzip") == b"z" * 10
+        assert cache.stats()["size_bytes"] == 50
+
+        cache.set("b", "p2", b"y" * 40, cache.generation("p2"))
+        cache.set_encoded("b", "gzip", b"z" * 20)  # 110 > 100: 오래된 a 제거
+        assert cache.get("a") is None
+        assert cache.stats()["size_bytes"] == 60
+
+    def test_set_encoded_ignored_without_entry(self):
+        cache = ResponseCache(max_bytes=100, ttl=60)
+        cache.set_encoded("missing", "gzip", b"z")
+        assert cache.stats()["size_bytes"] == 0
+
+    def test_invalidate_drops_encoded(self):
+        cache = ResponseCache(max_bytes=1000, ttl=60)
+        cache.set("a", "p1", b"x" * 40, cache.generation("p1"))
+        cache.set_encoded("a", "gzip", b"z" * 10)
+        cache.invalidate("p1")
+        assert cache.get_encoded("a", "gzip") is None
+        assert cache.stats()["size_bytes"] == 0
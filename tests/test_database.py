@@ -0,0 +1,479 @@
+"""SQLite 커넥션 풀 / DB 작업 스레드 풀 테스트."""
+
+import asyncio
+import inspect
+import os
+import tempfile
+import threading
+
+import pytest
+
+from app import database
+from app.database import (
+    ConnectionPool,
+    DBExecutor,
+    DBOverloadedError,
+    DBWriter,
+    PoolTimeoutError,
+    after_commit,
+    db_endpoint,
+    write_endpoint,
+)
+
+
+@pytest.fixture()
+def db_path():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    yield path
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+
+class TestConnectionPool:
+    def test_reuses_connection(self, db_path):
+        pool = ConnectionPool(db_path, max_size=2)
+        with pool.connection() as conn1:
+            pass
+        with pool.connection() as conn2:
+            pass
+        assert conn1 is conn2
+        stats = pool.stats()
+        assert stats["checkouts"] == 2
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+        assert stats["hit_rate"] == 0.5
+        pool.close()
+
+    def test_thread_affinity(self, db_path):
+        pool = ConnectionPool(db_path, max_size=2)
+        conn_a = pool.acquire()
+        conn_b = pool.acquire()
+        pool.release(conn_a)
+        pool.release(conn_b)
+
+        # 다른 스레드가 conn_a를 마지막으로 사용했다면 그 연결을 다시 받아야 함
+        seen: list = []
+
+        def worker():
+            conn = pool.acquire()
+            pool.release(conn)
+            seen.append(conn)
+            conn = pool.acquire()
+            pool.release(conn)
+            seen.append(conn)
+
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+        assert seen[0] is seen[1]
+        assert pool.stats()["affinity_hits"] >= 1
+        pool.close()
+
+    def test_bounded_size_times_out(self, db_path):
+        pool = ConnectionPool(db_path, max_size=1, timeout=0.05)
+        conn = pool.acquire()
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire()
+        stats = pool.stats()
+        assert stats["waits"] == 1
+        assert stats["timeouts"] == 1
+        pool.release(conn)
+        pool.close()
+
+    def test_waiter_gets_released_connection(self, db_path):
+        pool = ConnectionPool(db_path, max_size=1, timeout=5)
+        conn = pool.acquire()
+        got: list = []
+
+        t = threading.Thread(target=lambda: got.append(pool.acquire()))
+        t.start()
+        pool.release(conn)
+        t.join()
+        assert got == [conn]
+        pool.release(got[0])
+        pool.close()
+
+    def test_recycles_stale_connection(self, db_path):
+        pool = ConnectionPool(db_path, max_size=1, recycle=60)
+        with pool.connection() as conn1:
+            pass
+        # 생성 시각을 recycle 이전으로 되돌림
+        pool._created_at[id(conn1)] -= 120
+        with pool.connection() as conn2:
+            pass
+        assert conn1 is not conn2
+        assert pool.stats()["recycled"] == 1
+        pool.close()
+
+    def test_connect_outside_pool_lock(self, db_path, monkeypatch):
+        pool = ConnectionPool(db_path, max_size=2)
+        with pool.connection() as idle:
+            pass
+        opening = threading.Event()
+        proceed = threading.Event()
+        real_open = database._open_connection
+
+        def slow_open(path):
+            opening.set()
+            assert proceed.wait(5)
+            return real_open(path)
+
+        monkeypatch.setattr(database, "_open_connection", slow_open)
+        held = [pool.acquire()]
+        assert held == [idle]
+        t = threading.Thread(target=lambda: held.append(pool.acquire()))
+        t.start()
+        assert opening.wait(5)
+
+        # 새 연결을 여는 동안에도 반납과 통계 조회가 락을 기다리지 않아야 함
+        done = threading.Event()
+
+        def release_and_stats():
+            pool.release(idle)
+            assert pool.stats()["in_use"] == 1
+            done.set()
+
+        threading.Thread(target=release_and_stats).start()
+        assert done.wait(1)
+        proceed.set()
+        t.join()
+        assert pool.stats()["size"] == 2
+        pool.release(held[1])
+        pool.close()
+
+    def test_release_rolls_back_open_transaction(self, db_path):
+        pool = ConnectionPool(db_path, max_size=1)
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.commit()
+            conn.execute("INSERT INTO t VALUES (1)")
+        with pool.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+        pool.close()
+
+
+class TestMetricsEndpoint:
+    def test_db_pool_metrics(self, client):
+        client.get("/api/stats")
+        resp = client.get("/api/metrics")
+        assert resp.status_code == 200
+        pool = resp.json()["db_pool"]
+        assert pool["checkouts"] >= 1
+        assert "hit_rate" in pool
+        assert "waits" in pool
+
+    def test_db_executor_metrics(self, client):
+        client.get("/api/stats")
+        executor = client.get("/api/metrics").json()["db_executor"]
+        assert executor["completed"] >= 1
+        assert executor["workers"] >= 1
+        assert "max_wait_ms" in executor
+
+    def test_db_writer_metrics(self, client):
+        client.post("/api/products", json={"product_no": "WRITER_METRICS", "product_name": "지표"})
+        writer = client.get("/api/metrics").json()["db_writer"]
+        assert writer["committed"] >= 1
+        assert writer["batches"] >= 1
+        assert "avg_batch_size" in writer
+        assert "max_lock_wait_ms" in writer
+
+
+class TestAfterCommit:
+    def test_runs_after_commit_only(self, db_path):
+        pool = ConnectionPool(db_path, max_size=1)
+        calls: list[str] = []
+        with pool.connection() as conn:
+            after_commit(conn, lambda: calls.append("rolled back"))
+            conn.rollback()
+            after_commit(conn, lambda: calls.append("committed"))
+            assert calls == []
+            conn.commit()
+        assert calls == ["committed"]
+        pool.close()
+
+
+def _blocked(db, started: threading.Event, release: threading.Event) -> int:
+    started.set()
+    release.wait(5)
+    return db.execute("SELECT 1").fetchone()[0]
+
+
+class TestDBExecutor:
+    @pytest.fixture()
+    def pool(self, db_path):
+        pool = ConnectionPool(db_path, max_size=4)
+        yield pool
+        pool.close()
+
+    def test_runs_in_db_thread_and_commits(self, pool):
+        executor = DBExecutor(workers=2, connection=pool.connection)
+
+        def work(db, value):
+            db.execute("CREATE TABLE IF NOT EXISTS t (v INTEGER)")
+            db.execute("INSERT INTO t VALUES (?)", (value,))
+            db.commit()
+            return threading.current_thread().name
+
+        thread_name = asyncio.run(executor.run(work, 7))
+        assert thread_name.startswith("db")
+        with pool.connection() as conn:
+            assert conn.execute("SELECT v FROM t").fetchone()[0] == 7
+        executor.shutdown()
+
+    def test_event_loop_not_blocked(self, pool):
+        executor = DBExecutor(workers=1, connection=pool.connection)
+        started, release = threading.Event(), threading.Event()
+
+        async def scenario():
+            job = asyncio.ensure_future(executor.run(_blocked, started, release))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            # DB 작업이 스레드를 잡고 있는 동안에도 다른 코루틴이 진행된다
+            ticks = 0
+            for _ in range(5):
+                await asyncio.sleep(0.001)
+                ticks += 1
+            assert not job.done()
+            release.set()
+            return ticks, await job
+
+        assert asyncio.run(scenario()) == (5, 1)
+        executor.shutdown()
+
+    def test_rejects_when_queue_full(self, pool):
+        executor = DBExecutor(workers=1, max_queue=1, connection=pool.connection)
+        started, release = threading.Event(), threading.Event()
+        running = executor.submit(_blocked, started, release)
+        started.wait(5)
+        queued = executor.submit(lambda db: "queued")
+        with pytest.raises(DBOverloadedError):
+            executor.submit(lambda db: "rejected")
+
+        stats = executor.stats()
+        assert stats["active"] == 1
+        assert stats["queued"] == 1
+        assert stats["rejected"] == 1
+
+        release.set()
+        assert running.result(5) == 1
+        assert queued.result(5) == "queued"
+        assert executor.stats()["completed"] == 2
+        assert executor.stats()["queued"] == 0
+        executor.shutdown()
+
+    def test_exception_counts_as_failed(self, pool):
+        executor = DBExecutor(workers=1, connection=pool.connection)
+
+        def broken(db):
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            asyncio.run(executor.run(broken))
+        assert executor.stats()["failed"] == 1
+        executor.shutdown()
+
+
+class TestDBEndpoint:
+    def test_hides_db_parameter(self):
+        def handler(db, review_id: int, q: str = "x") -> dict:
+            return {}
+
+        endpoint = db_endpoint(handler)
+        assert inspect.iscoroutinefunction(endpoint)
+        assert list(inspect.signature(endpoint).parameters) == ["review_id", "q"]
+        assert endpoint.__name__ == "handler"
+
+    def test_requires_db_first(self):
+        with pytest.raises(TypeError):
+            db_endpoint(lambda review_id, db: None)
+        with pytest.raises(TypeError):
+            write_endpoint(lambda review_id, db: None)
+
+    def test_write_endpoint_signature(self):
+        def handler(db, review_id: int) -> dict:
+            return {}
+
+        endpoint = write_endpoint(handler)
+        assert inspect.iscoroutinefunction(endpoint)
+        assert list(inspect.signature(endpoint).parameters) == ["review_id"]
+
+    def test_overload_returns_503(self, client, monkeypatch, db_path):
+        pool = ConnectionPool(db_path, max_size=1)
+        # 실행 1 + 대기 1로 채우면 다음 요청은 거절된다
+        executor = DBExecutor(workers=1, max_queue=1, connection=pool.connection)
+        monkeypatch.setattr(database, "_db_executor", executor)
+        started, release = threading.Event(), threading.Event()
+        executor.submit(_blocked, started, release)
+        started.wait(5)
+        executor.submit(lambda db: None)
+        try:
+            resp = client.get("/api/stats")
+            assert resp.status_code == 503
+            assert resp.headers["retry-after"] == "1"
+        finally:
+            release.set()
+            executor.shutdown()
+            pool.close()
+
+
+def _insert(db, value: int) -> int:
+    return db.execute("INSERT INTO t VALUES (?)", (value,)).lastrowid
+
+
+class TestDBWriter:
+    @pytest.fixture()
+    def pool(self, db_path):
+        pool = ConnectionPool(db_path, max_size=4)
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE t (v INTEGER)")
+            conn.commit()
+        yield pool
+        pool.close()
+
+    def _values(self, pool) -> list[int]:
+        with pool.connection() as conn:
+            return [row[0] for row in conn.execute("SELECT v FROM t ORDER BY v")]
+
+    def _blocked_writer(self, pool, **kwargs):
+        """첫 작업이 쓰기 스레드를 잡고 있는 동안 뒤 작업을 대기열에 쌓는다."""
+        writer = DBWriter(connection=pool.connection, **kwargs)
+        started, release = threading.Event(), threading.Event()
+        first = writer.submit(_blocked, started, release)
+        started.wait(5)
+        return writer, first, release
+
+    def test_group_commit(self, pool):
+        writer, first, release = self._blocked_writer(pool)
+        futures = [writer.submit(_insert, i) for i in range(10)]
+        # 커밋 전에는 다른 연결에서 보이지 않는다
+        assert self._values(pool) == []
+        release.set()
+        assert first.result(5) == 1
+        assert [f.result(5) for f in futures] == list(range(1, 11))
+        assert self._values(pool) == list(range(10))
+
+        stats = writer.stats()
+        assert stats["batches"] == 1
+        assert stats["max_batch_size"] == 11
+        assert stats["committed"] == 11
+        assert stats["queued"] == 0
+        writer.shutdown()
+
+    def test_max_batch(self, pool):
+        writer, first, release = self._blocked_writer(pool, max_batch=4)
+        futures = [writer.submit(_insert, i) for i in range(7)]
+        release.set()
+        for future in futures:
+            future.result(5)
+        stats = writer.stats()
+        assert stats["batches"] == 2
+        assert stats["max_batch_size"] == 4
+        writer.shutdown()
+
+    def test_failed_job_rolled_back_alone(self, pool):
+        calls: list[str] = []
+
+        def ok(db, value):
+            _insert(db, value)
+            after_commit(db, lambda: calls.append(f"ok{value}"))
+
+        def broken(db):
+            _insert(db, 99)
+            after_commit(db, lambda: calls.append("broken"))
+            raise ValueError("boom")
+
+        writer, first, release = self._blocked_writer(pool)
+        futures = [writer.submit(ok, 1), writer.submit(broken), writer.submit(ok, 2)]
+        release.set()
+        futures[0].result(5)
+        futures[2].result(5)
+        with pytest.raises(ValueError):
+            futures[1].result(5)
+
+        assert self._values(pool) == [1, 2]
+        assert calls == ["ok1", "ok2"]
+        stats = writer.stats()
+        assert stats["batches"] == 1
+        assert stats["failed"] == 1
+        writer.shutdown()
+
+    def test_job_must_not_commit(self, pool):
+        def commits(db):
+            _insert(db, 5)
+            db.commit()
+
+        writer = DBWriter(connection=pool.connection)
+        with pytest.raises(RuntimeError):
+            writer.submit(commits).result(5)
+        # 쓰기 스레드는 계속 동작한다
+        assert writer.submit(_insert, 6).result(5)
+        writer.shutdown()
+
+    def test_cancelled_job_skipped(self, pool):
+        writer, first, release = self._blocked_writer(pool)
+        cancelled = writer.submit(_insert, 1)
+        kept = writer.submit(_insert, 2)
+        assert cancelled.cancel()
+        release.set()
+        kept.result(5)
+        assert self._values(pool) == [2]
+        assert writer.stats()["cancelled"] == 1
+        writer.shutdown()
+
+    def test_rejects_when_queue_full(self, pool):
+        writer, first, release = self._blocked_writer(pool, max_queue=2)
+        queued = writer.submit(_insert, 1)
+        with pytest.raises(DBOverloadedError):
+            writer.submit(_insert, 2)
+        assert writer.stats()["rejected"] == 1
+        release.set()
+        queued.result(5)
+        writer.shutdown()
+
+    def test_shutdown_commits_queued(self, pool):
+        writer, first, release = self._blocked_writer(pool)
+        futures = [writer.submit(_insert, i) for i in range(3)]
+        release.set()
+        writer.shutdown()
+        assert all(f.done() for f in futures)
+        assert self._values(pool) == [0, 1, 2]
+        with pytest.raises(RuntimeError):
+            writer.submit(_insert, 3)
+
+    def test_concurrent_writers(self, pool):
+        """여러 스레드가 동시에 써도 잠금 오류 없이 모두 커밋된다."""
+        writer = DBWriter(connection=pool.connection)
+
+        def worker(start: int) -> None:
+            for i in range(start, start + 50):
+                writer.submit(_insert, i).result(5)
+
+        threads = [threading.Thread(target=worker, args=(n * 50,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert self._values(pool) == list(range(400))
+        stats = writer.stats()
+        assert stats["committed"] == 400
+        assert stats["busy_errors"] == 0
+        assert stats["batches"] <= 400
+        writer.shutdown()
+
+    def test_overload_returns_503(self, client, monkeypatch, db_path):
+        pool = ConnectionPool(db_path, max_size=1)
+        writer = DBWriter(max_queue=1, connection=pool.connection)
+        monkeypatch.setattr(database, "_db_writer", writer)
+        started, release = threading.Event(), threading.Event()
+        writer.submit(_blocked, started, release)
+        started.wait(5)
+        try:
+            resp = client.post("/api/products", json={"product_no": "OVERLOAD", "product_name": ""})
+            assert resp.status_code == 503
+            assert resp.headers["retry-after"] == "1"
+        finally:
+            release.set()
+            writer.shutdown()
+            pool.close()
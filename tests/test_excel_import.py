@@ -0,0 +1,184 @@
+"""엑셀 일괄 등록(청크 단위 스트리밍) 테스트."""
+
+import datetime
+import os
+import tempfile
+
+import pytest
+from openpyxl import Workbook
+
+from app.database import get_db
+from app.models import ExcelUploadResult
+from app.utils import excel_import
+from app.utils.excel_import import import_workbook, parse_row
+
+_HEADER = ["상품번호", "상품명", "작성자명", "별점(1~5)", "리뷰제목", "리뷰내용", "작성일(YYYY-MM-DD)"]
+
+
+@pytest.fixture()
+def xlsx_path():
+    paths: list[str] = []
+
+    def make(rows: list[list]) -> str:
+        wb = Workbook()
+        ws = wb.active
+        ws.append(_HEADER)
+        for row in rows:
+            ws.append(row)
+        fd, path = tempfile.mkstemp(suffix=".xlsx")
+        os.close(fd)
+        wb.save(path)
+        paths.append(path)
+        return path
+
+    yield make
+    for path in paths:
+        os.unlink(path)
+
+
+class TestParseRow:
+    def test_valid_row(self):
+        row, errors = parse_row(("P1", " 상품 ", "작성자", 5, None, "내용", "2026-03-04"))
+        assert errors == []
+        assert row == ("P1", "상품", "작성자", 5, "", "내용",
+                       "2026-03-04 00:00:00", "2026-03-04 00:00:00")
+
+    def test_datetime_cell(self):
+        created = datetime.datetime(2026, 1, 2, 3, 4, 5)
+        row, _ = parse_row(("P1", "", "작성자", 3, "", "내용", created))
+        assert row[6] == "2026-01-02 03:04:05"
+
+    def test_short_row_without_created_at(self):
+        row, errors = parse_row(("P1", "", "작성자", "4", "", "내용"))
+        assert errors == []
+        assert row[3] == 4
+        assert row[6] is None
+
+    def test_all_errors_reported(self):
+        row, errors = parse_row(("", "", "", 9, "", ""))
+        assert row is None
+        assert len(errors) == 4
+
+
+class TestImportWorkbook:
+    def test_chunks_committed_with_progress(self, xlsx_path):
+        path = xlsx_path([
+            [f"XCHUNK{i % 2}", "", f"작성자{i}", 5, "", f"청크 {i}"] for i in range(5)
+        ])
+        progress: list[tuple[int, int]] = []
+        with get_db() as db:
+            result = import_workbook(
+                db, path, chunk_size=2,
+                on_chunk=lambda conn, r, last_row: progress.append((r.success_count, last_row)),
+            )
+            count = db.execute(
+                "SELECT COUNT(*) FROM reviews WHERE product_no LIKE 'XCHUNK%'"
+            ).fetchone()[0]
+        assert result.success_count == 5
+        assert progress == [(2, 3), (4, 5), (5, 6)]
+        assert count == 5
+
+    def test_resume_from_row(self, xlsx_path):
+        path = xlsx_path([
+            ["XRESUME", "", f"작성자{i}", 5, "", f"재개 {i}"] for i in range(4)
+        ])
+        with get_db() as db:
+            result = import_workbook(db, path, start_row=4)
+            contents = [
+                r[0] for r in db.execute(
+                    "SELECT content FROM reviews WHERE product_no = 'XRESUME' ORDER BY id"
+                )
+            ]
+        assert result.success_count == 2
+        assert contents == ["재개 2", "재개 3"]
+
+    def test_chunk_rolled_back_when_callback_raises(self, xlsx_path):
+        path = xlsx_path([
+            ["XABORT", "", f"작성자{i}", 5, "", f"중단 {i}"] for i in range(4)
+        ])
+
+        def on_chunk(conn, result, last_row):
+            if last_row > 3:
+                raise RuntimeError("stop")
+
+        with get_db() as db:
+            with pytest.raises(RuntimeError):
+                import_workbook(db, path, chunk_size=2, on_chunk=on_chunk)
+            db.rollback()
+            count = db.execute(
+                "SELECT COUNT(*) FROM reviews WHERE product_no = 'XABORT'"
+            ).fetchone()[0]
+        assert count == 2
+
+    def test_counts_only_committed_chunks(self, xlsx_path):
+        """콜백이 던져 롤백된 청크는 결과 건수에 남지 않는다 (이어서 진행할 때 부풀지 않게)."""
+        path = xlsx_path(
+            [["XCOUNT", "", f"작성자{i}", 5, "", f"건수 {i}"] for i in range(3)]
+            + [["", "", "", 0, "", ""]]
+        )
+        result = ExcelUploadResult(success_count=0, fail_count=0, errors=[])
+
+        def on_chunk(conn, chunk_result, last_row):
+            if last_row > 3:
+                raise RuntimeError("stop")
+
+        with get_db() as db:
+            with pytest.raises(RuntimeError):
+                import_workbook(db, path, chunk_size=2, on_chunk=on_chunk, result=result)
+            db.rollback()
+        assert (result.success_count, result.fail_count, result.errors) == (2, 0, [])
+
+    def test_created_at_defaults_to_now(self, xlsx_path):
+        path = xlsx_path([
+            ["XDATE", "", "작성자", 4, "", "날짜 지정", "2025-12-25"],
+            ["XDATE", "", "작성자", 4, "", "날짜 없음"],
+        ])
+        with get_db() as db:
+            import_workbook(db, path)
+            rows = {
+                r["content"]: r["created_at"]
+                for r in db.execute(
+                    "SELECT content, created_at FROM reviews WHERE product_no = 'XDATE'"
+                )
+            }
+        assert rows["날짜 지정"] == "2025-12-25 00:00:00"
+        assert rows["날짜 없음"] is not None
+        assert rows["날짜 없음"] != "2025-12-25 00:00:00"
+
+    def test_product_name_filled_once(self, xlsx_path):
+        path = xlsx_path([
+            ["XPROD", "", "작성자", 5, "", "이름 없음"],
+            ["XPROD", "첫 이름", "작성자", 5, "", "이름 있음"],
+            ["XPROD", "다른 이름", "작성자", 5, "", "다른 이름"],
+        ])
+        with get_db() as db:
+            import_workbook(db, path)
+            name = db.execute(
+                "SELECT product_name FROM products WHERE product_no = 'XPROD'"
+            ).fetchone()[0]
+        assert name == "첫 이름"
+
+        # 이미 상품명이 있으면 덮어쓰지 않음
+        path = xlsx_path([["XPROD", "새 이름", "작성자", 5, "", "재등록"]])
+        with get_db() as db:
+            import_workbook(db, path)
+            name = db.execute(
+                "SELECT product_name FROM products WHERE product_no = 'XPROD'"
+            ).fetchone()[0]
+        assert name == "첫 이름"
+
+    def test_reported_errors_capped(self, xlsx_path, monkeypatch):
+        monkeypatch.setattr(excel_import, "MAX_REPORTED_ERRORS", 2)
+        path = xlsx_path([["", "", "", 0, "", ""] for _ in range(4)])
+        with get_db() as db:
+            result = import_workbook(db, path)
+        assert result.fail_count == 4
+        assert [e.row for e in result.errors] == [2, 3]
+
+    def test_stats_updated(self, client, xlsx_path):
+        path = xlsx_path([["XSTATS", "", "작성자", 4, "", "통계"] for _ in range(3)])
+        with get_db() as db:
+            import_workbook(db, path, chunk_size=2)
+        data = client.get("/api/widget/reviews/XSTATS").json()
+        assert data["total_reviews"] == 3
+        assert data["average_rating"] == 4.0
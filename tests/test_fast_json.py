@@ -0,0 +1,90 @@
+"""FAST_JSON 경로가 기존 Pydantic 경로와 바이트 단위로 같은 응답을 내는지 테스트."""
+
+import json
+
+import pytest
+
+from app import config
+from app.database import get_db
+from app.utils.cache import widget_cache
+from app.utils.fast_json import dumps
+
+PRODUCT_NO = "FAST_JSON"
+
+_VARIANTS = json.dumps([
+    {"name": "thumb", "format": "webp", "width": 160, "height": 120,
+     "file_path": "blobs/fa/st/fast_thumb.webp", "file_size": 1234},
+    {"name": "thumb", "format": "jpeg", "width": 160, "height": 120,
+     "file_path": "blobs/fa/st/fast_thumb.jpg", "file_size": 2345},
+])
+
+
+@pytest.fixture(scope="module")
+def reviews(setup_db):
+    texts = [
+        "평범한 리뷰",
+        'Quote " backslash \\ slash / 탭\t줄바꿈\n제어\x01문자',
+        "이모지 😀 와   구분자",
+    ]
+    with get_db() as db:
+        ids = []
+        for i, text in enumerate(texts * 3):
+            ids.append(db.execute(
+                "INSERT INTO reviews (product_no, product_name, author, rating, title, "
+                "content, is_visible, display_order) VALUES (?, ?, ?, ?, ?, ?, 1, ?)",
+                (PRODUCT_NO, "상품 \"이름\"", f"작성자{i}", i % 5 + 1,
+                 "" if i % 2 else "제목", text, i % 3),
+            ).lastrowid)
+        db.execute(
+            "INSERT INTO review_images (review_id, file_path, original_name, file_size, "
+            "variant_status, variants) VALUES (?, ?, ?, ?, 'ready', ?)",
+            (ids[0], "blobs/fa/st/fast.jpg", "사진 1.jpg", 5000, _VARIANTS),
+        )
+        db.execute(
+            "INSERT INTO review_images (review_id, file_path, original_name) VALUES (?, ?, NULL)",
+            (ids[1], "blobs/fa/st/other.png"),
+        )
+    return ids
+
+
+def _fetch(client, monkeypatch, url: str, fast: bool) -> bytes:
+    monkeypatch.setattr(config, "FAST_JSON", fast)
+    widget_cache.clear()
+    resp = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert resp.status_code == 200
+    return resp.content
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        f"/api/widget/reviews/{PRODUCT_NO}?per_page=50",
+        f"/api/widget/reviews/{PRODUCT_NO}?per_page=2&cursor=",
+        f"/api/widget/reviews/{PRODUCT_NO}?photo_only=true&sort=rating_high",
+        f"/api/reviews?product_no={PRODUCT_NO}&per_page=50",
+        f"/api/reviews?product_no={PRODUCT_NO}&per_page=2&cursor=",
+        f"/api/reviews?product_no={PRODUCT_NO}&count=none",
+        f"/api/reviews?search=리뷰&sort=relevance&product_no={PRODUCT_NO}",
+        "/api/widget/reviews/FAST_JSON_EMPTY",
+    ],
+)
+def test_byte_identical(client, monkeypatch, reviews, url):
+    slow = _fetch(client, monkeypatch, url, fast=False)
+    fast = _fetch(client, monkeypatch, url, fast=True)
+    assert fast == slow
+
+
+def test_fast_path_keeps_cache_headers(client, monkeypatch, reviews):
+    monkeypatch.setattr(config, "FAST_JSON", True)
+    url = f"/api/reviews?product_no={PRODUCT_NO}"
+    resp = client.get(url)
+    assert resp.headers["cache-control"] == "private, no-cache"
+    assert client.get(url, headers={"If-None-Match": resp.headers["etag"]}).status_code == 304
+
+
+def test_dumps_matches_json_response():
+    content = {"a": "한글 \x00 \"", "b": [1, 2.5, None, True], "c": 4.0}
+    expected = json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+    assert dumps(content) == expected
@@ -0,0 +1,175 @@
+"""ETag / Last-Modified 조건부 요청 테스트."""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+from fastapi import Request
+
+from app.utils import http_cache
+
+
+@pytest.fixture
+def later(monkeypatch):
+    """http_cache가 보는 현재 시각을 2초 뒤로 옮긴다 (변경된 초가 지난 상태)."""
+    now = http_cache._now
+    monkeypatch.setattr(http_cache, "_now", lambda: now() + timedelta(seconds=2))
+
+
+def _create(client, product_no: str) -> int:
+    resp = client.post(
+        "/api/reviews",
+        json={
+            "product_no": product_no,
+            "author": "이태그",
+            "rating": 5,
+            "content": "조건부 요청 테스트",
+        },
+    )
+    return resp.json()["id"]
+
+
+class TestWidgetConditionalGet:
+    def test_etag_and_304(self, client, later):
+        _create(client, "ETAG_WIDGET")
+        resp = client.get("/api/widget/reviews/ETAG_WIDGET")
+        assert resp.status_code == 200
+        etag = resp.headers["etag"]
+        assert etag.startswith('"')
+        assert "max-age" in resp.headers["cache-control"]
+        assert "last-modified" in resp.headers
+
+        resp = client.get(
+            "/api/widget/reviews/ETAG_WIDGET", headers={"If-None-Match": etag}
+        )
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers["etag"] == etag
+
+    def test_etag_changes_after_write(self, client):
+        review_id = _create(client, "ETAG_WRITE")
+        etag = client.get("/api/widget/reviews/ETAG_WRITE").headers["etag"]
+
+        client.put(f"/api/reviews/{review_id}", json={"content": "수정된 내용"})
+        resp = client.get(
+            "/api/widget/reviews/ETAG_WRITE", headers={"If-None-Match": etag}
+        )
+        assert resp.status_code == 200
+        assert resp.headers["etag"] != etag
+        assert resp.json()["items"][0]["content"] == "수정된 내용"
+
+    def test_etag_differs_by_query(self, client):
+        _create(client, "ETAG_QUERY")
+        first = client.get("/api/widget/reviews/ETAG_QUERY?page=1").headers["etag"]
+        second = client.get("/api/widget/reviews/ETAG_QUERY?page=2").headers["etag"]
+        assert first != second
+
+    def test_if_modified_since(self, client, later):
+        _create(client, "ETAG_IMS")
+        resp = client.get("/api/widget/reviews/ETAG_IMS")
+        last_modified = resp.headers["last-modified"]
+        resp = client.get(
+            "/api/widget/reviews/ETAG_IMS",
+            headers={"If-Modified-Since": last_modified},
+        )
+        assert resp.status_code == 304
+
+    def test_etag_wins_over_if_modified_since(self, client, later):
+        review_id = _create(client, "ETAG_BOTH")
+        first = client.get("/api/widget/reviews/ETAG_BOTH")
+        client.put(f"/api/reviews/{review_id}", json={"content": "수정된 내용"})
+        resp = client.get(
+            "/api/widget/reviews/ETAG_BOTH",
+            headers={
+                "If-None-Match": first.headers["etag"],
+                "If-Modified-Since": "Fri, 31 Dec 9999 23:59:59 GMT",
+            },
+        )
+        assert resp.status_code == 200
+
+
+class TestAdminConditionalGet:
+    def test_list_reviews(self, client):
+        _create(client, "ETAG_LIST")
+        resp = client.get("/api/reviews?product_no=ETAG_LIST")
+        etag = resp.headers["etag"]
+        assert resp.headers["cache-control"] == "private, no-cache"
+        resp = client.get(
+            "/api/reviews?product_no=ETAG_LIST", headers={"If-None-Match": etag}
+        )
+        assert resp.status_code == 304
+
+    def test_get_review_changes_with_images(self, client):
+        review_id = _create(client, "ETAG_DETAIL")
+        etag = client.get(f"/api/reviews/{review_id}").headers["etag"]
+        resp = client.get(
+            f"/api/reviews/{review_id}", headers={"If-None-Match": f"W/{etag}"}
+        )
+        assert resp.status_code == 304
+
+        client.post(
+            f"/api/reviews/{review_id}/images",
+            files={"files": ("a.jpg", b"\xff\xd8\xff\xe0" + b"\x00" * 10, "image/jpeg")},
+        )
+        resp = client.get(
+            f"/api/reviews/{review_id}", headers={"If-None-Match": etag}
+        )
+        assert resp.status_code == 200
+        assert len(resp.json()["images"]) == 1
+
+    def test_stats_global_version(self, client):
+        etag = client.get("/api/stats").headers["etag"]
+        assert client.get("/api/stats", headers={"If-None-Match": etag}).status_code == 304
+        _create(client, "ETAG_STATS")
+        assert client.get("/api/stats", headers={"If-None-Match": etag}).status_code == 200
+
+    def test_openapi_schema_still_builds(self, client):
+        assert client.get("/openapi.json").status_code == 200
+
+
+def _request(**headers: str) -> Request:
+    raw = [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "headers": raw})
+
+
+class TestSameSecondWrites:
+    """Last-Modified는 초 단위라 같은 초의 두 번째 쓰기를 구분하지 못한다."""
+
+    def _version(self) -> http_cache.Version:
+        updated_at = datetime.now(timezone.utc).replace(microsecond=0)
+        return http_cache.Version(2, updated_at)
+
+    def test_no_last_modified_until_second_passes(self, monkeypatch):
+        version = self._version()
+        monkeypatch.setattr(http_cache, "_now", lambda: version.updated_at)
+        headers = http_cache.cache_headers('"e"', version, "no-cache")
+        assert "Last-Modified" not in headers
+
+        monkeypatch.setattr(
+            http_cache, "_now", lambda: version.updated_at + timedelta(seconds=1)
+        )
+        headers = http_cache.cache_headers('"e"', version, "no-cache")
+        assert headers["Last-Modified"] == format_datetime(
+            version.updated_at, usegmt=True
+        )
+
+    def test_if_modified_since_within_same_second(self, monkeypatch):
+        version = self._version()
+        since = format_datetime(version.updated_at, usegmt=True)
+        request = _request(if_modified_since=since)
+
+        monkeypatch.setattr(
+            http_cache, "_now", lambda: version.updated_at + timedelta(milliseconds=500)
+        )
+        assert not http_cache.is_not_modified(request, '"e"', version)
+
+        monkeypatch.setattr(
+            http_cache, "_now", lambda: version.updated_at + timedelta(seconds=2)
+        )
+        assert http_cache.is_not_modified(request, '"e"', version)
+
+    def test_etag_only_when_both_present(self, later):
+        version = self._version()
+        since = format_datetime(version.updated_at, usegmt=True)
+        request = _request(if_none_match='"old"', if_modified_since=since)
+        assert not http_cache.is_not_modified(request, '"new"', version)
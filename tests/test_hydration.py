@@ -0,0 +1,104 @@
+"""리뷰 이미지 일괄 로딩(N+1 제거) 테스트."""
+
+import io
+from contextlib import contextmanager
+
+import pytest
+
+from app.database import get_db, get_db_executor, get_db_writer
+from app.utils.image_variants import wait_for_variants
+
+
+def _upload_image(client, review_id: int) -> None:
+    image_file = io.BytesIO(b"\x89PNG\r\n\x1a\n" + b"\x00" * 100)
+    resp = client.post(
+        f"/api/reviews/{review_id}/images",
+        files=[("files", ("hydrate.png", image_file, "image/png"))],
+    )
+    assert resp.status_code == 201
+
+
+@pytest.fixture()
+def statement_counter():
+    """요청 처리 중 실행된 SQL 문을 기록하는 DB 연결 팩토리로 바꿔 끼운다."""
+    statements: list[str] = []
+
+    @contextmanager
+    def counting_connection():
+        with get_db() as conn:
+            conn.set_trace_callback(statements.append)
+            try:
+                yield conn
+            finally:
+                conn.set_trace_callback(None)
+
+    executor, writer = get_db_executor(), get_db_writer()
+    writer_connection = writer.connection
+    executor.connection = writer.connection = counting_connection
+    yield statements
+    executor.connection = get_db
+    writer.connection = writer_connection
+
+
+def _seed(client, product_no: str, count: int) -> None:
+    for i in range(count):
+        resp = client.post(
+            "/api/reviews",
+            json={
+                "product_no": product_no,
+                "author": f"수화작성자{i}",
+                "rating": 5,
+                "content": f"일괄 로딩 테스트 {i}",
+            },
+        )
+        _upload_image(client, resp.json()["id"])
+    # 백그라운드 변형 생성의 쓰기가 문장 수에 섞이지 않도록
+    wait_for_variants()
+
+
+def _image_selects(statements: list[str]) -> list[str]:
+    return [s for s in statements if "FROM review_images WHERE review_id IN" in s]
+
+
+class TestBatchedHydration:
+    def test_list_reviews_constant_queries(self, client, statement_counter):
+        _seed(client, "HYDRATE_LIST", 6)
+
+        statement_counter.clear()
+        resp = client.get("/api/reviews?product_no=HYDRATE_LIST&per_page=2")
+        assert resp.status_code == 200
+        small_page = len(statement_counter)
+
+        statement_counter.clear()
+        resp = client.get("/api/reviews?product_no=HYDRATE_LIST&per_page=6")
+        data = resp.json()
+        assert len(data["items"]) == 6
+        assert all(len(item["images"]) == 1 for item in data["items"])
+        assert len(statement_counter) == small_page
+        assert len(_image_selects(statement_counter)) == 1
+
+    def test_widget_constant_queries(self, client, statement_counter):
+        _seed(client, "HYDRATE_WIDGET", 6)
+
+        statement_counter.clear()
+        client.get("/api/widget/reviews/HYDRATE_WIDGET?per_page=1")
+        small_page = len(statement_counter)
+
+        statement_counter.clear()
+        resp = client.get("/api/widget/reviews/HYDRATE_WIDGET?per_page=6")
+        data = resp.json()
+        assert len(data["items"]) == 6
+        assert all(len(item["images"]) == 1 for item in data["items"])
+        assert len(statement_counter) == small_page
+        assert len(_image_selects(statement_counter)) == 1
+
+    def test_images_grouped_per_review(self, client, sample_review):
+        first = client.post("/api/reviews", json=sample_review).json()["id"]
+        second = client.post("/api/reviews", json=sample_review).json()["id"]
+        _upload_image(client, first)
+        _upload_image(client, first)
+
+        resp = client.get(f"/api/reviews/{first}")
+        assert len(resp.json()["images"]) == 2
+        resp = client.get(f"/api/reviews/{second}")
+        assert resp.json()["images"] == []
@@ -0,0 +1,173 @@
+"""업로드 이미지 변형(썸네일/반응형) 생성 테스트."""
+
+import json
+import os
+import time
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from app import config
+from app.database import get_db
+from app.utils import image_variants
+from app.utils.image_variants import generate_variants, process_image
+from app.utils.storage import wait_for_cleanup
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _stop_workers():
+    yield
+    image_variants.shutdown()
+
+
+def _image_bytes(size: tuple[int, int], fmt: str = "JPEG", mode: str = "RGB") -> bytes:
+    buf = BytesIO()
+    Image.new(mode, size, (200, 100, 50, 128)[: len(mode)]).save(buf, fmt)
+    return buf.getvalue()
+
+
+def _write_upload(relative: str, data: bytes) -> str:
+    full_path = os.path.join(config.UPLOAD_DIR, relative)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, "wb") as f:
+        f.write(data)
+    return relative
+
+
+def _create_review(client, product_no: str) -> int:
+    resp = client.post(
+        "/api/reviews",
+        json={"product_no": product_no, "author": "작성자", "rating": 5, "content": "내용"},
+    )
+    return resp.json()["id"]
+
+
+def _upload(client, review_id: int, data: bytes, name: str = "photo.jpg") -> dict:
+    resp = client.post(
+        f"/api/reviews/{review_id}/images",
+        files={"files": (name, BytesIO(data), "image/jpeg")},
+    )
+    assert resp.status_code == 201
+    return resp.json()[0]
+
+
+def _wait_for_status(image_id: int, timeout: float = 10.0) -> str:
+    deadline = time.monotonic() + timeout
+    while True:
+        with get_db() as db:
+            status = db.execute(
+                "SELECT variant_status FROM review_images WHERE id = ?", (image_id,)
+            ).fetchone()[0]
+        if status != image_variants.PENDING:
+            return status
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+
+
+class TestGenerateVariants:
+    @pytest.fixture()
+    def source(self, tmp_path):
+        def write(name: str, data: bytes) -> str:
+            path = tmp_path / name
+            path.write_bytes(data)
+            return str(path)
+
+        return write
+
+    def test_widths_and_formats(self, source, tmp_path):
+        variants = generate_variants(
+            source("large.jpg", _image_bytes((2000, 1500))), str(tmp_path)
+        )
+
+        sizes = {(v["name"], v["format"]): (v["width"], v["height"]) for v in variants}
+        assert sizes[("thumb", "webp")] == (160, 120)
+        assert sizes[("card", "jpeg")] == (480, 360)
+        assert sizes[("lightbox", "webp")] == (1280, 960)
+        assert len(variants) == 6
+        for v in variants:
+            assert os.path.getsize(tmp_path / v["file_path"]) == v["file_size"]
+        assert {v["file_path"] for v in variants} >= {"thumb.webp", "card.jpg"}
+
+    def test_never_upscales(self, source, tmp_path):
+        variants = generate_variants(
+            source("small.png", _image_bytes((300, 200), "PNG")), str(tmp_path)
+        )
+        widths = {v["name"]: v["width"] for v in variants}
+        assert widths == {"lightbox": 300, "card": 300, "thumb": 160}
+
+    def test_transparent_png_flattened_for_jpeg(self, source, tmp_path):
+        variants = generate_variants(
+            source("alpha.png", _image_bytes((400, 400), "PNG", "RGBA")), str(tmp_path)
+        )
+        jpeg = next(v for v in variants if v["format"] == "jpeg")
+        with Image.open(tmp_path / jpeg["file_path"]) as im:
+            assert im.mode == "RGB"
+
+    def test_animated_gif_skipped(self, source, tmp_path):
+        frames = [Image.new("RGB", (50, 50), color) for color in ("red", "blue")]
+        buf = BytesIO()
+        frames[0].save(buf, "GIF", save_all=True, append_images=frames[1:])
+        assert generate_variants(source("anim.gif", buf.getvalue()), str(tmp_path)) == []
+
+
+class TestUploadPipeline:
+    def test_variants_generated_after_upload(self, client):
+        review_id = _create_review(client, "VARIANT_OK")
+        image = _upload(client, review_id, _image_bytes((1000, 800)))
+        assert image["variant_status"] == "pending"
+
+        assert _wait_for_status(image["id"]) == "ready"
+        review = client.get(f"/api/reviews/{review_id}").json()
+        variants = review["images"][0]["variants"]
+        assert {v["name"] for v in variants} == {"thumb", "card", "lightbox"}
+
+        widget = client.get("/api/widget/reviews/VARIANT_OK").json()
+        assert widget["all_photo_urls"] == [image["file_path"]]
+        assert widget["all_photos"][0]["variants"] == variants
+
+    def test_undecodable_file_marked_failed(self, client):
+        review_id = _create_review(client, "VARIANT_FAIL")
+        image = _upload(client, review_id, b"\xff\xd8\xff\xe0" + b"\x00" * 96)
+        assert _wait_for_status(image["id"]) == "failed"
+        review = client.get(f"/api/reviews/{review_id}").json()
+        assert review["images"][0]["variants"] == []
+
+    def test_widget_etag_changes_when_variants_ready(self, client):
+        review_id = _create_review(client, "VARIANT_ETAG")
+        with get_db() as db:
+            image_id = db.execute(
+                "INSERT INTO review_images (review_id, file_path) VALUES (?, ?)",
+                (review_id, _write_upload(f"review_{review_id}/a.jpg", _image_bytes((600, 400)))),
+            ).lastrowid
+        before = client.get("/api/widget/reviews/VARIANT_ETAG")
+
+        assert process_image(image_id) == "ready"
+        after = client.get("/api/widget/reviews/VARIANT_ETAG")
+        assert after.headers["etag"] != before.headers["etag"]
+        assert after.json()["items"][0]["images"][0]["variant_status"] == "ready"
+
+    def test_delete_image_removes_variant_files(self, client):
+        review_id = _create_review(client, "VARIANT_DEL")
+        image = _upload(client, review_id, _image_bytes((500, 500)))
+        _wait_for_status(image["id"])
+        with get_db() as db:
+            variants = json.loads(db.execute(
+                "SELECT variants FROM review_images WHERE id = ?", (image["id"],)
+            ).fetchone()[0])
+        assert variants
+
+        assert client.delete(f"/api/images/{image['id']}").status_code == 200
+        wait_for_cleanup()
+        for v in variants:
+            assert not os.path.exists(os.path.join(config.UPLOAD_DIR, v["file_path"]))
+
+    def test_deleted_before_processing(self, client):
+        review_id = _create_review(client, "VARIANT_GONE")
+        with get_db() as db:
+            image_id = db.execute(
+                "INSERT INTO review_images (review_id, file_path) VALUES (?, ?)",
+                (review_id, _write_upload(f"review_{review_id}/b.jpg", _image_bytes((300, 300)))),
+            ).lastrowid
+            db.execute("DELETE FROM review_images WHERE id = ?", (image_id,))
+        assert process_image(image_id) == image_variants.FAILED
@@ -1,7 +1,21 @@
 """이미지 업로드/삭제 API 테스트."""
 
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
 from io import BytesIO
 
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app import config
+from app.database import get_connection, get_db
+from app.routers import images
+from app.utils import storage
+
 
 def _create_test_image(name: str = "test.jpg", size: int = 100) -> tuple:
     """테스트용 JPEG 이미지 파일을 생성한다."""
@@ -71,6 +85,241 @@ class TestImageUpload:
         assert resp.status_code == 400
 
 
+def _incoming_files() -> list[str]:
+    incoming_dir = os.path.join(config.UPLOAD_DIR, storage.INCOMING_DIR)
+    return os.listdir(incoming_dir) if os.path.isdir(incoming_dir) else []
+
+
+def _blob_refs(file_path: str):
+    with get_db() as db:
+        row = db.execute(
+            "SELECT ref_count FROM image_blobs WHERE file_path = ?", (file_path,)
+        ).fetchone()
+    return row[0] if row else None
+
+
+def _write_lock_free() -> bool:
+    """다른 연결이 쓰기 잠금을 잡고 있지 않은지 (기다리지 않고 확인)."""
+    conn = get_connection()
+    try:
+        conn.execute("PRAGMA busy_timeout = 0")
+        conn.execute("BEGIN IMMEDIATE")
+        conn.rollback()
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+
+class TestStreamingUpload:
+    def test_saved_in_chunks(self, client, sample_review, monkeypatch):
+        monkeypatch.setattr(storage, "_CHUNK_SIZE", 7)
+        review_id = client.post("/api/reviews", json=sample_review).json()["id"]
+        content = b"\xff\xd8\xff\xe0" + bytes(range(256)) * 4
+        resp = client.post(
+            f"/api/reviews/{review_id}/images",
+            files={"files": ("chunked.jpg", BytesIO(content), "image/jpeg")},
+        )
+        data = resp.json()[0]
+        assert data["file_size"] == len(content)
+        assert data["file_path"] == storage.blob_path(hashlib.sha256(content).hexdigest(), ".jpg")
+        with open(os.path.join(config.UPLOAD_DIR, data["file_path"]), "rb") as f:
+            assert f.read() == content
+        assert _incoming_files() == []
+
+    def test_oversize_rejected_without_leftover(self, client, sample_review, monkeypatch):
+        monkeypatch.setattr(config, "MAX_IMAGE_SIZE", 50)
+        review_id = client.post("/api/reviews", json=sample_review).json()["id"]
+        resp = client.post(
+            f"/api/reviews/{review_id}/images",
+            files={"files": _create_test_image(size=51)},
+        )
+        assert resp.status_code == 400
+        assert _incoming_files() == []
+
+    def test_oversize_rejected_while_streaming(self, monkeypatch):
+        """크기를 모르는 스트림도 한도를 넘는 순간 중단하고 임시 파일을 지운다."""
+        monkeypatch.setattr(config, "MAX_IMAGE_SIZE", 20)
+        monkeypatch.setattr(storage, "_CHUNK_SIZE", 8)
+        upload = UploadFile(
+            BytesIO(b"x" * 1000),
+            filename="stream.jpg",
+            headers={"content-type": "image/jpeg"},
+        )
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(storage.save_image(upload))
+        assert exc_info.value.status_code == 400
+        assert upload.file.tell() <= 24  # 한도 근처까지만 읽음
+        assert _incoming_files() == []
+
+    def test_failed_batch_rolls_back(self, client, sample_review):
+        review_id = client.post("/api/reviews", json=sample_review).json()["id"]
+        content = b"\xff\xd8\xff\xe0batch-rollback"
+        files = [
+            ("files", ("ok.jpg", BytesIO(content), "image/jpeg")),
+            ("files", ("empty.jpg", BytesIO(b""), "image/jpeg")),
+        ]
+        resp = client.post(f"/api/reviews/{review_id}/images", files=files)
+        assert resp.status_code == 400
+        assert _incoming_files() == []
+        assert client.get(f"/api/reviews/{review_id}").json()["images"] == []
+        path = storage.blob_path(hashlib.sha256(content).hexdigest(), ".jpg")
+        assert _blob_refs(path) is None
+
+
+class TestDeduplication:
+    def _upload(self, client, review_id: int, content: bytes, name: str) -> dict:
+        resp = client.post(
+            f"/api/reviews/{review_id}/images",
+            files={"files": (name, BytesIO(content), "image/jpeg")},
+        )
+        assert resp.status_code == 201
+        return resp.json()[0]
+
+    def test_same_content_shares_one_file(self, client, sample_review):
+        content = b"\xff\xd8\xff\xe0shared-photo"
+        first_review = client.post("/api/reviews", json=sample_review).json()["id"]
+        second_review = client.post("/api/reviews", json=sample_review).json()["id"]
+        first = self._upload(client, first_review, content, "a.jpg")
+        second = self._upload(client, second_review, content, "b.JPEG")
+
+        assert first["file_path"] == second["file_path"]
+        assert first["file_path"].startswith("blobs/")
+        assert _blob_refs(first["file_path"]) == 2
+        full_path = os.path.join(config.UPLOAD_DIR, first["file_path"])
+
+        # 참조가 남아 있으면 파일 유지
+        assert client.delete(f"/api/images/{first['id']}").status_code == 200
+        storage.wait_for_cleanup()
+        assert os.path.exists(full_path)
+        assert _blob_refs(first["file_path"]) == 1
+
+        # 리뷰 삭제(CASCADE)로 마지막 참조가 사라지면 파일 삭제
+        assert client.delete(f"/api/reviews/{second_review}").status_code == 200
+        storage.wait_for_cleanup()
+        assert not os.path.exists(full_path)
+        assert _blob_refs(first["file_path"]) is None
+
+    def test_reupload_after_delete(self, client, sample_review):
+        content = b"\xff\xd8\xff\xe0reupload"
+        review_id = client.post("/api/reviews", json=sample_review).json()["id"]
+        image = self._upload(client, review_id, content, "a.jpg")
+        client.delete(f"/api/images/{image['id']}")
+        storage.wait_for_cleanup()
+        image = self._upload(client, review_id, content, "a.jpg")
+        assert os.path.exists(os.path.join(config.UPLOAD_DIR, image["file_path"]))
+        assert _blob_refs(image["file_path"]) == 1
+
+    def test_blob_stored_off_writer_thread(self, client, sample_review, monkeypatch):
+        """저장소 배치(exists/put)는 쓰기 스레드의 트랜잭션 밖에서 실행된다."""
+        threads: list[str] = []
+        store_blob = storage.store_blob
+
+        def record(saved: dict) -> bool:
+            threads.append(threading.current_thread().name)
+            return store_blob(saved)
+
+        monkeypatch.setattr(images, "store_blob", record)
+        review_id = client.post("/api/reviews", json=sample_review).json()["id"]
+        self._upload(client, review_id, b"\xff\xd8\xff\xe0off-writer", "a.jpg")
+        assert threads and "db-writer" not in threads
+
+    def test_upload_overlapping_cleanup_rejected(self, client, sample_review, monkeypatch):
+        """배치한 뒤 같은 blob이 정리되었으면 등록하지 않고 503 (파일 없는 참조 방지)."""
+        store_blob = storage.store_blob
+
+        def store_then_cleaned(saved: dict) -> bool:
+            stored = store_blob(saved)
+            with get_db() as db:
+                db.execute(
+                    "INSERT INTO image_blob_deletions (file_path, started_at) VALUES (?, ?)",
+                    (saved["file_path"], time.time()),
+                )
+            return stored
+
+        monkeypatch.setattr(images, "store_blob", store_then_cleaned)
+        review_id = client.post("/api/reviews", json=sample_review).json()["id"]
+        resp = client.post(
+            f"/api/reviews/{review_id}/images",
+            files={"files": ("a.jpg", BytesIO(b"\xff\xd8\xff\xe0raced"), "image/jpeg")},
+        )
+        assert resp.status_code == 503
+        assert client.get(f"/api/reviews/{review_id}").json()["images"] == []
+
+
+class TestGarbageCollection:
+    def _write(self, relative: str, content: bytes = b"data") -> str:
+        full_path = os.path.join(config.UPLOAD_DIR, relative)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "wb") as f:
+            f.write(content)
+        return full_path
+
+    def test_reconciles_disk_and_rows(self, client, sample_review):
+        review_id = client.post("/api/reviews", json=sample_review).json()["id"]
+        kept = client.post(
+            f"/api/reviews/{review_id}/images",
+            files={"files": ("keep.jpg", BytesIO(b"\xff\xd8\xff\xe0gc-keep"), "image/jpeg")},
+        ).json()[0]
+        kept_path = os.path.join(config.UPLOAD_DIR, kept["file_path"])
+        variant = self._write(os.path.splitext(kept["file_path"])[0] + "_thumb.webp")
+        orphan = self._write("blobs/zz/zz/orphan.jpg")
+        stale = self._write("blobs/zz/zz/stale.jpg")
+        with get_db() as db:
+            db.execute(
+                "INSERT INTO image_blobs (file_path, ref_count) VALUES (?, 3)",
+                ("blobs/zz/zz/stale.jpg",),
+            )
+            db.execute(
+                "UPDATE image_blobs SET ref_count = 5 WHERE file_path = ?",
+                (kept["file_path"],),
+            )
+
+        with get_db() as db:
+            preview = storage.collect_garbage(db, grace_seconds=0, dry_run=True)
+        assert os.path.exists(orphan) and os.path.exists(stale)
+        assert preview["unreferenced"] >= 1
+
+        with get_db() as db:
+            stats = storage.collect_garbage(db, grace_seconds=0)
+        assert stats["recounted"] >= 2
+        assert stats["unreferenced"] >= 1
+        assert stats["orphan_files"] >= 1
+        assert not os.path.exists(orphan)
+        assert not os.path.exists(stale)
+        assert os.path.exists(kept_path) and os.path.exists(variant)
+        assert _blob_refs(kept["file_path"]) == 1
+
+    def test_storage_deleted_without_write_lock(self, monkeypatch):
+        """참조 없는 blob과 고아 파일을 지우는 동안 쓰기 잠금을 잡지 않는다."""
+        orphan = self._write("blobs/zz/zx/orphan.jpg")
+        self._write("blobs/zz/zx/unreferenced.jpg")
+        with get_db() as db:
+            db.execute(
+                "INSERT INTO image_blobs (file_path, ref_count) VALUES (?, 0)",
+                ("blobs/zz/zx/unreferenced.jpg",),
+            )
+        lock_free: list[bool] = []
+        remove_files = storage.remove_files
+
+        def record(file_path: str) -> None:
+            lock_free.append(_write_lock_free())
+            remove_files(file_path)
+
+        monkeypatch.setattr(storage, "remove_files", record)
+        with get_db() as db:
+            storage.collect_garbage(db, grace_seconds=0)
+        assert lock_free and all(lock_free)
+        assert not os.path.exists(orphan)
+
+    def test_grace_period_keeps_recent_files(self):
+        recent = self._write("blobs/zz/zy/recent.jpg")
+        with get_db() as db:
+            storage.collect_garbage(db, grace_seconds=3600)
+        assert os.path.exists(recent)
+
+
 class TestImageDelete:
     def test_delete_image(self, client, sample_review):
         # 리뷰 + 이미지 생성
@@ -86,6 +335,58 @@ class TestImageDelete:
         assert resp.status_code == 200
         assert resp.json()["detail"] == "삭제되었습니다"
 
+    def test_files_removed_off_writer_thread(self, client, sample_review, monkeypatch):
+        """파일 삭제는 쓰기 스레드가 아니라 정리 스레드에서 실행된다."""
+        threads: list[str] = []
+        remove_files = storage.remove_files
+
+        def record(file_path: str) -> None:
+            threads.append(threading.current_thread().name)
+            remove_files(file_path)
+
+        monkeypatch.setattr(storage, "remove_files", record)
+        review_id = client.post("/api/reviews", json=sample_review).json()["id"]
+        resp = client.post(
+            f"/api/reviews/{review_id}/images",
+            files={"files": ("gone.png", BytesIO(b"\x89PNG\r\n\x1a\noffwriter"), "image/png")},
+        )
+        image_id = resp.json()[0]["id"]
+        assert client.delete(f"/api/images/{image_id}").status_code == 200
+        storage.wait_for_cleanup()
+        assert threads and all(name.startswith("image-cleanup") for name in threads)
+
+    def test_files_removed_without_write_lock(self, client, sample_review, monkeypatch):
+        """저장소 삭제는 참조 확인을 커밋한 뒤 잠금 없이 하고, 진행 중임을 기록한다."""
+        seen: list[tuple[bool, object]] = []
+        remove_files = storage.remove_files
+
+        def record(file_path: str) -> None:
+            with get_db() as db:
+                finished = db.execute(
+                    "SELECT finished_at FROM image_blob_deletions WHERE file_path = ?",
+                    (file_path,),
+                ).fetchone()
+            seen.append((_write_lock_free(), finished[0] if finished else "missing"))
+            remove_files(file_path)
+
+        monkeypatch.setattr(storage, "remove_files", record)
+        review_id = client.post("/api/reviews", json=sample_review).json()["id"]
+        resp = client.post(
+            f"/api/reviews/{review_id}/images",
+            files={"files": ("gone.png", BytesIO(b"\x89PNG\r\n\x1a\nunlocked"), "image/png")},
+        )
+        image = resp.json()[0]
+        assert client.delete(f"/api/images/{image['id']}").status_code == 200
+        storage.wait_for_cleanup()
+        assert seen == [(True, None)]
+        with get_db() as db:
+            row = db.execute(
+                "SELECT finished_at FROM image_blob_deletions WHERE file_path = ?",
+                (image["file_path"],),
+            ).fetchone()
+        assert row[0] is not None
+        assert _blob_refs(image["file_path"]) is None
+
     def test_delete_image_not_found(self, client):
         resp = client.delete("/api/images/99999")
         assert resp.status_code == 404
@@ -0,0 +1,214 @@
+"""백그라운드 엑셀 등록 작업 테스트."""
+
+import os
+import tempfile
+import threading
+import time
+from io import BytesIO
+
+import pytest
+from openpyxl import Workbook
+
+from app import config
+from app.database import get_db
+from app.utils import import_jobs
+
+_HEADER = ["상품번호", "상품명", "작성자명", "별점(1~5)", "리뷰제목", "리뷰내용"]
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _stop_worker():
+    """모듈 종료 시 워커 스레드를 멈춘다."""
+    yield
+    import_jobs.shutdown()
+
+
+def _workbook_bytes(rows: list[list]) -> bytes:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(_HEADER)
+    for row in rows:
+        ws.append(row)
+    buf = BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def _rows(product_no: str, count: int) -> list[list]:
+    return [[product_no, "", f"작성자{i}", 5, "", f"작업 {i}"] for i in range(count)]
+
+
+def _wait_for(client, job_id: int, timeout: float = 10.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/api/import-jobs/{job_id}").json()
+        if job["status"] in import_jobs.FINISHED_STATUSES:
+            return job
+        assert time.monotonic() < deadline, job
+        time.sleep(0.05)
+
+
+def _insert_job(rows: list[list], **fields) -> tuple[int, str]:
+    """워커에 넘기지 않은 작업 행을 직접 만든다."""
+    fd, path = tempfile.mkstemp(suffix=".xlsx", dir=config.IMPORT_DIR)
+    with os.fdopen(fd, "wb") as f:
+        f.write(_workbook_bytes(rows))
+    columns = {"filename": "direct.xlsx", "file_path": path, **fields}
+    with get_db() as db:
+        cursor = db.execute(
+            f"INSERT INTO import_jobs ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' * len(columns))})",
+            list(columns.values()),
+        )
+        return cursor.lastrowid, path
+
+
+def _count(product_no: str) -> int:
+    with get_db() as db:
+        return db.execute(
+            "SELECT COUNT(*) FROM reviews WHERE product_no = ?", (product_no,)
+        ).fetchone()[0]
+
+
+class TestImportJobApi:
+    def test_upload_returns_immediately_and_completes(self, client):
+        rows = _rows("JOB_OK", 3) + [["", "", "", 0, "", ""]]
+        resp = client.post(
+            "/api/import-jobs",
+            files={"file": ("reviews.xlsx", _workbook_bytes(rows), "application/octet-stream")},
+        )
+        assert resp.status_code == 202
+        created = resp.json()
+        assert created["status"] in ("queued", "running", "completed")
+        assert created["filename"] == "reviews.xlsx"
+
+        job = _wait_for(client, created["id"])
+        assert job["status"] == "completed"
+        assert job["total_rows"] == 4
+        assert job["processed_rows"] == 4
+        assert job["success_count"] == 3
+        assert job["fail_count"] == 1
+        assert job["errors"][0]["row"] == 5
+        assert _count("JOB_OK") == 3
+        with get_db() as db:
+            path = db.execute(
+                "SELECT file_path FROM import_jobs WHERE id = ?", (created["id"],)
+            ).fetchone()[0]
+        assert not os.path.exists(path)  # 종료된 작업의 업로드 파일은 삭제
+
+    def test_upload_spooled_outside_db_threads(self, client, monkeypatch):
+        """업로드 파일 보관은 DB 스레드(연결을 잡은 상태)에서 하지 않는다."""
+        threads: list[str] = []
+        spool_upload = import_jobs.spool_upload
+
+        def record(file, directory=None):
+            threads.append(threading.current_thread().name)
+            return spool_upload(file, directory=directory)
+
+        monkeypatch.setattr(import_jobs, "spool_upload", record)
+        resp = client.post(
+            "/api/import-jobs",
+            files={"file": ("spool.xlsx", _workbook_bytes(_rows("JOB_SPOOL", 1)), "application/octet-stream")},
+        )
+        assert resp.status_code == 202
+        assert threads and not threads[0].startswith("db")
+        assert _wait_for(client, resp.json()["id"])["status"] == "completed"
+
+    def test_writes_go_through_writer(self, client, monkeypatch):
+        """작업 상태/진행 상황 기록은 쓰기 스레드에서 실행된다."""
+        threads: set[str] = set()
+        for name in ("_claim", "_save_progress", "_finish"):
+            original = getattr(import_jobs, name)
+
+            def record(*args, _original=original, **kwargs):
+                threads.add(threading.current_thread().name)
+                return _original(*args, **kwargs)
+
+            monkeypatch.setattr(import_jobs, name, record)
+        resp = client.post(
+            "/api/import-jobs",
+            files={"file": ("writer.xlsx", _workbook_bytes(_rows("JOB_WRITER", 3)), "application/octet-stream")},
+        )
+        assert _wait_for(client, resp.json()["id"])["status"] == "completed"
+        assert threads == {"db-writer"}
+
+    def test_invalid_extension(self, client):
+        resp = client.post(
+            "/api/import-jobs",
+            files={"file": ("reviews.csv", b"a,b", "text/csv")},
+        )
+        assert resp.status_code == 400
+
+    def test_unreadable_file_fails_job(self, client):
+        resp = client.post(
+            "/api/import-jobs",
+            files={"file": ("broken.xlsx", b"not excel", "application/octet-stream")},
+        )
+        job = _wait_for(client, resp.json()["id"])
+        assert job["status"] == "failed"
+        assert job["error_message"] == "엑셀 파일을 읽을 수 없습니다."
+
+    def test_not_found(self, client):
+        assert client.get("/api/import-jobs/999999").status_code == 404
+        assert client.post("/api/import-jobs/999999/cancel").status_code == 404
+
+    def test_list_jobs(self, client):
+        job_id, _ = _insert_job(_rows("JOB_LIST", 1), status="completed")
+        jobs = client.get("/api/import-jobs", params={"limit": 5}).json()
+        assert jobs[0]["id"] == job_id
+
+
+class TestCancel:
+    def test_cancel_queued_job(self, client):
+        job_id, path = _insert_job(_rows("JOB_CANCEL_Q", 2))
+        resp = client.post(f"/api/import-jobs/{job_id}/cancel")
+        assert resp.status_code == 200
+        assert resp.json()["status"] == "cancelled"
+        assert not os.path.exists(path)
+
+        # 워커가 나중에 가져가도 처리하지 않음
+        import_jobs.run_job(job_id)
+        assert _count("JOB_CANCEL_Q") == 0
+
+    def test_cancel_finished_job_conflict(self, client):
+        job_id, _ = _insert_job(_rows("JOB_DONE", 1), status="completed")
+        assert client.post(f"/api/import-jobs/{job_id}/cancel").status_code == 409
+
+    def test_cancel_while_running(self, client, monkeypatch):
+        job_id, _ = _insert_job(_rows("JOB_CANCEL_R", 5))
+        save_progress = import_jobs._save_progress
+
+        def save_and_cancel(db, job_id, result, last_row):
+            save_progress(db, job_id, result, last_row)
+            db.execute("UPDATE import_jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+
+        monkeypatch.setattr(import_jobs, "_save_progress", save_and_cancel)
+        import_jobs.run_job(job_id, chunk_size=2)
+
+        job = client.get(f"/api/import-jobs/{job_id}").json()
+        assert job["status"] == "cancelled"
+        assert job["processed_rows"] == 2
+        assert _count("JOB_CANCEL_R") == 2
+
+
+class TestResume:
+    def test_running_job_resumes_after_last_committed_row(self, client):
+        job_id, _ = _insert_job(
+            _rows("JOB_RESUME", 5),
+            status="running",
+            processed_rows=2,
+            success_count=2,
+        )
+        import_jobs.run_job(job_id, chunk_size=2)
+
+        job = client.get(f"/api/import-jobs/{job_id}").json()
+        assert job["status"] == "completed"
+        assert job["processed_rows"] == 5
+        assert job["success_count"] == 5
+        assert _count("JOB_RESUME") == 3  # 이전 프로세스가 등록한 2건은 이 DB에 없음
+
+    def test_resume_jobs_enqueues_unfinished(self, client):
+        job_id, _ = _insert_job(_rows("JOB_STARTUP", 2), status="running")
+        assert import_jobs.resume_jobs() >= 1
+        assert _wait_for(client, job_id)["status"] == "completed"
+        assert _count("JOB_STARTUP") == 2
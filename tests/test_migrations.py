@@ -0,0 +1,153 @@
+"""스키마 마이그레이션 테스트."""
+
+import os
+import tempfile
+
+import pytest
+
+from app.database import _CREATE_TABLES_SQL, _open_connection
+from app.migrations import (
+    MIGRATIONS,
+    Migration,
+    build_online_indexes,
+    current_version,
+    main,
+    migrate,
+    start_online_builds,
+    wait_for_online_builds,
+)
+
+_LATEST = max(step.version for step in MIGRATIONS)
+
+
+@pytest.fixture()
+def db_path():
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    yield path
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+
+@pytest.fixture()
+def conn(db_path):
+    connection = _open_connection(db_path)
+    yield connection
+    connection.close()
+
+
+def _names(conn, kind: str) -> set[str]:
+    return {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type = ?", (kind,))
+    }
+
+
+class TestMigrate:
+    def test_fresh_db_reaches_latest(self, conn):
+        applied = migrate(conn)
+        assert [step.version for step in applied] == list(range(1, _LATEST + 1))
+        assert current_version(conn) == _LATEST
+        assert {"reviews", "review_images", "products", "product_review_stats",
+                "data_versions"} <= _names(conn, "table")
+        assert "idx_reviews_widget_latest" in _names(conn, "index")
+
+    def test_second_run_is_noop(self, conn):
+        migrate(conn)
+        assert migrate(conn) == []
+        assert current_version(conn) == _LATEST
+
+    def test_dry_run_does_not_apply(self, conn):
+        todo = migrate(conn, dry_run=True)
+        assert [step.version for step in todo] == list(range(1, _LATEST + 1))
+        assert current_version(conn) == 0
+        assert "reviews" not in _names(conn, "table")
+
+    def test_legacy_bootstrap_db(self, conn):
+        """user_version 기록 이전의 DB(예전 부트스트랩)를 데이터 손실 없이 올린다."""
+        conn.executescript(
+            _CREATE_TABLES_SQL
+            + "CREATE INDEX IF NOT EXISTS idx_reviews_product_no ON reviews(product_no);"
+        )
+        conn.execute(
+            "INSERT INTO reviews (product_no, author, rating, content) "
+            "VALUES ('LEGACY', '기존 작성자', 4, '마이그레이션 이전 리뷰')"
+        )
+        conn.execute("INSERT INTO review_images (review_id, file_path) VALUES (1, 'a.jpg')")
+        conn.commit()
+
+        migrate(conn)
+
+        assert current_version(conn) == _LATEST
+        assert "idx_reviews_product_no" not in _names(conn, "index")
+        stats = conn.execute(
+            "SELECT review_count, rating_sum, photo_review_count "
+            "FROM product_review_stats WHERE product_no = 'LEGACY'"
+        ).fetchone()
+        assert tuple(stats) == (1, 4, 1)
+        hits = conn.execute(
+            "SELECT rowid FROM reviews_fts WHERE reviews_fts MATCH '\"이전 리뷰\"'"
+        ).fetchall()
+        assert [row[0] for row in hits] == [1]
+
+    def test_failed_step_rolls_back(self, conn):
+        steps = [
+            Migration(1, "ok", "CREATE TABLE IF NOT EXISTS a (id INTEGER);"),
+            Migration(2, "broken", "CREATE TABLE b (id INTEGER);\nNOT VALID SQL;"),
+            Migration(3, "after", "CREATE TABLE c (id INTEGER);"),
+        ]
+        with pytest.raises(Exception):
+            migrate(conn, steps)
+        assert current_version(conn) == 1
+        assert _names(conn, "table") == {"a"}
+
+    def test_steps_applied_in_version_order(self, conn):
+        steps = [
+            Migration(2, "second", "INSERT INTO log VALUES ('second');"),
+            Migration(1, "first", "CREATE TABLE log (name TEXT);\nINSERT INTO log VALUES ('first');"),
+        ]
+        migrate(conn, steps)
+        assert [row[0] for row in conn.execute("SELECT name FROM log")] == ["first", "second"]
+
+
+class TestOnlineBuilds:
+    def test_background_defers_index_build(self, db_path, conn):
+        migrate(conn, background=True)
+        assert current_version(conn) == _LATEST
+        assert "idx_reviews_widget_latest" not in _names(conn, "index")
+
+        start_online_builds(db_path)
+        assert wait_for_online_builds(timeout=10)
+        assert "idx_reviews_widget_latest" in _names(conn, "index")
+
+    def test_statements_go_through_write(self, conn):
+        migrate(conn, background=True)
+        seen = []
+
+        def write(fn, statement):
+            seen.append(statement)
+            fn(conn, statement)
+            conn.commit()
+
+        build_online_indexes(conn, write=write)
+        assert any("idx_reviews_widget_latest" in statement for statement in seen)
+        assert "idx_reviews_widget_latest" in _names(conn, "index")
+
+    def test_rebuild_is_idempotent(self, conn):
+        migrate(conn)
+        before = _names(conn, "index")
+        build_online_indexes(conn)
+        assert _names(conn, "index") == before
+
+
+class TestCli:
+    def test_dry_run_then_apply(self, db_path, capsys):
+        main(["--db", db_path, "--dry-run"])
+        assert "v1 create_tables" in capsys.readouterr().out
+
+        main(["--db", db_path])
+        assert f"-> {_LATEST}" in capsys.readouterr().out
+
+        main(["--db", db_path, "--dry-run"])
+        assert "대기 중인 단계 0개" in capsys.readouterr().out
@@ -0,0 +1,94 @@
+"""키셋(cursor) 페이지네이션 테스트."""
+
+import pytest
+
+from app.database import get_db
+
+
+@pytest.fixture(scope="module")
+def seeded_product():
+    """정렬 키가 겹치는(동점) 리뷰를 포함한 상품을 만든다."""
+    product_no = "CURSOR_PAGE"
+    rows = []
+    for i in range(23):
+        rows.append(
+            (
+                product_no,
+                f"커서작성자{i}",
+                (i % 5) + 1,
+                f"커서 테스트 {i}",
+                i % 3,  # display_order 동점
+                f"2026-01-{(i % 4) + 1:02d} 00:00:00",  # created_at 동점
+            )
+        )
+    with get_db() as db:
+        db.executemany(
+            "INSERT INTO reviews "
+            "(product_no, author, rating, content, display_order, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+    return product_no
+
+
+def _walk(client, url: str, per_page: int) -> list[int]:
+    ids: list[int] = []
+    cursor = ""
+    while True:
+        resp = client.get(url, params={"per_page": per_page, "cursor": cursor})
+        assert resp.status_code == 200
+        data = resp.json()
+        ids.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+class TestWidgetCursor:
+    @pytest.mark.parametrize("sort", ["latest", "rating_high", "rating_low"])
+    def test_cursor_matches_offset_order(self, client, seeded_product, sort):
+        url = f"/api/widget/reviews/{seeded_product}?sort={sort}"
+        expected = [
+            item["id"]
+            for item in client.get(url + "&per_page=50").json()["items"]
+        ]
+        assert len(expected) == 23
+        assert _walk(client, url, per_page=4) == expected
+
+    def test_photo_only_cursor(self, client, seeded_product):
+        url = f"/api/widget/reviews/{seeded_product}?photo_only=true"
+        assert _walk(client, url, per_page=5) == []
+
+    def test_offset_mode_has_no_cursor(self, client, seeded_product):
+        data = client.get(f"/api/widget/reviews/{seeded_product}").json()
+        assert data["next_cursor"] is None
+
+    def test_invalid_cursor(self, client, seeded_product):
+        resp = client.get(
+            f"/api/widget/reviews/{seeded_product}", params={"cursor": "garbage"}
+        )
+        assert resp.status_code == 400
+
+    def test_cursor_sort_mismatch(self, client, seeded_product):
+        url = f"/api/widget/reviews/{seeded_product}"
+        cursor = client.get(url, params={"per_page": 2, "cursor": ""}).json()[
+            "next_cursor"
+        ]
+        resp = client.get(url, params={"sort": "rating_low", "cursor": cursor})
+        assert resp.status_code == 400
+
+
+class TestListCursor:
+    def test_cursor_matches_offset_order(self, client, seeded_product):
+        url = f"/api/reviews?product_no={seeded_product}"
+        expected = [
+            item["id"]
+            for item in client.get(url + "&per_page=100").json()["items"]
+        ]
+        assert _walk(client, url, per_page=6) == expected
+
+    def test_count_modes(self, client, seeded_product):
+        url = f"/api/reviews?product_no={seeded_product}"
+        assert client.get(url).json()["total"] == 23
+        assert client.get(url + "&count=estimate").json()["total"] == 23
+        assert client.get(url + "&count=none").json()["total"] is None
@@ -0,0 +1,222 @@
+"""쿼리 플랜 회귀 테스트.
+
+10만 건 리뷰가 들어 있는 별도 DB에 위젯/관리 API를 실행하면서 실행된 SQL을
+모두 수집하고, 각 문장의 EXPLAIN QUERY PLAN에 전체 테이블 스캔이나 임시 정렬
+(USE TEMP B-TREE)이 없는지 검사한다.
+"""
+
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from io import BytesIO
+
+import pytest
+from openpyxl import Workbook
+
+from app.database import _CREATE_TABLES_SQL, ConnectionPool, get_db, get_db_executor, get_db_writer
+from app.migrations import migrate
+from app.utils.cache import widget_cache
+
+_REVIEW_COUNT = 100_000
+_PRODUCT_COUNT = 50
+
+# 전체 데이터를 봐야 하는 집계 / 인덱스를 쓸 수 없는 LIKE 검색은 스캔을 허용한다.
+# (패턴, 사유)
+_SCAN_ALLOWED = [
+    (r"^SELECT COUNT\(\*\) as cnt FROM reviews\s*$", "필터 없는 전체 건수"),
+    (r"COUNT\(\*\) as cnt FROM \(SELECT 1 FROM reviews\s+LIMIT", "상한 있는 건수 추정"),
+    (r"as total_reviews", "대시보드 전체 통계 (커버링 인덱스 스캔)"),
+    (r"author LIKE", "3자 미만 검색어의 LIKE 폴백"),
+    (r"FROM products ", "상품 전체 목록 / 검색 (소규모 테이블, 인덱스 순서로 읽음)"),
+]
+
+# 임시 정렬을 허용하는 문장. FTS 일치 결과는 인덱스 순서가 없어 정렬이 필요하지만
+# 정렬 대상이 검색어에 일치한 행으로 한정된다.
+_SORT_ALLOWED = [
+    (r"reviews_fts MATCH", "FTS 검색 결과 정렬"),
+]
+
+# 트랜잭션 제어문, PRAGMA, 트리거 본문 추적(-- 주석)은 검사 대상이 아니다.
+_SKIP_STATEMENT = re.compile(r"^\s*(BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE|PRAGMA|--)", re.I)
+_TABLE_SCAN = re.compile(r"^SCAN (reviews|review_images|products|product_review_stats|data_versions)$")
+_INDEX_SCAN = re.compile(r"^SCAN \w+ USING (COVERING )?INDEX")
+
+
+@pytest.fixture(scope="module")
+def plan_pool():
+    """10만 건 리뷰 DB. 테이블에 대량 적재한 뒤 나머지 마이그레이션(인덱스/트리거/파생 테이블)을 적용한다."""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    pool = ConnectionPool(path, max_size=2)
+    with pool.connection() as conn:
+        conn.executescript(_CREATE_TABLES_SQL)
+        conn.executemany(
+            "INSERT INTO reviews "
+            "(product_no, author, rating, content, is_visible, display_order, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    f"PLAN{i % _PRODUCT_COUNT}",
+                    f"작성자{i}",
+                    (i % 5) + 1,
+                    f"플랜 테스트 리뷰 {i}",
+                    0 if i % 10 == 0 else 1,
+                    i % 7,
+                    f"2026-{(i % 12) + 1:02d}-{(i % 28) + 1:02d} 00:00:00",
+                )
+                for i in range(_REVIEW_COUNT)
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO review_images (review_id, file_path) VALUES (?, ?)",
+            ((i, f"review_{i}/plan.jpg") for i in range(1, _REVIEW_COUNT + 1, 5)),
+        )
+        conn.executemany(
+            "INSERT INTO products (product_no, product_name) VALUES (?, ?)",
+            ((f"PLAN{i}", f"상품{i}") for i in range(_PRODUCT_COUNT)),
+        )
+        migrate(conn)
+    yield pool
+    pool.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+
+@pytest.fixture(scope="module")
+def traced_statements(plan_pool):
+    """plan DB로 API 요청을 처리하면서 실행된 SQL을 수집한다."""
+    statements: list[str] = []
+
+    @contextmanager
+    def traced_connection():
+        with plan_pool.connection() as conn:
+            conn.set_trace_callback(statements.append)
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.set_trace_callback(None)
+
+    executor, writer = get_db_executor(), get_db_writer()
+    writer_connection = writer.connection
+    executor.connection = writer.connection = traced_connection
+    widget_cache.clear()
+    try:
+        yield statements
+    finally:
+        executor.connection = get_db
+        writer.connection = writer_connection
+        widget_cache.clear()
+
+
+def _exercise_api(client) -> None:
+    """위젯/관리 API의 읽기·쓰기 경로를 모두 한 번씩 실행한다."""
+    widget = "/api/widget/reviews/PLAN7"
+    for sort in ("latest", "rating_high", "rating_low"):
+        for photo_only in ("false", "true"):
+            params = {"sort": sort, "photo_only": photo_only}
+            assert client.get(widget, params={**params, "page": 3}).status_code == 200
+            first = client.get(widget, params={**params, "cursor": ""}).json()
+            resp = client.get(widget, params={**params, "cursor": first["next_cursor"]})
+            assert resp.status_code == 200
+
+    for params in (
+        {},
+        {"page": 50},
+        {"product_no": "PLAN3"},
+        {"product_no": "PLAN3", "count": "estimate"},
+        {"search": "테스트 리뷰 4242"},
+        {"search": "테스트 리뷰 4242", "sort": "relevance"},
+        {"search": "4"},
+    ):
+        assert client.get("/api/reviews", params=params).status_code == 200
+    for params in ({"cursor": ""}, {"product_no": "PLAN3", "cursor": ""}):
+        first = client.get("/api/reviews", params=params).json()
+        resp = client.get(
+            "/api/reviews", params={**params, "cursor": first["next_cursor"]}
+        )
+        assert resp.status_code == 200
+
+    assert client.get("/api/stats").status_code == 200
+    assert client.get("/api/products").status_code == 200
+    assert client.get("/api/products", params={"search": "상품1"}).status_code == 200
+    assert client.get("/api/reviews/12345").status_code == 200
+
+    review = {"product_no": "PLAN7", "author": "플랜", "rating": 4, "content": "쓰기"}
+    review_id = client.post("/api/reviews", json=review).json()["id"]
+    client.put(f"/api/reviews/{review_id}", json={"rating": 2, "product_no": "PLAN8"})
+    client.patch(f"/api/reviews/{review_id}/visibility", json={"is_visible": False})
+    client.patch("/api/reviews/batch/visibility", json={"ids": [review_id, 12345], "is_visible": True})
+    client.patch("/api/reviews/batch/order", json={"items": [{"id": review_id, "display_order": 2}]})
+    images = client.post(
+        f"/api/reviews/{review_id}/images",
+        files={"files": ("plan.jpg", b"\xff\xd8\xff\xe0" + b"\x00" * 16, "image/jpeg")},
+    ).json()
+    client.delete(f"/api/images/{images[0]['id']}")
+    client.delete(f"/api/reviews/{review_id}")
+
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["상품번호", "상품명", "작성자명", "별점(1~5)", "리뷰제목", "리뷰내용"])
+    ws.append(["PLAN9", "상품9", "엑셀", 5, "", "엑셀 업로드"])
+    buf = BytesIO()
+    wb.save(buf)
+    buf.seek(0)
+    client.post(
+        "/api/reviews/excel-upload",
+        files={"file": ("plan.xlsx", buf, "application/octet-stream")},
+    )
+
+
+def _allowed(rules: list[tuple[str, str]], sql: str) -> bool:
+    return any(re.search(pattern, sql) for pattern, _reason in rules)
+
+
+def _violations(conn, sql: str) -> list[str]:
+    """문장의 쿼리 플랜에서 허용되지 않은 스캔/임시 정렬 항목을 돌려준다."""
+    allowed_scan = _allowed(_SCAN_ALLOWED, sql)
+    allowed_sort = _allowed(_SORT_ALLOWED, sql)
+
+    details = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+    problems = []
+    for detail in details:
+        if "USE TEMP B-TREE" in detail:
+            if not allowed_sort:
+                problems.append(detail)
+        elif _TABLE_SCAN.match(detail) and not allowed_scan:
+            problems.append(detail)
+        elif _INDEX_SCAN.match(detail) and not allowed_scan and "LIMIT" not in sql:
+            # 인덱스 순서대로 읽다가 LIMIT에서 멈추는 경우만 허용
+            problems.append(detail)
+    return problems
+
+
+def test_review_count_seeded(plan_pool):
+    with plan_pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0] == _REVIEW_COUNT
+
+
+def test_no_full_scan_or_temp_sort(client, plan_pool, traced_statements):
+    _exercise_api(client)
+
+    unique = [
+        sql for sql in dict.fromkeys(traced_statements)
+        if not _SKIP_STATEMENT.match(sql)
+    ]
+    assert len(unique) > 30
+
+    failures: dict[str, list[str]] = {}
+    with plan_pool.connection() as conn:
+        for sql in unique:
+            problems = _violations(conn, sql)
+            if problems:
+                failures[sql] = problems
+
+    assert not failures, "\n\n".join(
+        f"{sql}\n  -> {problems}" for sql, problems in failures.items()
+    )
@@ -0,0 +1,134 @@
+"""리뷰 내보내기(/api/reviews/export) 테스트."""
+
+import csv
+import io
+from datetime import date
+from itertools import combinations
+
+import pytest
+from openpyxl import load_workbook
+
+from app.database import get_connection
+from app.utils.review_export import EXPORT_HEADERS, export_query, iter_csv
+
+PRODUCT_NO = "EXPORT_TEST"
+
+
+@pytest.fixture(scope="module")
+def exported(setup_db):
+    """상품 EXPORT_TEST의 리뷰 3건 (1건 숨김, 1건 이미지, 날짜 서로 다름)."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    client = TestClient(app)
+    ids = []
+    for i, day in enumerate(("2026-01-05", "2026-02-10", "2026-03-15")):
+        resp = client.post("/api/reviews", json={
+            "product_no": PRODUCT_NO,
+            "product_name": "내보내기 상품",
+            "author": f"내보내기{i}",
+            "rating": i + 3,
+            "title": f"제목 {i}",
+            "content": f"내보내기, \"따옴표\"\n줄바꿈 {i}",
+        })
+        ids.append(resp.json()["id"])
+        conn = get_connection()
+        conn.execute(
+            "UPDATE reviews SET created_at = ? WHERE id = ?", (f"{day} 10:00:00", ids[-1])
+        )
+        conn.commit()
+        conn.close()
+    client.patch(f"/api/reviews/{ids[0]}/visibility", json={"is_visible": False})
+    image = client.post(
+        f"/api/reviews/{ids[2]}/images",
+        files=[("files", ("e.png", io.BytesIO(b"\x89PNG\r\n\x1a\n" + b"\x03" * 64), "image/png"))],
+    ).json()[0]
+    return ids, image
+
+
+def _csv_rows(resp) -> list[list[str]]:
+    assert resp.content.startswith(b"\xef\xbb\xbf")
+    return list(csv.reader(io.StringIO(resp.content.decode("utf-8-sig"))))
+
+
+class TestExportCsv:
+    def test_filtered_by_product(self, client, exported):
+        ids, image = exported
+        resp = client.get("/api/reviews/export", params={"format": "csv", "product_no": PRODUCT_NO})
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/csv")
+        assert "attachment" in resp.headers["content-disposition"]
+
+        header, *rows = _csv_rows(resp)
+        assert header == EXPORT_HEADERS
+        # 최신순
+        assert [int(r[7]) for r in rows] == ids[::-1]
+        newest = dict(zip(header, rows[0]))
+        assert newest["리뷰내용"] == "내보내기, \"따옴표\"\n줄바꿈 2"
+        assert newest["이미지"] == image["url"]
+        assert newest["노출여부"] == "Y"
+        assert rows[-1][8] == "N"
+
+    def test_visibility_and_dates(self, client, exported):
+        ids, _ = exported
+        params = {"format": "csv", "product_no": PRODUCT_NO}
+        rows = _csv_rows(client.get("/api/reviews/export", params={**params, "is_visible": False}))[1:]
+        assert [int(r[7]) for r in rows] == [ids[0]]
+
+        rows = _csv_rows(client.get("/api/reviews/export", params={
+            **params, "date_from": "2026-02-10", "date_to": "2026-03-14",
+        }))[1:]
+        assert [int(r[7]) for r in rows] == [ids[1]]
+
+    def test_invalid_params(self, client):
+        resp = client.get("/api/reviews/export", params={"date_from": "2026-03-01", "date_to": "2026-02-01"})
+        assert resp.status_code == 400
+        assert client.get("/api/reviews/export", params={"format": "pdf"}).status_code == 422
+        assert client.get("/api/reviews/export", params={"date_from": "어제"}).status_code == 422
+
+    def test_chunked(self):
+        rows = ([PRODUCT_NO, "상품", "작성자", 5, "제목", "내용" * 50, "", i, "Y", 0, "", ""] for i in range(5000))
+        chunks = list(iter_csv(rows))
+        assert len(chunks) > 10
+        assert max(len(chunk) for chunk in chunks) < 80 * 1024
+
+
+class TestExportXlsx:
+    def test_round_trip_import(self, client, exported):
+        resp = client.get("/api/reviews/export", params={"product_no": PRODUCT_NO})
+        assert resp.status_code == 200
+        assert "spreadsheetml" in resp.headers["content-type"]
+
+        ws = load_workbook(io.BytesIO(resp.content), read_only=True).active
+        values = list(ws.iter_rows(values_only=True))
+        assert list(values[0]) == EXPORT_HEADERS
+        assert len(values) == 4
+        assert values[1][3] == 5 and values[1][7] == exported[0][2]
+
+        # 앞 7열이 템플릿과 같아 그대로 다시 등록할 수 있다
+        resp = client.post(
+            "/api/reviews/excel-upload",
+            files={"file": ("export.xlsx", io.BytesIO(resp.content), "application/octet-stream")},
+        )
+        assert resp.json()["success_count"] == 3
+
+
+class TestExportQueryPlan:
+    def test_no_temp_sort(self, setup_db):
+        """어떤 필터 조합이든 인덱스 순서로 읽어 임시 정렬 없이 스트리밍한다."""
+        filters = {
+            "product_no": "P",
+            "is_visible": True,
+            "date_from": date(2026, 1, 1),
+            "date_to": date(2026, 12, 31),
+        }
+        conn = get_connection()
+        try:
+            for n in range(len(filters) + 1):
+                for keys in combinations(filters, n):
+                    sql, params = export_query(**{k: filters[k] for k in keys})
+                    plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+                    assert not any("TEMP B-TREE" in detail for detail in plan), (keys, plan)
+        finally:
+            conn.close()
@@ -0,0 +1,129 @@
+"""상품별 리뷰 요약 테이블(product_review_stats) 동기화 테스트."""
+
+import io
+from io import BytesIO
+
+from openpyxl import Workbook
+
+from app.database import get_db
+from app.utils.review_stats import rebuild_product_stats
+
+_COLUMNS = (
+    "review_count, rating_sum, star_1, star_2, star_3, star_4, star_5, "
+    "photo_review_count"
+)
+
+
+def _stored(product_no: str) -> tuple:
+    with get_db() as db:
+        row = db.execute(
+            f"SELECT {_COLUMNS} FROM product_review_stats WHERE product_no = ?",
+            (product_no,),
+        ).fetchone()
+    return tuple(row) if row else (0,) * 8
+
+
+def _recomputed(product_no: str) -> tuple:
+    """요약 테이블을 원본으로부터 재계산한 값 (트리거 결과와 비교용)."""
+    with get_db() as db:
+        db.execute("SAVEPOINT recompute")
+        rebuild_product_stats(db, product_no)
+        row = db.execute(
+            f"SELECT {_COLUMNS} FROM product_review_stats WHERE product_no = ?",
+            (product_no,),
+        ).fetchone()
+        db.execute("ROLLBACK TO recompute")
+        db.execute("RELEASE recompute")
+    return tuple(row) if row else (0,) * 8
+
+
+def _create(client, product_no: str, rating: int) -> int:
+    resp = client.post(
+        "/api/reviews",
+        json={
+            "product_no": product_no,
+            "author": "요약작성자",
+            "rating": rating,
+            "content": "요약 테이블 테스트",
+        },
+    )
+    return resp.json()["id"]
+
+
+def _upload_image(client, review_id: int) -> int:
+    image_file = io.BytesIO(b"\x89PNG\r\n\x1a\n" + b"\x00" * 100)
+    resp = client.post(
+        f"/api/reviews/{review_id}/images",
+        files=[("files", ("stats.png", image_file, "image/png"))],
+    )
+    return resp.json()[0]["id"]
+
+
+class TestProductReviewStats:
+    def test_create_and_update(self, client):
+        pno = "STATS_WRITE"
+        first = _create(client, pno, 5)
+        _create(client, pno, 3)
+        assert _stored(pno) == (2, 8, 0, 0, 1, 0, 1, 0)
+
+        client.put(f"/api/reviews/{first}", json={"rating": 4})
+        assert _stored(pno) == (2, 7, 0, 0, 1, 1, 0, 0)
+        assert _stored(pno) == _recomputed(pno)
+
+    def test_move_between_products(self, client):
+        review_id = _create(client, "STATS_MOVE_A", 2)
+        _upload_image(client, review_id)
+        client.put(f"/api/reviews/{review_id}", json={"product_no": "STATS_MOVE_B"})
+        assert _stored("STATS_MOVE_A")[0] == 0
+        assert _stored("STATS_MOVE_B") == (1, 2, 0, 1, 0, 0, 0, 1)
+
+    def test_visibility_toggle(self, client):
+        pno = "STATS_VIS"
+        review_id = _create(client, pno, 4)
+        _upload_image(client, review_id)
+        client.patch(f"/api/reviews/{review_id}/visibility", json={"is_visible": False})
+        assert _stored(pno) == (0,) * 8
+        client.patch(f"/api/reviews/{review_id}/visibility", json={"is_visible": True})
+        assert _stored(pno) == (1, 4, 0, 0, 0, 1, 0, 1)
+
+    def test_images_and_delete(self, client):
+        pno = "STATS_IMG"
+        review_id = _create(client, pno, 5)
+        image_id = _upload_image(client, review_id)
+        _upload_image(client, review_id)
+        assert _stored(pno)[-1] == 1
+
+        client.delete(f"/api/images/{image_id}")
+        assert _stored(pno)[-1] == 1
+
+        client.delete(f"/api/reviews/{review_id}")
+        assert _stored(pno) == (0,) * 8
+        assert _stored(pno) == _recomputed(pno)
+
+    def test_excel_upload(self, client):
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["상품번호", "상품명", "작성자명", "별점(1~5)", "리뷰제목", "리뷰내용"])
+        ws.append(["STATS_XLSX", "상품", "작성자", 5, "", "좋아요"])
+        ws.append(["STATS_XLSX", "상품", "작성자", 1, "", "별로예요"])
+        buf = BytesIO()
+        wb.save(buf)
+        buf.seek(0)
+        client.post(
+            "/api/reviews/excel-upload",
+            files={"file": ("reviews.xlsx", buf, "application/octet-stream")},
+        )
+        assert _stored("STATS_XLSX") == (2, 6, 1, 0, 0, 0, 1, 0)
+
+    def test_rebuild_endpoint_repairs_drift(self, client):
+        pno = "STATS_DRIFT"
+        _create(client, pno, 5)
+        with get_db() as db:
+            db.execute(
+                "UPDATE product_review_stats SET review_count = 99 WHERE product_no = ?",
+                (pno,),
+            )
+        resp = client.post("/api/stats/rebuild")
+        assert resp.status_code == 200
+        assert resp.json()["rebuilt_products"] >= 1
+        assert _stored(pno) == (1, 5, 0, 0, 0, 0, 1, 0)
@@ -1,9 +1,14 @@
 """리뷰 CRUD API 테스트."""
 
+import os
 from io import BytesIO
 
 from openpyxl import Workbook
 
+from app import config, database
+from app.database import ConnectionPool
+from app.utils.storage import wait_for_cleanup
+
 
 class TestCreateReview:
     def test_create_review(self, client, sample_review):
@@ -151,6 +156,70 @@ class TestVisibility:
         assert resp.json()["is_visible"] is True
 
 
+class TestBatch:
+    def _create(self, client, sample_review, count: int) -> list[int]:
+        return [client.post("/api/reviews", json=sample_review).json()["id"] for _ in range(count)]
+
+    def test_batch_visibility(self, client, sample_review):
+        ids = self._create(client, sample_review, 3)
+        resp = client.patch(
+            "/api/reviews/batch/visibility",
+            json={"ids": [ids[0], 99999, ids[1], ids[0]], "is_visible": False},
+        )
+        assert resp.status_code == 200
+        assert resp.json() == {
+            "succeeded": 2,
+            "not_found": 1,
+            "results": [
+                {"id": ids[0], "status": "updated"},
+                {"id": 99999, "status": "not_found"},
+                {"id": ids[1], "status": "updated"},
+            ],
+        }
+        visible = [client.get(f"/api/reviews/{i}").json()["is_visible"] for i in ids]
+        assert visible == [False, False, True]
+
+    def test_batch_delete_removes_files(self, client, sample_review):
+        ids = self._create(client, sample_review, 2)
+        image = client.post(
+            f"/api/reviews/{ids[0]}/images",
+            files={"files": ("a.jpg", BytesIO(b"\xff\xd8\xff\xe0batch-delete"), "image/jpeg")},
+        ).json()[0]
+        full_path = os.path.join(config.UPLOAD_DIR, image["file_path"])
+
+        resp = client.post("/api/reviews/batch/delete", json={"ids": ids})
+        assert resp.status_code == 200
+        assert resp.json()["succeeded"] == 2
+        assert {r["status"] for r in resp.json()["results"]} == {"deleted"}
+        assert all(client.get(f"/api/reviews/{i}").status_code == 404 for i in ids)
+
+        # 파일은 커밋 후 백그라운드에서 지운다
+        wait_for_cleanup()
+        assert not os.path.exists(full_path)
+
+    def test_batch_reorder(self, client, sample_review):
+        ids = self._create(client, sample_review, 2)
+        resp = client.patch("/api/reviews/batch/order", json={"items": [
+            {"id": ids[0], "display_order": 7},
+            {"id": ids[1], "display_order": 3},
+        ]})
+        assert resp.status_code == 200
+        assert resp.json()["succeeded"] == 2
+        orders = [client.get(f"/api/reviews/{i}").json()["display_order"] for i in ids]
+        assert orders == [7, 3]
+
+    def test_batch_validation(self, client, sample_review):
+        review_id = self._create(client, sample_review, 1)[0]
+        resp = client.patch("/api/reviews/batch/order", json={"items": [
+            {"id": review_id, "display_order": 1},
+            {"id": review_id, "display_order": 2},
+        ]})
+        assert resp.status_code == 400
+        assert client.post("/api/reviews/batch/delete", json={"ids": []}).status_code == 422
+        too_many = list(range(1, config.MAX_BATCH_SIZE + 2))
+        assert client.post("/api/reviews/batch/delete", json={"ids": too_many}).status_code == 422
+
+
 class TestExcelUpload:
     def _make_xlsx(self, rows: list[list]) -> BytesIO:
         """테스트용 엑셀 파일을 생성한다."""
@@ -192,6 +261,22 @@ class TestExcelUpload:
         assert data["fail_count"] == 1
         assert len(data["errors"]) == 1
 
+    def test_excel_upload_without_writer_single_connection(self, client, monkeypatch):
+        """쓰기 스레드를 끄고 연결이 하나뿐이어도 파싱이 연결을 잡고 있지 않아 막히지 않는다."""
+        pool = ConnectionPool(database._get_db_path(), max_size=1, timeout=2)
+        monkeypatch.setattr(config, "DB_WRITER_ENABLED", False)
+        monkeypatch.setattr(database, "_pool", pool)
+        xlsx = self._make_xlsx([["P_SINGLE", "상품", "작성자", 5, "", "연결 하나"]])
+        try:
+            resp = client.post(
+                "/api/reviews/excel-upload",
+                files={"file": ("reviews.xlsx", xlsx, "application/octet-stream")},
+            )
+        finally:
+            pool.close()
+        assert resp.status_code == 200
+        assert resp.json()["success_count"] == 1
+
     def test_excel_upload_invalid_file(self, client):
         resp = client.post(
             "/api/reviews/excel-upload",
@@ -0,0 +1,83 @@
+"""FTS5 trigram 검색 테스트."""
+
+from app.database import get_db
+from app.utils.search import fts_available, rebuild_search_index
+
+
+def _create(client, content: str, author: str = "검색작성자", title: str = "") -> int:
+    resp = client.post(
+        "/api/reviews",
+        json={
+            "product_no": "FTS_TEST",
+            "author": author,
+            "rating": 5,
+            "title": title,
+            "content": content,
+        },
+    )
+    return resp.json()["id"]
+
+
+def _search_ids(client, term: str, **params) -> list[int]:
+    resp = client.get("/api/reviews", params={"search": term, "per_page": 100, **params})
+    assert resp.status_code == 200
+    return [item["id"] for item in resp.json()["items"]]
+
+
+class TestFullTextSearch:
+    def test_index_exists(self):
+        with get_db() as db:
+            assert fts_available(db)
+
+    def test_korean_substring(self, client):
+        review_id = _create(client, "배송이 빠르고 포장이 꼼꼼했어요")
+        assert review_id in _search_ids(client, "포장이 꼼꼼")
+        assert review_id not in _search_ids(client, "포장이 엉망")
+
+    def test_short_term_falls_back_to_like(self, client):
+        review_id = _create(client, "짧은검색어 테스트 리뷰", author="홍길")
+        assert review_id in _search_ids(client, "홍길")
+
+    def test_searches_author_and_title(self, client):
+        review_id = _create(client, "내용", author="트라이그램작가", title="특별한제목입니다")
+        assert review_id in _search_ids(client, "트라이그램")
+        assert review_id in _search_ids(client, "특별한제목")
+
+    def test_case_insensitive_ascii(self, client):
+        review_id = _create(client, "Fits PERFECTLY on me")
+        assert review_id in _search_ids(client, "perfectly")
+
+    def test_quotes_are_literal(self, client):
+        review_id = _create(client, 'he said "wow" loudly')
+        assert review_id in _search_ids(client, '"wow"')
+
+    def test_update_and_delete_sync(self, client):
+        review_id = _create(client, "원래내용입니다")
+        client.put(f"/api/reviews/{review_id}", json={"content": "바뀐내용입니다"})
+        assert review_id not in _search_ids(client, "원래내용")
+        assert review_id in _search_ids(client, "바뀐내용")
+
+        client.delete(f"/api/reviews/{review_id}")
+        assert review_id not in _search_ids(client, "바뀐내용")
+
+    def test_relevance_sort(self, client):
+        weak = _create(client, "관련도테스트 한 번 언급하는 아주 길고 긴 리뷰 내용입니다 " * 3)
+        strong = _create(client, "관련도테스트 관련도테스트 관련도테스트")
+        ids = _search_ids(client, "관련도테스트", sort="relevance")
+        assert ids.index(strong) < ids.index(weak)
+
+    def test_relevance_rejects_cursor(self, client):
+        resp = client.get(
+            "/api/reviews",
+            params={"search": "관련도테스트", "sort": "relevance", "cursor": ""},
+        )
+        assert resp.status_code == 400
+
+    def test_rebuild_backfills_index(self, client):
+        review_id = _create(client, "백필검증용리뷰")
+        with get_db() as db:
+            db.execute("INSERT INTO reviews_fts (reviews_fts) VALUES ('delete-all')")
+        assert review_id not in _search_ids(client, "백필검증용")
+        with get_db() as db:
+            rebuild_search_index(db)
+        assert review_id in _search_ids(client, "백필검증용")
@@ -0,0 +1,207 @@
+"""SQLite 온라인 스냅샷(/api/admin/snapshots) 테스트."""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import config
+from app.database import get_connection
+from app.utils import snapshots
+
+
+@pytest.fixture(autouse=True)
+def backup_dir(tmp_path, monkeypatch):
+    """테스트마다 빈 스냅샷 디렉토리."""
+    monkeypatch.setattr(config, "BACKUP_DIR", str(tmp_path / "backups"))
+    monkeypatch.setattr(config, "BACKUP_STEP_SLEEP", 0)
+    monkeypatch.setattr(snapshots, "_last_attempt", None)
+    return tmp_path / "backups"
+
+
+@pytest.fixture(scope="module")
+def photo_review(setup_db):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    client = TestClient(app)
+    review_id = client.post("/api/reviews", json={
+        "product_no": "SNAPSHOT_TEST",
+        "author": "스냅샷",
+        "rating": 5,
+        "content": "스냅샷 테스트 리뷰",
+    }).json()["id"]
+    resp = client.post(
+        f"/api/reviews/{review_id}/images",
+        files=[("files", ("s.png", io.BytesIO(b"\x89PNG\r\n\x1a\n" + b"\x02" * 64), "image/png"))],
+    )
+    assert resp.status_code == 201
+    return review_id, resp.json()[0]["file_path"]
+
+
+def _open_snapshot(backup_dir, meta, tmp_path) -> sqlite3.Connection:
+    data = (backup_dir / meta["file"]).read_bytes()
+    if meta["compressed"]:
+        data = gzip.decompress(data)
+    assert hashlib.sha256(data).hexdigest() == meta["sha256"]
+    path = tmp_path / "restored.db"
+    path.write_bytes(data)
+    return sqlite3.connect(path)
+
+
+def _review_count() -> int:
+    conn = get_connection()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestCreateSnapshot:
+    def test_compressed_snapshot(self, backup_dir, tmp_path, photo_review):
+        meta = snapshots.create_snapshot()
+        assert meta["compressed"] and meta["file"].endswith(".db.gz")
+        assert meta["file_size"] < meta["db_size"]
+        assert meta["pages"] * meta["page_size"] == meta["db_size"]
+        assert meta["steps"] >= 1
+
+        conn = _open_snapshot(backup_dir, meta, tmp_path)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        assert conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0] == _review_count()
+        conn.close()
+
+        # 메타데이터가 마지막에 기록되고, 임시 파일은 남지 않는다
+        assert sorted(os.listdir(backup_dir)) == sorted([
+            meta["file"], meta["uploads_manifest"], f"{meta['name']}.json",
+        ])
+        assert snapshots.list_snapshots() == [meta]
+
+    def test_uncompressed(self, backup_dir, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "BACKUP_COMPRESS", False)
+        meta = snapshots.create_snapshot()
+        assert meta["file"].endswith(".db") and meta["file_size"] == meta["db_size"]
+        _open_snapshot(backup_dir, meta, tmp_path).close()
+
+    def test_uploads_manifest(self, backup_dir, photo_review):
+        _, file_path = photo_review
+        meta = snapshots.create_snapshot()
+        with gzip.open(backup_dir / meta["uploads_manifest"], "rt", encoding="utf-8") as f:
+            entries = {e["path"]: e for e in map(json.loads, f)}
+        assert entries[file_path]["referenced"] is True
+        assert "missing" not in entries[file_path]
+        assert meta["uploads"]["stored_files"] == len(
+            [e for e in entries.values() if not e.get("missing")]
+        )
+        assert meta["uploads"]["missing_files"] == len(
+            [e for e in entries.values() if e.get("missing")]
+        )
+
+    def test_writes_during_copy(self, backup_dir, tmp_path, monkeypatch):
+        """단계 사이에 다른 연결이 써도 막히지 않고, 스냅샷은 시작 시점 상태가 된다."""
+        monkeypatch.setattr(config, "BACKUP_STEP_PAGES", 1)
+        writer = get_connection()
+        written = []
+
+        def write_between_steps() -> None:
+            writer.execute(
+                "INSERT INTO reviews (product_no, author, rating, content) "
+                "VALUES ('SNAPSHOT_WRITE', '쓰기', 4, '복사 중 쓰기')"
+            )
+            writer.commit()
+            written.append(1)
+
+        before = _review_count()
+        monkeypatch.setattr(snapshots, "_between_steps", write_between_steps)
+        try:
+            meta = snapshots.create_snapshot()
+        finally:
+            writer.close()
+
+        assert meta["steps"] == meta["pages"] > 1
+        assert len(written) == meta["steps"] - 1
+        assert _review_count() == before + len(written)
+        conn = _open_snapshot(backup_dir, meta, tmp_path)
+        assert conn.execute("PRAGMA quick_check").fetchone()[0] == "ok"
+        assert conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0] == before
+        conn.close()
+
+    def test_rotation(self, backup_dir, monkeypatch):
+        monkeypatch.setattr(config, "BACKUP_KEEP", 2)
+        names = [snapshots.create_snapshot()["name"] for _ in range(3)]
+        assert [m["name"] for m in snapshots.list_snapshots()] == names[:0:-1]
+        assert not any(f.startswith(f"{names[0]}.") for f in os.listdir(backup_dir))
+
+    def test_busy(self):
+        assert snapshots._lock.acquire(blocking=False)
+        try:
+            with pytest.raises(snapshots.SnapshotBusyError):
+                snapshots.create_snapshot()
+        finally:
+            snapshots._lock.release()
+
+
+class TestSchedule:
+    def test_next_run(self, monkeypatch):
+        monkeypatch.setattr(config, "BACKUP_INTERVAL_HOURS", 24)
+        now = datetime(2026, 3, 1, 12, 0, 0)
+        # 스냅샷이 없으면 잠시 뒤
+        assert snapshots.next_run_at(now) == now + timedelta(seconds=snapshots._MIN_DELAY)
+
+        meta = snapshots.create_snapshot()
+        created = datetime.fromisoformat(meta["created_at"])
+        later = created + timedelta(hours=1)
+        assert snapshots.next_run_at(later) == created + timedelta(hours=24)
+
+        monkeypatch.setattr(config, "BACKUP_INTERVAL_HOURS", 0)
+        assert snapshots.next_run_at(later) is None
+
+
+class TestSnapshotEndpoints:
+    def test_create_wait_and_status(self, client):
+        resp = client.post("/api/admin/snapshots", params={"wait": "true"})
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["running"] is False
+        assert len(data["snapshots"]) == 1
+        snapshot = data["snapshots"][0]
+        assert snapshot["trigger"] == "manual"
+        assert snapshot["duration_ms"] >= snapshot["copy_ms"] > 0
+
+        assert client.get("/api/admin/snapshots").json()["snapshots"] == [snapshot]
+
+    def test_create_background(self, client):
+        resp = client.post("/api/admin/snapshots")
+        assert resp.status_code == 202
+        # 잠금이 풀릴 때까지 기다린다
+        with snapshots._lock:
+            pass
+        assert len(client.get("/api/admin/snapshots").json()["snapshots"]) == 1
+
+    def test_busy_conflict(self, client):
+        snapshots._lock.acquire()
+        try:
+            assert client.post("/api/admin/snapshots").status_code == 409
+        finally:
+            snapshots._lock.release()
+
+    def test_download(self, client):
+        meta = snapshots.create_snapshot()
+        resp = client.get(f"/api/admin/snapshots/{meta['name']}/db")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/gzip"
+        assert "attachment" in resp.headers["content-disposition"]
+        assert hashlib.sha256(gzip.decompress(resp.content)).hexdigest() == meta["sha256"]
+
+        resp = client.get(f"/api/admin/snapshots/{meta['name']}/uploads")
+        assert resp.status_code == 200
+
+    def test_download_not_found(self, client):
+        assert client.get("/api/admin/snapshots/reviews-20260101-000000/db").status_code == 404
+        assert client.get("/api/admin/snapshots/..%2Freviews/db").status_code == 404
+        assert client.get("/api/admin/snapshots/x/other").status_code == 422
@@ -0,0 +1,284 @@
+"""업로드 저장 백엔드(로컬 / S3 호환) 테스트.
+
+S3는 boto3 클라이언트와 같은 메서드를 가진 메모리 기반 대역(MinIO 대용)으로 검증한다.
+"""
+
+import os
+import time
+from datetime import datetime, timezone
+from io import BytesIO
+from urllib.parse import quote
+
+import pytest
+from PIL import Image
+
+from app import config
+from app.database import get_db
+from app.utils import image_variants, storage, storage_backends
+from app.utils.image_variants import process_image
+from app.utils.storage import collect_garbage, wait_for_cleanup
+from app.utils.storage_backends import LocalStorage, S3Storage
+
+
+class FakeS3Client:
+    """테스트용 S3 호환 클라이언트 (boto3 S3 클라이언트의 사용 메서드만 구현)."""
+
+    def __init__(self, page_size: int = 1000) -> None:
+        self.objects: dict[tuple[str, str], dict] = {}
+        self.page_size = page_size
+        self.presigned = 0
+
+    def upload_file(self, Filename, Bucket, Key, ExtraArgs=None):
+        with open(Filename, "rb") as f:
+            self.objects[(Bucket, Key)] = {
+                "Body": f.read(),
+                "LastModified": datetime.now(timezone.utc),
+                **(ExtraArgs or {}),
+            }
+
+    def download_file(self, Bucket, Key, Filename):
+        with open(Filename, "wb") as f:
+            f.write(self.objects[(Bucket, Key)]["Body"])
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+    def list_objects_v2(self, Bucket, Prefix="", MaxKeys=None, ContinuationToken=None):
+        keys = sorted(
+            key for bucket, key in self.objects if bucket == Bucket and key.startswith(Prefix)
+        )
+        start = int(ContinuationToken or 0)
+        limit = min(MaxKeys or self.page_size, self.page_size)
+        page = keys[start:start + limit]
+        response = {
+            "Contents": [
+                {"Key": key, "LastModified": self.objects[(Bucket, key)]["LastModified"]}
+                for key in page
+            ],
+            "IsTruncated": start + limit < len(keys),
+        }
+        if response["IsTruncated"]:
+            response["NextContinuationToken"] = str(start + limit)
+        return response
+
+    def generate_presigned_url(self, operation, Params, ExpiresIn):
+        self.presigned += 1
+        return (
+            f"https://s3.test/{Params['Bucket']}/{quote(Params['Key'])}"
+            f"?X-Amz-Expires={ExpiresIn}&X-Amz-Signature=fake"
+        )
+
+    def keys(self, bucket: str = "reviews") -> set[str]:
+        return {key for b, key in self.objects if b == bucket}
+
+
+@pytest.fixture()
+def s3():
+    client = FakeS3Client(page_size=2)
+    storage_backends.set_backend(S3Storage(client, "reviews", prefix="media"))
+    yield client
+    storage_backends.set_backend(None)
+
+
+def _source_file(tmp_path, content: bytes = b"image-bytes") -> str:
+    path = tmp_path / "source.part"
+    path.write_bytes(content)
+    return str(path)
+
+
+class TestLocalStorage:
+    def test_put_list_delete(self, tmp_path):
+        backend = LocalStorage(str(tmp_path / "root"))
+        backend.put("blobs/aa/bb/x.jpg", _source_file(tmp_path))
+        backend.put("blobs/aa/bb/x_thumb.webp", _source_file(tmp_path))
+        assert backend.exists("blobs/aa/bb/x.jpg")
+        assert sorted(key for key, _ in backend.list("blobs/aa/bb/x_")) == [
+            "blobs/aa/bb/x_thumb.webp"
+        ]
+        assert backend.get("blobs/aa/bb/x.jpg") == b"image-bytes"
+
+        backend.delete("blobs/aa/bb/x.jpg")
+        backend.delete("blobs/aa/bb/x.jpg")  # 없으면 무시
+        assert not backend.exists("blobs/aa/bb/x.jpg")
+
+    def test_url(self, tmp_path):
+        assert LocalStorage(str(tmp_path)).url("blobs/a b.jpg") == "/uploads/blobs/a%20b.jpg"
+
+
+class TestS3Storage:
+    def test_put_sets_metadata_and_removes_source(self, tmp_path):
+        client = FakeS3Client()
+        backend = S3Storage(client, "reviews", prefix="/media/")
+        source = _source_file(tmp_path)
+        backend.put("blobs/aa/bb/x.jpg", source)
+
+        stored = client.objects[("reviews", "media/blobs/aa/bb/x.jpg")]
+        assert stored["Body"] == b"image-bytes"
+        assert stored["ContentType"] == "image/jpeg"
+        assert "immutable" in stored["CacheControl"]
+        assert not os.path.exists(source)
+        assert backend.exists("blobs/aa/bb/x.jpg")
+        assert not backend.exists("blobs/aa/bb/x")
+        assert backend.get("blobs/aa/bb/x.jpg") == b"image-bytes"
+
+    def test_list_paginates(self, tmp_path):
+        client = FakeS3Client(page_size=2)
+        backend = S3Storage(client, "reviews")
+        for name in ("a", "b", "c", "d", "e"):
+            backend.put(f"blobs/{name}.jpg", _source_file(tmp_path))
+        keys = [key for key, _ in backend.list("blobs/")]
+        assert keys == [f"blobs/{name}.jpg" for name in "abcde"]
+        assert all(isinstance(modified, float) for _, modified in backend.list())
+
+    def test_presigned_and_public_urls(self):
+        client = FakeS3Client()
+        presigned = S3Storage(client, "reviews", presign_expires=600).url("blobs/x.jpg")
+        assert presigned.startswith("https://s3.test/reviews/blobs/x.jpg?")
+        assert "X-Amz-Expires=600" in presigned
+
+        public = S3Storage(
+            client, "reviews", prefix="media", public_base_url="https://cdn.test/"
+        ).url("blobs/x.jpg")
+        assert public == "https://cdn.test/media/blobs/x.jpg"
+
+    def test_create_backend_requires_bucket(self, monkeypatch):
+        monkeypatch.setattr(config, "STORAGE_BACKEND", "s3")
+        monkeypatch.setattr(config, "S3_BUCKET", "")
+        with pytest.raises(RuntimeError):
+            storage_backends.create_backend()
+
+
+class TestUploadsThroughS3:
+    def _image(self, color: str) -> bytes:
+        buf = BytesIO()
+        Image.new("RGB", (640, 480), color).save(buf, "JPEG")
+        return buf.getvalue()
+
+    def test_upload_variants_and_delete(self, client, sample_review, s3):
+        review_id = client.post("/api/reviews", json=sample_review).json()["id"]
+        resp = client.post(
+            f"/api/reviews/{review_id}/images",
+            files={"files": ("s3.jpg", BytesIO(self._image("navy")), "image/jpeg")},
+        )
+        assert resp.status_code == 201
+        image = resp.json()[0]
+        assert f"media/{image['file_path']}" in s3.keys()
+        assert image["url"].startswith("https://s3.test/reviews/media/blobs/")
+        # 업로드 파일은 로컬 UPLOAD_DIR에 남지 않음
+        assert not os.path.exists(os.path.join(config.UPLOAD_DIR, image["file_path"]))
+
+        assert process_image(image["id"]) == "ready"
+        review = client.get(f"/api/reviews/{review_id}").json()
+        variants = review["images"][0]["variants"]
+        assert len(variants) == 6
+        for variant in variants:
+            assert f"media/{variant['file_path']}" in s3.keys()
+            assert variant["url"].startswith("https://s3.test/")
+
+        assert client.delete(f"/api/images/{image['id']}").status_code == 200
+        wait_for_cleanup()
+        assert s3.keys() == set()
+
+    def test_garbage_collection_lists_bucket(self, client, sample_review, s3, tmp_path):
+        review_id = client.post("/api/reviews", json=sample_review).json()["id"]
+        image = client.post(
+            f"/api/reviews/{review_id}/images",
+            files={"files": ("keep.jpg", BytesIO(self._image("olive")), "image/jpeg")},
+        ).json()[0]
+        storage_backends.get_backend().put("blobs/zz/zz/orphan.jpg", _source_file(tmp_path))
+        time.sleep(0.01)
+
+        with get_db() as db:
+            stats = collect_garbage(db, grace_seconds=0)
+        assert stats["orphan_files"] >= 1
+        assert s3.keys() >= {f"media/{image['file_path']}"}
+        assert "media/blobs/zz/zz/orphan.jpg" not in s3.keys()
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    """time.time()을 지정한 초만큼 앞당기는 함수."""
+    real_time = time.time
+    offset = [0.0]
+    monkeypatch.setattr(time, "time", lambda: real_time() + offset[0])
+
+    def advance(seconds: float) -> None:
+        offset[0] += seconds
+
+    return advance
+
+
+class TestPresignedUrlExpiry:
+    """사전 서명 URL이 만료되기 전에 ETag/위젯 캐시가 바뀌는지."""
+
+    def _widget_with_photo(self, client, sample_review, monkeypatch) -> str:
+        # 변형 생성이 끝나야 상품 버전이 더 바뀌지 않음
+        futures = []
+        schedule = image_variants.schedule
+
+        def schedule_and_track(image_ids):
+            futures.extend(schedule(image_ids))
+            return futures
+
+        monkeypatch.setattr(image_variants, "schedule", schedule_and_track)
+        review_id = client.post("/api/reviews", json=sample_review).json()["id"]
+        buf = BytesIO()
+        Image.new("RGB", (640, 480), "teal").save(buf, "JPEG")
+        client.post(
+            f"/api/reviews/{review_id}/images",
+            files={"files": ("p.jpg", BytesIO(buf.getvalue()), "image/jpeg")},
+        )
+        for future in futures:
+            assert future.result() == "ready"
+        return f"/api/widget/reviews/{sample_review['product_no']}"
+
+    def test_etag_and_cache_roll_with_url_epoch(
+        self, client, sample_review, s3, clock, monkeypatch
+    ):
+        url = self._widget_with_photo(client, sample_review, monkeypatch)
+        # 주기 시작 직후로 맞춰 테스트 중에 주기가 바뀌지 않게
+        interval = storage.url_refresh_interval()
+        clock(interval - time.time() % interval + 1)
+        first = client.get(url)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        last_modified = first.headers["last-modified"]
+
+        # 같은 주기: 304, 캐시된 본문 재사용 (URL을 다시 서명하지 않음)
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+        signed = s3.presigned
+        assert client.get(url).status_code == 200
+        assert s3.presigned == signed
+
+        # 유효 시간의 절반이 지나면 새 ETag와 새로 서명한 URL
+        clock(interval)
+        resp = client.get(url, headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["etag"] != etag
+        assert s3.presigned > signed
+        resp = client.get(url, headers={"If-Modified-Since": last_modified})
+        assert resp.status_code == 200
+
+    def test_max_age_below_refresh_interval(self, client, sample_review, monkeypatch):
+        storage_backends.set_backend(
+            S3Storage(FakeS3Client(), "reviews", presign_expires=60)
+        )
+        try:
+            monkeypatch.setattr(config, "WIDGET_HTTP_MAX_AGE", 600)
+            url = self._widget_with_photo(client, sample_review, monkeypatch)
+            resp = client.get(url)
+            assert resp.headers["cache-control"] == "public, max-age=30"
+        finally:
+            storage_backends.set_backend(None)
+
+    def test_public_urls_keep_etag(self, client, sample_review, clock, monkeypatch):
+        storage_backends.set_backend(
+            S3Storage(FakeS3Client(), "reviews", public_base_url="https://cdn.test")
+        )
+        try:
+            url = self._widget_with_photo(client, sample_review, monkeypatch)
+            etag = client.get(url).headers["etag"]
+            clock(86400)
+            assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+        finally:
+            storage_backends.set_backend(None)
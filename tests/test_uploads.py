@@ -0,0 +1,182 @@
+"""/uploads 이미지 서빙 (immutable 캐시, ETag, Range, Accept 협상) 테스트."""
+
+import os
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from app import config
+from app.utils.file_serving import parse_range
+from app.utils.image_variants import wait_for_variants
+
+BODY = bytes(range(256)) * 4  # 1024바이트
+
+
+@pytest.fixture()
+def upload_file():
+    created: list[str] = []
+
+    def write(relative: str, data: bytes = BODY) -> str:
+        full_path = os.path.join(config.UPLOAD_DIR, relative)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "wb") as f:
+            f.write(data)
+        created.append(full_path)
+        return f"/uploads/{relative}"
+
+    yield write
+    for full_path in created:
+        if os.path.exists(full_path):
+            os.remove(full_path)
+
+
+class TestParseRange:
+    def test_ranges(self):
+        assert parse_range("bytes=0-99", 1024) == (0, 99)
+        assert parse_range("bytes=1000-", 1024) == (1000, 1023)
+        assert parse_range("bytes=1000-5000", 1024) == (1000, 1023)
+        assert parse_range("bytes=-24", 1024) == (1000, 1023)
+        assert parse_range("bytes=-5000", 1024) == (0, 1023)
+
+    def test_ignored(self):
+        assert parse_range("bytes=0-1,5-6", 1024) is None
+        assert parse_range("items=0-1", 1024) is None
+        assert parse_range("bytes=abc", 1024) is None
+        assert parse_range("bytes=9-3", 1024) is None
+
+    def test_unsatisfiable(self):
+        with pytest.raises(ValueError):
+            parse_range("bytes=1024-", 1024)
+        with pytest.raises(ValueError):
+            parse_range("bytes=-0", 1024)
+
+
+class TestServeUpload:
+    def test_full_response_headers(self, client, upload_file):
+        url = upload_file("blobs/aa/aa/serve.jpg")
+        resp = client.get(url)
+        assert resp.status_code == 200
+        assert resp.content == BODY
+        assert resp.headers["content-type"] == "image/jpeg"
+        assert resp.headers["cache-control"] == "public, max-age=31536000, immutable"
+        assert resp.headers["accept-ranges"] == "bytes"
+        assert resp.headers["content-length"] == "1024"
+        assert resp.headers["etag"].startswith('"')
+        assert "last-modified" in resp.headers
+
+    def test_head(self, client, upload_file):
+        resp = client.head(upload_file("blobs/aa/aa/head.jpg"))
+        assert resp.status_code == 200
+        assert resp.headers["content-length"] == "1024"
+        assert resp.content == b""
+
+    def test_if_none_match(self, client, upload_file):
+        url = upload_file("blobs/aa/aa/etag.jpg")
+        etag = client.get(url).headers["etag"]
+        resp = client.get(url, headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers["etag"] == etag
+        assert "immutable" in resp.headers["cache-control"]
+
+    def test_range(self, client, upload_file):
+        url = upload_file("blobs/aa/aa/range.jpg")
+        resp = client.get(url, headers={"Range": "bytes=10-19"})
+        assert resp.status_code == 206
+        assert resp.content == BODY[10:20]
+        assert resp.headers["content-range"] == "bytes 10-19/1024"
+        assert resp.headers["content-length"] == "10"
+
+        suffix = client.get(url, headers={"Range": "bytes=-4"})
+        assert suffix.status_code == 206
+        assert suffix.content == BODY[-4:]
+
+    def test_range_unsatisfiable(self, client, upload_file):
+        resp = client.get(upload_file("blobs/aa/aa/416.jpg"), headers={"Range": "bytes=5000-"})
+        assert resp.status_code == 416
+        assert resp.headers["content-range"] == "bytes */1024"
+
+    def test_if_range_mismatch_sends_full_body(self, client, upload_file):
+        url = upload_file("blobs/aa/aa/ifrange.jpg")
+        resp = client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+        assert resp.status_code == 200
+        assert resp.content == BODY
+
+        etag = resp.headers["etag"]
+        resp = client.get(url, headers={"Range": "bytes=0-9", "If-Range": etag})
+        assert resp.status_code == 206
+
+    def test_large_file_streamed_in_chunks(self, client, upload_file):
+        data = os.urandom(700 * 1024)
+        resp = client.get(upload_file("blobs/aa/aa/large.png", data))
+        assert resp.content == data
+        resp = client.get(
+            upload_file("blobs/aa/aa/large.png", data), headers={"Range": "bytes=300000-"}
+        )
+        assert resp.content == data[300000:]
+
+    def test_accept_negotiation(self, client, upload_file):
+        url = upload_file("blobs/bb/bb/photo_card.jpg", b"jpeg")
+        upload_file("blobs/bb/bb/photo_card.webp", b"webp")
+
+        resp = client.get(url, headers={"Accept": "image/webp,image/*;q=0.8"})
+        assert resp.content == b"webp"
+        assert resp.headers["content-type"] == "image/webp"
+        assert resp.headers["vary"] == "Accept"
+
+        resp = client.get(url, headers={"Accept": "image/webp;q=0, image/jpeg"})
+        assert resp.content == b"jpeg"
+        assert resp.headers["vary"] == "Accept"
+
+        # AVIF는 만들지 않으므로 WebP
+        resp = client.get(url, headers={"Accept": "image/avif,image/webp"})
+        assert resp.content == b"webp"
+
+    def test_no_alternative_no_vary(self, client, upload_file):
+        url = upload_file("blobs/bb/bb/plain.jpg", b"jpeg")
+        upload_file("blobs/bb/bb/plain.avif", b"avif")
+        resp = client.get(url, headers={"Accept": "image/avif,image/webp,*/*"})
+        assert resp.content == b"jpeg"
+        assert "vary" not in resp.headers
+
+    def test_uploaded_original_and_variants(self, client, sample_review):
+        """실제 업로드: 원본 blob은 협상하지 않고, 변형 JPEG는 WebP 변형으로 대체한다."""
+        review_id = client.post("/api/reviews", json=sample_review).json()["id"]
+        buf = BytesIO()
+        Image.new("RGB", (640, 480), "maroon").save(buf, "JPEG")
+        image = client.post(
+            f"/api/reviews/{review_id}/images",
+            files={"files": ("orig.jpg", BytesIO(buf.getvalue()), "image/jpeg")},
+        ).json()[0]
+        wait_for_variants()
+        webp_first = {"Accept": "image/avif,image/webp,*/*"}
+
+        resp = client.get(image["url"], headers=webp_first)
+        assert resp.headers["content-type"] == "image/jpeg"
+        assert "vary" not in resp.headers
+
+        variants = client.get(f"/api/reviews/{review_id}").json()["images"][0]["variants"]
+        card = next(v for v in variants if v["name"] == "card" and v["format"] == "jpeg")
+        resp = client.get(card["url"], headers=webp_first)
+        assert resp.headers["content-type"] == "image/webp"
+        assert resp.headers["vary"] == "Accept"
+
+    def test_webp_request_not_negotiated(self, client, upload_file):
+        resp = client.get(upload_file("blobs/bb/bb/only.webp", b"webp"))
+        assert resp.status_code == 200
+        assert "vary" not in resp.headers
+
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "/uploads/missing.jpg",
+            "/uploads/.incoming/x.part",
+            "/uploads/blobs/../../app/config.py",
+            "/uploads/blobs/%2e%2e/%2e%2e/app/config.py",
+            "/uploads/blobs",
+        ],
+    )
+    def test_not_found(self, client, upload_file, path):
+        upload_file(".incoming/x.part")
+        assert client.get(path).status_code == 404